@@ -0,0 +1,152 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utilities to time Mava hot paths and record the results."""
+
+import platform
+import subprocess
+import time
+from typing import Any, Callable, Dict, Optional, Union
+
+import jax
+import numpy as np
+import reverb
+import tree
+
+LATENCY_PERCENTILES = (50, 90, 99)
+
+
+def benchmark(
+    fn: Callable[[], Any],
+    num_iterations: int,
+    num_warmup_iterations: int = 5,
+    setup_fn: Optional[Callable[[], None]] = None,
+    items_per_call: Union[int, Callable[[Any], int]] = 1,
+) -> Dict[str, Any]:
+    """Time a function and summarise its throughput and latency.
+
+    Jax computations are waited for, so that asynchronous dispatch does not
+    hide their run time.
+
+    Args:
+        fn: function to time.
+        num_iterations: number of timed calls to the function.
+        num_warmup_iterations: number of calls made before timing the function,
+            e.g. to compile jitted functions.
+        setup_fn: function called before every call to fn, which is not timed.
+        items_per_call: number of items, e.g. environment steps, processed by
+            a call to fn, or a function computing it from the output of fn.
+
+    Returns:
+        Dictionary with the number of calls and items per second, and the
+        latency percentiles of a call in milliseconds.
+    """
+    for _ in range(num_warmup_iterations):
+        if setup_fn is not None:
+            setup_fn()
+        jax.block_until_ready(fn())
+
+    latencies = []
+    num_items = 0
+    for _ in range(num_iterations):
+        if setup_fn is not None:
+            setup_fn()
+        start_time = time.perf_counter()
+        output = jax.block_until_ready(fn())
+        latencies.append(time.perf_counter() - start_time)
+        num_items += (
+            items_per_call(output) if callable(items_per_call) else items_per_call
+        )
+
+    latencies_ms = 1000 * np.array(latencies)
+    total_time = float(np.sum(latencies))
+    return {
+        "num_iterations": num_iterations,
+        "calls_per_second": num_iterations / total_time,
+        "items_per_second": num_items / total_time,
+        "latency_ms": {
+            "mean": float(np.mean(latencies_ms)),
+            **{
+                f"p{percentile}": float(np.percentile(latencies_ms, percentile))
+                for percentile in LATENCY_PERCENTILES
+            },
+            "max": float(np.max(latencies_ms)),
+        },
+    }
+
+
+def make_synthetic_sample(
+    data_server_client: reverb.Client, table: str, batch_size: int
+) -> reverb.ReplaySample:
+    """Create a batch of samples matching the signature of a reverb table.
+
+    All values are set to one, which gives valid actions and legal action
+    masks, so that training steps on the sample do not need a filled table.
+
+    Args:
+        data_server_client: client of the reverb server holding the table.
+        table: name of the table.
+        batch_size: number of samples in the batch.
+
+    Returns:
+        Batch of synthetic reverb samples.
+    """
+    signature = data_server_client.server_info()[table].signature
+    data = tree.map_structure(
+        lambda spec: np.ones(
+            [batch_size] + [dim or 1 for dim in spec.shape.as_list()],
+            dtype=spec.dtype.as_numpy_dtype,
+        ),
+        signature,
+    )
+    info = reverb.SampleInfo(
+        *[
+            np.ones(batch_size, dtype=dtype.as_numpy_dtype)
+            for dtype in reverb.SampleInfo.tf_dtypes()
+        ]
+    )
+    return reverb.ReplaySample(info=info, data=data)
+
+
+def parameters_size(parameters: Any) -> int:
+    """Number of bytes held by the arrays in a nest of parameters."""
+    return sum(np.asarray(leaf).nbytes for leaf in tree.flatten(parameters))
+
+
+def run_metadata() -> Dict[str, Any]:
+    """Describe the code and machine the benchmarks ran on.
+
+    Returns:
+        Dictionary with the git commit, the jax backend and the platform.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "jax_version": jax.__version__,
+        "jax_backend": jax.default_backend(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "python_version": platform.python_version(),
+    }
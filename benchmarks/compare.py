@@ -0,0 +1,121 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare the benchmark results of two commits.
+
+Example:
+    python -m benchmarks.compare --baseline_path=main.json --results_path=new.json
+"""
+
+import json
+from typing import Any, Dict, Iterator, List, Tuple
+
+from absl import app, flags
+
+FLAGS = flags.FLAGS
+flags.DEFINE_string("baseline_path", None, "Results to compare against (str).")
+flags.DEFINE_string("results_path", None, "Results to compare (str).")
+flags.DEFINE_float(
+    "regression_threshold",
+    0.1,
+    "Relative throughput drop reported as a regression (float).",
+)
+flags.mark_flags_as_required(["baseline_path", "results_path"])
+
+
+def iterate_benchmarks(results: Dict[str, Any]) -> Iterator[Tuple[str, Dict]]:
+    """Iterate over the benchmarks of a results file.
+
+    Args:
+        results: benchmark results.
+
+    Yields:
+        Name of each benchmark, e.g. "trainer/sgd_step", and its results.
+    """
+    for subsystem, benchmarks in results["benchmarks"].items():
+        for name, benchmark_results in benchmarks.items():
+            yield f"{subsystem}/{name}", benchmark_results
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    results: Dict[str, Any],
+    regression_threshold: float,
+) -> Tuple[Dict[str, Dict[str, float]], List[str]]:
+    """Compute the relative change of the benchmarks run in both results.
+
+    Args:
+        baseline: benchmark results to compare against.
+        results: benchmark results to compare.
+        regression_threshold: relative throughput drop reported as a
+            regression.
+
+    Returns:
+        The relative change of the items per second and of the p50 and p99
+        latencies of each benchmark, and the names of the benchmarks whose
+        throughput regressed.
+    """
+    baseline_benchmarks = dict(iterate_benchmarks(baseline))
+    changes: Dict[str, Dict[str, float]] = {}
+    regressions = []
+    for name, benchmark_results in iterate_benchmarks(results):
+        if name not in baseline_benchmarks:
+            continue
+        baseline_results = baseline_benchmarks[name]
+        changes[name] = {
+            "items_per_second": benchmark_results["items_per_second"]
+            / baseline_results["items_per_second"]
+            - 1,
+            **{
+                percentile: benchmark_results["latency_ms"][percentile]
+                / baseline_results["latency_ms"][percentile]
+                - 1
+                for percentile in ["p50", "p99"]
+            },
+        }
+        if changes[name]["items_per_second"] < -regression_threshold:
+            regressions.append(name)
+    return changes, regressions
+
+
+def main(_: Any) -> None:
+    """Print the relative change of each benchmark.
+
+    Args:
+        _ : _
+    """
+    with open(FLAGS.baseline_path) as f:
+        baseline = json.load(f)
+    with open(FLAGS.results_path) as f:
+        results = json.load(f)
+
+    changes, regressions = compare_results(
+        baseline, results, FLAGS.regression_threshold
+    )
+    print(
+        f"{'benchmark':40} {'items/s change':>15} {'p50 change':>12} {'p99 change':>12}"
+    )
+    for name, change in changes.items():
+        print(
+            f"{name:40} {change['items_per_second']:>+15.1%} "
+            f"{change['p50']:>+12.1%} {change['p99']:>+12.1%}"
+        )
+
+    if regressions:
+        print(f"Throughput regressions: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    app.run(main)
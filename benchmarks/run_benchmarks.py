@@ -0,0 +1,265 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the executor, trainer and parameter server of an IPPO system.
+
+Builds a single process IPPO system on the debugging simple_spread environment
+and times its hot paths. Results are written to a JSON file, which can be
+compared with the results of another commit using benchmarks/compare.py.
+
+Example:
+    python -m benchmarks.run_benchmarks --output_path=results.json
+"""
+
+import functools
+import json
+import tempfile
+from typing import Any, Dict
+
+import jax
+import optax
+from absl import app, flags, logging
+
+from benchmarks.benchmark_utils import (
+    benchmark,
+    make_synthetic_sample,
+    parameters_size,
+    run_metadata,
+)
+from mava.systems import ippo
+from mava.utils.environments import debugging_utils
+from mava.utils.loggers import logger_utils
+
+FLAGS = flags.FLAGS
+flags.DEFINE_string(
+    "output_path", "benchmark_results.json", "File to write the results to (str)."
+)
+flags.DEFINE_list(
+    "benchmarks",
+    ["executor", "trainer", "parameter_server"],
+    "Subsystems to benchmark (list).",
+)
+flags.DEFINE_integer("num_iterations", 200, "Number of timed calls (int).")
+flags.DEFINE_integer(
+    "num_warmup_iterations", 5, "Number of calls before timing, e.g. to compile."
+)
+flags.DEFINE_integer("num_episodes", 20, "Number of timed episodes (int).")
+flags.DEFINE_integer("num_agents", 3, "Number of agents in simple_spread (int).")
+flags.DEFINE_integer("epoch_batch_size", 32, "Trainer batch size (int).")
+flags.DEFINE_string("platform", "cpu", "Jax platform to run on (str).")
+
+
+def build_system() -> Dict[str, Any]:
+    """Build a single process IPPO system on simple_spread.
+
+    Returns:
+        Dictionary with the parameter server, executor and trainer nodes.
+    """
+    environment_factory = functools.partial(
+        debugging_utils.make_environment,
+        env_name="simple_spread",
+        action_space="discrete",
+        num_agents=FLAGS.num_agents,
+    )
+
+    def network_factory(*args: Any, **kwargs: Any) -> Any:
+        return ippo.make_default_networks(  # type: ignore
+            policy_layer_sizes=(64, 64),
+            critic_layer_sizes=(64, 64, 64),
+            *args,
+            **kwargs,
+        )
+
+    base_dir = tempfile.mkdtemp()
+    logger_factory = functools.partial(
+        logger_utils.make_logger,
+        directory=base_dir,
+        to_terminal=False,
+        to_tensorboard=False,
+        time_stamp="benchmark",
+        time_delta=60,
+    )
+
+    optimiser = optax.chain(
+        optax.clip_by_global_norm(40.0), optax.scale_by_adam(), optax.scale(-1e-4)
+    )
+
+    system = ippo.IPPOSystem()
+    system.build(
+        environment_factory=environment_factory,
+        network_factory=network_factory,
+        logger_factory=logger_factory,
+        experiment_path=f"{base_dir}/benchmark",
+        policy_optimiser=optimiser,
+        critic_optimiser=optimiser,
+        multi_process=False,
+        run_evaluator=False,
+        num_executors=1,
+        epoch_batch_size=FLAGS.epoch_batch_size,
+        # Keep the queue from filling up since no trainer consumes it.
+        max_queue_size=100000,
+        nodes_on_gpu=[],
+        checkpoint_minute_interval=1e6,
+    )
+    _, parameter_server, executor, trainer = system._builder.store.system_build
+    return {
+        "parameter_server": parameter_server,
+        "executor": executor,
+        "trainer": trainer,
+    }
+
+
+def benchmark_executor(nodes: Dict[str, Any]) -> Dict[str, Any]:
+    """Time action selection and whole environment steps.
+
+    Args:
+        nodes: nodes of the built system.
+
+    Returns:
+        Results of the executor benchmarks.
+    """
+    executor_loop = nodes["executor"]
+    executor = executor_loop._executor
+    observations = executor_loop._environment.reset().observation
+    num_agents = len(observations)
+
+    return {
+        "select_actions": benchmark(
+            lambda: executor.select_actions(observations),
+            num_iterations=FLAGS.num_iterations,
+            num_warmup_iterations=FLAGS.num_warmup_iterations,
+            items_per_call=num_agents,
+        ),
+        "environment_loop_episode": benchmark(
+            executor_loop.run_episode,
+            num_iterations=FLAGS.num_episodes,
+            num_warmup_iterations=1,
+            items_per_call=lambda result: result["episode_length"],
+        ),
+    }
+
+
+def benchmark_trainer(nodes: Dict[str, Any]) -> Dict[str, Any]:
+    """Time SGD steps on synthetic reverb samples.
+
+    Args:
+        nodes: nodes of the built system.
+
+    Returns:
+        Results of the trainer benchmarks.
+    """
+    trainer = nodes["trainer"]
+    sample = make_synthetic_sample(
+        trainer.store.data_server_client,
+        trainer.store.trainer_id,
+        FLAGS.epoch_batch_size,
+    )
+    sample = sample._replace(data=jax.device_put(sample.data))
+
+    return {
+        "sgd_step": benchmark(
+            lambda: trainer.store.step_fn(sample),
+            num_iterations=FLAGS.num_iterations,
+            num_warmup_iterations=FLAGS.num_warmup_iterations,
+            items_per_call=FLAGS.epoch_batch_size,
+        ),
+    }
+
+
+def benchmark_parameter_server(nodes: Dict[str, Any]) -> Dict[str, Any]:
+    """Time parameter syncs between the parameter server and an executor.
+
+    Args:
+        nodes: nodes of the built system.
+
+    Returns:
+        Results of the parameter server benchmarks.
+    """
+    parameter_server = nodes["parameter_server"]
+    executor_loop = nodes["executor"]
+    parameter_client = executor_loop._executor.store.executor_parameter_client
+    network_keys = [
+        key
+        for key in parameter_client._get_keys
+        if key.startswith(("policy_network-", "critic_network-"))
+    ]
+    network_parameters = parameter_server.get_parameters(network_keys)
+    num_bytes = parameters_size(network_parameters)
+
+    def update_networks() -> None:
+        """Set the networks so that the next sync transfers them."""
+        parameter_server.set_parameters(network_parameters)
+
+    return {
+        "get_and_wait": benchmark(
+            parameter_client.get_and_wait,
+            num_iterations=FLAGS.num_iterations,
+            num_warmup_iterations=FLAGS.num_warmup_iterations,
+            setup_fn=update_networks,
+        ),
+        "copy_networks": {
+            "bytes_per_call": num_bytes,
+            **benchmark(
+                lambda: parameter_client._copy(network_parameters),
+                num_iterations=FLAGS.num_iterations,
+                num_warmup_iterations=FLAGS.num_warmup_iterations,
+                items_per_call=num_bytes,
+            ),
+        },
+    }
+
+
+BENCHMARKS = {
+    "executor": benchmark_executor,
+    "trainer": benchmark_trainer,
+    "parameter_server": benchmark_parameter_server,
+}
+
+
+def main(_: Any) -> None:
+    """Run the benchmarks and write their results.
+
+    Args:
+        _ : _
+    """
+    jax.config.update("jax_platform_name", FLAGS.platform)
+    unknown_benchmarks = set(FLAGS.benchmarks) - set(BENCHMARKS)
+    if unknown_benchmarks:
+        raise ValueError(f"Unknown benchmarks: {sorted(unknown_benchmarks)}.")
+
+    nodes = build_system()
+    results: Dict[str, Any] = {
+        "metadata": {
+            **run_metadata(),
+            "config": {
+                "num_iterations": FLAGS.num_iterations,
+                "num_episodes": FLAGS.num_episodes,
+                "num_agents": FLAGS.num_agents,
+                "epoch_batch_size": FLAGS.epoch_batch_size,
+            },
+        },
+        "benchmarks": {},
+    }
+    for name in FLAGS.benchmarks:
+        logging.info("Running the %s benchmarks.", name)
+        results["benchmarks"][name] = BENCHMARKS[name](nodes)
+
+    with open(FLAGS.output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    logging.info("Wrote the benchmark results to %s.", FLAGS.output_path)
+
+
+if __name__ == "__main__":
+    app.run(main)
@@ -15,6 +15,7 @@
 
 """Adders that use Reverb (github.com/deepmind/reverb) as a backend."""
 
+import time
 from typing import (
     Any,
     Callable,
@@ -24,6 +25,7 @@ from typing import (
     Mapping,
     NamedTuple,
     Optional,
+    Set,
     Tuple,
     Union,
 )
@@ -39,6 +41,11 @@ from acme.adders.reverb.base import ReverbAdder
 
 from mava import types as mava_types
 from mava.adders.base import ParallelAdder
+from mava.adders.reverb.encoding import (
+    FieldEncodings,
+    encode_field,
+    validate_field_encodings,
+)
 from mava.utils.sort_utils import sort_str_num
 
 DEFAULT_PRIORITY_TABLE = "priority_table"
@@ -124,6 +131,10 @@ class ReverbParallelAdder(ReverbAdder, ParallelAdder):
         delta_encoded: bool = False,
         priority_fns: Optional[PriorityFnMapping] = None,
         get_signature_timeout_ms: int = 300_000,
+        flush_batch_size: int = 1,
+        flush_interval_seconds: Optional[float] = None,
+        field_encodings: Optional[FieldEncodings] = None,
+        max_chunk_length: Optional[int] = None,
     ):
         """Reverb Base Adder.
 
@@ -140,6 +151,25 @@ class ReverbParallelAdder(ReverbAdder, ParallelAdder):
                 table names to priority functions. Defaults to None.
             get_signature_timeout_ms (int, optional): Timeout while fetching
                 signature. Defaults to 300_000.
+            flush_batch_size (int, optional): Number of items created before the
+                writer is flushed. Defaults to 1, which flushes after every item.
+            flush_interval_seconds (Optional[float], optional): Also flush the
+                writer when this many seconds passed since the last flush, even
+                if fewer than `flush_batch_size` items were created. The interval
+                is checked whenever a step is added, so pending items are not
+                flushed while the adder is idle: the writer is not thread safe,
+                so no timer thread flushes it. Defaults to None.
+            field_encodings (Optional[FieldEncodings], optional): Storage
+                encodings of the observation and extras fields, see
+                `mava.adders.reverb.encoding`. Defaults to None.
+            max_chunk_length (Optional[int], optional): Number of steps of a
+                column compressed together in a chunk. Longer chunks compress
+                correlated steps better. Defaults to None, in which case reverb
+                tunes the chunk length.
+
+        Raises:
+            ValueError: if flush_batch_size is less than 1 or a field cannot be
+                encoded.
         """
         super().__init__(
             client=client,
@@ -149,6 +179,76 @@ class ReverbParallelAdder(ReverbAdder, ParallelAdder):
             priority_fns=priority_fns,
             get_signature_timeout_ms=get_signature_timeout_ms,
         )
+        if flush_batch_size < 1:
+            raise ValueError(
+                f"flush_batch_size must be at least 1, got {flush_batch_size}."
+            )
+        self._flush_batch_size = flush_batch_size
+        self._flush_interval_seconds = flush_interval_seconds
+        self._num_unflushed_items = 0
+        self._last_flush_time = time.monotonic()
+
+        self._field_encodings = field_encodings or {}
+        validate_field_encodings(self._field_encodings)
+        self._max_chunk_length = max_chunk_length
+        # Writer whose columns have their chunk length set, and these columns.
+        self._chunked_writer: Optional[reverb.TrajectoryWriter] = None
+        self._chunked_paths: Set[Tuple] = set()
+
+    def _append(self, data: Dict[str, Any], partial_step: bool = False) -> None:
+        """Append data to the writer, setting the chunk length of new columns.
+
+        Args:
+            data: step data to append.
+            partial_step: whether the step is left open for more data.
+        """
+        writer = self._writer
+        if self._max_chunk_length is not None:
+            if writer is not self._chunked_writer:
+                self._chunked_writer = writer
+                self._chunked_paths = set()
+            for path, _ in tree.flatten_with_path(data):
+                if path not in self._chunked_paths:
+                    writer.configure(
+                        path,
+                        num_keep_alive_refs=self._max_sequence_length,
+                        max_chunk_length=min(
+                            self._max_chunk_length, self._max_sequence_length
+                        ),
+                    )
+                    self._chunked_paths.add(path)
+        writer.append(data, partial_step=partial_step)
+
+    def _maybe_flush(self) -> None:
+        """Flush the writer once a batch of items is pending or the interval passed.
+
+        Flushing blocks until at most `max_in_flight_items` items are waiting
+        for the server, so at most `flush_batch_size + max_in_flight_items`
+        items are ever pending in the writer. Called when items are created and
+        when steps are added, so items created before a slow stretch of the
+        episode are flushed at the next step after the interval.
+        """
+        if self._num_unflushed_items == 0:
+            return
+        interval_passed = self._flush_interval_seconds is not None and (
+            time.monotonic() - self._last_flush_time >= self._flush_interval_seconds
+        )
+        if self._num_unflushed_items < self._flush_batch_size and not interval_passed:
+            return
+
+        self._writer.flush(self._max_in_flight_items)
+        self._num_unflushed_items = 0
+        self._last_flush_time = time.monotonic()
+
+    def reset(self, timeout_ms: Optional[int] = None) -> None:
+        """Resets the adder's buffer, waiting for all pending items.
+
+        Args:
+            timeout_ms: Timeout in milliseconds while waiting for the items.
+        """
+        super().reset(timeout_ms)
+        self._num_unflushed_items = 0
+        self._last_flush_time = time.monotonic()
 
     def write_experience_to_tables(  # noqa
         self,
@@ -175,8 +275,9 @@ class ReverbParallelAdder(ReverbAdder, ParallelAdder):
                 table=table_name, priority=priority, trajectory=trajectory
             )
 
-        # Flush the writer.
-        self._writer.flush(self._max_in_flight_items)
+        # Flush the writer once enough items are pending.
+        self._num_unflushed_items += 1
+        self._maybe_flush()
 
     def add_first(
         self,
@@ -192,11 +293,13 @@ class ReverbParallelAdder(ReverbAdder, ParallelAdder):
         # Record the next observation but leave the history buffer row open by
         # passing `partial_step=True`.
         add_dict = dict(
-            observations=timestep.observation,
+            observations=encode_field(
+                "observations", timestep.observation, self._field_encodings
+            ),
             start_of_episode=timestep.first(),
         )
 
-        self._writer.append(
+        self._append(
             add_dict,
             partial_step=True,
         )
@@ -213,32 +316,111 @@ class ReverbParallelAdder(ReverbAdder, ParallelAdder):
         if not self._add_first_called:
             raise ValueError("adder.add_first must be called before adder.add.")
 
+        self._add_step(
+            actions=actions,
+            rewards=next_timestep.reward,
+            discounts=next_timestep.discount,
+            extras=encode_field("extras", extras, self._field_encodings),
+            next_observations=encode_field(
+                "observations", next_timestep.observation, self._field_encodings
+            ),
+            start_of_episode=next_timestep.first(),
+            last=next_timestep.last(),
+        )
+
+    def add_trajectory(
+        self,
+        actions: Dict[str, mava_types.NestedArray],
+        next_timesteps: dm_env.TimeStep,
+        extras: Dict[str, mava_types.NestedArray] = {},
+    ) -> None:
+        """Record the actions and following timesteps of consecutive steps.
+
+        Equivalent to calling add at each step, with the observations and extras
+        of the whole trajectory encoded at once. Reverb writers append a single
+        step at a time, so the steps are then appended one by one.
+
+        Args:
+            actions: actions of the agents, with a leading time axis.
+            next_timesteps: timesteps following the actions, whose fields have
+                a leading time axis. Only the last one can end the episode.
+            extras: extras of the steps, with a leading time axis.
+        """
+        if not self._add_first_called:
+            raise ValueError(
+                "adder.add_first must be called before adder.add_trajectory."
+            )
+        step_types = np.asarray(next_timesteps.step_type)
+        if np.any(step_types[:-1] == dm_env.StepType.LAST):
+            raise ValueError(
+                "Only the last timestep of a trajectory can end the episode."
+            )
+
+        trajectory = (
+            actions,
+            next_timesteps.reward,
+            next_timesteps.discount,
+            encode_field("extras", extras, self._field_encodings),
+            encode_field(
+                "observations", next_timesteps.observation, self._field_encodings
+            ),
+        )
+        leaves = tree.flatten(trajectory)
+        for t, step_type in enumerate(step_types):
+            (
+                step_actions,
+                rewards,
+                discounts,
+                step_extras,
+                next_observations,
+            ) = tree.unflatten_as(trajectory, [leaf[t] for leaf in leaves])
+            self._add_step(
+                actions=step_actions,
+                rewards=rewards,
+                discounts=discounts,
+                extras=step_extras,
+                next_observations=next_observations,
+                start_of_episode=step_type == dm_env.StepType.FIRST,
+                last=step_type == dm_env.StepType.LAST,
+            )
+
+    def _add_step(
+        self,
+        actions: Dict[str, mava_types.NestedArray],
+        rewards: Dict[str, mava_types.NestedArray],
+        discounts: Dict[str, mava_types.NestedArray],
+        extras: Dict[str, mava_types.NestedArray],
+        next_observations: Dict[str, mava_types.NestedArray],
+        start_of_episode: bool,
+        last: bool,
+    ) -> None:
+        """Append a step whose extras and next observations are encoded."""
         # Add the timestep to the buffer.
         current_step = dict(
             # Observations was passed at the previous add call.
             actions=actions,
-            rewards=next_timestep.reward,
-            discounts=next_timestep.discount,
+            rewards=rewards,
+            discounts=discounts,
             # Start of episode indicator was passed at the previous add call.
+            extras=extras,
         )
-
-        current_step["extras"] = extras
-        self._writer.append(current_step)
+        self._append(current_step)
 
         # Record the next observation and write.
         next_step = dict(
-            observations=next_timestep.observation,
-            start_of_episode=next_timestep.first(),
+            observations=next_observations,
+            start_of_episode=start_of_episode,
         )
 
-        self._writer.append(
+        self._append(
             next_step,
             partial_step=True,
         )
 
         self._write()
+        self._maybe_flush()
 
-        if next_timestep.last():
+        if last:
             # Complete the row by appending zeros to remaining open fields.
             # TODO(acme): remove this when fields are no longer expected to be
             # of equal length on the learner side.
@@ -0,0 +1,177 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Storage encodings of the fields written to reverb tables.
+
+Fields can be stored with a smaller dtype than the one of the environment, e.g.
+observations as float16, or as uint8 with a scale and an offset. The adders
+encode the fields before writing them, the table signatures use the encoded
+dtypes and the trainer datasets decode the sampled fields back to float32.
+"""
+
+from typing import Any, Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+import tensorflow as tf
+import tree
+
+# Fields of the written items that can be encoded. Rewards and discounts are
+# kept as they are since the adders compute returns from them.
+ENCODABLE_FIELDS = ("observations", "extras")
+# Leaves of OLT observations that are never encoded.
+_UNENCODED_LEAVES = ("legal_actions", "terminal")
+
+
+class FieldEncoding(NamedTuple):
+    """Storage dtype of a field, whose values are stored as (x - offset) / scale.
+
+    Values stored with an integer dtype are rounded and clipped to its range.
+    """
+
+    dtype: str
+    scale: float = 1.0
+    offset: float = 0.0
+
+
+FieldEncodings = Mapping[str, FieldEncoding]
+
+
+def validate_field_encodings(field_encodings: FieldEncodings) -> None:
+    """Check that the encoded fields can be encoded.
+
+    Args:
+        field_encodings: mapping from field paths, e.g. "observations" or
+            "extras/s_t", to their encoding.
+
+    Raises:
+        ValueError: if a field is not an observation or extras field, or if an
+            encoding does not use a numeric dtype.
+    """
+    for field, encoding in field_encodings.items():
+        if field.split("/")[0] not in ENCODABLE_FIELDS:
+            raise ValueError(
+                f"Cannot encode field '{field}', only the fields under "
+                f"{ENCODABLE_FIELDS} can be encoded."
+            )
+        if np.dtype(encoding.dtype).kind not in "iuf":
+            raise ValueError(
+                f"Field '{field}' must be encoded with a numeric dtype, "
+                f"got {encoding.dtype}."
+            )
+
+
+def _leaf_encoding(
+    path: Sequence[Any], dtype: Any, field_encodings: FieldEncodings
+) -> Optional[FieldEncoding]:
+    """Find the encoding of a leaf of a written item, if any.
+
+    Args:
+        path: path of the leaf in the item. The next observations of transitions
+            use the encodings of the observations.
+        dtype: dtype of the leaf before encoding.
+        field_encodings: encodings of the fields.
+
+    Returns:
+        The encoding of the leaf, or None if it is stored as it is.
+    """
+    if not field_encodings or not tf.as_dtype(dtype).is_floating:
+        return None
+    path = [str(p) for p in path]
+    if path[-1] in _UNENCODED_LEAVES:
+        return None
+    if path[0] == "next_observations":
+        path[0] = "observations"
+
+    # The most specific field containing the leaf gives its encoding.
+    for length in range(len(path), 0, -1):
+        encoding = field_encodings.get("/".join(path[:length]))
+        if encoding is not None:
+            return encoding
+    return None
+
+
+def encode_field(field: str, value: Any, field_encodings: FieldEncodings) -> Any:
+    """Encode the values of a field before writing them.
+
+    Args:
+        field: name of the field, e.g. "observations".
+        value: nested values of the field.
+        field_encodings: encodings of the fields.
+
+    Returns:
+        The encoded values.
+    """
+
+    def encode(path: Sequence[Any], leaf: Any) -> Any:
+        leaf = np.asarray(leaf)
+        encoding = _leaf_encoding((field, *path), leaf.dtype, field_encodings)
+        if encoding is None:
+            return leaf
+        leaf = (leaf - encoding.offset) / encoding.scale
+        dtype = np.dtype(encoding.dtype)
+        if dtype.kind in "iu":
+            info = np.iinfo(dtype)
+            leaf = np.clip(np.rint(leaf), info.min, info.max)
+        return leaf.astype(dtype)
+
+    if not field_encodings:
+        return value
+    return tree.map_structure_with_path(encode, value)
+
+
+def encode_signature(signature: Any, field_encodings: FieldEncodings) -> Any:
+    """Use the storage dtypes in the signature of a table.
+
+    Args:
+        signature: item signature whose leaves are `tf.TensorSpec`s.
+        field_encodings: encodings of the fields.
+
+    Returns:
+        The signature of the encoded items.
+    """
+
+    def encode(path: Sequence[Any], spec: tf.TensorSpec) -> tf.TensorSpec:
+        encoding = _leaf_encoding(path, spec.dtype, field_encodings)
+        if encoding is None:
+            return spec
+        return tf.TensorSpec(shape=spec.shape, dtype=encoding.dtype, name=spec.name)
+
+    return tree.map_structure_with_path(encode, signature)
+
+
+def decode_sample(sample: Any, field_encodings: FieldEncodings) -> Any:
+    """Decode the encoded fields of sampled items to float32.
+
+    Leaves with the storage dtype of their field are decoded, so fields holding
+    integers should not be encoded with an integer dtype.
+
+    Args:
+        sample: a `reverb.ReplaySample` of encoded items.
+        field_encodings: encodings of the fields.
+
+    Returns:
+        The sample with decoded data.
+    """
+
+    def decode(path: Sequence[Any], value: tf.Tensor) -> tf.Tensor:
+        # Leaves that were not encoded keep their dtype, e.g. integer extras.
+        encoding = _leaf_encoding(path, tf.float32, field_encodings)
+        if encoding is None or value.dtype != tf.as_dtype(encoding.dtype):
+            return value
+        return tf.cast(value, tf.float32) * encoding.scale + encoding.offset
+
+    if not field_encodings:
+        return sample
+    return sample._replace(data=tree.map_structure_with_path(decode, sample.data))
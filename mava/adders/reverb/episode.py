@@ -23,14 +23,13 @@ This implements full episode adders, potentially with padding.
 
 from typing import Any, Dict, Optional
 
-import dm_env
 import reverb
 import tensorflow as tf
 import tree
 from acme.adders.reverb import utils as acme_utils
 from acme.adders.reverb.episode import EpisodeAdder, _PaddingFn
 
-from mava import specs, types
+from mava import specs
 from mava.adders.reverb import base
 from mava.adders.reverb import utils as mava_utils
 from mava.adders.reverb.base import ReverbParallelAdder
@@ -81,19 +80,14 @@ class ParallelEpisodeAdder(EpisodeAdder, ReverbParallelAdder):
         )
         self._padding_fn = padding_fn
 
-    def add(
-        self,
-        action: types.NestedArray,
-        next_timestep: dm_env.TimeStep,
-        extras: types.NestedArray = (),
-    ) -> None:
+    def _add_step(self, *args: Any, **kwargs: Any) -> None:
         if self._writer.episode_steps >= self._max_sequence_length - 1:
             raise ValueError(
                 "The number of observations within the same episode will exceed "
                 "max_sequence_length with the addition of this transition."
             )
 
-        super().add(action, next_timestep, extras)
+        super()._add_step(*args, **kwargs)
 
     def _write_last(self) -> None:
         if (
@@ -32,6 +32,7 @@ from acme.adders.reverb.sequence import EndBehavior, SequenceAdder
 from mava import specs
 from mava.adders.reverb import base
 from mava.adders.reverb.base import ReverbParallelAdder
+from mava.adders.reverb.encoding import FieldEncodings
 from mava.adders.reverb.utils import trajectory_signature
 
 
@@ -50,6 +51,10 @@ class ParallelSequenceAdder(SequenceAdder, ReverbParallelAdder):
         priority_fns: Optional[base.PriorityFnMapping] = None,
         max_in_flight_items: int = 2,
         end_of_episode_behavior: Optional[EndBehavior] = EndBehavior.ZERO_PAD,
+        flush_batch_size: int = 1,
+        flush_interval_seconds: Optional[float] = None,
+        field_encodings: Optional[FieldEncodings] = None,
+        max_chunk_length: Optional[int] = None,
     ):
         """Makes a SequenceAdder instance.
 
@@ -79,6 +84,14 @@ class ParallelSequenceAdder(SequenceAdder, ReverbParallelAdder):
             sequence in the episode may have length less than `sequence_length`.
           break_end_of_episode: If 'False' (True by default) does not break
             sequences on env reset. In this case 'pad_end_of_episode' is not used.
+          flush_batch_size: Number of sequences created before the writer is
+            flushed.
+          flush_interval_seconds: Maximum time between flushes of the writer, if
+            set.
+          field_encodings: Storage encodings of the observation and extras
+            fields, see `mava.adders.reverb.encoding`.
+          max_chunk_length: Number of steps of a column compressed together, if
+            set.
         """
         ReverbParallelAdder.__init__(
             self,
@@ -89,6 +102,10 @@ class ParallelSequenceAdder(SequenceAdder, ReverbParallelAdder):
             delta_encoded=delta_encoded,
             priority_fns=priority_fns,
             max_in_flight_items=max_in_flight_items,
+            flush_batch_size=flush_batch_size,
+            flush_interval_seconds=flush_interval_seconds,
+            field_encodings=field_encodings,
+            max_chunk_length=max_chunk_length,
         )
 
         self._period = period
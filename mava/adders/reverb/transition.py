@@ -22,8 +22,9 @@ This implements an N-step transition adder which collapses trajectory sequences
 into a single transition, simplifying to a simple transition adder when N=1.
 """
 import copy
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+import dm_env
 import numpy as np
 import reverb
 import tensorflow as tf
@@ -37,6 +38,121 @@ from mava import types
 from mava import types as mava_types
 from mava.adders.reverb import base
 from mava.adders.reverb.base import ReverbParallelAdder
+from mava.adders.reverb.encoding import FieldEncodings
+
+
+class NStepAccumulator:
+    """Ring buffer of the last N rewards and discounts of all the agents.
+
+    The rewards and discounts of a step are stacked over the agents, so the
+    n-step returns and discounts of all the agents are computed together. The
+    rewards and discounts of an agent must have the same shape.
+    """
+
+    def __init__(self, n_step: int, discount: Union[float, Dict[str, float]]) -> None:
+        """Creates the accumulator.
+
+        Args:
+            n_step: number of steps kept in the buffer.
+            discount: additional discount applied to future rewards, either
+                shared by the agents or given for each agent.
+        """
+        self._n_step = n_step
+        self._discount = discount
+        # Powers of the discount of each agent, with shape [n_step, num_agents].
+        self._discount_powers: Optional[np.ndarray] = None
+        self._agents: List[str] = []
+        self._rewards: Optional[np.ndarray] = None
+        self._discounts: Optional[np.ndarray] = None
+
+    def append(
+        self,
+        step: int,
+        rewards: Dict[str, types.NestedArray],
+        discounts: Dict[str, types.NestedArray],
+    ) -> None:
+        """Store the rewards and discounts of a step of the episode.
+
+        Args:
+            step: index of the step in the episode.
+            rewards: rewards of each agent.
+            discounts: environment discounts of each agent.
+        """
+        if self._rewards is None or self._discounts is None:
+            # The buffers are created once the shapes are known.
+            self._agents = list(rewards.keys())
+            reward = np.asarray(rewards[self._agents[0]])
+            discount = np.asarray(discounts[self._agents[0]])
+            shape = (self._n_step, len(self._agents)) + reward.shape
+            self._rewards = np.zeros(
+                shape, dtype=np.result_type(reward.dtype, discount.dtype)
+            )
+            self._discounts = np.zeros(shape, dtype=discount.dtype)
+            if isinstance(self._discount, dict):
+                agent_discounts = np.array(
+                    [self._discount[agent] for agent in self._agents],
+                    dtype=np.float32,
+                )
+            else:
+                agent_discounts = np.full(
+                    len(self._agents), self._discount, dtype=np.float32
+                )
+            self._discount_powers = (
+                agent_discounts ** np.arange(self._n_step, dtype=np.float32)[:, None]
+            )
+        reward_buffer, discount_buffer = self._rewards, self._discounts
+
+        slot = step % self._n_step
+        reward_buffer[slot] = [rewards[agent] for agent in self._agents]
+        discount_buffer[slot] = [discounts[agent] for agent in self._agents]
+
+    def reset(self) -> None:
+        """Clear the rewards and discounts at the end of an episode."""
+        if self._rewards is not None and self._discounts is not None:
+            self._rewards.fill(0)
+            self._discounts.fill(0)
+
+    def compute(
+        self, first: int, last: int
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """Compute the n-step returns and discounts of the steps [first, last).
+
+        Args:
+            first: index of the first step of the transition.
+            last: index after the last step of the transition, with
+                last - first <= n_step.
+
+        Returns:
+            The n-step return and total discount of each agent.
+        """
+        if (
+            self._rewards is None
+            or self._discounts is None
+            or self._discount_powers is None
+        ):
+            raise ValueError("Steps must be appended before computing returns.")
+        slots = np.arange(first, last) % self._n_step
+        rewards = self._rewards[slots]
+        discounts = self._discounts[slots]
+
+        # Reward i is discounted by g^i * d_0 * ... * d_{i-1}.
+        cumulative_discounts = np.cumprod(discounts, axis=0)
+        powers = self._discount_powers[: len(slots)].reshape(
+            (len(slots), len(self._agents)) + (1,) * (rewards.ndim - 2)
+        )
+        reward_discounts = np.concatenate(
+            [np.ones_like(discounts[:1]), cumulative_discounts[:-1]]
+        )
+        n_step_return = np.sum(powers * reward_discounts * rewards, axis=0)
+        total_discount = powers[-1] * cumulative_discounts[-1]
+
+        n_step_return = n_step_return.astype(rewards.dtype, copy=False)
+        total_discount = total_discount.astype(discounts.dtype, copy=False)
+        # Indexing with an ellipsis keeps arrays for scalar rewards.
+        return (
+            {agent: n_step_return[i, ...] for i, agent in enumerate(self._agents)},
+            {agent: total_discount[i, ...] for i, agent in enumerate(self._agents)},
+        )
 
 
 class ParallelNStepTransitionAdder(NStepTransitionAdder, ReverbParallelAdder):
@@ -91,6 +207,10 @@ class ParallelNStepTransitionAdder(NStepTransitionAdder, ReverbParallelAdder):
         *,
         priority_fns: Optional[base.PriorityFnMapping] = None,
         max_in_flight_items: int = 5,
+        flush_batch_size: int = 1,
+        flush_interval_seconds: Optional[float] = None,
+        field_encodings: Optional[FieldEncodings] = None,
+        max_chunk_length: Optional[int] = None,
     ) -> None:
         """Creates an N-step transition adder.
 
@@ -107,6 +227,17 @@ class ParallelNStepTransitionAdder(NStepTransitionAdder, ReverbParallelAdder):
           table_network_config: A dictionary mapping table names to lists of
             network names.
           priority_fns: See docstring for BaseAdder.
+          max_in_flight_items: The maximum number of items allowed to be "in flight"
+            at the same time. See `block_until_num_items` in
+            `reverb.TrajectoryWriter.flush` for more info.
+          flush_batch_size: Number of transitions created before the writer is
+            flushed.
+          flush_interval_seconds: Maximum time between flushes of the writer, if
+            set.
+          field_encodings: Storage encodings of the observation and extras
+            fields, see `mava.adders.reverb.encoding`.
+          max_chunk_length: Number of steps of a column compressed together, if
+            set.
 
         Raises:
           ValueError: If n_step is less than 1.
@@ -119,6 +250,7 @@ class ParallelNStepTransitionAdder(NStepTransitionAdder, ReverbParallelAdder):
         self._first_idx = 0
         self._last_idx = 0
         self._table_network_config = table_network_config
+        self._accumulator = NStepAccumulator(n_step, discount)
 
         ReverbParallelAdder.__init__(
             self,
@@ -126,6 +258,64 @@ class ParallelNStepTransitionAdder(NStepTransitionAdder, ReverbParallelAdder):
             max_sequence_length=n_step + 1,
             priority_fns=priority_fns,
             max_in_flight_items=max_in_flight_items,
+            flush_batch_size=flush_batch_size,
+            flush_interval_seconds=flush_interval_seconds,
+            field_encodings=field_encodings,
+            max_chunk_length=max_chunk_length,
+        )
+
+    def add(
+        self,
+        actions: Dict[str, types.NestedArray],
+        next_timestep: dm_env.TimeStep,
+        extras: Dict[str, types.NestedArray] = {},
+    ) -> None:
+        """Record an action and the following timestep.
+
+        The window of the n-step transition is advanced in `_add_step` rather
+        than in `NStepTransitionAdder.add`, so that `add_trajectory` advances
+        it too.
+        """
+        ReverbParallelAdder.add(self, actions, next_timestep, extras)
+
+    def reset(self, timeout_ms: Optional[int] = None) -> None:
+        """Resets the adder's buffer, n-step window and accumulated rewards.
+
+        Args:
+            timeout_ms: Timeout in milliseconds while waiting for the items.
+        """
+        ReverbParallelAdder.reset(self, timeout_ms)
+        self._first_idx = 0
+        self._last_idx = 0
+        self._accumulator.reset()
+
+    def _add_step(
+        self,
+        actions: Dict[str, types.NestedArray],
+        rewards: Dict[str, types.NestedArray],
+        discounts: Dict[str, types.NestedArray],
+        extras: Dict[str, types.NestedArray],
+        next_observations: Dict[str, types.NestedArray],
+        start_of_episode: bool,
+        last: bool,
+    ) -> None:
+        """Advance the n-step window and accumulate the step before appending it."""
+        # Increment the indices for the start and end of the window for
+        # computing n-step returns.
+        if self._writer.episode_steps >= self.n_step:
+            self._first_idx += 1
+        self._last_idx += 1
+
+        # The step is the number of steps added before it in the episode.
+        self._accumulator.append(self._last_idx - 1, rewards, discounts)
+        super()._add_step(
+            actions,
+            rewards,
+            discounts,
+            extras,
+            next_observations,
+            start_of_episode,
+            last,
         )
 
     def _write(self) -> None:
@@ -136,11 +326,6 @@ class ParallelNStepTransitionAdder(NStepTransitionAdder, ReverbParallelAdder):
         def get_last(x: np.ndarray) -> np.ndarray:
             return x[self._last_idx]
 
-        # Note: this getter is meant to be used on a TrajectoryWriter.history to
-        # obtain its numpy values.
-        def get_all_np(x: np.ndarray) -> np.ndarray:
-            return x[self._first_idx : self._last_idx].numpy()  # type: ignore
-
         # Get the state, action, next_state, as well as possibly extras for the
         # transition that is about to be written.
 
@@ -155,14 +340,10 @@ class ParallelNStepTransitionAdder(NStepTransitionAdder, ReverbParallelAdder):
         # transitions (of size 1, 2, ...) and at the end of an episode (when
         # called from write_last) we will write the final transitions of size (N,
         # N-1, ...). See the Note in the docstring.
-        # Get numpy view of the steps to be fed into the priority functions.
-
-        rewards, discounts = tree.map_structure(
-            get_all_np, (history["rewards"], history["discounts"])
-        )
-        # Compute discounted return and geometric discount over n steps.
-        n_step_return, total_discount = self._compute_cumulative_quantities(
-            rewards, discounts
+        # Compute discounted return and geometric discount over n steps from the
+        # rewards and discounts kept by the accumulator.
+        n_step_return, total_discount = self._accumulator.compute(
+            self._first_idx, self._last_idx
         )
 
         # Append the computed n-step return and total discount.
@@ -229,6 +229,19 @@ class Callback(ABC):
         """End of executor observing."""
         pass
 
+    # OBSERVE TRAJECTORY
+    def on_execution_observe_trajectory_start(self, executor: SystemExecutor) -> None:
+        """Start of executor observing the steps of a trajectory."""
+        pass
+
+    def on_execution_observe_trajectory(self, executor: SystemExecutor) -> None:
+        """Executor observing the steps of a trajectory."""
+        pass
+
+    def on_execution_observe_trajectory_end(self, executor: SystemExecutor) -> None:
+        """End of executor observing the steps of a trajectory."""
+        pass
+
     # SELECT ACTIONS
     def on_execution_select_actions_start(self, executor: SystemExecutor) -> None:
         """Start of executor selecting actions for all agents in the system."""
@@ -96,6 +96,22 @@ class ExecutorHookMixin(ABC):
         for callback in self.callbacks:
             callback.on_execution_observe_end(self)
 
+    # OBSERVE TRAJECTORY
+    def on_execution_observe_trajectory_start(self) -> None:
+        """Start of executor observing the steps of a trajectory."""
+        for callback in self.callbacks:
+            callback.on_execution_observe_trajectory_start(self)
+
+    def on_execution_observe_trajectory(self) -> None:
+        """Executor observing the steps of a trajectory."""
+        for callback in self.callbacks:
+            callback.on_execution_observe_trajectory(self)
+
+    def on_execution_observe_trajectory_end(self) -> None:
+        """End of executor observing the steps of a trajectory."""
+        for callback in self.callbacks:
+            callback.on_execution_observe_trajectory_end(self)
+
     # SELECT ACTIONS
     def on_execution_select_actions_start(self) -> None:
         """Start of executor selecting actions for all agents in the system."""
@@ -28,8 +28,11 @@ from mava.components.building.data_server import OffPolicyDataServer, OnPolicyDa
 from mava.components.building.datasets import TrajectoryDataset, TransitionDataset
 from mava.components.building.distributor import Distributor
 from mava.components.building.environments import (
+    AsyncVectorParallelExecutorEnvironmentLoop,
     EnvironmentSpec,
+    JaxRolloutExecutorEnvironmentLoop,
     ParallelExecutorEnvironmentLoop,
+    VectorParallelExecutorEnvironmentLoop,
 )
 from mava.components.building.extras_spec import ExtrasSpec
 from mava.components.building.loggers import Logger
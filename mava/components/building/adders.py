@@ -15,12 +15,13 @@
 
 """Commonly used adder components for system builders"""
 import abc
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from types import SimpleNamespace
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Optional, Type
 
 from mava import specs
 from mava.adders import reverb as reverb_adders
+from mava.adders.reverb.encoding import encode_signature
 from mava.callbacks import Callback
 from mava.components import Component
 from mava.components.building.system_init import BaseSystemInit
@@ -137,6 +138,12 @@ class AdderSignature(Component):
 class ParallelTransitionAdderConfig:
     n_step: int = 5
     discount: float = 0.99
+    flush_batch_size: int = 1
+    flush_interval_seconds: Optional[float] = None
+    field_encodings: Dict[str, reverb_adders.FieldEncoding] = field(
+        default_factory=lambda: {}
+    )
+    max_chunk_length: Optional[int] = None
 
 
 class ParallelTransitionAdder(Adder):
@@ -151,6 +158,17 @@ class ParallelTransitionAdder(Adder):
         """
         self.config = config
 
+    def on_building_init_start(self, builder: SystemBuilder) -> None:
+        """Add the storage encodings of the fields to the builder store.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            None.
+        """
+        builder.store.field_encodings = self.config.field_encodings
+
     def on_building_executor_adder(self, builder: SystemBuilder) -> None:
         """Create a ParallelNStepTransitionAdder.
 
@@ -161,16 +179,28 @@ class ParallelTransitionAdder(Adder):
             None.
         """
 
-        adder = reverb_adders.ParallelNStepTransitionAdder(
-            priority_fns=builder.store.priority_fns,
-            client=builder.store.data_server_client,  # Created by builder
-            net_ids_to_keys=builder.store.unique_net_keys,
-            n_step=self.config.n_step,
-            table_network_config=builder.store.table_network_config,
-            discount=self.config.discount,
-        )
+        def adder_factory() -> reverb_adders.ParallelNStepTransitionAdder:
+            """Create a ParallelNStepTransitionAdder writing to the data servers.
+
+            Returns:
+                A new adder, with its own episode state.
+            """
+            return reverb_adders.ParallelNStepTransitionAdder(
+                priority_fns=builder.store.priority_fns,
+                client=builder.store.data_server_client,  # Created by builder
+                net_ids_to_keys=builder.store.unique_net_keys,
+                n_step=self.config.n_step,
+                table_network_config=builder.store.table_network_config,
+                discount=self.config.discount,
+                flush_batch_size=self.config.flush_batch_size,
+                flush_interval_seconds=self.config.flush_interval_seconds,
+                field_encodings=self.config.field_encodings,
+                max_chunk_length=self.config.max_chunk_length,
+            )
 
-        builder.store.adder = adder
+        # Components stepping several environments create an adder per environment.
+        builder.store.adder_factory = adder_factory
+        builder.store.adder = adder_factory()
 
 
 class UniformAdderPriority(AdderPriority):
@@ -200,6 +230,9 @@ class ParallelTransitionAdderSignature(AdderSignature):
             None.
         """
 
+        # Set by the adder component.
+        field_encodings = getattr(builder.store, "field_encodings", {})
+
         def adder_sig_fn(
             ma_environment_spec: specs.MAEnvironmentSpec,
             extras_specs: Dict[str, Any],
@@ -211,11 +244,13 @@ class ParallelTransitionAdderSignature(AdderSignature):
                 extras_specs: Other specs.
 
             Returns:
-                ParallelNStepTransitionAdder signature.
+                ParallelNStepTransitionAdder signature, with the storage dtypes
+                of the encoded fields.
             """
-            return reverb_adders.ParallelNStepTransitionAdder.signature(
+            signature = reverb_adders.ParallelNStepTransitionAdder.signature(
                 ma_environment_spec=ma_environment_spec, extras_specs=extras_specs
             )
+            return encode_signature(signature, field_encodings)
 
         builder.store.adder_signature_fn = adder_sig_fn
 
@@ -224,6 +259,12 @@ class ParallelTransitionAdderSignature(AdderSignature):
 class ParallelSequenceAdderConfig:
     sequence_length: int = 20
     period: int = 10
+    flush_batch_size: int = 1
+    flush_interval_seconds: Optional[float] = None
+    field_encodings: Dict[str, reverb_adders.FieldEncoding] = field(
+        default_factory=lambda: {}
+    )
+    max_chunk_length: Optional[int] = None
 
 
 class ParallelSequenceAdder(Adder):
@@ -238,7 +279,7 @@ class ParallelSequenceAdder(Adder):
         self.config = config
 
     def on_building_init_start(self, builder: SystemBuilder) -> None:
-        """Add the sequence length variable to the builder store.
+        """Add the sequence length and field encodings to the builder store.
 
         Args:
             builder: SystemBuilder.
@@ -247,6 +288,7 @@ class ParallelSequenceAdder(Adder):
             None.
         """
         builder.store.sequence_length = self.config.sequence_length
+        builder.store.field_encodings = self.config.field_encodings
 
     def on_building_executor_adder(self, builder: SystemBuilder) -> None:
         """Create a ParallelSequenceAdder.
@@ -257,16 +299,29 @@ class ParallelSequenceAdder(Adder):
         Returns:
             None.
         """
-        adder = reverb_adders.ParallelSequenceAdder(
-            priority_fns=builder.store.priority_fns,
-            client=builder.store.data_server_client,  # Created by builder
-            net_ids_to_keys=builder.store.unique_net_keys,
-            sequence_length=self.config.sequence_length,
-            table_network_config=builder.store.table_network_config,
-            period=self.config.period,
-        )
 
-        builder.store.adder = adder
+        def adder_factory() -> reverb_adders.ParallelSequenceAdder:
+            """Create a ParallelSequenceAdder writing to the data servers.
+
+            Returns:
+                A new adder, with its own episode state.
+            """
+            return reverb_adders.ParallelSequenceAdder(
+                priority_fns=builder.store.priority_fns,
+                client=builder.store.data_server_client,  # Created by builder
+                net_ids_to_keys=builder.store.unique_net_keys,
+                sequence_length=self.config.sequence_length,
+                table_network_config=builder.store.table_network_config,
+                period=self.config.period,
+                flush_batch_size=self.config.flush_batch_size,
+                flush_interval_seconds=self.config.flush_interval_seconds,
+                field_encodings=self.config.field_encodings,
+                max_chunk_length=self.config.max_chunk_length,
+            )
+
+        # Components stepping several environments create an adder per environment.
+        builder.store.adder_factory = adder_factory
+        builder.store.adder = adder_factory()
 
 
 class ParallelSequenceAdderSignature(AdderSignature):
@@ -280,6 +335,9 @@ class ParallelSequenceAdderSignature(AdderSignature):
             None.
         """
 
+        # Set by the adder component.
+        field_encodings = getattr(builder.store, "field_encodings", {})
+
         def adder_sig_fn(
             ma_environment_spec: specs.MAEnvironmentSpec,
             sequence_length: int,
@@ -293,12 +351,14 @@ class ParallelSequenceAdderSignature(AdderSignature):
                 extras_specs: Other specs.
 
             Returns:
-                ParallelSequenceAdder signature.
+                ParallelSequenceAdder signature, with the storage dtypes of the
+                encoded fields.
             """
-            return reverb_adders.ParallelSequenceAdder.signature(
+            signature = reverb_adders.ParallelSequenceAdder.signature(
                 ma_environment_spec=ma_environment_spec,
                 sequence_length=sequence_length,
                 extras_specs=extras_specs,
             )
+            return encode_signature(signature, field_encodings)
 
         builder.store.adder_signature_fn = adder_sig_fn
@@ -15,19 +15,65 @@
 
 """Commonly used dataset components for system builders"""
 import abc
+import functools
 from dataclasses import dataclass
-from typing import Any, Callable, List, Optional, Type
+from typing import Any, Callable, List, NamedTuple, Optional, Type
 
 import reverb
+import tensorflow as tf
 from acme import datasets
 
+from mava.adders.reverb.encoding import decode_sample
 from mava.callbacks import Callback
 from mava.components import Component
 from mava.core_jax import SystemBuilder
+from mava.utils.dataset_utils import DevicePrefetchIterator
 
 Transform = Callable[[reverb.ReplaySample], reverb.ReplaySample]
 
 
+class ShardReplaySample(NamedTuple):
+    """Replay sample with the index of the data server shard it came from."""
+
+    info: reverb.SampleInfo
+    data: Any
+    shard: Any
+
+
+def _add_shard(sample: reverb.ReplaySample, shard: int) -> ShardReplaySample:
+    """Record the index of the data server shard a sample came from."""
+    return ShardReplaySample(
+        info=sample.info, data=sample.data, shard=tf.constant(shard, dtype=tf.int32)
+    )
+
+
+def merge_shard_datasets(
+    shard_datasets: List[tf.data.Dataset], weights: Optional[List[float]] = None
+) -> tf.data.Dataset:
+    """Merge the datasets sampling from the tables of each data server shard.
+
+    Elements are drawn at random from the shards, with probabilities given by
+    the shares of the executors' data the shards receive. With several shards,
+    the elements are `ShardReplaySample`s holding the index of their shard, so
+    that their priorities can be updated on that shard only.
+
+    Args:
+        shard_datasets: one dataset per data server shard.
+        weights: probability of drawing from each shard. Defaults to None, in
+            which case the shards are drawn uniformly.
+
+    Returns:
+        The merged dataset.
+    """
+    if len(shard_datasets) == 1:
+        return shard_datasets[0]
+    shard_datasets = [
+        dataset.map(functools.partial(_add_shard, shard=shard))
+        for shard, dataset in enumerate(shard_datasets)
+    ]
+    return tf.data.Dataset.sample_from_datasets(shard_datasets, weights=weights)
+
+
 class TrainerDataset(Component):
     @abc.abstractmethod
     def __init__(
@@ -77,6 +123,7 @@ class TransitionDatasetConfig:
     num_parallel_calls: int = 12
     max_in_flight_samples_per_worker: Optional[int] = None
     postprocess: Optional[Transform] = None
+    device_prefetch_size: int = 0
     # dataset_name: str = "transition_dataset"
 
 
@@ -95,6 +142,9 @@ class TransitionDataset(TrainerDataset):
     def on_building_trainer_dataset(self, builder: SystemBuilder) -> None:
         """Build a transition dataset and save it to the store.
 
+        Fields stored with a smaller dtype are decoded, and the next batches of
+        the dataset are optionally kept on device.
+
         Args:
             builder: SystemBuilder.
 
@@ -103,18 +153,50 @@ class TransitionDataset(TrainerDataset):
         """
         builder.store.epoch_batch_size = self.config.epoch_batch_size
         max_in_flight_samples_per_worker = self.config.max_in_flight_samples_per_worker
-        dataset = datasets.make_reverb_dataset(
-            table=builder.store.trainer_id,  # Set by builder
-            # Set by builder
-            server_address=builder.store.data_server_client.server_address,
-            batch_size=self.config.epoch_batch_size,
-            prefetch_size=self.config.prefetch_size,
-            num_parallel_calls=self.config.num_parallel_calls,
-            max_in_flight_samples_per_worker=max_in_flight_samples_per_worker,
-            postprocess=self.config.postprocess,
+
+        # Set by the adder component.
+        field_encodings = getattr(builder.store, "field_encodings", {})
+        postprocess = self.config.postprocess
+        if field_encodings:
+
+            def decode_and_postprocess(
+                sample: reverb.ReplaySample,
+            ) -> reverb.ReplaySample:
+                """Decode the sample before any configured postprocessing."""
+                sample = decode_sample(sample, field_encodings)
+                if self.config.postprocess is not None:
+                    sample = self.config.postprocess(sample)
+                return sample
+
+            postprocess = decode_and_postprocess
+
+        # Set by builder, holds a single client unless the data server is sharded.
+        data_server_clients = getattr(
+            builder.store, "data_server_clients", [builder.store.data_server_client]
         )
+        dataset = merge_shard_datasets(
+            [
+                datasets.make_reverb_dataset(
+                    table=builder.store.trainer_id,  # Set by builder
+                    server_address=data_server_client.server_address,
+                    batch_size=self.config.epoch_batch_size,
+                    num_parallel_calls=self.config.num_parallel_calls,
+                    max_in_flight_samples_per_worker=max_in_flight_samples_per_worker,
+                    postprocess=postprocess,
+                )
+                for data_server_client in data_server_clients
+            ],
+            # Set by the distributor when the data server is sharded.
+            weights=getattr(builder.store, "data_server_shard_weights", None),
+        )
+        if self.config.prefetch_size:
+            dataset = dataset.prefetch(self.config.prefetch_size)
 
         builder.store.dataset_iterator = dataset.as_numpy_iterator()
+        if self.config.device_prefetch_size > 0:
+            builder.store.dataset_iterator = DevicePrefetchIterator(
+                builder.store.dataset_iterator, self.config.device_prefetch_size
+            )
 
 
 @dataclass
@@ -125,6 +207,7 @@ class TrajectoryDatasetConfig:
     max_samples_per_stream: int = -1
     rate_limiter_timeout_ms: int = -1
     get_signature_timeout_secs: Optional[int] = None
+    device_prefetch_size: int = 0
     # max_samples: int = -1
     # dataset_name: str = "trajectory_dataset"
 
@@ -144,7 +227,8 @@ class TrajectoryDataset(TrainerDataset):
     def on_building_trainer_dataset(self, builder: SystemBuilder) -> None:
         """Build a trajectory dataset and save it to the store.
 
-        Automatically adds a batch dimension to the dataset.
+        Fields stored with a smaller dtype are decoded and a batch dimension is
+        added to the dataset, which optionally keeps its next batches on device.
 
         Args:
             builder: SystemBuilder.
@@ -153,18 +237,40 @@ class TrajectoryDataset(TrainerDataset):
             None.
         """
         builder.store.epoch_batch_size = self.config.epoch_batch_size
-        dataset = reverb.TrajectoryDataset.from_table_signature(
-            server_address=builder.store.data_server_client.server_address,
-            table=builder.store.trainer_id,
-            max_in_flight_samples_per_worker=2 * self.config.epoch_batch_size,
-            num_workers_per_iterator=self.config.num_workers_per_iterator,
-            max_samples_per_stream=self.config.max_samples_per_stream,
-            rate_limiter_timeout_ms=self.config.rate_limiter_timeout_ms,
-            get_signature_timeout_secs=self.config.get_signature_timeout_secs,
-            # max_samples=self.config.max_samples,
+        # Set by builder, holds a single client unless the data server is sharded.
+        data_server_clients = getattr(
+            builder.store, "data_server_clients", [builder.store.data_server_client]
+        )
+        dataset = merge_shard_datasets(
+            [
+                reverb.TrajectoryDataset.from_table_signature(
+                    server_address=data_server_client.server_address,
+                    table=builder.store.trainer_id,
+                    max_in_flight_samples_per_worker=2 * self.config.epoch_batch_size,
+                    num_workers_per_iterator=self.config.num_workers_per_iterator,
+                    max_samples_per_stream=self.config.max_samples_per_stream,
+                    rate_limiter_timeout_ms=self.config.rate_limiter_timeout_ms,
+                    get_signature_timeout_secs=self.config.get_signature_timeout_secs,
+                    # max_samples=self.config.max_samples,
+                )
+                for data_server_client in data_server_clients
+            ],
+            # Set by the distributor when the data server is sharded.
+            weights=getattr(builder.store, "data_server_shard_weights", None),
         )
 
+        # Set by the adder component.
+        field_encodings = getattr(builder.store, "field_encodings", {})
+        if field_encodings:
+            dataset = dataset.map(
+                functools.partial(decode_sample, field_encodings=field_encodings)
+            )
+
         # Add batch dimension.
         dataset = dataset.batch(self.config.epoch_batch_size, drop_remainder=True)
 
         builder.store.dataset_iterator = dataset.as_numpy_iterator()
+        if self.config.device_prefetch_size > 0:
+            builder.store.dataset_iterator = DevicePrefetchIterator(
+                builder.store.dataset_iterator, self.config.device_prefetch_size
+            )
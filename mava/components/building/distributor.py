@@ -14,6 +14,7 @@
 # limitations under the License.
 
 """Commonly used distributor components for system builders"""
+import zlib
 from dataclasses import dataclass
 from typing import List, Optional, Type, Union
 
@@ -37,15 +38,93 @@ class DistributorConfig:
     single_process_max_episodes: Optional[int] = None
     is_test: Optional[bool] = False
     wait: Optional[bool] = False
+    num_data_servers: int = 1
+    data_server_shard_selection: str = "round_robin"
+
+
+def executor_data_server_shard(
+    executor_id: str, num_data_servers: int, shard_selection: str
+) -> int:
+    """Index of the data server shard an executor writes to.
+
+    Args:
+        executor_id: id of the executor, e.g. "executor_3".
+        num_data_servers: number of data server shards.
+        shard_selection: "round_robin" to spread the executors evenly over the
+            shards using their index, or "hash" to use a stable hash of their id.
+
+    Raises:
+        ValueError: if the shard selection is not supported.
+
+    Returns:
+        The shard index.
+    """
+    if shard_selection == "round_robin":
+        return int(executor_id.split("_")[-1]) % num_data_servers
+    elif shard_selection == "hash":
+        # Python's hash of strings changes between processes.
+        return zlib.crc32(executor_id.encode()) % num_data_servers
+    raise ValueError(
+        f"Data server shard selection {shard_selection} not supported, "
+        + "use 'round_robin' or 'hash'."
+    )
+
+
+def data_server_shard_sizes(
+    num_executors: int, num_data_servers: int, shard_selection: str
+) -> List[int]:
+    """Number of executors writing to each data server shard.
+
+    Args:
+        num_executors: number of executors.
+        num_data_servers: number of data server shards.
+        shard_selection: selection of the shard of each executor, see
+            executor_data_server_shard.
+
+    Returns:
+        The number of executors of each shard.
+    """
+    sizes = [0] * num_data_servers
+    for executor_id in range(num_executors):
+        sizes[
+            executor_data_server_shard(
+                f"executor_{executor_id}", num_data_servers, shard_selection
+            )
+        ] += 1
+    return sizes
 
 
 class Distributor(Component):
     def __init__(self, config: DistributorConfig = DistributorConfig()):
         """Component builds launchpad program nodes and launches the program.
 
+        Executors write to one of num_data_servers data server shards, chosen
+        with data_server_shard_selection, and trainers sample from all of them
+        in proportion to their number of executors.
+
         Args:
             config: DistributorConfig.
+
+        Raises:
+            ValueError: if num_data_servers is smaller than one, or if a data
+                server shard would receive no executor.
         """
+        if config.num_data_servers < 1:
+            raise ValueError(
+                f"num_data_servers must be at least 1, got {config.num_data_servers}."
+            )
+        shard_sizes = data_server_shard_sizes(
+            config.num_executors,
+            config.num_data_servers,
+            config.data_server_shard_selection,
+        )
+        if 0 in shard_sizes:
+            raise ValueError(
+                f"Every data server shard needs an executor, but the "
+                f"{config.num_executors} executors are spread over the "
+                f"{config.num_data_servers} shards as {shard_sizes} with "
+                f"'{config.data_server_shard_selection}' shard selection."
+            )
         if isinstance(config.nodes_on_gpu, str):
             config.nodes_on_gpu = [config.nodes_on_gpu]
         self.config = config
@@ -54,14 +133,24 @@ class Distributor(Component):
         """Create nodes for the program and save the program in the store.
 
         Create data server, parameter server, executor, trainer, and evaluator nodes.
-        Handles both single-process and multi-process.
+        Handles both single-process and multi-process. With several data servers,
+        each executor gets the client of its shard and each trainer gets the list
+        of all the shard clients.
 
         Args:
             builder: SystemBuilder.
 
+        Raises:
+            ValueError: if several data servers are used in a single process.
+
         Returns:
             None.
         """
+        if self.config.num_data_servers > 1 and not self.config.multi_process:
+            raise ValueError(
+                "Sharding the data server requires a multi-process distributor."
+            )
+
         builder.store.program = Launcher(
             multi_process=self.config.multi_process,
             nodes_on_gpu=self.config.nodes_on_gpu,
@@ -72,8 +161,18 @@ class Distributor(Component):
             wait=self.config.wait,
         )
 
-        # Save number of the executors
+        # Save number of the executors and data servers
         builder.store.num_executors = self.config.num_executors
+        builder.store.num_data_servers = self.config.num_data_servers
+        # Trainers sample from the shards in proportion to their executors.
+        builder.store.data_server_shard_weights = [
+            size / self.config.num_executors
+            for size in data_server_shard_sizes(
+                self.config.num_executors,
+                self.config.num_data_servers,
+                self.config.data_server_shard_selection,
+            )
+        ]
 
         # Generate keys for the data_server, parameter_server and evaluator.
         (
@@ -96,12 +195,15 @@ class Distributor(Component):
         # Delete the builder key as it should not be used directly.
         del builder.store.base_key
 
-        # tables node
-        data_server = builder.store.program.add(
-            builder.data_server,
-            node_type=NodeType.reverb,
-            name="data_server",
-        )
+        # tables nodes
+        data_servers = [
+            builder.store.program.add(
+                builder.data_server,
+                node_type=NodeType.reverb,
+                name="data_server",
+            )
+            for _ in range(self.config.num_data_servers)
+        ]
 
         # variable server node
         parameter_server = builder.store.program.add(
@@ -112,9 +214,14 @@ class Distributor(Component):
 
         # executor nodes
         for executor_id in range(self.config.num_executors):
+            shard = executor_data_server_shard(
+                f"executor_{executor_id}",
+                self.config.num_data_servers,
+                self.config.data_server_shard_selection,
+            )
             builder.store.program.add(
                 builder.executor,
-                [f"executor_{executor_id}", data_server, parameter_server],
+                [f"executor_{executor_id}", data_servers[shard], parameter_server],
                 node_type=NodeType.courier,
                 name="executor",
             )
@@ -123,16 +230,20 @@ class Distributor(Component):
             # evaluator node
             builder.store.program.add(
                 builder.executor,
-                ["evaluator", data_server, parameter_server],
+                # The evaluator does not write to the data server.
+                ["evaluator", data_servers[0], parameter_server],
                 node_type=NodeType.courier,
                 name="evaluator",
             )
 
         # trainer nodes
+        trainer_data_server = (
+            data_servers if self.config.num_data_servers > 1 else data_servers[0]
+        )
         for trainer_id in builder.store.trainer_networks.keys():
             builder.store.program.add(
                 builder.trainer,
-                [trainer_id, data_server, parameter_server],
+                [trainer_id, trainer_data_server, parameter_server],
                 node_type=NodeType.courier,
                 name="trainer",
             )
@@ -17,7 +17,7 @@
 import abc
 import os
 from dataclasses import dataclass
-from typing import Callable, List, Optional, Tuple, Type, Union
+from typing import Any, Callable, List, Optional, Tuple, Type, Union
 
 import acme
 
@@ -26,13 +26,19 @@ from mava.callbacks import Callback
 from mava.components import Component
 from mava.components.building.loggers import Logger
 from mava.core_jax import SystemBuilder
-from mava.environment_loop import ParallelEnvironmentLoop
+from mava.environment_loop import (
+    AsyncVectorParallelEnvironmentLoop,
+    ParallelEnvironmentLoop,
+    VectorParallelEnvironmentLoop,
+)
 from mava.utils.sort_utils import sort_str_num
 from mava.wrappers.environment_loop_wrappers import (
     DetailedPerAgentStatistics,
     EnvironmentLoopStatisticsBase,
+    JaxRolloutEnvironmentLoop,
     MonitorParallelEnvironmentLoop,
 )
+from mava.wrappers.subprocess_env import SubprocessEnvWrapper
 
 
 @dataclass
@@ -177,6 +183,262 @@ class ParallelExecutorEnvironmentLoop(ExecutorEnvironmentLoop):
         builder.store.system_executor = executor_environment_loop
 
 
+@dataclass
+class VectorParallelExecutorEnvironmentLoopConfig(ExecutorEnvironmentLoopConfig):
+    num_executor_environments: int = 4
+
+
+class VectorParallelExecutorEnvironmentLoop(ParallelExecutorEnvironmentLoop):
+    def __init__(
+        self,
+        config: VectorParallelExecutorEnvironmentLoopConfig = VectorParallelExecutorEnvironmentLoopConfig(),  # noqa
+    ):
+        """Component creates an environment loop that steps several environments.
+
+        Args:
+            config: VectorParallelExecutorEnvironmentLoopConfig.
+        """
+        self.config = config
+
+    def on_building_init(self, builder: SystemBuilder) -> None:
+        """Check that the executors can step several environments.
+
+        The vector environment loop keeps the episode state of every environment
+        apart, which does not include the recurrent states of the executor.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            None.
+        """
+        # Imported here since the executor components import this module.
+        from mava.components.executing.observing import RecurrentExecutorObserve
+
+        if self.config.num_executor_environments > 1 and builder.has(
+            RecurrentExecutorObserve
+        ):
+            raise NotImplementedError(
+                "The vector environment loop only supports feedforward executors."
+            )
+
+    def on_building_executor_environment(self, builder: SystemBuilder) -> None:
+        """Create and store the executor environments from the factory in config.
+
+        Executors step `num_executor_environments` environments while the
+        evaluator only uses a single one. Every environment gets its own adder,
+        since adders keep the state of the episode being written.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            None.
+        """
+        num_environments = (
+            1 if builder.store.is_evaluator else self.config.num_executor_environments
+        )
+        builder.store.executor_environments = [
+            self._make_environment(builder) for _ in range(num_environments)
+        ]
+        builder.store.executor_environment = builder.store.executor_environments[0]
+
+        # The executor writes to the first adder by default.
+        builder.store.executor_adders = [builder.store.adder]
+        if builder.store.adder:
+            # Set up by the adder component.
+            adder_factory = builder.store.adder_factory
+            builder.store.executor_adders += [
+                adder_factory() for _ in range(num_environments - 1)
+            ]
+
+    def _make_environment(self, builder: SystemBuilder) -> Any:
+        """Create a single executor environment from the factory in config.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            The environment.
+        """
+        environment, _ = builder.store.global_config.environment_factory(
+            evaluation=builder.store.is_evaluator
+        )  # type: ignore
+        return environment
+
+    def _make_vector_environment_loop(self, builder: SystemBuilder) -> Any:
+        """Create the environment loop stepping all executor environments.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            The environment loop.
+        """
+        return VectorParallelEnvironmentLoop(
+            environments=builder.store.executor_environments,
+            executor=builder.store.executor,
+            adders=builder.store.executor_adders,
+            logger=builder.store.executor_logger,
+            should_update=self.config.should_update,
+        )
+
+    def on_building_executor_environment_loop(self, builder: SystemBuilder) -> None:
+        """Create and store a vector parallel environment loop.
+
+        Falls back to a `ParallelEnvironmentLoop` when there is a single environment.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            None.
+        """
+        if len(builder.store.executor_environments) == 1:
+            executor_environment_loop = ParallelEnvironmentLoop(
+                environment=builder.store.executor_environment,
+                executor=builder.store.executor,
+                logger=builder.store.executor_logger,
+                should_update=self.config.should_update,
+            )
+        else:
+            executor_environment_loop = self._make_vector_environment_loop(builder)
+        del builder.store.executor_logger
+
+        if self.config.executor_stats_wrapper_class:
+            executor_environment_loop = self.config.executor_stats_wrapper_class(
+                executor_environment_loop
+            )
+        builder.store.system_executor = executor_environment_loop
+
+
+@dataclass
+class AsyncVectorParallelExecutorEnvironmentLoopConfig(
+    VectorParallelExecutorEnvironmentLoopConfig
+):
+    environment_worker_start_method: str = "spawn"
+
+
+class AsyncVectorParallelExecutorEnvironmentLoop(VectorParallelExecutorEnvironmentLoop):
+    def __init__(
+        self,
+        config: AsyncVectorParallelExecutorEnvironmentLoopConfig = AsyncVectorParallelExecutorEnvironmentLoopConfig(),  # noqa
+    ):
+        """Component that runs each executor environment in a worker process.
+
+        The executor selects actions for whichever environments have finished
+        their step, so slow simulators can use every core of the machine.
+        The evaluator keeps a single environment in its own process.
+
+        Args:
+            config: AsyncVectorParallelExecutorEnvironmentLoopConfig.
+        """
+        self.config = config
+
+    def _make_environment(self, builder: SystemBuilder) -> Any:
+        """Start an executor environment in a worker process.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            The environment wrapper talking to the worker process.
+        """
+        if builder.store.is_evaluator:
+            return super()._make_environment(builder)
+
+        return SubprocessEnvWrapper(
+            environment_factory=builder.store.global_config.environment_factory,
+            evaluation=False,
+            start_method=self.config.environment_worker_start_method,
+        )
+
+    def _make_vector_environment_loop(self, builder: SystemBuilder) -> Any:
+        """Create the environment loop stepping the environments asynchronously.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            The environment loop.
+        """
+        return AsyncVectorParallelEnvironmentLoop(
+            environments=builder.store.executor_environments,
+            executor=builder.store.executor,
+            adders=builder.store.executor_adders,
+            logger=builder.store.executor_logger,
+            should_update=self.config.should_update,
+        )
+
+
+@dataclass
+class JaxRolloutExecutorEnvironmentLoopConfig(ExecutorEnvironmentLoopConfig):
+    rollout_length: Optional[int] = None
+
+
+class JaxRolloutExecutorEnvironmentLoop(ParallelExecutorEnvironmentLoop):
+    def __init__(
+        self,
+        config: JaxRolloutExecutorEnvironmentLoopConfig = JaxRolloutExecutorEnvironmentLoopConfig(),  # noqa
+    ):
+        """Component creates an environment loop compiling whole rollouts.
+
+        Only supports jax environments wrapped by the JaxDebuggingEnvWrapper.
+
+        Args:
+            config: JaxRolloutExecutorEnvironmentLoopConfig.
+        """
+        self.config = config
+
+    def on_building_init(self, builder: SystemBuilder) -> None:
+        """Check that the executors select actions with policy info.
+
+        The compiled rollout stores the actions and policy info returned by the
+        executor's select_actions_fn, which is not the case of value based
+        executors such as the DQN one.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            None.
+        """
+        # Imported here since the executor components import this module.
+        from mava.components.executing.action_selection import (
+            FeedforwardExecutorSelectAction,
+        )
+
+        if not builder.has(FeedforwardExecutorSelectAction):
+            raise NotImplementedError(
+                "The jax rollout environment loop only supports feedforward "
+                "executors selecting actions with policy info."
+            )
+
+    def on_building_executor_environment_loop(self, builder: SystemBuilder) -> None:
+        """Create and store a jax rollout environment loop.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            None.
+        """
+        executor_environment_loop = JaxRolloutEnvironmentLoop(
+            environment=builder.store.executor_environment,
+            executor=builder.store.executor,
+            rollout_length=self.config.rollout_length,
+            logger=builder.store.executor_logger,
+            should_update=self.config.should_update,
+        )
+        del builder.store.executor_logger
+
+        if self.config.executor_stats_wrapper_class:
+            executor_environment_loop = self.config.executor_stats_wrapper_class(
+                executor_environment_loop
+            )
+        builder.store.system_executor = executor_environment_loop
+
+
 @dataclass
 class MonitorExecutorEnvironmentLoopConfig(ExecutorEnvironmentLoopConfig):
     filename: str = "agents"
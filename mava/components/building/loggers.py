@@ -35,7 +35,7 @@ class Logger(Component):
         self,
         config: LoggerConfig = LoggerConfig(),
     ):
-        """Component creates executor, trainer, and evaluator loggers.
+        """Component creates executor, trainer, evaluator and server loggers.
 
         Args:
             config: LoggerConfig.
@@ -101,6 +101,25 @@ class Logger(Component):
             builder.store.trainer_id, **logger_config
         )
 
+    def on_building_parameter_server(self, builder: SystemBuilder) -> None:
+        """Create and store the parameter server logger.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            None.
+        """
+        logger_config = self.config.logger_config if self.config.logger_config else {}
+        name = "parameter_server"
+        if self.config.logger_config and name in self.config.logger_config:
+            logger_config = self.config.logger_config[name]
+
+        logger_factory = self.config.logger_factory
+        builder.store.parameter_server_logger = logger_factory(  # type: ignore
+            name, **logger_config
+        )
+
     @staticmethod
     def name() -> str:
         """Static method that returns component name."""
@@ -72,6 +72,7 @@ class BaseParameterClient(Component):
 @dataclass
 class ExecutorParameterClientConfig:
     executor_parameter_update_period: int = 200
+    executor_versioned_parameter_sync: bool = True
 
 
 class ExecutorParameterClient(BaseParameterClient):
@@ -136,6 +137,10 @@ class ExecutorParameterClient(BaseParameterClient):
                 get_keys=get_keys,
                 set_keys=set_keys,
                 update_period=self.config.executor_parameter_update_period,
+                versioned=self.config.executor_versioned_parameter_sync,
+                shared_parameters_name=getattr(
+                    builder.store, "shared_parameters_name", None
+                ),
             )
 
             # Make sure not to use a random policy after checkpoint restoration by
@@ -185,6 +190,7 @@ class ActorCriticExecutorParameterClient(ExecutorParameterClient):
 @dataclass
 class TrainerParameterClientConfig:
     trainer_parameter_update_period: int = 5
+    trainer_versioned_parameter_sync: bool = True
 
 
 class TrainerParameterClient(BaseParameterClient):
@@ -239,6 +245,10 @@ class TrainerParameterClient(BaseParameterClient):
                 get_keys=get_keys,
                 set_keys=set_keys,
                 update_period=self.config.trainer_parameter_update_period,
+                versioned=self.config.trainer_versioned_parameter_sync,
+                shared_parameters_name=getattr(
+                    builder.store, "shared_parameters_name", None
+                ),
             )
 
             # Get all the initial parameters
@@ -16,10 +16,12 @@
 """Execution components for system builders"""
 
 import abc
+import functools
 from types import SimpleNamespace
-from typing import Any, Dict, List, Tuple, Type
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 import jax
+import numpy as np
 from acme.jax import networks as networks_lib
 from acme.jax import utils
 
@@ -31,7 +33,55 @@ from mava.components.normalisation import ObservationNormalisation
 from mava.components.training.trainer import BaseTrainerInit
 from mava.core_jax import SystemExecutor
 from mava.types import NestedArray
-from mava.utils.jax_training_utils import executor_normalize_observation
+from mava.utils.jax_training_utils import (
+    ExecutorObservationStats,
+    executor_normalisation_args,
+    normalize_stacked_observations,
+)
+from mava.utils.jax_tree_utils import index_stacked_tree, stack_trees
+from mava.utils.sort_utils import group_agents_by_network, sort_str_num
+
+
+def _normalises_observations(executor: SystemExecutor) -> bool:
+    """Whether the executor normalises the observations."""
+    return (
+        executor.has(ObservationNormalisation)
+        and executor.store.global_config.normalise_observations
+    )
+
+
+def _stack_network_observations(
+    observations: Dict[str, NestedArray],
+    agents: List[str],
+    observation_stats: Optional[Dict[str, Dict[str, NestedArray]]],
+    alive: Optional[NestedArray],
+    net_key: str,
+) -> NestedArray:
+    """Stack the observations of the agents of a network.
+
+    Args:
+        observations : The observations for all the agents.
+        agents : The agents using the network.
+        observation_stats : Normalisation stats stacked per network, or None
+            if the observations are not normalised.
+        alive : Death mask array in the order of sort_str_num(observations).
+        net_key : The network key.
+
+    Returns:
+        the stacked observations, normalised if stats are given.
+    """
+    network_observations = stack_trees([observations[agent] for agent in agents])
+    if observation_stats is None:
+        return network_observations
+    assert alive is not None, "The death mask is given with the stats."
+    agent_indices = {
+        agent: index for index, agent in enumerate(sort_str_num(observations.keys()))
+    }
+    return normalize_stacked_observations(
+        observation_stats[net_key],
+        network_observations,
+        alive[np.array([agent_indices[agent] for agent in agents])],
+    )
 
 
 class ExecutorSelectAction(Component):
@@ -96,12 +146,12 @@ class FeedforwardExecutorSelectAction(ExecutorSelectAction):
         """
 
         observations = executor.store.observations
-        # Normalize the observations before selecting actions.
-        if (
-            executor.has(ObservationNormalisation)
-            and executor.store.global_config.normalise_observations
-        ):
-            observations = executor_normalize_observation(executor, observations)
+        # The observations are normalised when selecting actions.
+        normalisation_args: Tuple = ()
+        if _normalises_observations(executor):
+            normalisation_args = executor_normalisation_args(
+                executor, list(observations.keys())
+            )
 
         # Dict with params per network
         current_agent_params = {
@@ -113,7 +163,10 @@ class FeedforwardExecutorSelectAction(ExecutorSelectAction):
             executor.store.policies_info,
             executor.store.base_key,
         ) = executor.store.select_actions_fn(
-            observations, current_agent_params, executor.store.base_key
+            observations,
+            current_agent_params,
+            executor.store.base_key,
+            *normalisation_args,
         )
 
     def on_execution_init_end(self, executor: SystemExecutor) -> None:
@@ -127,64 +180,86 @@ class FeedforwardExecutorSelectAction(ExecutorSelectAction):
         """
         networks = executor.store.networks
         agent_net_keys = executor.store.agent_net_keys
+        if _normalises_observations(executor):
+            executor.store.observation_stats = ExecutorObservationStats(agent_net_keys)
 
         def select_action(
+            network: Any,
             observation: NestedArray,
             current_params: NestedArray,
-            network: Any,
-            base_key: networks_lib.PRNGKey,
-        ) -> Tuple[NestedArray, NestedArray, networks_lib.PRNGKey]:
+            action_key: networks_lib.PRNGKey,
+        ) -> Tuple[NestedArray, NestedArray]:
             """Action selection across a single agent.
 
             Args:
+                network : The network object used by the current agent.
                 observation : The observation for the current agent.
                 current_params : The parameters for current agent's network.
-                network : The network object used by the current agent.
-                key : A JAX prng key.
+                action_key : A JAX prng key used to sample the action.
 
             Returns:
-                action info, policy info and new key.
+                action info and policy info.
             """
             observation_data = utils.add_batch_dim(observation.observation)
-            # We use the action_key immediately and keep the new key for future splits.
-            base_key, action_key = jax.random.split(base_key)
             action_info, policy_info = network.get_action(
                 observations=observation_data,
                 params=current_params,
                 base_key=action_key,
                 mask=utils.add_batch_dim(observation.legal_actions),
             )
-            return action_info, policy_info, base_key
+            return action_info, policy_info
 
         def select_actions(
             observations: Dict[str, NestedArray],
             current_params: Dict[str, NestedArray],
             base_key: networks_lib.PRNGKey,
+            observation_stats: Optional[Dict[str, Dict[str, NestedArray]]] = None,
+            alive: Optional[NestedArray] = None,
         ) -> Tuple[
             Dict[str, NestedArray], Dict[str, NestedArray], networks_lib.PRNGKey
         ]:
             """Select actions across all agents - this is jitted below.
 
+            Agents that share a network select their actions with a single
+            vmapped call, so compile time does not grow with the number of agents.
+
             Args:
                 observations : The observations for all the agents.
                 current_params : The parameters for all the agents.
                 base_key : A JAX prng_key.
+                observation_stats : Normalisation stats stacked per network, if
+                    the observations are normalised.
+                alive : Death mask array, if the observations are normalised.
 
             Returns:
                 action info, policy info and new prng key.
             """
             actions_info, policies_info = {}, {}
-            # TODO Look at tree mapping this forloop.
-            # Since this is jitted, compiling a forloop with lots of agents could take
-            # long, we should vectorize this.
-            for agent, observation in observations.items():
-                network = networks[agent_net_keys[agent]]
-                actions_info[agent], policies_info[agent], base_key = select_action(
-                    observation=observation,
-                    current_params=current_params[agent_net_keys[agent]],
-                    network=network,
-                    base_key=base_key,
+            agents_per_network = group_agents_by_network(
+                observations.keys(), agent_net_keys
+            )
+            for net_key, agents in agents_per_network.items():
+                # We use the action keys immediately and keep the new key for
+                # future splits.
+                keys = jax.random.split(base_key, len(agents) + 1)
+                base_key = keys[0]
+                network_actions_info, network_policies_info = jax.vmap(
+                    functools.partial(select_action, networks[net_key]),
+                    in_axes=(0, None, 0),
+                )(
+                    _stack_network_observations(
+                        observations, agents, observation_stats, alive, net_key
+                    ),
+                    current_params[net_key],
+                    keys[1:],
                 )
+                for agent_index, agent in enumerate(agents):
+                    actions_info[agent] = index_stacked_tree(
+                        network_actions_info, agent_index
+                    )
+                    policies_info[agent] = index_stacked_tree(
+                        network_policies_info, agent_index
+                    )
             return actions_info, policies_info, base_key
 
         executor.store.select_actions_fn = jax.jit(select_actions)
@@ -214,12 +289,12 @@ class RecurrentExecutorSelectAction(ExecutorSelectAction):
         """
 
         observations = executor.store.observations
-        # Normalize the observations before selecting actions.
-        if (
-            executor.has(ObservationNormalisation)
-            and executor.store.global_config.normalise_observations
-        ):
-            observations = executor_normalize_observation(executor, observations)
+        # The observations are normalised when selecting actions.
+        normalisation_args: Tuple = ()
+        if _normalises_observations(executor):
+            normalisation_args = executor_normalisation_args(
+                executor, list(observations.keys())
+            )
 
         # Dict with params per network
         current_agent_params = {
@@ -237,6 +312,7 @@ class RecurrentExecutorSelectAction(ExecutorSelectAction):
             current_agent_params,
             executor.store.policy_states,
             executor.store.base_key,
+            *normalisation_args,
         )
 
     def on_execution_init_end(self, executor: SystemExecutor) -> None:
@@ -250,30 +326,29 @@ class RecurrentExecutorSelectAction(ExecutorSelectAction):
         """
         networks = executor.store.networks
         agent_net_keys = executor.store.agent_net_keys
+        if _normalises_observations(executor):
+            executor.store.observation_stats = ExecutorObservationStats(agent_net_keys)
 
         def select_action(
+            network: Any,
             observation: NestedArray,
             current_params: NestedArray,
             policy_state: NestedArray,
-            network: Any,
-            base_key: networks_lib.PRNGKey,
-        ) -> Tuple[NestedArray, NestedArray, NestedArray, networks_lib.PRNGKey]:
+            action_key: networks_lib.PRNGKey,
+        ) -> Tuple[NestedArray, NestedArray, NestedArray]:
             """Action selection across a single agent.
 
             Args:
-
+                network : The network object used by the current agent.
                 observation : The observation for the current agent.
                 current_params : The parameters for current agent's network.
                 policy_state: State of the recurrent units for the current agent.
-                network : The network object used by the current agent.
-                key : A JAX prng key.
+                action_key : A JAX prng key used to sample the action.
 
             Returns:
-                action info, policy info and new key.
+                action info, policy info and new policy state.
             """
             observation_data = utils.add_batch_dim(observation.observation)
-            # We use the subkey immediately and keep the new key for future splits.
-            base_key, action_key = jax.random.split(base_key)
             action_info, policy_info, policy_state = network.get_action(
                 observations=observation_data,
                 params=current_params,
@@ -281,13 +356,15 @@ class RecurrentExecutorSelectAction(ExecutorSelectAction):
                 base_key=action_key,
                 mask=utils.add_batch_dim(observation.legal_actions),
             )
-            return action_info, policy_info, policy_state, base_key
+            return action_info, policy_info, policy_state
 
         def select_actions(
             observations: Dict[str, NestedArray],
             current_params: Dict[str, NestedArray],
             policy_states: Dict[str, NestedArray],
             base_key: networks_lib.PRNGKey,
+            observation_stats: Optional[Dict[str, Dict[str, NestedArray]]] = None,
+            alive: Optional[NestedArray] = None,
         ) -> Tuple[
             Dict[str, NestedArray],
             NestedArray,
@@ -296,32 +373,55 @@ class RecurrentExecutorSelectAction(ExecutorSelectAction):
         ]:
             """Select actions across all agents - this is jitted below.
 
+            Agents that share a network select their actions with a single
+            vmapped call, so compile time does not grow with the number of agents.
+
             Args:
                 observations : The observations for all the agents.
                 current_params : The parameters for all the agents.
+                policy_states : The recurrent states of all the agents.
                 base_key : A JAX prng_key.
+                observation_stats : Normalisation stats stacked per network, if
+                    the observations are normalised.
+                alive : Death mask array, if the observations are normalised.
 
             Returns:
-                action info, policy info and new prng key.
+                action info, policy info, new policy states and new prng key.
             """
             actions_info, policies_info, new_policy_states = {}, {}, {}
-            # TODO Look at tree mapping this forloop.
-            # Since this is jitted, compiling a forloop with lots of agents could take
-            # long, we should vectorize this.
-            for agent, observation in observations.items():
-                network = networks[agent_net_keys[agent]]
+            agents_per_network = group_agents_by_network(
+                observations.keys(), agent_net_keys
+            )
+            for net_key, agents in agents_per_network.items():
+                # We use the action keys immediately and keep the new key for
+                # future splits.
+                keys = jax.random.split(base_key, len(agents) + 1)
+                base_key = keys[0]
                 (
-                    actions_info[agent],
-                    policies_info[agent],
-                    new_policy_states[agent],
-                    base_key,
-                ) = select_action(
-                    observation=observation,
-                    current_params=current_params[agent_net_keys[agent]],
-                    policy_state=policy_states[agent],
-                    network=network,
-                    base_key=base_key,
+                    network_actions_info,
+                    network_policies_info,
+                    network_policy_states,
+                ) = jax.vmap(
+                    functools.partial(select_action, networks[net_key]),
+                    in_axes=(0, None, 0, 0),
+                )(
+                    _stack_network_observations(
+                        observations, agents, observation_stats, alive, net_key
+                    ),
+                    current_params[net_key],
+                    stack_trees([policy_states[agent] for agent in agents]),
+                    keys[1:],
                 )
+                for agent_index, agent in enumerate(agents):
+                    actions_info[agent] = index_stacked_tree(
+                        network_actions_info, agent_index
+                    )
+                    policies_info[agent] = index_stacked_tree(
+                        network_policies_info, agent_index
+                    )
+                    new_policy_states[agent] = index_stacked_tree(
+                        network_policy_states, agent_index
+                    )
             return actions_info, policies_info, new_policy_states, base_key
 
         executor.store.select_actions_fn = jax.jit(select_actions)
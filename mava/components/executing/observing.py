@@ -20,6 +20,9 @@ import copy
 from types import SimpleNamespace
 from typing import Any, Dict, List, Type
 
+import jax
+import numpy as np
+
 from mava.callbacks import Callback
 from mava.components import Component
 from mava.components.building.adders import Adder
@@ -30,6 +33,21 @@ from mava.core_jax import SystemExecutor
 from mava.utils.sort_utils import sample_new_agent_keys, sort_str_num
 
 
+def broadcast_to_steps(values: Any, num_steps: int) -> Any:
+    """Repeat nested values that are constant over an episode at each step.
+
+    Args:
+        values: nested values, e.g. the network keys of the episode.
+        num_steps: number of steps of the trajectory.
+
+    Returns:
+        Read-only views of the values with a leading time axis.
+    """
+    return jax.tree_util.tree_map(
+        lambda x: np.broadcast_to(x, (num_steps,) + np.shape(x)), values
+    )
+
+
 class ExecutorObserve(Component):
     @abc.abstractmethod
     def __init__(self, config: SimpleNamespace = SimpleNamespace()):
@@ -158,6 +176,46 @@ class FeedforwardExecutorObserve(ExecutorObserve):
             "network_int_keys"
         ] = executor.store.network_int_keys_extras
 
+    def on_execution_observe_trajectory(self, executor: SystemExecutor) -> None:
+        """Handle the observations of a trajectory and pass it along to the adder.
+
+        Args:
+            executor: SystemExecutor.
+
+        Returns:
+            None.
+        """
+        if not executor.store.adder:
+            return
+
+        # Actions and policy info of each step, with a leading time axis.
+        actions_info = executor.store.actions_info
+        policies_info = executor.store.policies_info
+
+        adder_actions = {
+            agent: {"actions_info": actions_info[agent]}
+            for agent in actions_info.keys()
+        }
+
+        # The extras set at the start of the episode are the same at each step.
+        # executor.store.next_timesteps set by Executor
+        num_steps = len(executor.store.next_timesteps.step_type)
+        extras = broadcast_to_steps(
+            {
+                key: value
+                for key, value in executor.store.extras.items()
+                if key != "policy_info"
+            },
+            num_steps,
+        )
+        extras["policy_info"] = {
+            agent: policies_info[agent] for agent in actions_info.keys()
+        }
+
+        executor.store.adder.add_trajectory(
+            adder_actions, executor.store.next_timesteps, extras
+        )
+
     def on_execution_update(self, executor: SystemExecutor) -> None:
         """Update the executor variables."""
         if executor.store.executor_parameter_client:
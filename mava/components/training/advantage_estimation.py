@@ -28,10 +28,52 @@ from mava.components.training.base import Utility
 from mava.core_jax import SystemTrainer
 
 
+def associative_scan_gae(
+    r_t: jnp.ndarray,
+    discount_t: jnp.ndarray,
+    lambda_: float,
+    values: jnp.ndarray,
+) -> jnp.ndarray:
+    """Compute truncated GAE with an associative scan over time.
+
+    Equivalent to rlax.truncated_generalized_advantage_estimation, which scans
+    sequentially over time. The advantages follow the linear recurrence
+    A_t = delta_t + lambda * discount_t * A_{t+1}. Composing its steps is
+    associative, so they are combined in logarithmic depth over the sequence
+    length.
+
+    Args:
+        r_t: sequence of rewards at times [1, k].
+        discount_t: sequence of discounts at times [1, k].
+        lambda_: mixing parameter.
+        values: sequence of values under the policy at times [0, k].
+
+    Returns:
+        Sequence of advantages at times [0, k-1].
+    """
+    decay_t = lambda_ * discount_t
+    delta_t = r_t + discount_t * values[1:] - values[:-1]
+
+    def compose(
+        later: Tuple[jnp.ndarray, jnp.ndarray], earlier: Tuple[jnp.ndarray, jnp.ndarray]
+    ) -> Tuple[jnp.ndarray, jnp.ndarray]:
+        """Compose the steps A -> delta + decay * A of two time ranges."""
+        later_decay, later_delta = later
+        earlier_decay, earlier_delta = earlier
+        return (
+            earlier_decay * later_decay,
+            earlier_delta + earlier_decay * later_delta,
+        )
+
+    _, advantage_t = jax.lax.associative_scan(compose, (decay_t, delta_t), reverse=True)
+    return advantage_t
+
+
 @dataclass
 class GAEConfig:
     gae_lambda: float = 0.95
     max_abs_reward: float = np.inf
+    use_associative_scan_gae: bool = False
 
 
 class GAE(Utility):
@@ -76,7 +118,12 @@ class GAE(Utility):
             max_abs_reward = self.config.max_abs_reward
             rewards = jnp.clip(rewards, -max_abs_reward, max_abs_reward)
 
-            advantages = rlax.truncated_generalized_advantage_estimation(
+            gae_fn = (
+                associative_scan_gae
+                if self.config.use_associative_scan_gae
+                else rlax.truncated_generalized_advantage_estimation
+            )
+            advantages = gae_fn(
                 rewards[:-1],
                 discounts[:-1],
                 self.config.gae_lambda,
@@ -15,9 +15,10 @@
 
 """Trainer components for calculating losses."""
 import abc
+import functools
 from dataclasses import dataclass
 from types import SimpleNamespace
-from typing import Any, Dict, List, Tuple, Type
+from typing import Any, Callable, Dict, List, Tuple, Type
 
 import chex
 import haiku as hk
@@ -30,6 +31,8 @@ from haiku._src.basic import merge_leading_dims
 from mava.callbacks import Callback
 from mava.components import Component, training
 from mava.core_jax import SystemTrainer
+from mava.utils.jax_tree_utils import index_stacked_tree, stack_trees
+from mava.utils.sort_utils import group_agents_by_network
 
 
 def clipped_surrogate_pg_loss(
@@ -79,6 +82,60 @@ def clipped_surrogate_pg_loss(
     return -jnp.sum(clipped_objective * mask) / (jnp.sum(mask) + eps)
 
 
+def batched_agent_loss_grad(
+    loss_fn: Callable,
+    params: Dict[str, Any],
+    networks: Dict[str, Any],
+    agents: List[str],
+    agent_net_keys: Dict[str, str],
+    *agent_inputs: Dict[str, Any],
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, jnp.ndarray]]]:
+    """Computes one gradient per network for the agents sharing that network.
+
+    The inputs of agents sharing a network are stacked and the per-agent loss
+    is vmapped over them, so that each network is only differentiated once
+    instead of once per agent. The loss of a network is the mean of the losses
+    of its agents.
+
+    Args:
+        loss_fn: per-agent loss function taking the network, its parameters and
+            the agent inputs, returning the loss and the loss information.
+        params: parameters per network.
+        networks: networks per network key.
+        agents: agents to compute the loss for.
+        agent_net_keys: network key used by each agent.
+        agent_inputs: loss function inputs, each a dictionary keyed by agent.
+
+    Returns:
+        Tuple[gradients per network, loss information per agent]
+    """
+    grads = {}
+    loss_info = {}
+    for net_key, net_agents in group_agents_by_network(agents, agent_net_keys).items():
+        stacked_inputs = [
+            stack_trees([agent_input[agent] for agent in net_agents])
+            for agent_input in agent_inputs
+        ]
+        batched_loss_fn = jax.vmap(
+            functools.partial(loss_fn, networks[net_key]),
+            in_axes=(None,) + (0,) * len(stacked_inputs),
+        )
+
+        def mean_loss_fn(
+            net_params: Any, *inputs: Any
+        ) -> Tuple[jnp.ndarray, Dict[str, jnp.ndarray]]:
+            """Mean of the losses of the agents sharing the network."""
+            losses, net_loss_info = batched_loss_fn(net_params, *inputs)
+            return jnp.mean(losses), net_loss_info
+
+        grads[net_key], net_loss_info = jax.grad(mean_loss_fn, has_aux=True)(
+            params[net_key], *stacked_inputs
+        )
+        for agent_index, agent in enumerate(net_agents):
+            loss_info[agent] = index_stacked_tree(net_loss_info, agent_index)
+    return grads, loss_info
+
+
 class ValueLoss(Component):
     @abc.abstractmethod
     def on_training_utility_fns(self, trainer: SystemTrainer) -> None:
@@ -196,6 +253,9 @@ class MAPGTrustRegionClippingLossConfig:
 
     The idea is to scale it to try and match the effect of the normalisation
     on the target values.
+
+    When batch_agents_by_network is True, agents sharing a network are batched
+    into a single loss and gradient per network instead of one per agent.
     """
 
     clipping_epsilon: float = 0.2
@@ -203,6 +263,7 @@ class MAPGTrustRegionClippingLossConfig:
     clip_value: bool = True
     entropy_cost: float = 0.01
     value_cost: float = 0.5
+    batch_agents_by_network: bool = False
 
 
 class MAPGWithTrustRegionClippingLoss(Loss):
@@ -247,106 +308,120 @@ class MAPGWithTrustRegionClippingLoss(Loss):
                 advantages: advantage estimation values per agent.
 
             Returns:
-                Tuple[policy gradients, policy loss information]
+                Tuple[policy gradients, policy loss information]. Gradients are
+                    per network if batch_agents_by_network is set and per agent
+                    otherwise.
             """
 
-            policy_grads = {}
-            loss_info_policy = {}
-            for agent_key in trainer.store.trainer_agents:
-                agent_net_key = trainer.store.trainer_agent_net_keys[agent_key]
-                network = trainer.store.networks[agent_net_key]
-                # Note (dries): This is placed here to set the networks correctly in
-                # the case of non-shared weights.
-
-                def policy_loss_fn(
-                    policy_params: Any,
-                    policy_states: Any,
-                    observations: Any,
-                    actions: jnp.ndarray,
-                    behaviour_log_probs: jnp.ndarray,
-                    advantages: jnp.ndarray,
-                    mask: jnp.ndarray,
-                ) -> Tuple[jnp.ndarray, Dict[str, jnp.ndarray]]:
-                    """Inner policy loss function: see outer function for parameters."""
-
-                    # TODO (dries): Can we implement something more general here?
-                    # Like a function call?
-                    if policy_states:
-                        # Recurrent actor.
-                        minibatch_size = int(
-                            trainer.store.epoch_batch_size
-                            / trainer.store.num_minibatches
-                        )
-                        seq_len = trainer.store.sequence_length - 1
-
-                        batch_seq_observations = observations.reshape(
-                            minibatch_size, seq_len, -1
-                        )
-
-                        batch_seq_policy_states = policy_states[0].reshape(
-                            minibatch_size, seq_len, -1
-                        )
-
-                        # Use the state at the start of the sequence
-                        # and unroll the policy.
-                        # core = lambda x, y: network.policy_network.apply(
-                        #     policy_params, [x, y]
-                        # )
-
-                        def core(x: jnp.ndarray, y: jnp.ndarray) -> jnp.ndarray:
-                            return network.policy_network.apply(policy_params, [x, y])
-
-                        distribution_params, _ = hk.static_unroll(
-                            core,
-                            batch_seq_observations,
-                            batch_seq_policy_states[:, 0],
-                            time_major=False,
-                        )
-
-                        # Flatten the distribution_params
-
-                        distribution_params = jax.tree_util.tree_map(
-                            lambda x: merge_leading_dims(x, 2),
-                            distribution_params,
-                        )
-                    else:
-                        # Feedforward actor.
-                        distribution_params = network.policy_network.apply(
-                            policy_params, observations
-                        )
-
-                    log_probs = network.log_prob(distribution_params, actions)
-                    entropy = network.entropy(distribution_params)
-
-                    # Compute importance sampling weights:
-                    # current policy / behavior policy.
-                    rhos = jnp.exp(log_probs - behaviour_log_probs)
-                    clipping_epsilon = self.config.clipping_epsilon
-
-                    policy_loss = clipped_surrogate_pg_loss(
-                        rhos, advantages, clipping_epsilon, mask
+            def policy_loss_fn(
+                network: Any,
+                policy_params: Any,
+                policy_states: Any,
+                observations: Any,
+                actions: jnp.ndarray,
+                behaviour_log_probs: jnp.ndarray,
+                advantages: jnp.ndarray,
+                mask: jnp.ndarray,
+            ) -> Tuple[jnp.ndarray, Dict[str, jnp.ndarray]]:
+                """Inner policy loss function: see outer function for parameters."""
+
+                # TODO (dries): Can we implement something more general here?
+                # Like a function call?
+                if policy_states:
+                    # Recurrent actor.
+                    minibatch_size = int(
+                        trainer.store.epoch_batch_size / trainer.store.num_minibatches
                     )
+                    seq_len = trainer.store.sequence_length - 1
 
-                    eps = 1e-10
-                    # Entropy regulariser.
-                    entropy_loss = -jnp.sum(entropy * mask) / (jnp.sum(mask) + eps)
+                    batch_seq_observations = observations.reshape(
+                        minibatch_size, seq_len, -1
+                    )
 
-                    total_policy_loss = (
-                        policy_loss + entropy_loss * self.config.entropy_cost
+                    batch_seq_policy_states = policy_states[0].reshape(
+                        minibatch_size, seq_len, -1
                     )
 
-                    # TODO: (Ruan) Keeping the entropy penalty for now.
-                    # can remove or add a flag for including it.
-                    loss_info_policy = {
-                        "policy_loss_total": total_policy_loss,
-                        "loss_policy": policy_loss,
-                        "loss_entropy": entropy_loss,
-                    }
+                    # Use the state at the start of the sequence
+                    # and unroll the policy.
+                    # core = lambda x, y: network.policy_network.apply(
+                    #     policy_params, [x, y]
+                    # )
+
+                    def core(x: jnp.ndarray, y: jnp.ndarray) -> jnp.ndarray:
+                        return network.policy_network.apply(policy_params, [x, y])
+
+                    distribution_params, _ = hk.static_unroll(
+                        core,
+                        batch_seq_observations,
+                        batch_seq_policy_states[:, 0],
+                        time_major=False,
+                    )
+
+                    # Flatten the distribution_params
+
+                    distribution_params = jax.tree_util.tree_map(
+                        lambda x: merge_leading_dims(x, 2),
+                        distribution_params,
+                    )
+                else:
+                    # Feedforward actor.
+                    distribution_params = network.policy_network.apply(
+                        policy_params, observations
+                    )
+
+                log_probs = network.log_prob(distribution_params, actions)
+                entropy = network.entropy(distribution_params)
+
+                # Compute importance sampling weights:
+                # current policy / behavior policy.
+                rhos = jnp.exp(log_probs - behaviour_log_probs)
+                clipping_epsilon = self.config.clipping_epsilon
+
+                policy_loss = clipped_surrogate_pg_loss(
+                    rhos, advantages, clipping_epsilon, mask
+                )
+
+                eps = 1e-10
+                # Entropy regulariser.
+                entropy_loss = -jnp.sum(entropy * mask) / (jnp.sum(mask) + eps)
+
+                total_policy_loss = (
+                    policy_loss + entropy_loss * self.config.entropy_cost
+                )
 
-                    return total_policy_loss, loss_info_policy
+                # TODO: (Ruan) Keeping the entropy penalty for now.
+                # can remove or add a flag for including it.
+                loss_info_policy = {
+                    "policy_loss_total": total_policy_loss,
+                    "loss_policy": policy_loss,
+                    "loss_entropy": entropy_loss,
+                }
+
+                return total_policy_loss, loss_info_policy
+
+            if self.config.batch_agents_by_network:
+                return batched_agent_loss_grad(
+                    policy_loss_fn,
+                    policy_params,
+                    trainer.store.networks,
+                    trainer.store.trainer_agents,
+                    trainer.store.trainer_agent_net_keys,
+                    policy_states,
+                    {agent: obs.observation for agent, obs in observations.items()},
+                    actions,
+                    behaviour_log_probs,
+                    advantages,
+                    masks,
+                )
 
+            policy_grads = {}
+            loss_info_policy = {}
+            for agent_key in trainer.store.trainer_agents:
+                agent_net_key = trainer.store.trainer_agent_net_keys[agent_key]
+                network = trainer.store.networks[agent_net_key]
                 policy_grads[agent_key], loss_info_policy[agent_key] = jax.grad(
-                    policy_loss_fn, has_aux=True
+                    functools.partial(policy_loss_fn, network), has_aux=True
                 )(
                     policy_params[agent_net_key],
                     policy_states[agent_key],
@@ -377,67 +452,80 @@ class MAPGWithTrustRegionClippingLoss(Loss):
                     using the current critic network in the environment.
 
             Returns:
-                Tuple[critic gradients, critic loss information]
+                Tuple[critic gradients, critic loss information]. Gradients are
+                    per network if batch_agents_by_network is set and per agent
+                    otherwise.
             """
 
-            critic_grads = {}
-            loss_info_critic = {}
-            for agent_key in trainer.store.trainer_agents:
-                agent_net_key = trainer.store.trainer_agent_net_keys[agent_key]
-                network = trainer.store.networks[agent_net_key]
+            def critic_loss_fn(
+                network: Any,
+                critic_params: Any,
+                observations: Any,
+                target_values: jnp.ndarray,
+                behavior_values: jnp.ndarray,
+                mask: jnp.ndarray,
+            ) -> Tuple[jnp.ndarray, Dict[str, jnp.ndarray]]:
+                """Inner critic loss function: see outer function for parameters."""
+
+                values = (
+                    network.critic_network.apply(critic_params, observations) * mask
+                )
 
-                def critic_loss_fn(
-                    critic_params: Any,
-                    observations: Any,
-                    target_values: jnp.ndarray,
-                    behavior_values: jnp.ndarray,
-                    mask: jnp.ndarray,
-                ) -> Tuple[jnp.ndarray, Dict[str, jnp.ndarray]]:
-                    """Inner critic loss function: see outer function for parameters."""
-
-                    values = (
-                        network.critic_network.apply(critic_params, observations) * mask
-                    )
+                # Value function loss. Exclude the bootstrap value
+                unclipped_value_error = target_values - values
 
-                    # Value function loss. Exclude the bootstrap value
-                    unclipped_value_error = target_values - values
+                unclipped_value_loss = trainer.store.value_loss_fn(
+                    unclipped_value_error
+                )
 
-                    unclipped_value_loss = trainer.store.value_loss_fn(
-                        unclipped_value_error
-                    )
+                eps = 1e-10
+                value_clip_parameter = self.config.value_clip_parameter
+                if self.config.clip_value:
+                    # Clip values to reduce variablility during critic training.
 
-                    eps = 1e-10
-                    value_clip_parameter = self.config.value_clip_parameter
-                    if self.config.clip_value:
-                        # Clip values to reduce variablility during critic training.
-
-                        clipped_values = behavior_values + jnp.clip(
-                            values - behavior_values,
-                            -value_clip_parameter,
-                            value_clip_parameter,
-                        )
-                        clipped_value_error = target_values - clipped_values
-                        clipped_value_loss = trainer.store.value_loss_fn(
-                            clipped_value_error
-                        )
-                        value_loss = jnp.sum(
-                            jnp.fmax(unclipped_value_loss, clipped_value_loss)
-                        ) / (jnp.sum(mask) + eps)
-                    else:
-                        value_loss = jnp.sum(unclipped_value_loss) / (
-                            jnp.sum(mask) + eps
-                        )
-
-                    # TODO (Ruan): Including value loss parameter in the
-                    # value loss for now but can add a flag
-                    value_loss = value_loss * self.config.value_cost
-
-                    loss_info_critic = {"loss_critic": value_loss}
-
-                    return value_loss, loss_info_critic
+                    clipped_values = behavior_values + jnp.clip(
+                        values - behavior_values,
+                        -value_clip_parameter,
+                        value_clip_parameter,
+                    )
+                    clipped_value_error = target_values - clipped_values
+                    clipped_value_loss = trainer.store.value_loss_fn(
+                        clipped_value_error
+                    )
+                    value_loss = jnp.sum(
+                        jnp.fmax(unclipped_value_loss, clipped_value_loss)
+                    ) / (jnp.sum(mask) + eps)
+                else:
+                    value_loss = jnp.sum(unclipped_value_loss) / (jnp.sum(mask) + eps)
+
+                # TODO (Ruan): Including value loss parameter in the
+                # value loss for now but can add a flag
+                value_loss = value_loss * self.config.value_cost
+
+                loss_info_critic = {"loss_critic": value_loss}
+
+                return value_loss, loss_info_critic
+
+            if self.config.batch_agents_by_network:
+                return batched_agent_loss_grad(
+                    critic_loss_fn,
+                    critic_params,
+                    trainer.store.networks,
+                    trainer.store.trainer_agents,
+                    trainer.store.trainer_agent_net_keys,
+                    {agent: obs.observation for agent, obs in observations.items()},
+                    target_values,
+                    behavior_values,
+                    masks,
+                )
 
+            critic_grads = {}
+            loss_info_critic = {}
+            for agent_key in trainer.store.trainer_agents:
+                agent_net_key = trainer.store.trainer_agent_net_keys[agent_key]
+                network = trainer.store.networks[agent_net_key]
                 critic_grads[agent_key], loss_info_critic[agent_key] = jax.grad(
-                    critic_loss_fn, has_aux=True
+                    functools.partial(critic_loss_fn, network), has_aux=True
                 )(
                     critic_params[agent_net_key],
                     observations[agent_key].observation,
@@ -450,3 +538,4 @@ class MAPGWithTrustRegionClippingLoss(Loss):
         # Save the gradient funcitons.
         trainer.store.policy_grad_fn = policy_loss_grad_fn
         trainer.store.critic_grad_fn = critic_loss_grad_fn
+        trainer.store.grads_per_network = self.config.batch_agents_by_network
@@ -34,6 +34,7 @@ from mava.components.training.losses import Loss
 from mava.components.training.step import Step
 from mava.components.training.trainer import BaseTrainerInit
 from mava.core_jax import SystemTrainer
+from mava.utils.sort_utils import group_agents_by_network
 
 
 class MinibatchUpdate(Utility):
@@ -132,9 +133,20 @@ class MAPGMinibatchUpdate(MinibatchUpdate):
                 minibatch.masks,
             )
 
+            # Agents sharing a network have a single gradient and optimiser
+            # update when the loss batches them per network.
+            if getattr(trainer.store, "grads_per_network", False):
+                update_groups = group_agents_by_network(
+                    trainer.store.trainer_agents, trainer.store.trainer_agent_net_keys
+                )
+            else:
+                update_groups = {
+                    agent_key: [agent_key] for agent_key in trainer.store.trainer_agents
+                }
+
             metrics = {}
-            for agent_key in trainer.store.trainer_agents:
-                agent_net_key = trainer.store.trainer_agent_net_keys[agent_key]
+            for grad_key, agent_keys in update_groups.items():
+                agent_net_key = trainer.store.trainer_agent_net_keys[agent_keys[0]]
                 # Update the policy networks and optimisers.
                 # Apply updates
                 # TODO (dries): Use one optimiser per network type here and not
@@ -143,21 +155,13 @@ class MAPGMinibatchUpdate(MinibatchUpdate):
                     policy_updates,
                     policy_opt_states[agent_net_key][constants.OPT_STATE_DICT_KEY],
                 ) = trainer.store.policy_optimiser.update(
-                    policy_gradients[agent_key],
+                    policy_gradients[grad_key],
                     policy_opt_states[agent_net_key][constants.OPT_STATE_DICT_KEY],
                 )
                 policy_params[agent_net_key] = optax.apply_updates(
                     policy_params[agent_net_key], policy_updates
                 )
 
-                policy_agent_metrics[agent_key]["norm_policy_grad"] = optax.global_norm(
-                    policy_gradients[agent_key]
-                )
-                policy_agent_metrics[agent_key][
-                    "norm_policy_updates"
-                ] = optax.global_norm(policy_updates)
-                metrics[agent_key] = policy_agent_metrics[agent_key]
-
                 # Update the critic networks and optimisers.
                 # Apply updates
                 # TODO (dries): Use one optimiser per network type here and not
@@ -166,21 +170,30 @@ class MAPGMinibatchUpdate(MinibatchUpdate):
                     critic_updates,
                     critic_opt_states[agent_net_key][constants.OPT_STATE_DICT_KEY],
                 ) = trainer.store.critic_optimiser.update(
-                    critic_gradients[agent_key],
+                    critic_gradients[grad_key],
                     critic_opt_states[agent_net_key][constants.OPT_STATE_DICT_KEY],
                 )
                 critic_params[agent_net_key] = optax.apply_updates(
                     critic_params[agent_net_key], critic_updates
                 )
 
-                critic_agent_metrics[agent_key]["norm_critic_grad"] = optax.global_norm(
-                    critic_gradients[agent_key]
-                )
-                critic_agent_metrics[agent_key][
-                    "norm_critic_updates"
-                ] = optax.global_norm(critic_updates)
-                # TODO (Ruan): double check that this was done correctly
-                metrics[agent_key].update(critic_agent_metrics[agent_key])
+                for agent_key in agent_keys:
+                    policy_agent_metrics[agent_key][
+                        "norm_policy_grad"
+                    ] = optax.global_norm(policy_gradients[grad_key])
+                    policy_agent_metrics[agent_key][
+                        "norm_policy_updates"
+                    ] = optax.global_norm(policy_updates)
+                    metrics[agent_key] = policy_agent_metrics[agent_key]
+
+                    critic_agent_metrics[agent_key][
+                        "norm_critic_grad"
+                    ] = optax.global_norm(critic_gradients[grad_key])
+                    critic_agent_metrics[agent_key][
+                        "norm_critic_updates"
+                    ] = optax.global_norm(critic_updates)
+                    # TODO (Ruan): double check that this was done correctly
+                    metrics[agent_key].update(critic_agent_metrics[agent_key])
 
             return (
                 policy_params,
@@ -41,6 +41,7 @@ from mava.components.training.advantage_estimation import GAE
 from mava.components.training.base import Batch, TrainingState
 from mava.components.training.trainer import BaseTrainerInit
 from mava.core_jax import SystemTrainer
+from mava.utils.dataset_utils import DevicePrefetchIterator
 from mava.utils.jax_training_utils import denormalize, normalize
 
 
@@ -137,6 +138,10 @@ class DefaultTrainerStep(TrainerStep):
         # Add the trainer counts.
         results.update(trainer.store.trainer_counts)
 
+        # Add the prefetching metrics.
+        if isinstance(trainer.store.dataset_iterator, DevicePrefetchIterator):
+            results.update(trainer.store.dataset_iterator.metrics)
+
         # Write to the loggers.
         trainer.store.trainer_logger.write({**results})
 
@@ -19,6 +19,7 @@ from mava.components.updating.checkpointer import Checkpointer
 from mava.components.updating.parameter_server import (
     ActorCriticParameterServer,
     DefaultParameterServer,
+    SharedMemoryParameterBroadcast,
 )
 from mava.components.updating.terminators import (
     CountConditionTerminator,
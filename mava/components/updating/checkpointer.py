@@ -13,9 +13,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import threading
 import time
-from typing import List, Type, Union
+from typing import Dict, List, Type, Union
 
+from absl import logging
 from acme.jax import savers as acme_savers
 from chex import dataclass
 
@@ -28,11 +31,14 @@ from mava.wrappers import SaveableWrapper
 
 """Checkpointer component for Mava systems."""
 
+_CHECKPOINT_SUBDIRECTORY = "default"
+
 
 @dataclass
 class CheckpointerConfig:
     checkpoint_minute_interval: float = 5
     restore_best_net: Union[str, None] = None
+    async_checkpointing: bool = True
 
 
 class Checkpointer(Component):
@@ -57,9 +63,16 @@ class Checkpointer(Component):
         server.store.system_checkpointer = acme_savers.Checkpointer(
             object_to_save=saveable_parameters,  # must be type saveable
             directory=server.store.experiment_path,
+            subdirectory=_CHECKPOINT_SUBDIRECTORY,
             add_uid=False,
             time_delta_minutes=0,
         )
+        # The acme checkpointer writes to <directory>/checkpoints/<subdirectory>.
+        server.store.checkpoint_dir = os.path.join(
+            os.path.expanduser(server.store.experiment_path),
+            "checkpoints",
+            _CHECKPOINT_SUBDIRECTORY,
+        )
 
         # Check if the checkpointer restored the network parameters
         # and if the user wants the network with the best performance.
@@ -68,6 +81,11 @@ class Checkpointer(Component):
         ):
             update_to_best_net(server, self.config.restore_best_net)
 
+        server.store.saveable_parameters = saveable_parameters
+        server.store.checkpoint_thread = None
+        # Error of a checkpoint that failed on the background thread.
+        server.store.checkpoint_error = None
+        server.store.checkpoint_metrics = {}
         server.store.last_checkpoint_time = time.time()
         server.store.checkpoint_minute_interval = self.config.checkpoint_minute_interval
 
@@ -76,19 +94,118 @@ class Checkpointer(Component):
     ) -> None:
         """Intermittently checkpoint the server parameters.
 
+        With asynchronous checkpointing, a snapshot of the parameters is taken
+        and written to disk on a background thread, so the parameter server
+        keeps serving requests while the checkpoint is written. A checkpoint
+        is only started once the previous one has been written, and the system
+        termination function waits for the last one. The error of a failed
+        background checkpoint is raised by the next call.
+
         Args:
             server: SystemParameterServer.
 
         Returns:
             None.
         """
+        if server.store.checkpoint_error is not None:
+            raise server.store.checkpoint_error
+
         if (
             time.time() - server.store.last_checkpoint_time
             > self.config.checkpoint_minute_interval * 60 + 1
         ):
-            server.store.system_checkpointer.save()
+            if not self.config.async_checkpointing:
+                self._save(server)
+            elif (
+                server.store.checkpoint_thread is None
+                or not server.store.checkpoint_thread.is_alive()
+            ):
+                server.store.saveable_parameters.snapshot()
+                server.store.checkpoint_thread = threading.Thread(
+                    target=self._save_in_background, args=(server,)
+                )
+                server.store.checkpoint_thread.start()
+            else:
+                # Wait for the previous checkpoint to be written.
+                return
             server.store.last_checkpoint_time = time.time()
 
+    def _save_in_background(self, server: SystemParameterServer) -> None:
+        """Write a checkpoint, storing the error if it fails.
+
+        An exception would otherwise silently end the background thread.
+
+        Args:
+            server: SystemParameterServer.
+
+        Returns:
+            None.
+        """
+        try:
+            self._save(server)
+        except Exception as error:
+            logging.exception("Checkpointer: failed to write a checkpoint.")
+            server.store.checkpoint_error = error
+
+    def _save(self, server: SystemParameterServer) -> None:
+        """Write a checkpoint to disk and log how long it took.
+
+        Args:
+            server: SystemParameterServer.
+
+        Returns:
+            None.
+        """
+        checkpoint_dir = server.store.checkpoint_dir
+        start_time = time.time()
+        old_files = self._file_modification_times(checkpoint_dir)
+        server.store.system_checkpointer.save()
+
+        # Flush the checkpoint files written by this save to disk.
+        bytes_written = 0
+        for path, modification_time in self._file_modification_times(
+            checkpoint_dir
+        ).items():
+            if old_files.get(path) != modification_time:
+                file_descriptor = os.open(path, os.O_RDONLY)
+                try:
+                    os.fsync(file_descriptor)
+                finally:
+                    os.close(file_descriptor)
+                bytes_written += os.path.getsize(path)
+
+        server.store.checkpoint_metrics = {
+            "checkpoint_duration_seconds": time.time() - start_time,
+            "checkpoint_bytes_written": bytes_written,
+        }
+        logging.info(
+            "Checkpointer: wrote %d bytes in %.2f seconds.",
+            bytes_written,
+            server.store.checkpoint_metrics["checkpoint_duration_seconds"],
+        )
+        # Set up by the Logger component.
+        parameter_server_logger = getattr(server.store, "parameter_server_logger", None)
+        if parameter_server_logger:
+            parameter_server_logger.write(server.store.checkpoint_metrics)
+
+    @staticmethod
+    def _file_modification_times(directory: str) -> Dict[str, int]:
+        """Get the modification time of the files in a directory.
+
+        Args:
+            directory: path of the directory.
+
+        Returns:
+            dictionary {file path: modification time in nanoseconds}.
+        """
+        if not os.path.isdir(directory):
+            return {}
+        return {
+            entry.path: entry.stat().st_mtime_ns
+            for entry in os.scandir(directory)
+            if entry.is_file()
+        }
+
     @staticmethod
     def name() -> str:
         """Static method that returns component name."""
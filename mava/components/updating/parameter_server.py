@@ -15,9 +15,11 @@
 
 """Parameter server Component for Mava systems."""
 import abc
+import atexit
+import uuid
 from dataclasses import dataclass
 from types import SimpleNamespace
-from typing import Any, Dict, List, Optional, Sequence, Type, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union
 
 import numpy as np
 from chex import Array
@@ -25,8 +27,9 @@ from chex import Array
 from mava.callbacks import Callback
 from mava.components.building.networks import Networks
 from mava.components.component import Component
-from mava.core_jax import SystemParameterServer
+from mava.core_jax import SystemBuilder, SystemParameterServer
 from mava.utils.lp_utils import termination_fn
+from mava.utils.shared_memory_utils import SharedParameterBuffer, is_shareable
 
 
 @dataclass
@@ -137,6 +140,12 @@ class DefaultParameterServer(ParameterServer):
         # Interrupt the system in case all the executors failed
         server.store.parameters["num_executor_failed"] = 0
 
+        # Version of each parameter, incremented every time it is set or added to.
+        # Parameters that were never updated are at version 0. Parameters assigned
+        # directly in the store keep their version, so this is only done before
+        # the clients first request them, e.g. when restoring a checkpoint.
+        server.store.parameter_versions = {}
+
     # Get
     def on_parameter_server_get_parameters(self, server: SystemParameterServer) -> None:
         """Fetch the parameters from the server specified in the store.
@@ -149,10 +158,25 @@ class DefaultParameterServer(ParameterServer):
         """
         # server.store._param_names set by Parameter Server
         names: Union[str, Sequence[str]] = server.store._param_names
+        # server.store._param_versions set by Parameter Server, these are the
+        # versions held by the client or None if all parameters are requested.
+        client_versions: Optional[Dict[str, int]] = server.store._param_versions
 
         if type(names) == str:
             get_params = server.store.parameters[names]  # type: ignore
         else:
+            if client_versions is not None:
+                # Only send the parameters that changed since the client got them.
+                names = [
+                    var_key
+                    for var_key in names
+                    if server.store.parameter_versions.get(var_key, 0)
+                    != client_versions.get(var_key)
+                ]
+                server.store.get_parameter_versions = {
+                    var_key: server.store.parameter_versions.get(var_key, 0)
+                    for var_key in names
+                }
             get_params = {}
             for var_key in names:
                 get_params[var_key] = server.store.parameters[var_key]
@@ -189,6 +213,7 @@ class DefaultParameterServer(ParameterServer):
                 #     server.store.parameters[var_key][var_i].assign(params[var_key][var_i])
             else:
                 server.store.parameters[var_key] = params[var_key]
+            self._increment_version(server, var_key)
 
     # Add
     def on_parameter_server_add_to_parameters(
@@ -209,6 +234,21 @@ class DefaultParameterServer(ParameterServer):
         for var_key in names:
             assert var_key in server.store.parameters
             server.store.parameters[var_key] += params[var_key]
+            self._increment_version(server, var_key)
+
+    def _increment_version(self, server: SystemParameterServer, var_key: str) -> None:
+        """Increment the version of a parameter after it changed.
+
+        Args:
+            server: SystemParameterServer.
+            var_key: name of the parameter that changed.
+
+        Returns:
+            None.
+        """
+        server.store.parameter_versions[var_key] = (
+            server.store.parameter_versions.get(var_key, 0) + 1
+        )
 
     def _get_network_parameters(
         self, store: SimpleNamespace, networks: Dict
@@ -241,3 +281,126 @@ class ActorCriticParameterServer(DefaultParameterServer):
             ]
 
         return parameters
+
+
+@dataclass
+class SharedMemoryParameterBroadcastConfig:
+    broadcast_parameter_prefixes: Tuple[str, ...] = (
+        "policy_network-",
+        "critic_network-",
+        "norm_params",
+    )
+
+
+class SharedMemoryParameterBroadcast(Component):
+    def __init__(
+        self,
+        config: SharedMemoryParameterBroadcastConfig = SharedMemoryParameterBroadcastConfig(),  # noqa: E501
+    ) -> None:
+        """Publishes parameters to clients on the same host through shared memory.
+
+        The parameter server writes the parameters whose names start with one of
+        the broadcast prefixes into a shared memory buffer every time they are
+        set. Parameter clients on the same host read them from the buffer instead
+        of requesting them from the parameter server. Only use this component
+        when all nodes run on the same host, e.g. with local multi-processing.
+
+        Args:
+            config: SharedMemoryParameterBroadcastConfig.
+        """
+        self.config = config
+
+    def on_building_init_end(self, builder: SystemBuilder) -> None:
+        """Name the shared memory buffer used by this system.
+
+        Args:
+            builder: SystemBuilder.
+
+        Returns:
+            None.
+        """
+        builder.store.shared_parameters_name = f"mava_params_{uuid.uuid4().hex[:16]}"
+
+    def on_parameter_server_init_end(self, server: SystemParameterServer) -> None:
+        """Create the shared memory buffer and publish the initial parameters.
+
+        Args:
+            server: SystemParameterServer.
+
+        Returns:
+            None.
+        """
+        broadcast_parameters = {
+            key: value
+            for key, value in server.store.parameters.items()
+            if key.startswith(self.config.broadcast_parameter_prefixes)
+            and is_shareable(value)
+        }
+        server.store.shared_parameters = SharedParameterBuffer(
+            server.store.shared_parameters_name, broadcast_parameters
+        )
+        atexit.register(server.store.shared_parameters.close)
+        self._publish(server, list(broadcast_parameters.keys()))
+
+    def on_parameter_server_set_parameters_end(
+        self, server: SystemParameterServer
+    ) -> None:
+        """Publish the parameters that were set.
+
+        Args:
+            server: SystemParameterServer.
+
+        Returns:
+            None.
+        """
+        self._publish(server, server.store._set_params.keys())
+
+    def on_parameter_server_add_to_parameters_end(
+        self, server: SystemParameterServer
+    ) -> None:
+        """Publish the parameters that were added to.
+
+        Args:
+            server: SystemParameterServer.
+
+        Returns:
+            None.
+        """
+        self._publish(server, server.store._add_to_params.keys())
+
+    def _publish(self, server: SystemParameterServer, names: Sequence[str]) -> None:
+        """Write the given parameters into the shared memory buffer.
+
+        Args:
+            server: SystemParameterServer.
+            names: names of the parameters that changed. Parameters that are
+                not broadcast are ignored.
+
+        Returns:
+            None.
+        """
+        shared_keys = set(server.store.shared_parameters.keys)
+        shared_names = [key for key in names if key in shared_keys]
+        if not shared_names:
+            return
+        server.store.shared_parameters.write(
+            {key: server.store.parameters[key] for key in shared_names},
+            {key: server.store.parameter_versions.get(key, 0) for key in shared_names},
+        )
+
+    @staticmethod
+    def name() -> str:
+        """Static method that returns component name."""
+        return "shared_memory_parameter_broadcast"
+
+    @staticmethod
+    def required_components() -> List[Type[Callback]]:
+        """List of other Components required in the system for this Component to function.
+
+        ParameterServer required to set up server.store.parameters and
+        server.store.parameter_versions.
+
+        Returns:
+            List of required component classes.
+        """
+        return [ParameterServer]
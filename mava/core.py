@@ -59,16 +59,35 @@ class Executor(acme.Actor):
     @abc.abstractmethod
     def observe(
         self,
-        actions: Dict[str, types.NestedArray],
+        actions: Union[
+            Dict[str, types.NestedArray],
+            Tuple[Dict[str, types.NestedArray], Dict[str, types.NestedArray]],
+        ],
         next_timestep: dm_env.TimeStep,
         next_extras: Dict[str, types.NestedArray] = {},
     ) -> None:
         """Make an observation of timestep data from parallel environment.
         Args:
-        action: action taken in the environment.
+        action: action taken in the environment, with the policy info returned
+            by `select_actions` if any.
         next_timestep: timestep produced by the environment given the action.
         """
 
+    def observe_trajectory(
+        self,
+        actions: Tuple[Dict[str, types.NestedArray], Dict[str, types.NestedArray]],
+        next_timesteps: dm_env.TimeStep,
+        next_extras: Dict[str, types.NestedArray] = {},
+    ) -> None:
+        """Make an observation of consecutive steps of a parallel environment.
+        Args:
+        actions: actions taken in the environment and their policy info, with
+            a leading time axis.
+        next_timesteps: timesteps produced by the environment, whose fields
+            have a leading time axis.
+        """
+        raise NotImplementedError
+
 
 class VariableSource(abc.ABC):
     """Abstract source of variables.
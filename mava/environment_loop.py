@@ -14,10 +14,22 @@
 # limitations under the License.
 
 """A simple multi-agent-system-environment training loop."""
+import collections
+import contextlib
 import copy
 import logging
 import time
-from typing import Any, Dict, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import acme
 import dm_env
@@ -31,6 +43,9 @@ from mava.utils.checkpointing_utils import update_best_checkpoint, update_evalua
 from mava.utils.training_utils import check_count_condition
 from mava.utils.wrapper_utils import generate_zeros_from_spec
 
+if TYPE_CHECKING:
+    from mava.wrappers.subprocess_env import SubprocessEnvWrapper  # noqa: F401
+
 
 class ParallelEnvironmentLoop(acme.core.Worker):
     """A parallel MARL environment loop.
@@ -92,6 +107,9 @@ class ParallelEnvironmentLoop(acme.core.Worker):
     def _compute_step_statistics(self, rewards: Dict[str, float]) -> None:
         pass
 
+    def _compute_trajectory_statistics(self, rewards: Dict[str, np.ndarray]) -> None:
+        pass
+
     def _compute_episode_statistics(
         self,
         episode_returns: Dict[str, float],
@@ -176,6 +194,24 @@ class ParallelEnvironmentLoop(acme.core.Worker):
             for agent, reward in rewards.items():
                 episode_returns[agent] = episode_returns[agent] + reward
 
+        return self._episode_results(episode_returns, episode_steps, start_time)
+
+    def _episode_results(
+        self,
+        episode_returns: Dict[str, float],
+        episode_steps: int,
+        start_time: float,
+    ) -> loggers.LoggingData:
+        """Compute the statistics of a finished episode.
+
+        Args:
+            episode_returns: undiscounted return of each agent.
+            episode_steps: number of steps taken in the episode.
+            start_time: time at which the episode started.
+
+        Returns:
+            An instance of `loggers.LoggingData`.
+        """
         self._compute_episode_statistics(
             episode_returns,
             episode_steps,
@@ -424,3 +460,441 @@ class ParallelEnvironmentLoop(acme.core.Worker):
                     )
                 self._executor.force_update()
                 break
+
+
+class VectorParallelEnvironmentLoop(ParallelEnvironmentLoop):
+    """A parallel MARL environment loop that steps several environments at once.
+
+    The observations of all environments are stacked along a leading axis so that
+    the executor selects the actions of every environment with a single jitted
+    call, which amortises the per-step Python and XLA dispatch overhead. Each
+    environment keeps its own adder, episode metrics and book-keeping and is
+    reset independently as soon as its episode ends. A call to `run_episode` steps all
+    environments until at least one episode finishes and returns its results, so
+    the loop can be used wherever a `ParallelEnvironmentLoop` is expected. When
+    several episodes finish in the same step, the results of the others are
+    returned by the following calls, without stepping the environments.
+    """
+
+    # Executor store entries that hold per-episode state and therefore
+    # need to be kept separately for every environment.
+    _PER_ENVIRONMENT_STORE_KEYS = (
+        "adder",
+        "extras",
+        "agent_net_keys",
+        "network_int_keys_extras",
+        "episode_metrics",
+    )
+
+    def __init__(
+        self,
+        environments: List[dm_env.Environment],
+        executor: mava.core.Executor,
+        adders: Optional[List[Any]] = None,
+        counter: Optional[counting.Counter] = None,
+        logger: Optional[loggers.Logger] = None,
+        should_update: bool = True,
+        label: str = "parallel_environment_loop",
+    ):
+        """Vector parallel environment loop init
+
+        Args:
+            environments: list of environments to step together.
+            executor: a Mava executor
+            adders: one adder per environment. Defaults to None, in which case
+                the executor adder is used for the first environment only.
+            counter: an optional counter. Defaults to None.
+            logger: an optional counter. Defaults to None.
+            should_update: should update. Defaults to True.
+            label: optional label. Defaults to "parallel_environment_loop".
+        """
+        super().__init__(
+            environment=environments[0],
+            executor=executor,
+            counter=counter,
+            logger=logger,
+            should_update=should_update,
+            label=label,
+        )
+        self._environments = environments
+        self._num_environments = len(environments)
+
+        if adders is None:
+            adders = [executor.store.adder] + [None] * (self._num_environments - 1)
+        if len(adders) != self._num_environments:
+            raise ValueError(
+                f"Expected {self._num_environments} adders, got {len(adders)}."
+            )
+
+        self._environment_stores: List[Dict[str, Any]] = [
+            {
+                "adder": adder,
+                "extras": {},
+                "agent_net_keys": executor.store.agent_net_keys,
+                "network_int_keys_extras": None,
+                "episode_metrics": {},
+            }
+            for adder in adders
+        ]
+
+        # Per environment episode book-keeping.
+        self._timesteps: List[Optional[dm_env.TimeStep]] = [
+            None
+        ] * self._num_environments
+        self._episode_steps = [0] * self._num_environments
+        self._episode_returns: List[Dict[str, Any]] = [
+            {} for _ in range(self._num_environments)
+        ]
+        self._start_times = [0.0] * self._num_environments
+        # Results of finished episodes that have not been returned yet.
+        self._finished_results: Deque[loggers.LoggingData] = collections.deque()
+
+        executor.store.select_actions_fn = self._make_batched_select_actions_fn(
+            executor.store.select_actions_fn
+        )
+
+    def _make_batched_select_actions_fn(self, select_actions_fn: Any) -> Any:
+        """Vectorise an executor action selection function over environments.
+
+        The action selection functions take the observations, the network
+        parameters and a prng key, followed by any extra arguments, and return
+        the prng key as their last output. When the executor normalises the
+        observations, which it marks by keeping observation stats in its store,
+        the last two extra arguments are the normalisation stats and death mask.
+        The stats and the other extra arguments, e.g. the epsilon of a DQN
+        executor, are shared by all environments, while the death mask given by
+        the executor is replaced by the masks of every environment.
+
+        Args:
+            select_actions_fn: action selection function for a single environment.
+
+        Returns:
+            action selection function for stacked observations.
+        """
+        num_environments = self._num_environments
+        normalises_observations = (
+            getattr(self._executor.store, "observation_stats", None) is not None
+        )
+
+        def batched_select_actions(
+            observations: Dict[str, Any],
+            current_params: Dict[str, Any],
+            base_key: jax.random.KeyArray,
+            *extra_args: Any,
+        ) -> Tuple:
+            """Select actions for all environments - this is jitted below."""
+            keys = jax.random.split(base_key, num_environments + 1)
+            in_axes: Tuple = (0, None, 0) + (None,) * len(extra_args)
+            if normalises_observations:
+                in_axes = in_axes[:-1] + (0,)
+            outputs = jax.vmap(select_actions_fn, in_axes=in_axes)(
+                observations, current_params, keys[1:], *extra_args
+            )
+            return (*outputs[:-1], keys[0])
+
+        jitted_select_actions = jax.jit(batched_select_actions)
+
+        def select_actions(
+            observations: Dict[str, Any],
+            current_params: Dict[str, Any],
+            base_key: jax.random.KeyArray,
+            *extra_args: Any,
+        ) -> Tuple:
+            """Select actions with the death masks of all environments."""
+            if normalises_observations:
+                assert len(extra_args) >= 2, "The stats are given with a death mask."
+                extra_args = (
+                    *extra_args[:-1],
+                    self._alive_masks(list(observations.keys())),
+                )
+            return jitted_select_actions(
+                observations, current_params, base_key, *extra_args
+            )
+
+        return select_actions
+
+    def _alive_masks(self, agents: List[str]) -> np.ndarray:
+        """Whether each agent is alive in each environment.
+
+        Args:
+            agents: agents whose observations are normalised.
+
+        Returns:
+            death masks of shape [num_environments, num_agents], with the agents
+            in the order of sort_str_num(agents).
+        """
+        observation_stats = self._executor.store.observation_stats
+        return np.stack(
+            [
+                observation_stats.alive_mask(
+                    agents, getattr(environment, "death_masked_agents", [])
+                )
+                for environment in self._environments
+            ]
+        )
+
+    @contextlib.contextmanager
+    def _environment_context(self, env_id: int) -> Iterator[None]:
+        """Load the executor state of one environment into the executor store.
+
+        Args:
+            env_id: index of the environment.
+
+        Yields:
+            None.
+        """
+        store = self._executor.store
+        environment_store = self._environment_stores[env_id]
+        for key, value in environment_store.items():
+            setattr(store, key, value)
+        try:
+            yield
+        finally:
+            for key in self._PER_ENVIRONMENT_STORE_KEYS:
+                environment_store[key] = getattr(store, key, None)
+
+    def _reset_environment(self, env_id: int) -> None:
+        """Reset a single environment and let the executor observe it.
+
+        Args:
+            env_id: index of the environment.
+
+        Returns:
+            None.
+        """
+        timestep = self._environments[env_id].reset()
+
+        if type(timestep) == tuple:
+            timestep, env_extras = timestep
+        else:
+            env_extras = {}
+
+        # clear metrics at the start of each episode
+        self._environment_stores[env_id]["episode_metrics"] = {}
+        with self._environment_context(env_id):
+            self._executor.observe_first(timestep, extras=env_extras)
+
+        if hasattr(self._executor.store, "policy_states"):
+            raise NotImplementedError(
+                "The vector environment loop only supports feedforward executors."
+            )
+
+        self._timesteps[env_id] = timestep
+        self._episode_steps[env_id] = 0
+        self._episode_returns[env_id] = {
+            agent: generate_zeros_from_spec(spec)
+            for agent, spec in self._environment.reward_spec().items()
+        }
+        self._start_times[env_id] = time.time()
+
+    def _get_batched_actions(self) -> Tuple[Any, Any]:
+        """Select the actions of all environments with a single executor call.
+
+        Returns:
+            actions and policy info with a leading environment axis.
+        """
+        env_observations = []
+        for timestep in self._timesteps:
+            assert timestep is not None, "Environments are reset before stepping."
+            env_observations.append(timestep.observation)
+        observations = jax.tree_util.tree_map(lambda *x: np.stack(x), *env_observations)
+        self._executor.store.episode_metrics = {}
+        actions = self._executor.select_actions(observations)
+
+        # The metrics of the action selection, e.g. the epsilon of a DQN
+        # executor, are shared by all environments.
+        for environment_store in self._environment_stores:
+            environment_store["episode_metrics"].update(
+                self._executor.store.episode_metrics
+            )
+
+        # Move the results to host memory once instead of once per environment.
+        return jax.tree_util.tree_map(np.asarray, actions)
+
+    def _observe_environment_step(
+        self, env_id: int, timestep: Any, env_actions: Any, env_policies: Any
+    ) -> bool:
+        """Let the executor observe the step of one environment.
+
+        Args:
+            env_id: index of the environment.
+            timestep: output of the environment step.
+            env_actions: actions taken in the environment.
+            env_policies: policy info of the actions.
+
+        Returns:
+            whether the episode of the environment finished.
+        """
+        if type(timestep) == tuple:
+            timestep, env_extras = timestep
+        else:
+            env_extras = {}
+
+        with self._environment_context(env_id):
+            self._executor.store.actions_info = env_actions
+            self._executor.store.policies_info = env_policies
+            self._executor.observe(
+                (env_actions, env_policies),
+                next_timestep=timestep,
+                next_extras=env_extras,
+            )
+
+        # Book-keeping.
+        self._timesteps[env_id] = timestep
+        self._episode_steps[env_id] += 1
+        self._compute_step_statistics(timestep.reward)
+
+        episode_returns = self._episode_returns[env_id]
+        for agent, reward in timestep.reward.items():
+            episode_returns[agent] = episode_returns[agent] + reward
+
+        return timestep.last()
+
+    def _finish_episodes(self, finished: List[int]) -> List[loggers.LoggingData]:
+        """Compute the results of finished episodes and reset their environments.
+
+        Args:
+            finished: indices of the environments whose episode finished.
+
+        Returns:
+            An instance of `loggers.LoggingData` for every finished episode.
+        """
+        results = []
+        for env_id in finished:
+            with self._environment_context(env_id):
+                results.append(
+                    self._episode_results(
+                        self._episode_returns[env_id],
+                        self._episode_steps[env_id],
+                        self._start_times[env_id],
+                    )
+                )
+            self._reset_environment(env_id)
+
+        return results
+
+    def run_episode(self) -> loggers.LoggingData:
+        """Step all environments until at least one episode finishes.
+
+        Returns:
+            An instance of `loggers.LoggingData` for a finished episode.
+        """
+        if self._finished_results:
+            return self._finished_results.popleft()
+
+        for env_id, timestep in enumerate(self._timesteps):
+            if timestep is None:
+                self._reset_environment(env_id)
+
+        finished: List[int] = []
+        while not finished:
+            actions_info, policies_info = self._get_batched_actions()
+
+            for env_id, environment in enumerate(self._environments):
+                env_actions = jax.tree_util.tree_map(lambda x: x[env_id], actions_info)
+                env_policies = jax.tree_util.tree_map(
+                    lambda x: x[env_id], policies_info
+                )
+                if self._observe_environment_step(
+                    env_id, environment.step(env_actions), env_actions, env_policies
+                ):
+                    finished.append(env_id)
+
+            # Update once per vector step rather than once per environment.
+            if self._should_update:
+                self._executor.update()
+
+        self._finished_results.extend(self._finish_episodes(finished))
+        return self._finished_results.popleft()
+
+
+class AsyncVectorParallelEnvironmentLoop(VectorParallelEnvironmentLoop):
+    """A vector MARL environment loop for environments in worker processes.
+
+    The environments are stepped with `step_async` and the executor handles
+    whichever environments have finished their step, so the policy keeps running
+    while slow simulators are busy.
+
+    Actions are deliberately selected for all environments in one call, and only
+    the actions of the environments that are ready are used. Selecting actions
+    for the ready subset would compile the action selection function once per
+    number of ready environments, which costs more than the discarded actions
+    of a batched call. The discarded actions also consume prng keys, which does
+    not bias the actions that are used since every call splits new keys.
+    """
+
+    def __init__(
+        self,
+        environments: Sequence["SubprocessEnvWrapper"],
+        executor: mava.core.Executor,
+        adders: Optional[List[Any]] = None,
+        counter: Optional[counting.Counter] = None,
+        logger: Optional[loggers.Logger] = None,
+        should_update: bool = True,
+        label: str = "parallel_environment_loop",
+    ):
+        super().__init__(
+            environments=list(environments),
+            executor=executor,
+            adders=adders,
+            counter=counter,
+            logger=logger,
+            should_update=should_update,
+            label=label,
+        )
+        # Imported here since the wrappers import this module.
+        from mava.wrappers.subprocess_env import wait_for_environments
+
+        self._wait_for_environments = wait_for_environments
+        # Environments waiting for actions and the actions of stepping ones.
+        self._ready = list(range(self._num_environments))
+        self._pending_actions: Dict[int, Tuple[Any, Any]] = {}
+
+    def run_episode(self) -> loggers.LoggingData:
+        """Step the ready environments until at least one episode finishes.
+
+        Returns:
+            An instance of `loggers.LoggingData` for a finished episode.
+        """
+        if self._finished_results:
+            return self._finished_results.popleft()
+
+        for env_id, timestep in enumerate(self._timesteps):
+            if timestep is None:
+                self._reset_environment(env_id)
+
+        finished: List[int] = []
+        while not finished:
+            # The actions of the environments that are not ready are discarded.
+            actions_info, policies_info = self._get_batched_actions()
+
+            for env_id in self._ready:
+                env_actions = jax.tree_util.tree_map(lambda x: x[env_id], actions_info)
+                env_policies = jax.tree_util.tree_map(
+                    lambda x: x[env_id], policies_info
+                )
+                self._pending_actions[env_id] = (env_actions, env_policies)
+                self._environments[env_id].step_async(env_actions)
+
+            self._ready = self._wait_for_environments(self._environments)
+
+            for env_id in self._ready:
+                env_actions, env_policies = self._pending_actions.pop(env_id)
+                if self._observe_environment_step(
+                    env_id,
+                    self._environments[env_id].step_wait(),
+                    env_actions,
+                    env_policies,
+                ):
+                    finished.append(env_id)
+
+            if self._should_update:
+                self._executor.update()
+
+        self._finished_results.extend(self._finish_episodes(finished))
+        return self._finished_results.popleft()
+
+    def close(self) -> None:
+        """Stop the environment worker processes."""
+        for environment in self._environments:
+            environment.close()
@@ -176,7 +176,8 @@ class Builder(SystemBuilder, BuilderHookMixin):
 
         Args:
             trainer_id : id to identify the trainer process for logging purposes.
-            data_server_client : data server client for pulling transition data.
+            data_server_client : data server client for pulling transition data,
+                or list of the clients of all the data server shards.
             parameter_server_client : parameter server client for pushing parameters.
 
         Returns:
@@ -187,7 +188,11 @@ class Builder(SystemBuilder, BuilderHookMixin):
         self.store.base_key = self.store.trainer_keys[int(trainer_id.split("_")[-1])]
 
         self.store.trainer_id = trainer_id
-        self.store.data_server_client = data_server_client
+        if isinstance(data_server_client, (list, tuple)):
+            self.store.data_server_clients = list(data_server_client)
+        else:
+            self.store.data_server_clients = [data_server_client]
+        self.store.data_server_client = self.store.data_server_clients[0]
         self.store.parameter_server_client = parameter_server_client
 
         # start of making the trainer
@@ -75,14 +75,18 @@ class Executor(SystemExecutor, ExecutorHookMixin):
 
     def observe(
         self,
-        actions: Dict[str, NestedArray],
+        actions: Union[
+            Dict[str, NestedArray],
+            Tuple[Dict[str, NestedArray], Dict[str, NestedArray]],
+        ],
         next_timestep: dm_env.TimeStep,
         next_extras: Dict[str, NestedArray] = {},
     ) -> None:
         """Record observed timestep from the environment.
 
         Args:
-            actions : actions taken by agents in previous step.
+            actions : actions taken by agents in previous step, along with their
+                policy info if `select_actions` returned it.
             next_timestep : data emitted by an environment during interaction.
             next_extras : possible extra information to record during the transition.
         """
@@ -96,6 +100,32 @@ class Executor(SystemExecutor, ExecutorHookMixin):
 
         self.on_execution_observe_end()
 
+    def observe_trajectory(
+        self,
+        actions: Tuple[Dict[str, NestedArray], Dict[str, NestedArray]],
+        next_timesteps: dm_env.TimeStep,
+        next_extras: Dict[str, NestedArray] = {},
+    ) -> None:
+        """Record consecutive timesteps from the environment at once.
+
+        Args:
+            actions : actions taken by agents at each step, along with their
+                policy info, with a leading time axis.
+            next_timesteps : timesteps emitted by the environment, whose fields
+                have a leading time axis. Only the last one can end the episode.
+            next_extras : possible extra information to record during the
+                transitions, with a leading time axis.
+        """
+        self.store.actions = actions
+        self.store.next_timesteps = next_timesteps
+        self.store.next_extras = next_extras
+
+        self.on_execution_observe_trajectory_start()
+
+        self.on_execution_observe_trajectory()
+
+        self.on_execution_observe_trajectory_end()
+
     def select_actions(
         self, observations: Dict[str, NestedArray]
     ) -> Union[
@@ -15,6 +15,7 @@
 
 """Execution components for system builders"""
 
+import functools
 from types import SimpleNamespace
 from typing import Dict, Tuple
 
@@ -26,6 +27,8 @@ from acme.jax import utils
 from mava.components.executing.action_selection import ExecutorSelectAction
 from mava.core_jax import SystemExecutor
 from mava.systems.idqn.idqn_network import IDQNNetwork
+from mava.utils.jax_tree_utils import stack_trees
+from mava.utils.sort_utils import group_agents_by_network
 
 
 class DQNFeedforwardExecutorSelectAction(ExecutorSelectAction):
@@ -57,28 +60,25 @@ class DQNFeedforwardExecutorSelectAction(ExecutorSelectAction):
         executor.store.policies_info = None
 
         def select_action(
+            network: IDQNNetwork,
             observation: networks_lib.Observation,
             current_params: networks_lib.Params,
-            network: IDQNNetwork,
-            base_key: jax.random.KeyArray,
+            action_key: jax.random.KeyArray,
             epsilon: float,
-        ) -> Tuple[jnp.ndarray, jax.random.KeyArray]:
+        ) -> jnp.ndarray:
             """Action selection across a single agent.
 
             Args:
+                network: The network object used by the current agent.
                 observation: The observation for the current agent.
                 current_params: The parameters for current agent's network.
-                network: The network object used by the current agent.
-                base_key: A JAX prng key.
+                action_key: A JAX prng key used to sample the action.
                 epsilon: chance agent takes a random action
 
             Returns:
-                action info, policy info and new key.
+                action info.
             """
             observation_data = utils.add_batch_dim(observation.observation)
-
-            # We use the action_key immediately and keep the new key for future splits.
-            base_key, action_key = jax.random.split(base_key)
             action_info = network.get_action(
                 observations=observation_data,
                 params=current_params,
@@ -86,7 +86,7 @@ class DQNFeedforwardExecutorSelectAction(ExecutorSelectAction):
                 base_key=action_key,
                 mask=utils.add_batch_dim(observation.legal_actions),
             )
-            return jax.numpy.squeeze(action_info), base_key
+            return jax.numpy.squeeze(action_info)
 
         def select_actions(
             observations: Dict[str, jnp.ndarray],
@@ -96,29 +96,38 @@ class DQNFeedforwardExecutorSelectAction(ExecutorSelectAction):
         ) -> Tuple[Dict[str, jnp.ndarray], jax.random.KeyArray]:
             """Select actions across all agents - this is jitted below.
 
+            Agents that share a network select their actions with a single
+            vmapped call, so compile time does not grow with the number of agents.
+
             Args:
                 observations : The observations for all the agents.
                 current_params : The parameters for all the agents.
                 base_key : A JAX prng_key.
+                epsilon: chance agents take a random action
 
             Returns:
-                action info, policy info and new prng key.
+                action info and new prng key.
             """
             actions_info = {}
-            # TODO Look at tree mapping this forloop.
-            # Since this is jitted, compiling a forloop with lots of agents could take
-            # long, we should vectorize this.
-            for agent, observation in observations.items():
-                network = networks[agent_net_keys[agent]]
-                current_agent_params = current_params[agent_net_keys[agent]]
-
-                actions_info[agent], base_key = select_action(
-                    observation=observation,
-                    current_params=current_agent_params["policy_network"],
-                    network=network,
-                    base_key=base_key,
-                    epsilon=epsilon,
+            agents_per_network = group_agents_by_network(
+                observations.keys(), agent_net_keys
+            )
+            for net_key, agents in agents_per_network.items():
+                # We use the action keys immediately and keep the new key for
+                # future splits.
+                keys = jax.random.split(base_key, len(agents) + 1)
+                base_key = keys[0]
+                network_actions_info = jax.vmap(
+                    functools.partial(select_action, networks[net_key]),
+                    in_axes=(0, None, 0, None),
+                )(
+                    stack_trees([observations[agent] for agent in agents]),
+                    current_params[net_key]["policy_network"],
+                    keys[1:],
+                    epsilon,
                 )
+                for agent_index, agent in enumerate(agents):
+                    actions_info[agent] = network_actions_info[agent_index]
             return actions_info, base_key
 
         executor.store.select_actions_fn = jax.jit(select_actions)
@@ -18,7 +18,10 @@
 from types import SimpleNamespace
 from typing import Any, Dict
 
-from mava.components.executing.observing import FeedforwardExecutorObserve
+from mava.components.executing.observing import (
+    FeedforwardExecutorObserve,
+    broadcast_to_steps,
+)
 from mava.core_jax import SystemExecutor
 
 
@@ -59,3 +62,34 @@ class DQNFeedforwardExecutorObserve(FeedforwardExecutorObserve):
         executor.store.adder.add(
             adder_actions, executor.store.next_timestep, executor.store.extras
         )
+
+    def on_execution_observe_trajectory(self, executor: SystemExecutor) -> None:
+        """Handle the observations of a trajectory and pass it along to the adder.
+
+        Args:
+            executor: SystemExecutor.
+
+        Returns:
+            None.
+        """
+        if not executor.store.adder:
+            return
+
+        # Actions of each step, with a leading time axis.
+        actions_info = executor.store.actions_info
+
+        adder_actions = {
+            agent: {"actions_info": actions_info[agent]}
+            for agent in actions_info.keys()
+        }
+
+        network_int_keys = executor.store.network_int_keys_extras
+        executor.store.extras["network_int_keys"] = network_int_keys
+
+        # executor.store.next_timesteps set by Executor
+        extras = broadcast_to_steps(
+            executor.store.extras, len(executor.store.next_timesteps.step_type)
+        )
+        executor.store.adder.add_trajectory(
+            adder_actions, executor.store.next_timesteps, extras
+        )
@@ -15,7 +15,7 @@
 
 """Trainer components for calculating losses."""
 from dataclasses import dataclass
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 import jax
 import jax.numpy as jnp
@@ -28,6 +28,29 @@ from mava.core_jax import SystemTrainer
 @dataclass
 class IDQNLossConfig:
     gamma: float = 0.99
+    importance_sampling_exponent: float = 0.2
+    priority_epsilon: float = 1e-6
+
+
+def importance_sampling_weights(
+    probabilities: jnp.ndarray, importance_sampling_exponent: float
+) -> jnp.ndarray:
+    """Importance sampling weights correcting for prioritised sampling.
+
+    The weights are normalised by their maximum, so they are all one when the
+    transitions are sampled uniformly.
+
+    Args:
+        probabilities: probabilities of sampling each transition of the batch.
+        importance_sampling_exponent: exponent annealing the correction, with
+            zero applying no correction.
+
+    Returns:
+        The weight of each transition of the batch.
+    """
+    weights = (1.0 / probabilities).astype(jnp.float32)
+    weights = weights**importance_sampling_exponent
+    return weights / jnp.max(weights)
 
 
 class IDQNLoss(Loss):
@@ -60,8 +83,11 @@ class IDQNLoss(Loss):
             rewards: Dict[str, jnp.ndarray],
             next_observations: Any,
             discounts: Dict[str, jnp.ndarray],
-        ) -> Tuple[Dict[str, jnp.ndarray], Dict[str, Dict[str, jnp.ndarray]]]:
-            """Surrogate loss using clipped probability ratios.
+            probabilities: Optional[jnp.ndarray] = None,
+        ) -> Tuple[
+            Dict[str, jnp.ndarray], Dict[str, Dict[str, jnp.ndarray]], jnp.ndarray
+        ]:
+            """Double Q-learning loss, weighted when sampled by priority.
 
             Args:
                 policy_params: policy network parameters.
@@ -71,13 +97,25 @@ class IDQNLoss(Loss):
                 rewards: rewards given to the agent
                 next_observations: agent observations at timestep t+1
                 discounts: terminal agent mask (dm_env discounts)
+                probabilities: probabilities of sampling the transitions, if
+                    they were sampled by priority. Defaults to None, in which
+                    case the transitions are not reweighted.
 
             Returns:
-                Tuple[policy gradients, policy loss information]
+                Tuple[policy gradients, policy loss information, priorities]. The
+                priority of a transition is its largest absolute TD error over
+                the agents plus `priority_epsilon`, so that transitions without
+                error are still sampled.
             """
+            importance_weights: Any = 1.0
+            if probabilities is not None:
+                importance_weights = importance_sampling_weights(
+                    probabilities, self.config.importance_sampling_exponent
+                )
 
             policy_grads = {}
             loss_info_policy = {}
+            td_errors = []
             for agent_key in trainer.store.trainer_agents:
                 agent_net_key = trainer.store.trainer_agent_net_keys[agent_key]
                 network = trainer.store.networks[agent_net_key]
@@ -91,7 +129,7 @@ class IDQNLoss(Loss):
                     next_observations: Any,
                     discounts: jnp.ndarray,
                     masks: jnp.ndarray,
-                ) -> Tuple[jnp.ndarray, Dict[str, jnp.ndarray]]:
+                ) -> Tuple[jnp.ndarray, Tuple[Dict[str, jnp.ndarray], jnp.ndarray]]:
                     """Inner policy loss function: see outer function for parameters."""
 
                     # Feedforward actor.
@@ -115,15 +153,16 @@ class IDQNLoss(Loss):
                         True,
                     )
 
-                    loss = jax.numpy.mean(rlax.l2_loss(error))
+                    loss = jax.numpy.mean(importance_weights * rlax.l2_loss(error))
 
                     loss_info_policy = {"policy_loss_total": loss}
 
-                    return loss, loss_info_policy
+                    return loss, (loss_info_policy, jnp.abs(error))
 
-                policy_grads[agent_key], loss_info_policy[agent_key] = jax.grad(
-                    policy_loss_fn, has_aux=True
-                )(
+                (
+                    policy_grads[agent_key],
+                    (loss_info_policy[agent_key], td_error),
+                ) = jax.grad(policy_loss_fn, has_aux=True)(
                     policy_params[agent_net_key],
                     target_policy_params[agent_net_key],
                     observations[agent_key].observation,
@@ -133,7 +172,12 @@ class IDQNLoss(Loss):
                     discounts[agent_key],
                     next_observations[agent_key].legal_actions,
                 )
-            return policy_grads, loss_info_policy
+                td_errors.append(td_error)
+
+            priorities = (
+                jnp.max(jnp.stack(td_errors), axis=0) + self.config.priority_epsilon
+            )
+            return policy_grads, loss_info_policy, priorities
 
         # Save the gradient funcitons.
         trainer.store.policy_grad_fn = policy_loss_grad_fn
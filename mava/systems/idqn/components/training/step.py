@@ -14,11 +14,14 @@
 # limitations under the License.
 
 """Trainer components for gradient step calculations."""
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Type
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 import jax
 import jax.numpy as jnp
+import numpy as np
 import optax
 import reverb
 import rlax
@@ -37,6 +40,34 @@ from mava.systems.idqn.components.training.loss import IDQNLoss
 @dataclass
 class IDQNStepConfig:
     target_update_period: int = 100
+    update_priorities: bool = False
+
+
+def shard_priority_updates(
+    keys: np.ndarray, priorities: np.ndarray, shards: Any = 0
+) -> Dict[int, Dict[int, float]]:
+    """Group the new priorities of sampled items by data server shard.
+
+    Args:
+        keys: keys of the sampled items.
+        priorities: new priorities of the items.
+        shards: index of the data server shard of each item, or of all of them.
+
+    Returns:
+        The priority updates of each shard holding some of the items.
+    """
+    keys = np.asarray(keys)
+    priorities = np.asarray(priorities)
+    shards = np.broadcast_to(np.asarray(shards), keys.shape)
+    return {
+        int(shard): dict(
+            zip(
+                keys[shards == shard].tolist(),
+                priorities[shards == shard].tolist(),
+            )
+        )
+        for shard in np.unique(shards)
+    }
 
 
 class IDQNStep(Step):
@@ -44,10 +75,15 @@ class IDQNStep(Step):
         self,
         config: IDQNStepConfig = IDQNStepConfig(),
     ):
-        """Component defines the MAPGWithTrustRegion SGD step.
+        """Component defines the IDQN SGD step.
+
+        With update_priorities, the TD errors of the sampled transitions are
+        sent back to the data server shard they were sampled from as their new
+        priorities, which should be used with a PrioritySampler, and the loss
+        is corrected with importance sampling weights.
 
         Args:
-            config: MAPGWithTrustRegionStepConfig.
+            config: IDQNStepConfig.
         """
         self.config = config
 
@@ -65,7 +101,7 @@ class IDQNStep(Step):
         @jit
         def sgd_step(
             states: DQNTrainingState, sample: reverb.ReplaySample
-        ) -> Tuple[DQNTrainingState, Dict[str, jnp.ndarray]]:
+        ) -> Tuple[DQNTrainingState, Dict[str, jnp.ndarray], jnp.ndarray]:
             """Performs a minibatch SGD step.
 
             Args:
@@ -73,7 +109,7 @@ class IDQNStep(Step):
                 sample: Reverb sample.
 
             Returns:
-                Tuple[new state, metrics].
+                Tuple[new state, metrics, priorities of the sampled transitions].
             """
 
             # Extract the data.
@@ -92,7 +128,11 @@ class IDQNStep(Step):
             policy_params = states.policy_params
             policy_opt_states = states.policy_opt_states
 
-            policy_gradients, grad_metrics = trainer.store.policy_grad_fn(
+            (
+                policy_gradients,
+                grad_metrics,
+                priorities,
+            ) = trainer.store.policy_grad_fn(
                 policy_params,
                 target_policy_params,
                 observations,
@@ -100,6 +140,8 @@ class IDQNStep(Step):
                 rewards,
                 next_observations,
                 discounts,
+                # Only prioritised samples are corrected by importance weights.
+                sample.info.probability if self.config.update_priorities else None,
             )
 
             metrics: Dict[str, jnp.ndarray] = {}
@@ -142,7 +184,38 @@ class IDQNStep(Step):
                 random_key=states.random_key,
                 trainer_iteration=states.trainer_iteration,
             )
-            return new_states, metrics
+            return new_states, metrics, priorities
+
+        # Priorities are updated in a background thread, one update at a time.
+        priority_updater: Optional[ThreadPoolExecutor] = None
+        pending_update: Optional[Future] = None
+        if self.config.update_priorities:
+            priority_updater = ThreadPoolExecutor(max_workers=1)
+            # Finish the last update when the trainer is deleted or at exit.
+            weakref.finalize(trainer, priority_updater.shutdown)
+        trainer.store.priority_updater = priority_updater
+
+        def update_priorities(
+            keys: np.ndarray, priorities: jnp.ndarray, shards: Any
+        ) -> None:
+            """Set the priorities of the sampled items in the trainer table.
+
+            Args:
+                keys: keys of the sampled items.
+                priorities: new priorities of the items.
+                shards: index of the data server shard of the items.
+            """
+            # Set by builder, holds a single client unless the data server is
+            # sharded.
+            data_server_clients = getattr(trainer.store, "data_server_clients", None)
+            if data_server_clients is None:
+                data_server_clients = [trainer.store.data_server_client]
+            for shard, updates in shard_priority_updates(
+                keys, priorities, shards
+            ).items():
+                data_server_clients[shard].mutate_priorities(
+                    table=trainer.store.trainer_id, updates=updates
+                )
 
         def step(sample: reverb.ReplaySample) -> Tuple[Dict[str, jnp.ndarray]]:
             """Step over the reverb sample and update the parameters / optimiser states.
@@ -153,6 +226,7 @@ class IDQNStep(Step):
             Returns:
                 Metrics from SGD step.
             """
+            nonlocal pending_update
 
             # Repeat training for the given number of epoch, taking a random
             # permutation for every epoch.
@@ -178,7 +252,19 @@ class IDQNStep(Step):
                 trainer_iteration=steps,
             )
 
-            new_states, metrics = sgd_step(states, sample)
+            new_states, metrics, priorities = sgd_step(states, sample)
+
+            if priority_updater is not None:
+                # Wait for the previous update, which also raises its errors.
+                if pending_update is not None:
+                    pending_update.result()
+                # Samples of a sharded data server record their shard.
+                pending_update = priority_updater.submit(
+                    update_priorities,
+                    sample.info.key,
+                    priorities,
+                    getattr(sample, "shard", 0),
+                )
 
             # Set the new variables
             # TODO (dries): key is probably not being store correctly.
@@ -20,3 +20,5 @@ from dataclasses import dataclass
 @dataclass
 class IDQNDefaultConfig:
     epoch_batch_size: int = 32
+    n_step: int = 5
+    discount: float = 0.99
@@ -15,6 +15,7 @@
 
 """Parameter client for Jax system. Adapted from Deepmind's Acme library"""
 
+import threading
 from concurrent import futures
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -23,6 +24,7 @@ import numpy as np
 
 from mava.systems.parameter_server import ParameterServer
 from mava.utils.done_future import DoneFuture
+from mava.utils.shared_memory_utils import SharedParameterBuffer
 from mava.utils.sort_utils import sort_str_num
 
 
@@ -38,6 +40,8 @@ class ParameterClient:
         set_keys: Optional[List[str]] = None,
         update_period: int = 1,
         devices: Dict[str, Optional[Union[str, jax.xla.Device]]] = {},
+        versioned: bool = False,
+        shared_parameters_name: Optional[str] = None,
     ):
         """Initialise the parameter client.
 
@@ -50,6 +54,14 @@ class ParameterClient:
             set_keys: names of parameters to set in the server.
             update_period: number of calls between syncs with the server.
             devices: dictionary {parameter name: device} defining devices for params.
+            versioned: whether to only request the parameters that changed on the
+                server since this client last received them. Only the parameters
+                changed through the server's set and add calls get a new
+                version, so parameters assigned directly in the server store
+                after the clients started are not sent to versioned clients.
+            shared_parameters_name: name of the shared memory buffer the server
+                publishes parameters to. Parameters found in it are read from
+                shared memory instead of being requested from the server.
         """
         self._all_keys = sort_str_num(list(parameters.keys()))
         # TODO (dries): Is the below change correct?
@@ -63,6 +75,19 @@ class ParameterClient:
         self._update_period = update_period
         self._server = server
         self._devices = devices
+        self._versioned = versioned
+        # Server version of each parameter held by this client. The versions
+        # are updated by the done callbacks of asynchronous requests, which run
+        # on another thread.
+        self._versions: Dict[str, int] = {}
+        self._versions_lock = threading.Lock()
+
+        # Parameters published in shared memory are not requested from the server
+        # once the client is attached to the shared memory buffer.
+        self._shared_parameters_name = shared_parameters_name
+        self._shared_parameters: Optional[SharedParameterBuffer] = None
+        self._request_keys = self._get_keys
+        self._request_all_keys = self._all_keys
 
         # note below it is assumed that if one device is specified with a string
         # they all are - need to test this works
@@ -71,8 +96,16 @@ class ParameterClient:
             for key, device in self._devices.items():
                 self._devices[key] = jax.devices(device)[0]  # type: ignore
 
-        self._request = lambda: server.get_parameters(self._get_keys)
-        self._request_all = lambda: server.get_parameters(self._all_keys)
+        if versioned:
+            self._request = lambda: server.get_updated_parameters(
+                self._request_keys, self._get_versions()
+            )
+            self._request_all = lambda: server.get_updated_parameters(
+                self._request_all_keys, self._get_versions()
+            )
+        else:
+            self._request = lambda: server.get_parameters(self._request_keys)
+            self._request_all = lambda: server.get_parameters(self._request_all_keys)
 
         self._adjust = lambda: server.set_parameters(
             {key: self._parameters[key] for key in self._set_keys},
@@ -85,7 +118,12 @@ class ParameterClient:
         # parameter server only has `futures` attribute if it is a launchpad node
         # and it is only a launchpad node if we are running in multiprocess
         if multi_process:
-            self._async_request = lambda: server.futures.get_parameters(self._get_keys)  # type: ignore # noqa
+            if versioned:
+                self._async_request = lambda: server.futures.get_updated_parameters(  # type: ignore # noqa
+                    self._request_keys, self._get_versions()
+                )
+            else:
+                self._async_request = lambda: server.futures.get_parameters(self._request_keys)  # type: ignore # noqa
             self._async_adjust = lambda: server.futures.set_parameters(  # type: ignore
                 {key: self._parameters[key] for key in self._set_keys},
             )
@@ -115,7 +153,8 @@ class ParameterClient:
         self._server.set_parameters(
             {key: self._parameters[key] for key in self._set_keys},
         )
-        self._copy(self._server.get_parameters(self._get_keys))
+        self._read_shared_parameters(self._get_keys)
+        self._copy_response(self._request())
 
     def _async_adjust_and_request(
         self,
@@ -136,9 +175,17 @@ class ParameterClient:
             {key: self._parameters[key] for key in self._set_keys},
         )
         # Get all parameters in _get_keys that we didn't set above with _set_keys
-        get_keys = set(self._get_keys) - set(self._set_keys)
-        get_future = self._server.futures.get_parameters(get_keys)  # type: ignore
-        get_future.add_done_callback(lambda ctx: self._copy(ctx.result()))
+        self._read_shared_parameters(
+            [key for key in self._get_keys if key not in self._set_keys]
+        )
+        get_keys = set(self._request_keys) - set(self._set_keys)
+        if self._versioned:
+            get_future = self._server.futures.get_updated_parameters(  # type: ignore
+                get_keys, self._get_versions()
+            )
+        else:
+            get_future = self._server.futures.get_parameters(get_keys)  # type: ignore
+        get_future.add_done_callback(lambda ctx: self._copy_response(ctx.result()))
 
         return set_future, get_future
 
@@ -156,12 +203,13 @@ class ParameterClient:
         if period_reached and self._get_future is None:
             # The update period has been reached and no request has been sent yet, so
             # making an asynchronous request now.
+            self._read_shared_parameters(self._get_keys)
             self._get_future = self._async_request()
             self._get_call_counter = 0
 
         if self._get_future is not None and self._get_future.done():
             # The active request is done so copy the result and remove the future.\
-            self._copy(self._get_future.result())
+            self._copy_response(self._get_future.result())
             self._get_future = None
 
     def set_async(self, params: Optional[Dict[str, Any]] = None) -> None:
@@ -267,7 +315,8 @@ class ParameterClient:
         Returns:
             None.
         """
-        self._copy(self._request())
+        self._read_shared_parameters(self._get_keys)
+        self._copy_response(self._request())
 
     def get_all_and_wait(self) -> None:
         """Update all parameters from server. Wait for completion.
@@ -278,7 +327,8 @@ class ParameterClient:
         Returns:
             None.
         """
-        self._copy(self._request_all())
+        self._read_shared_parameters(self._all_keys)
+        self._copy_response(self._request_all())
 
     def set_and_wait(self, params: Optional[Dict[str, Any]] = None) -> None:
         """Update server with set parameters. Wait for completion.
@@ -294,6 +344,79 @@ class ParameterClient:
         else:
             self._adjust_param(params)
 
+    def _read_shared_parameters(self, names: List[str]) -> None:
+        """Copy the parameters that changed in shared memory, if it is used.
+
+        Args:
+            names: names of the parameters to read.
+
+        Returns:
+            None.
+        """
+        if self._shared_parameters_name is None:
+            return
+
+        if self._shared_parameters is None:
+            try:
+                self._shared_parameters = SharedParameterBuffer(
+                    self._shared_parameters_name
+                )
+            except FileNotFoundError:
+                # The server has not published its parameters yet, so they are
+                # still requested from it.
+                return
+            shared_keys = set(self._shared_parameters.keys)
+            self._request_keys = [
+                key for key in self._get_keys if key not in shared_keys
+            ]
+            self._request_all_keys = [
+                key for key in self._all_keys if key not in shared_keys
+            ]
+
+        new_parameters, versions = self._shared_parameters.read(
+            names, self._get_versions()
+        )
+        self._copy(new_parameters)
+        self._update_versions(versions)
+
+    def _copy_response(self, response: Any) -> None:
+        """Copy the parameters returned by a server request.
+
+        Args:
+            response: the requested parameters, along with their versions if the
+                client is versioned.
+
+        Returns:
+            None.
+        """
+        if self._versioned:
+            new_parameters, versions = response
+            self._copy(new_parameters)
+            self._update_versions(versions)
+        else:
+            self._copy(response)
+
+    def _get_versions(self) -> Dict[str, int]:
+        """Copy the server versions of the parameters held by this client.
+
+        Returns:
+            dictionary {parameter name: version}.
+        """
+        with self._versions_lock:
+            return dict(self._versions)
+
+    def _update_versions(self, versions: Dict[str, int]) -> None:
+        """Record the server versions of newly received parameters.
+
+        Args:
+            versions: dictionary {parameter name: version}.
+
+        Returns:
+            None.
+        """
+        with self._versions_lock:
+            self._versions.update(versions)
+
     # TODO(Dries/Arnu): this needs a bit of a cleanup
     def _copy(self, new_parameters: Dict[str, Any]) -> None:
         """Copy the given new parameters to the existing ones.
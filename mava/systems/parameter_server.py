@@ -17,7 +17,7 @@
 
 
 from types import SimpleNamespace
-from typing import Any, Dict, List, Sequence, Union
+from typing import Any, Dict, List, Sequence, Tuple, Union
 
 from mava.callbacks import Callback, ParameterServerHookMixin
 from mava.core_jax import SystemParameterServer
@@ -59,6 +59,7 @@ class ParameterServer(SystemParameterServer, ParameterServerHookMixin):
             The parameters that were requested.
         """
         self.store._param_names = names
+        self.store._param_versions = None
 
         self.on_parameter_server_get_parameters_start()
 
@@ -68,6 +69,33 @@ class ParameterServer(SystemParameterServer, ParameterServerHookMixin):
 
         return self.store.get_parameters
 
+    def get_updated_parameters(
+        self, names: Sequence[str], versions: Dict[str, int]
+    ) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """Get the parameters that changed since the given versions.
+
+        Args:
+            names: names of the parameters to get.
+            versions: dictionary {parameter name: version held by the caller}.
+                Parameters missing from it are always returned.
+
+        Returns:
+            The requested parameters with a different version than the
+            caller's, and their current versions.
+        """
+        self.store._param_names = names
+        self.store._param_versions = versions
+        # Without versions the caller requests the parameters again next time.
+        self.store.get_parameter_versions = {}
+
+        self.on_parameter_server_get_parameters_start()
+
+        self.on_parameter_server_get_parameters()
+
+        self.on_parameter_server_get_parameters_end()
+
+        return self.store.get_parameters, self.store.get_parameter_versions
+
     def set_parameters(self, set_params: Dict[str, Any]) -> None:
         """Set parameters in the parameter server.
 
@@ -0,0 +1,124 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utilities for feeding trainer datasets to jax."""
+
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import jax
+
+
+class _ProducerError:
+    """Wraps an exception raised while producing samples."""
+
+    def __init__(self, error: Exception):
+        """Store the exception to raise in the consumer thread."""
+        self.error = error
+
+
+_END_OF_ITERATOR = object()
+
+
+class DevicePrefetchIterator:
+    """Iterator keeping the next samples of a dataset on device.
+
+    A background thread pulls samples from the wrapped iterator and puts them
+    on device, so the next samples are transferred while the current training
+    step runs. The info of replay samples, e.g. the 64 bit sample keys, and
+    the data server shard they came from are kept on the host.
+    """
+
+    def __init__(
+        self,
+        iterator: Iterator[Any],
+        buffer_size: int,
+        device: Optional[jax.Device] = None,
+    ):
+        """Start prefetching samples.
+
+        Args:
+            iterator: iterator of samples.
+            buffer_size: number of samples to keep on device ahead of time.
+            device: device to put the samples on. Defaults to None, in which
+                case the default device is used.
+        """
+        if buffer_size < 1:
+            raise ValueError("The buffer size of the iterator must be positive.")
+        self._iterator = iterator
+        self._device = device
+        self._queue: queue.Queue = queue.Queue(maxsize=buffer_size)
+        self._queue_depth = 0
+        self._stall_time = 0.0
+        self._thread = threading.Thread(target=self._prefetch, daemon=True)
+        self._thread.start()
+
+    def _device_put(self, sample: Any) -> Any:
+        """Put a sample on device.
+
+        Only the data of replay samples, i.e. named tuples with `info` and
+        `data` fields such as `reverb.ReplaySample` and the samples of sharded
+        data servers, is put on device, and their other fields stay on the host.
+        """
+        fields = getattr(sample, "_fields", ())
+        if "info" in fields and "data" in fields:
+            return sample._replace(data=jax.device_put(sample.data, self._device))
+        return jax.device_put(sample, self._device)
+
+    def _prefetch(self) -> None:
+        """Keep the buffer full of samples on device."""
+        try:
+            for sample in self._iterator:
+                self._queue.put(self._device_put(sample))
+        except Exception as error:
+            self._queue.put(_ProducerError(error))
+        else:
+            self._queue.put(_END_OF_ITERATOR)
+
+    def __iter__(self) -> "DevicePrefetchIterator":
+        """Return the iterator itself."""
+        return self
+
+    def __next__(self) -> Any:
+        """Get the next sample, waiting for it if it is not on device yet."""
+        self._queue_depth = self._queue.qsize()
+        start_time = time.time()
+        sample = self._queue.get()
+        self._stall_time = time.time() - start_time
+
+        if sample is _END_OF_ITERATOR:
+            # Let later calls stop too.
+            self._queue.put(_END_OF_ITERATOR)
+            raise StopIteration
+        if isinstance(sample, _ProducerError):
+            # Let later calls raise the error too.
+            self._queue.put(sample)
+            raise sample.error
+        return sample
+
+    @property
+    def metrics(self) -> Dict[str, float]:
+        """Prefetching metrics of the last call to next.
+
+        Returns:
+            the number of samples that were ready on device, and how long the
+            call waited for a sample.
+        """
+        return {
+            "prefetch_queue_depth": self._queue_depth,
+            "prefetch_stall_seconds": self._stall_time,
+        }
@@ -10,9 +10,49 @@ import numpy as np
 class EntityState(object):
     def __init__(self) -> None:
         # physical position
-        self.p_pos: Optional[np.ndarray] = None
+        self._p_pos: Optional[np.ndarray] = None
         # physical velocity
-        self.p_vel: Optional[np.ndarray] = None
+        self._p_vel: Optional[np.ndarray] = None
+        # world arrays holding the state once the entity is added to a world
+        self._world_state: Optional["WorldState"] = None
+        self._index = 0
+
+    @property
+    def p_pos(self) -> Optional[np.ndarray]:
+        if self._world_state is not None:
+            return self._world_state.p_pos[self._index]
+        return self._p_pos
+
+    @p_pos.setter
+    def p_pos(self, value: Optional[np.ndarray]) -> None:
+        if self._world_state is not None:
+            self._world_state.p_pos[self._index] = value
+        else:
+            self._p_pos = value
+
+    @property
+    def p_vel(self) -> Optional[np.ndarray]:
+        if self._world_state is not None:
+            return self._world_state.p_vel[self._index]
+        return self._p_vel
+
+    @p_vel.setter
+    def p_vel(self, value: Optional[np.ndarray]) -> None:
+        if self._world_state is not None:
+            self._world_state.p_vel[self._index] = value
+        else:
+            self._p_vel = value
+
+    def bind(self, world_state: "WorldState", index: int) -> None:
+        # store the state in row [index] of the world arrays
+        p_pos, p_vel = self.p_pos, self.p_vel
+        if p_pos is not None:
+            world_state.p_pos[index] = p_pos
+        if p_vel is not None:
+            world_state.p_vel[index] = p_vel
+        self._p_pos = self._p_vel = None
+        self._world_state = world_state
+        self._index = index
 
 
 # state of agents (including communication and internal/mental state)
@@ -44,7 +84,7 @@ class Entity(object):
         # color
         self.color = None
         # max speed and accel
-        self.max_speed = None
+        self.max_speed: Optional[float] = None
         self.accel = None
         # state
         self.state = EntityState()
@@ -80,6 +120,39 @@ class Agent(Entity):
         self.action = Action()
 
 
+# physical state and properties of all entities in a world, stored as arrays
+# with one row per entity so that the physics can be vectorized
+class WorldState(object):
+    def __init__(self, entities: List[Entity], dim_p: int) -> None:
+        self.entities = list(entities)
+        num_entities = len(self.entities)
+        self.p_pos = np.zeros((num_entities, dim_p))
+        self.p_vel = np.zeros((num_entities, dim_p))
+        # properties are read when the entities are added to the world
+        self.size = np.array([entity.size for entity in self.entities], dtype=float)
+        self.mass = np.array([entity.mass for entity in self.entities], dtype=float)
+        self.movable = np.array(
+            [entity.movable for entity in self.entities], dtype=bool
+        )
+        self.collide = np.array(
+            [entity.collide for entity in self.entities], dtype=bool
+        )
+        self.max_speed = np.array(
+            [
+                np.inf if entity.max_speed is None else entity.max_speed
+                for entity in self.entities
+            ],
+            dtype=float,
+        )
+        for i, entity in enumerate(self.entities):
+            entity.state.bind(self, i)
+
+    def matches(self, entities: List[Entity]) -> bool:
+        return len(entities) == len(self.entities) and all(
+            entity is other for entity, other in zip(entities, self.entities)
+        )
+
+
 # multi-agent world
 class World(object):
     def __init__(self) -> None:
@@ -98,6 +171,8 @@ class World(object):
         # contact response parameters
         self.contact_force = 1e2
         self.contact_margin = 1e-3
+        # structure-of-arrays state of the entities
+        self._state: Optional[WorldState] = None
 
     # return all entities in the world
     @property
@@ -107,6 +182,16 @@ class World(object):
         entity_list.extend(self.landmarks)
         return entity_list
 
+    # return the arrays holding the state of all entities
+    @property
+    def state(self) -> WorldState:
+        # the entities can change at execution-time, e.g. when a scenario
+        # creates new agents, in which case their state is moved to new arrays
+        entities = self.entities
+        if self._state is None or not self._state.matches(entities):
+            self._state = WorldState(entities, self.dim_p)
+        return self._state
+
     # return all agents controllable by external policies
     @property
     def policy_agents(self) -> List[Agent]:
@@ -130,9 +215,9 @@ class World(object):
 
     # gather agent action forces
     @typing.no_type_check
-    def apply_action_force(self) -> List[float]:
-        # set applied forces
-        p_force = []
+    def apply_action_force(self) -> np.ndarray:
+        # set applied forces, with one row per entity
+        p_force = np.zeros_like(self.state.p_pos)
         for i, agent in enumerate(self.agents):
             if agent.movable:
                 noise = (
@@ -140,50 +225,55 @@ class World(object):
                     if agent.u_noise
                     else 0.0
                 )
-                p_force.append(agent.action.u + noise)
+                p_force[i] = agent.action.u + noise
         return p_force
 
     # gather physical forces acting on entities
-    def apply_environment_force(self, p_force: List[float]) -> List[float]:
-        # simple (but inefficient) collision response
-        for a, entity_a in enumerate(self.entities):
-            for b, entity_b in enumerate(self.entities):
-                if b <= a:
-                    continue
-                [f_a, f_b] = self.get_collision_force(entity_a, entity_b)
-                if f_a is not None:
-                    if p_force[a] is None:
-                        p_force[a] = 0.0
-                    p_force[a] = f_a + p_force[a]
-                if f_b is not None:
-                    if p_force[b] is None:
-                        p_force[b] = 0.0
-                    p_force[b] = f_b + p_force[b]
-        return p_force
+    def apply_environment_force(self, p_force: np.ndarray) -> np.ndarray:
+        return p_force + self.get_collision_forces()
 
     # integrate physical state
-    @typing.no_type_check
-    def integrate_state(self, p_force: List[float]) -> None:
-        for i, entity in enumerate(self.entities):
-            if not entity.movable:
-                continue
-            entity.state.p_vel = entity.state.p_vel * (1 - self.damping)
-            if p_force[i] is not None:
-                entity.state.p_vel += (p_force[i] / entity.mass) * self.dt
-            if entity.max_speed is not None:
-                speed = np.sqrt(
-                    np.square(entity.state.p_vel[0]) + np.square(entity.state.p_vel[1])
-                )
-                if speed > entity.max_speed:
-                    entity.state.p_vel = (
-                        entity.state.p_vel
-                        / np.sqrt(
-                            np.square(entity.state.p_vel[0])
-                            + np.square(entity.state.p_vel[1])
-                        )
-                        * entity.max_speed
-                    )
-            entity.state.p_pos += entity.state.p_vel * self.dt
+    def integrate_state(self, p_force: np.ndarray) -> None:
+        state = self.state
+        movable = state.movable[:, np.newaxis]
+        p_vel = state.p_vel * (1 - self.damping)
+        p_vel += (p_force / state.mass[:, np.newaxis]) * self.dt
+        # clamp the speed of entities going faster than their max speed
+        speed = np.sqrt(np.sum(np.square(p_vel), axis=-1, keepdims=True))
+        max_speed = state.max_speed[:, np.newaxis]
+        too_fast = speed > max_speed
+        np.divide(p_vel, speed, out=p_vel, where=too_fast)
+        np.multiply(p_vel, max_speed, out=p_vel, where=too_fast)
+        # only movable entities are integrated
+        state.p_vel[:] = np.where(movable, p_vel, state.p_vel)
+        state.p_pos += np.where(movable, state.p_vel * self.dt, 0.0)
+
+    # get the collision forces acting on every entity, from all its contacts
+    def get_collision_forces(self) -> np.ndarray:
+        state = self.state
+        forces = np.zeros_like(state.p_pos)
+        # only colliders collide
+        colliders = np.flatnonzero(state.collide)
+        if len(colliders) < 2:
+            return forces
+        p_pos = state.p_pos[colliders]
+        # compute actual distance between all pairs of colliders
+        delta_pos = p_pos[:, np.newaxis] - p_pos[np.newaxis]
+        dist = np.sqrt(np.sum(np.square(delta_pos), axis=-1))
+        # minimum allowable distance
+        size = state.size[colliders]
+        dist_min = size[:, np.newaxis] + size[np.newaxis]
+        # softmax penetration
+        k = self.contact_margin
+        penetration = np.logaddexp(0, -(dist - dist_min) / k) * k
+        # the force between a and b is scale[a, b] * (p_pos[a] - p_pos[b])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = self.contact_force * penetration / dist
+        # don't collide against itself
+        np.fill_diagonal(scale, 0.0)
+        forces[colliders] = scale.sum(axis=1, keepdims=True) * p_pos - scale @ p_pos
+        # forces only act on movable entities
+        return np.where(state.movable[:, np.newaxis], forces, 0.0)
 
     # get collision forces for any contact between two entities
     @typing.no_type_check
@@ -0,0 +1,235 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pure jax implementation of the simple_spread debugging environment.
+
+Reset and step are pure functions of an explicit environment state, so they
+can be jitted, vmapped over many environments and fused with the policy into
+a single compiled rollout. The dynamics, observations and rewards follow the
+simple_spread scenario of the debugging MultiAgentEnv.
+"""
+
+from typing import NamedTuple, Tuple
+
+import chex
+import jax
+import jax.numpy as jnp
+
+
+class SimpleSpreadState(NamedTuple):
+    """State of a simple_spread environment."""
+
+    agent_pos: chex.Array
+    agent_vel: chex.Array
+    landmark_pos: chex.Array
+    step: chex.Array
+
+
+class JaxSimpleSpread:
+    """Simple spread scenario with functional reset and step."""
+
+    # World properties, as set by the debugging World and simple_spread.
+    dim_p = 2
+    dt = 0.1
+    damping = 0.25
+    contact_force = 1e2
+    contact_margin = 1e-3
+    agent_size = 0.15
+    sensitivity = 5.0
+    max_steps = 50
+
+    def __init__(
+        self,
+        num_agents: int = 3,
+        action_space: str = "discrete",
+        recurrent_test: bool = False,
+    ):
+        """Create the environment.
+
+        Args:
+            num_agents: number of agents, and of landmarks.
+            action_space: "discrete" for the five discrete moves, or
+                "continuous" for a 2D force in [-1, 1].
+            recurrent_test: whether the landmark positions are only observed
+                at the start of the episode, to test agent memory.
+        """
+        assert action_space in ["continuous", "discrete"]
+        self.num_agents = num_agents
+        self.action_space = action_space
+        self.recurrent_test = recurrent_test
+        self.num_actions = self.dim_p * 2 + 1
+
+    @property
+    def observation_size(self) -> int:
+        """Size of the observation of an agent."""
+        return 4 * self.num_agents + 3
+
+    @property
+    def state_size(self) -> int:
+        """Size of the global state vector."""
+        return 3 * self.num_agents * self.dim_p + 1
+
+    def reset(self, key: chex.PRNGKey) -> Tuple[SimpleSpreadState, chex.Array]:
+        """Start a new episode.
+
+        Args:
+            key: random key used to place the agents and landmarks.
+
+        Returns:
+            The initial state, and the observations of shape
+            [num_agents, observation_size].
+        """
+        agent_key, landmark_key = jax.random.split(key)
+        shape = (self.num_agents, self.dim_p)
+        state = SimpleSpreadState(
+            agent_pos=jax.random.uniform(agent_key, shape, minval=-1.0, maxval=1.0),
+            agent_vel=jnp.zeros(shape),
+            landmark_pos=jax.random.uniform(
+                landmark_key, shape, minval=-1.0, maxval=1.0
+            ),
+            step=jnp.zeros((), dtype=jnp.int32),
+        )
+        return state, self.observations(state)
+
+    def step(
+        self, state: SimpleSpreadState, actions: chex.Array
+    ) -> Tuple[SimpleSpreadState, chex.Array, chex.Array, chex.Array]:
+        """Advance the world by one step.
+
+        Args:
+            state: current state.
+            actions: actions of shape [num_agents] for discrete actions, or
+                [num_agents, 2] for continuous actions.
+
+        Returns:
+            The next state, the observations of shape
+            [num_agents, observation_size], the rewards of shape [num_agents]
+            and whether the episode is done.
+        """
+        p_force = self._action_force(actions) + self._collision_force(state.agent_pos)
+
+        # Integrate the physical state of the agents, landmarks do not move.
+        agent_vel = state.agent_vel * (1 - self.damping) + p_force * self.dt
+        agent_pos = state.agent_pos + agent_vel * self.dt
+
+        state = state._replace(
+            agent_pos=agent_pos, agent_vel=agent_vel, step=state.step + 1
+        )
+        done = state.step >= self.max_steps
+        return state, self.observations(state), self.rewards(state), done
+
+    def _action_force(self, actions: chex.Array) -> chex.Array:
+        """Force applied by the agents' actions."""
+        if self.action_space == "discrete":
+            # No-op, left, right, down and up.
+            moves = jnp.array(
+                [[0.0, 0.0], [-1.0, 0.0], [1.0, 0.0], [0.0, -1.0], [0.0, 1.0]]
+            )
+            u = moves[actions]
+        else:
+            u = jnp.asarray(actions, dtype=jnp.float32)
+        return u * self.sensitivity
+
+    def _collision_force(self, agent_pos: chex.Array) -> chex.Array:
+        """Sum of the soft contact forces between agents."""
+        delta_pos = agent_pos[:, None] - agent_pos[None]
+        is_self = jnp.eye(self.num_agents, dtype=bool)
+        dist = jnp.sqrt(jnp.sum(jnp.square(delta_pos), axis=-1))
+        # Avoid dividing by zero for the distance of an agent to itself.
+        dist = jnp.where(is_self, 1.0, dist)
+        k = self.contact_margin
+        penetration = jnp.logaddexp(0, -(dist - 2 * self.agent_size) / k) * k
+        force = (
+            self.contact_force * delta_pos / dist[..., None] * penetration[..., None]
+        )
+        return jnp.sum(jnp.where(is_self[..., None], 0.0, force), axis=1)
+
+    def observations(self, state: SimpleSpreadState) -> chex.Array:
+        """Observations of all agents.
+
+        Args:
+            state: current state.
+
+        Returns:
+            Observations of shape [num_agents, observation_size].
+        """
+        num_agents = self.num_agents
+        # Index of the other agents, in order, for each agent.
+        others = jnp.array(
+            [[j for j in range(num_agents) if j != i] for i in range(num_agents)],
+            dtype=jnp.int32,
+        ).reshape(num_agents, num_agents - 1)
+
+        target_landmark = state.landmark_pos - state.agent_pos
+        other_agents_pos = state.agent_pos[others] - state.agent_pos[:, None]
+        other_landmarks_pos = state.landmark_pos[others] - state.agent_pos[:, None]
+        if self.recurrent_test:
+            # Only provide the landmarks initially when testing agent memory.
+            target_landmark = jnp.where(state.step < 5, target_landmark, 0.0)
+            other_landmarks_pos = jnp.where(state.step == 0, other_landmarks_pos, 0.0)
+
+        return jnp.concatenate(
+            [
+                state.agent_vel,
+                state.agent_pos,
+                jnp.full((num_agents, 1), state.step / self.max_steps),
+                target_landmark,
+                other_agents_pos.reshape(num_agents, -1),
+                other_landmarks_pos.reshape(num_agents, -1),
+            ],
+            axis=-1,
+        ).astype(jnp.float32)
+
+    def rewards(self, state: SimpleSpreadState) -> chex.Array:
+        """Rewards of all agents.
+
+        Agents are rewarded based on their distance to their landmark, and
+        penalised for colliding with other agents.
+
+        Args:
+            state: current state.
+
+        Returns:
+            Rewards of shape [num_agents].
+        """
+        distance = jnp.sqrt(
+            jnp.sum(jnp.square(state.agent_pos - state.landmark_pos), axis=-1)
+        )
+        delta_pos = state.agent_pos[:, None] - state.agent_pos[None]
+        dist = jnp.sqrt(jnp.sum(jnp.square(delta_pos), axis=-1))
+        collisions = (dist < 2 * self.agent_size) & ~jnp.eye(
+            self.num_agents, dtype=bool
+        )
+        return (1 - jnp.minimum(distance, 1.0) - jnp.sum(collisions, axis=-1)).astype(
+            jnp.float32
+        )
+
+    def global_state(self, state: SimpleSpreadState) -> chex.Array:
+        """Global state vector, as returned by the debugging environment.
+
+        Args:
+            state: current state.
+
+        Returns:
+            The step, landmark positions, agent positions and agent velocities.
+        """
+        return jnp.concatenate(
+            [
+                jnp.reshape(state.step / self.max_steps, (1,)),
+                state.landmark_pos.reshape(-1),
+                state.agent_pos.reshape(-1),
+                state.agent_vel.reshape(-1),
+            ]
+        ).astype(jnp.float32)
@@ -17,6 +17,7 @@ from typing import Any, Dict, Optional, Tuple
 
 import dm_env
 
+from mava.utils.debugging.jax_simple_spread import JaxSimpleSpread
 from mava.utils.debugging.make_env import make_debugging_env
 from mava.utils.jax_training_utils import set_jax_double_precision
 from mava.wrappers.debugging_envs import DebuggingEnvWrapper
@@ -24,6 +25,7 @@ from mava.wrappers.env_preprocess_wrappers import (
     ConcatAgentIdToObservation,
     StackObservations,
 )
+from mava.wrappers.jax_debugging_envs import JaxDebuggingEnvWrapper
 
 
 def make_environment(
@@ -57,6 +59,13 @@ def make_environment(
         environment = DebuggingEnvWrapper(
             env_module, return_state_info=return_state_info
         )
+    elif env_name == "jax_simple_spread":
+        """Creates a jax MPE environment."""
+        environment = JaxDebuggingEnvWrapper(
+            JaxSimpleSpread(num_agents, action_space, recurrent_test),
+            return_state_info=return_state_info,
+            random_seed=random_seed,
+        )
     else:
         raise ValueError(f"Environment {env_name} not found.")
 
@@ -13,6 +13,7 @@ from jax.config import config as jax_config
 from mava import constants
 from mava.core_jax import SystemExecutor
 from mava.types import OLT
+from mava.utils.sort_utils import group_agents_by_network, sort_str_num
 
 
 def action_mask_categorical_policies(
@@ -252,28 +253,133 @@ def normalize_observations(
     return observation._replace(observation=norm_obs)
 
 
-def executor_normalize_observation(executor: SystemExecutor, observations: Any) -> Any:
-    """Execute the observations normalization before action selection
+def normalize_stacked_observations(
+    stats: Dict[str, jnp.ndarray], observations: OLT, alive: jnp.ndarray
+) -> OLT:
+    """Normalise the stacked observations of the agents of a network.
 
     Args:
-        executor (SystemExecutor) -- an environment executor
-        observation (OLT namespace) -- current batch of observations
+        stats (Dictionary) -- stacked running mean and std of the agents.
+        observations (OLT namespace) -- stacked observations of the agents.
+        alive (array) -- whether each agent is alive. The observations of
+            death masked agents are not normalised.
 
     Returns:
-        observations (OLT namespace)
+        normalized observations (OLT namespace)
     """
 
-    observations_stats = executor.store.norm_params[constants.OBS_NORM_STATE_DICT_KEY]
-    agents = list(observations.keys())
-    death_masked_agents = executor.store.executor_environment.death_masked_agents
-    agents_alive = list(set(agents) - set(death_masked_agents))
+    # Cast to keep the dtype of the observations, as in normalize_observations.
+    obs = observations.observation
+    stats_cast = {
+        "mean": stats["mean"].astype(obs.dtype),
+        "std": stats["std"].astype(obs.dtype),
+    }
+    norm_obs = normalize(stats_cast, obs)
+
+    alive = jnp.reshape(alive, alive.shape + (1,) * (obs.ndim - 1))
+    return observations._replace(observation=jnp.where(alive, norm_obs, obs))
+
+
+class ExecutorObservationStats:
+    """Observation normalisation stats of an executor, kept on device.
+
+    The stats of the agents of each network are stacked in the order of
+    group_agents_by_network, as select_actions_fn stacks their observations.
+    They are only stacked and put on device again when the parameter client
+    replaces them, so normalising adds no transfer to the action selection.
+    """
+
+    def __init__(self, agent_net_keys: Dict[str, str]) -> None:
+        """Initialise the stats
+
+        Args:
+            agent_net_keys (Dictionary) -- network key of each agent.
+        """
+        self._agent_net_keys = agent_net_keys
+        self._agents: List[str] = []
+        self._leaves: List[Any] = []
+        self._stacked_stats: Dict[str, Dict[str, jnp.ndarray]] = {}
+        self._all_alive = np.ones(0, dtype=bool)
+
+    def stacked_stats(
+        self, observation_stats: Dict[str, Dict[str, Any]], agents: List[str]
+    ) -> Dict[str, Dict[str, jnp.ndarray]]:
+        """Mean and std of the agents, stacked per network on device.
+
+        Args:
+            observation_stats (Dictionary) -- running stats of each agent.
+            agents (List) -- agents whose observations are normalised.
+
+        Returns:
+            stacked stats of each network.
+        """
+        leaves = [
+            observation_stats[agent][key] for agent in agents for key in ("mean", "std")
+        ]
+        if agents != self._agents or any(
+            new is not old for new, old in zip(leaves, self._leaves)
+        ):
+            self._agents = list(agents)
+            self._leaves = leaves
+            self._stacked_stats = jax.device_put(
+                {
+                    net_key: {
+                        key: np.stack(
+                            [
+                                np.asarray(observation_stats[agent][key])
+                                for agent in network_agents
+                            ]
+                        )
+                        for key in ("mean", "std")
+                    }
+                    for net_key, network_agents in group_agents_by_network(
+                        agents, self._agent_net_keys
+                    ).items()
+                }
+            )
+        return self._stacked_stats
+
+    def alive_mask(self, agents: List[str], death_masked_agents: List) -> np.ndarray:
+        """Whether each agent is alive, in the order of sort_str_num(agents).
 
-    for key in agents_alive:
-        observations[key] = normalize_observations(
-            observations_stats[key], observations[key]
-        )
+        Args:
+            agents (List) -- agents whose observations are normalised.
+            death_masked_agents (List) -- agents that are death masked.
 
-    return observations
+        Returns:
+            the death mask array.
+        """
+        if not death_masked_agents:
+            if len(self._all_alive) != len(agents):
+                self._all_alive = np.ones(len(agents), dtype=bool)
+            return self._all_alive
+        return np.isin(sort_str_num(agents), death_masked_agents, invert=True)
+
+
+def executor_normalisation_args(
+    executor: SystemExecutor, agents: List[str]
+) -> Tuple[Dict[str, Dict[str, jnp.ndarray]], np.ndarray]:
+    """Arguments of select_actions_fn normalising the observations
+
+    Args:
+        executor (SystemExecutor) -- an environment executor
+        agents (List) -- agents whose observations are normalised
+
+    Returns:
+        observation stats stacked per network, and the death mask array.
+    """
+
+    observation_stats = getattr(executor.store, "observation_stats", None)
+    if observation_stats is None:
+        observation_stats = ExecutorObservationStats(executor.store.agent_net_keys)
+        executor.store.observation_stats = observation_stats
+    death_masked_agents = executor.store.executor_environment.death_masked_agents
+    return (
+        observation_stats.stacked_stats(
+            executor.store.norm_params[constants.OBS_NORM_STATE_DICT_KEY], agents
+        ),
+        observation_stats.alive_mask(agents, death_masked_agents),
+    )
 
 
 def set_growing_gpu_memory_jax() -> None:
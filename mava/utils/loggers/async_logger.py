@@ -0,0 +1,182 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Logger writing to its destinations from a background thread."""
+
+import atexit
+import queue
+import threading
+import time
+from typing import List, Optional
+
+from absl import logging
+from acme.utils.loggers import base
+
+_STOP = object()
+
+OVERFLOW_MODES = ("aggregate", "drop")
+
+
+def _merge(record: Optional[base.LoggingData], data: base.LoggingData) -> dict:
+    """Merge a record into an older one, keeping the latest value of each key."""
+    if record is None:
+        return dict(data)
+    record.update(data)
+    return record
+
+
+class AsyncLogger(base.Logger):
+    """Logger enqueueing its records for a background thread to write.
+
+    Writing only puts the record in a bounded queue, so the terminal, csv,
+    tensorboard and json destinations never run on the calling thread. The
+    background thread writes the queued records in batches. Records less than
+    time_delta seconds apart are coalesced into a single record with the latest
+    value of each key, which is written once time_delta has elapsed.
+
+    When the queue is full, new records are either aggregated into a single
+    overflow record, written after the queued ones, or dropped. Records written
+    once the logger is closed, e.g. by threads still running at exit, are
+    dropped.
+    """
+
+    def __init__(
+        self,
+        to: base.Logger,
+        time_delta: float = 0.0,
+        max_queue_size: int = 1000,
+        overflow: str = "aggregate",
+    ):
+        """Start the background thread.
+
+        Args:
+            to: logger the records are written to.
+            time_delta: minimum elapsed time (in seconds) between written
+                records. Records are written one by one if it is not positive.
+            max_queue_size: maximum number of queued records.
+            overflow: what to do with records written when the queue is full,
+                either "aggregate" or "drop".
+        """
+        if max_queue_size < 1:
+            raise ValueError("The queue size of the logger must be positive.")
+        if overflow not in OVERFLOW_MODES:
+            raise ValueError(
+                f"Unknown overflow mode '{overflow}', expected one of "
+                f"{OVERFLOW_MODES}."
+            )
+        self._to = to
+        self._time_delta = time_delta
+        self._overflow = overflow
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        # Records written while the queue was full, merged together. The lock
+        # keeps them ordered after the queued records.
+        self._overflow_record: Optional[dict] = None
+        self._lock = threading.Lock()
+        self._num_dropped = 0
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._write_records, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, data: base.LoggingData) -> None:
+        """Enqueue a record without waiting for it to be written."""
+        with self._lock:
+            if self._closed:
+                self._num_dropped += 1
+                return
+            if self._overflow_record is None:
+                try:
+                    self._queue.put_nowait(dict(data))
+                    return
+                except queue.Full:
+                    pass
+            if self._overflow == "drop":
+                self._num_dropped += 1
+            else:
+                self._overflow_record = _merge(self._overflow_record, data)
+
+    def _next_records(self, timeout: Optional[float]) -> List:
+        """Wait for records and take all the ones that are ready.
+
+        Args:
+            timeout: maximum time to wait for a record, None to wait forever.
+
+        Returns:
+            the records, from the oldest to the most recent.
+        """
+        try:
+            records = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            records = []
+        with self._lock:
+            while True:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if self._overflow_record is not None:
+                records.append(self._overflow_record)
+                self._overflow_record = None
+        return records
+
+    def _write(self, data: base.LoggingData) -> None:
+        """Write a record, without stopping the thread if it fails."""
+        try:
+            self._to.write(data)
+        except Exception:
+            logging.exception("Failed to write a logged record.")
+
+    def _write_records(self) -> None:
+        """Write the enqueued records until the logger is closed."""
+        pending: Optional[dict] = None
+        last_write_time = 0.0
+        stop = False
+        while not stop:
+            timeout = None
+            if pending is not None:
+                timeout = max(last_write_time + self._time_delta - time.time(), 0.0)
+
+            for record in self._next_records(timeout):
+                if record is _STOP:
+                    stop = True
+                elif self._time_delta > 0:
+                    pending = _merge(pending, record)
+                else:
+                    self._write(record)
+
+            now = time.time()
+            if pending is not None and (
+                stop or now - last_write_time >= self._time_delta
+            ):
+                self._write(pending)
+                pending = None
+                last_write_time = now
+
+    @property
+    def num_dropped(self) -> int:
+        """Number of records dropped because the queue was full or closed."""
+        return self._num_dropped
+
+    def close(self) -> None:
+        """Write the remaining records and close the destination logger."""
+        with self._lock:
+            if self._closed:
+                return
+            # Records enqueued before this are still written.
+            self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._to.close()
@@ -29,6 +29,7 @@ except ModuleNotFoundError:
 from acme.utils import loggers, paths
 from acme.utils.loggers import base
 
+from mava.utils.loggers.async_logger import AsyncLogger
 from mava.utils.loggers.eval_json_logger import JSONLogger
 from mava.utils.loggers.tf_logger import TFSummaryLogger
 
@@ -62,6 +63,8 @@ class Logger(MavaLogger):
         time_stamp: Optional[str] = None,
         extra_logger_kwargs: Dict = {},
         external_logger: Optional[base.Logger] = None,
+        asynchronous: bool = False,
+        max_queue_size: int = 1000,
         **external_logger_kwargs: Any,
     ):
         """Initialise logger."""
@@ -84,6 +87,8 @@ class Logger(MavaLogger):
             print_fn,
             extra_logger_kwargs,
             external_logger=external_logger,
+            asynchronous=asynchronous,
+            max_queue_size=max_queue_size,
             **external_logger_kwargs,
         )
         self._logger_info = (
@@ -109,6 +114,8 @@ class Logger(MavaLogger):
         print_fn: Callable[[str], None],
         extra_logger_kwargs: Dict,
         external_logger: Optional[base.Logger],
+        asynchronous: bool = False,
+        max_queue_size: int = 1000,
         **external_logger_kwargs: Any,
     ) -> loggers.Logger:
         """Build a Mava logger.
@@ -126,6 +133,10 @@ class Logger(MavaLogger):
             extra_logger_kwarg: any extra kwargs not related to an
                 external logger.
             external_logger: optional external logger.
+            asynchronous: whether to write the logs from a background thread,
+                so that writing does not block the caller.
+            max_queue_size: maximum number of logs waiting to be written in
+                the background. Logs written when it is full are aggregated.
             external_logger_kwargs: optional external logger params.
 
         Returns:
@@ -178,7 +189,10 @@ class Logger(MavaLogger):
         if logger:
             logger = loggers.Dispatcher(logger)
             logger = loggers.NoneFilter(logger)
-            logger = loggers.TimeFilter(logger, time_delta)
+            if asynchronous:
+                logger = AsyncLogger(logger, time_delta, max_queue_size)
+            else:
+                logger = loggers.TimeFilter(logger, time_delta)
         else:
             logger = loggers.NoOpLogger()
 
@@ -15,13 +15,40 @@
 
 import json
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 import jax
 from acme.utils import paths
 
 
+def read_json_records(records_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Read the records appended to a json lines evaluation log.
+
+    Args:
+        records_path: path of the json lines file.
+
+    Yields:
+        the key of each record, e.g. "step_0", and its data. A last line left
+        incomplete by an interrupted write is skipped.
+    """
+    with open(records_path, "r") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            record = json.loads(line)
+            yield record["key"], record["data"]
+
+
 class JSONLogger:
+    """Logger of evaluation data to json files.
+
+    Each evaluation is appended as one line to a json lines file, so writing
+    does not depend on the number of logged evaluations and an interrupted
+    write can only lose the last evaluation. The records are exported to a json
+    file with the nested layout used by the plotting tools when the absolute
+    metrics are written, when the logger is closed, or by calling export.
+    """
+
     def __init__(
         self,
         experiment_path: str,
@@ -52,6 +79,7 @@ class JSONLogger:
             f"{self._log_dir}{env_name}_{task_name}"
             + f"_run{str(random_seed)}_evaluation_data.json"
         )
+        self._records_file_dir = self._logs_file_dir + "l"
 
         self._step_count = 0
         self._random_seed = str(random_seed)
@@ -63,20 +91,41 @@ class JSONLogger:
         if not os.path.exists(self._log_dir):
             os.makedirs(self._log_dir)
 
-        # Initialise json file for logging data
-        if not os.path.exists(self._logs_file_dir):
-            with open(self._logs_file_dir, "w+") as f:
-                json.dump(
-                    {
-                        self._env_name: {
-                            self._task_name: {
-                                self._system_name: {self._random_seed: {}}
-                            }
-                        }
-                    },
-                    f,
-                    indent=4,
-                )
+        # Initialise json lines file for logging data, keeping the data of
+        # json files written before the records were appended.
+        if not os.path.exists(self._records_file_dir):
+            logged_data: Dict[str, Any] = {}
+            if os.path.exists(self._logs_file_dir):
+                with open(self._logs_file_dir, "r") as f:
+                    logged_data = (
+                        json.load(f)
+                        .get(self._env_name, {})
+                        .get(self._task_name, {})
+                        .get(self._system_name, {})
+                        .get(self._random_seed, {})
+                    )
+            open(self._records_file_dir, "a").close()
+            for dict_key, data in logged_data.items():
+                self._append_record(dict_key, data)
+        else:
+            self._remove_incomplete_record()
+
+        # Continue the step keys of the evaluations logged by an earlier run.
+        self._step_count = sum(
+            1
+            for dict_key, _ in read_json_records(self._records_file_dir)
+            if dict_key.startswith("step_")
+        )
+
+        self.export()
+
+    def _empty_log(self) -> Dict[str, Any]:
+        """Nested layout of the json file without any data."""
+        return {
+            self._env_name: {
+                self._task_name: {self._system_name: {self._random_seed: {}}}
+            }
+        }
 
     def _jsonify_and_process(self, results_dict: Dict[str, Any]) -> None:
         """Convert all elements to be logged to native python types."""
@@ -86,15 +135,22 @@ class JSONLogger:
 
         self._results_dict = results_dict
 
+    def _record_key(self, dictionary_to_add: Dict[str, Any]) -> str:
+        """Key of logged data in the json file."""
+        if "step_count" not in list(dictionary_to_add.keys()):
+            return "absolute_metrics"
+        return f"step_{str(self._step_count)}"
+
     def _add_data_to_dictionary(
-        self, original_dictionary: Dict[str, Any], dictionary_to_add: Dict[str, Any]
+        self,
+        original_dictionary: Dict[str, Any],
+        dictionary_to_add: Dict[str, Any],
+        dict_key: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Adds new data to already logged data read in from a json file."""
 
-        if "step_count" not in list(dictionary_to_add.keys()):
-            dict_key = "absolute_metrics"
-        else:
-            dict_key = f"step_{str(self._step_count)}"
+        if dict_key is None:
+            dict_key = self._record_key(dictionary_to_add)
 
         original_dictionary[self._env_name][self._task_name][self._system_name][
             self._random_seed
@@ -102,8 +158,46 @@ class JSONLogger:
 
         return original_dictionary
 
+    def _append_record(self, dict_key: str, data: Dict[str, Any]) -> None:
+        """Append a record to the json lines file with a single write."""
+        line = json.dumps({"key": dict_key, "data": data}) + "\n"
+        fd = os.open(self._records_file_dir, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+        try:
+            os.write(fd, line.encode())
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _remove_incomplete_record(self) -> None:
+        """Truncate a last line left incomplete by an interrupted write."""
+        with open(self._records_file_dir, "rb+") as f:
+            content = f.read()
+            if content and not content.endswith(b"\n"):
+                f.truncate(content.rfind(b"\n") + 1)
+
+    def export(self) -> None:
+        """Export the records to the nested layout of the json file.
+
+        The json file is replaced atomically, so it always holds a complete
+        export.
+        """
+        logged_data = self._empty_log()
+        for dict_key, data in read_json_records(self._records_file_dir):
+            self._add_data_to_dictionary(logged_data, data, dict_key)
+
+        temp_file_dir = self._logs_file_dir + ".tmp"
+        with open(temp_file_dir, "w") as f:
+            json.dump(logged_data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file_dir, self._logs_file_dir)
+
+    def close(self) -> None:
+        """Export the records before closing the logger."""
+        self.export()
+
     def write(self, results_dict: Dict[str, Any]) -> None:
-        """Write current evaluation data to a json file.
+        """Append current evaluation data to the json lines file.
 
         The json logger will filter all logged Mava results and select only
         elements in the results dictionary starting with `eval` to form a
@@ -130,6 +224,9 @@ class JSONLogger:
             'metric_1': <array>,
             'metric_2': <array>
         }
+
+        The absolute metrics are logged at the end of the run, so all the
+        records are exported to the json file when they are written.
         """
 
         eval_dict = {
@@ -142,14 +239,9 @@ class JSONLogger:
         if len(eval_dict) > 0:
             self._jsonify_and_process(results_dict=eval_dict)
 
-            # Load current logged data
-            with open(self._logs_file_dir, "r") as f:
-                read_in_data = json.load(f)
-
-            with open(self._logs_file_dir, "w+") as f:
-                updated_data = self._add_data_to_dictionary(
-                    read_in_data, self._results_dict
-                )
-                json.dump(updated_data, f, indent=4)
+            dict_key = self._record_key(self._results_dict)
+            self._append_record(dict_key, self._results_dict)
+            if dict_key == "absolute_metrics":
+                self.export()
 
             self._step_count += 1
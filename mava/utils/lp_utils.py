@@ -95,7 +95,17 @@ def termination_fn(
 
     Args:
         parameter_server: SystemParameterServer in order to get main pid
+
+    Raises:
+        Exception: the error of an asynchronous checkpoint that failed, once the
+            processes are stopped.
     """
+    # Let an asynchronous checkpoint finish writing before stopping the processes.
+    checkpoint_thread = getattr(parameter_server.store, "checkpoint_thread", None)
+    if checkpoint_thread is not None:
+        checkpoint_thread.join()
+    checkpoint_error = getattr(parameter_server.store, "checkpoint_error", None)
+
     if parameter_server.store.manager_pid:
         # parent_pid: the pid of the main thread process
         parent_pid = parameter_server.store.manager_pid
@@ -105,6 +115,9 @@ def termination_fn(
     else:
         lp.stop()
 
+    if checkpoint_error is not None:
+        raise checkpoint_error
+
 
 class StepsLimiter:
     def __init__(
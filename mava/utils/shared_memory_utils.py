@@ -0,0 +1,317 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utilities for sharing arrays between processes on the same host."""
+
+import pickle
+import threading
+import time
+from multiprocessing import resource_tracker  # type: ignore
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import tree
+
+# Byte alignment of the arrays stored in shared memory.
+_ALIGNMENT = 8
+# Size of the header holding the sequence number and the size of the layout.
+_HEADER_SIZE = 16
+# Seconds readers wait between checks of a write in progress.
+_READ_RETRY_INTERVAL = 1e-4
+# Seconds readers wait for a consistent read before giving up.
+_READ_TIMEOUT = 10.0
+# Names of the buffers created by this process.
+_created_buffers: Set[str] = set()
+
+
+def _aligned(nbytes: int) -> int:
+    """Round a number of bytes up to the alignment of the buffer."""
+    return -(-nbytes // _ALIGNMENT) * _ALIGNMENT
+
+
+def array_layout(
+    arrays: Sequence[Any], offset: int = 0
+) -> Tuple[List[Tuple[Tuple[int, ...], str, int]], int]:
+    """Compute where arrays are stored in a buffer, each one aligned.
+
+    Args:
+        arrays: arrays to store one after the other.
+        offset: offset of the first array in the buffer.
+
+    Returns:
+        The shape, dtype and offset of each array, and the offset of the end of
+        the last array.
+    """
+    layout = []
+    for array in arrays:
+        array = np.asarray(array)
+        layout.append((array.shape, array.dtype.str, offset))
+        offset += _aligned(array.nbytes)
+    return layout, offset
+
+
+def array_views(
+    shared_memory: SharedMemory,
+    layout: Sequence[Tuple[Tuple[int, ...], str, int]],
+    offset: int = 0,
+) -> List[np.ndarray]:
+    """Create the arrays stored in shared memory following a layout.
+
+    Args:
+        shared_memory: shared memory holding the arrays.
+        layout: shape, dtype and offset of each array, see `array_layout`.
+        offset: offset the layout is relative to.
+
+    Returns:
+        Arrays viewing the shared memory.
+    """
+    return [
+        np.ndarray(
+            shape, dtype=dtype, buffer=shared_memory.buf, offset=offset + array_offset
+        )
+        for shape, dtype, array_offset in layout
+    ]
+
+
+def create_shared_memory(size: int, name: Optional[str] = None) -> SharedMemory:
+    """Create a shared memory block, which this process is responsible for freeing.
+
+    Args:
+        size: size of the block in bytes.
+        name: name of the block. Defaults to None, in which case a unique name is
+            generated.
+
+    Returns:
+        The shared memory block.
+    """
+    shared_memory = SharedMemory(name=name, create=True, size=size)
+    _created_buffers.add(shared_memory.name)
+    return shared_memory
+
+
+def attach_shared_memory(name: str) -> SharedMemory:
+    """Attach to a shared memory block created by this or another process.
+
+    Args:
+        name: name of the block.
+
+    Returns:
+        The shared memory block.
+    """
+    shared_memory = SharedMemory(name=name)
+    # Only the creator of the block should free it, so processes attaching to it
+    # do not let the resource tracker unlink it when they exit.
+    if name not in _created_buffers:
+        resource_tracker.unregister(
+            shared_memory._name, "shared_memory"  # type: ignore
+        )
+    return shared_memory
+
+
+def free_shared_memory(shared_memory: SharedMemory) -> None:
+    """Close and free a shared memory block created by this process.
+
+    Args:
+        shared_memory: shared memory block from `create_shared_memory`.
+    """
+    name = shared_memory.name
+    shared_memory.close()
+    shared_memory.unlink()
+    _created_buffers.discard(name)
+
+
+def is_shareable(value: Any) -> bool:
+    """Whether a parameter only holds numeric arrays and can be shared."""
+    return all(np.asarray(leaf).dtype.kind in "biuf" for leaf in tree.flatten(value))
+
+
+class SharedParameterBuffer:
+    """Versioned parameters stored in shared memory and guarded by a seqlock.
+
+    One process creates the buffer and publishes parameters into it. Processes
+    on the same host attach to it by name and read the parameters without
+    asking the parameter server. The sequence number is odd while a write is in
+    progress, and readers retry when it changed during their read.
+    """
+
+    def __init__(self, name: str, parameters: Optional[Dict[str, Any]] = None):
+        """Create or attach to a shared parameter buffer.
+
+        Args:
+            name: name of the shared memory block.
+            parameters: parameters defining the layout of a new buffer. Defaults
+                to None, in which case the existing buffer is attached to.
+        """
+        self._owner = parameters is not None
+        if self._owner:
+            layout = self._make_layout(parameters)  # type: ignore
+            layout_bytes = pickle.dumps(layout)
+            size = _HEADER_SIZE + _aligned(len(layout_bytes)) + layout["size"]
+            self.shared_memory = create_shared_memory(size, name=name)
+            self.shared_memory.buf[
+                _HEADER_SIZE : _HEADER_SIZE + len(layout_bytes)
+            ] = layout_bytes
+            # Readers wait for the size of the layout to be set.
+            header = np.ndarray(2, dtype=np.uint64, buffer=self.shared_memory.buf)
+            header[1] = len(layout_bytes)
+        else:
+            self.shared_memory = attach_shared_memory(name)
+            header = np.ndarray(2, dtype=np.uint64, buffer=self.shared_memory.buf)
+            if not header[1]:
+                # The creator has not written the layout yet.
+                self.shared_memory.close()
+                raise FileNotFoundError(f"Shared parameters '{name}' are not ready.")
+            layout = pickle.loads(
+                self.shared_memory.buf[_HEADER_SIZE : _HEADER_SIZE + int(header[1])]
+            )
+
+        self._sequence = header[:1]
+        data_offset = _HEADER_SIZE + _aligned(int(header[1]))
+        self._structures: Dict[str, Any] = layout["structures"]
+        self._versions = np.ndarray(
+            len(layout["keys"]),
+            dtype=np.uint64,
+            buffer=self.shared_memory.buf,
+            offset=data_offset,
+        )
+        self._key_index = {key: i for i, key in enumerate(layout["keys"])}
+        self._views: Dict[str, List[np.ndarray]] = {
+            key: array_views(self.shared_memory, leaves, offset=data_offset)
+            for key, leaves in layout["leaves"].items()
+        }
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def _make_layout(parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Compute where the leaves of each parameter are stored in the buffer."""
+        keys = list(parameters.keys())
+        size = _aligned(len(keys) * np.dtype(np.uint64).itemsize)
+        structures: Dict[str, Any] = {}
+        leaves: Dict[str, List[Tuple[Tuple[int, ...], str, int]]] = {}
+        for key in keys:
+            structures[key] = tree.map_structure(lambda _: None, parameters[key])
+            leaves[key], size = array_layout(tree.flatten(parameters[key]), size)
+        return dict(keys=keys, structures=structures, leaves=leaves, size=size)
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+        return self.shared_memory.name
+
+    @property
+    def keys(self) -> List[str]:
+        """Names of the parameters held by the buffer."""
+        return list(self._key_index.keys())
+
+    def write(self, parameters: Dict[str, Any], versions: Dict[str, int]) -> None:
+        """Publish new values of parameters held by the buffer.
+
+        Args:
+            parameters: dictionary {parameter name: new value}.
+            versions: dictionary {parameter name: version of the new value}.
+
+        Raises:
+            ValueError: if a value does not match the layout of the buffer.
+        """
+        new_leaves = {}
+        for key, value in parameters.items():
+            new_leaves[key] = [np.asarray(leaf) for leaf in tree.flatten(value)]
+            views = self._views[key]
+            if len(new_leaves[key]) != len(views) or any(
+                leaf.shape != view.shape or leaf.dtype != view.dtype
+                for leaf, view in zip(new_leaves[key], views)
+            ):
+                raise ValueError(
+                    f"Parameter '{key}' does not match the shared memory layout."
+                )
+
+        with self._write_lock:
+            self._sequence += 1
+            try:
+                for key, leaves in new_leaves.items():
+                    for view, leaf in zip(self._views[key], leaves):
+                        view[...] = leaf
+                    self._versions[self._key_index[key]] = versions[key]
+            finally:
+                self._sequence += 1
+
+    def read(
+        self,
+        names: Sequence[str],
+        versions: Dict[str, int],
+        timeout: float = _READ_TIMEOUT,
+    ) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """Read the parameters that changed since the given versions.
+
+        Args:
+            names: names of the parameters to read. Names that are not held by
+                the buffer are ignored.
+            versions: dictionary {parameter name: version held by the caller}.
+            timeout: seconds to wait for a consistent read.
+
+        Returns:
+            The parameters with a different version than the caller's, and
+            their current versions.
+
+        Raises:
+            TimeoutError: if no consistent read was possible within the timeout,
+                e.g. because the writer died in the middle of a write.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            sequence = int(self._sequence[0])
+            if sequence % 2:
+                # A write is in progress.
+                if time.monotonic() > deadline:
+                    raise TimeoutError(
+                        f"Shared parameters '{self.name}' are still being written."
+                    )
+                time.sleep(_READ_RETRY_INTERVAL)
+                continue
+
+            new_versions = {
+                key: int(self._versions[self._key_index[key]])
+                for key in names
+                if key in self._key_index
+            }
+            new_versions = {
+                key: version
+                for key, version in new_versions.items()
+                if version != versions.get(key)
+            }
+            parameters = {
+                key: tree.unflatten_as(
+                    self._structures[key], [view.copy() for view in self._views[key]]
+                )
+                for key in new_versions
+            }
+
+            if int(self._sequence[0]) == sequence:
+                return parameters, new_versions
+            if time.monotonic() > deadline:
+                raise TimeoutError(
+                    f"Shared parameters '{self.name}' changed during every read."
+                )
+
+    def close(self) -> None:
+        """Release the shared memory, freeing it if this buffer created it."""
+        self._sequence = self._versions = None  # type: ignore
+        self._views = {}
+        if self._owner:
+            self._owner = False
+            free_shared_memory(self.shared_memory)
+        else:
+            self.shared_memory.close()
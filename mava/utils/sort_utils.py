@@ -62,3 +62,20 @@ def sample_new_agent_keys(
         loop_i += 1
 
     return save_net_keys, agent_net_keys
+
+
+def group_agents_by_network(
+    agents: Any, agent_net_keys: Dict[str, str]
+) -> Dict[str, List[str]]:
+    """
+    Groups agents by the network they use.
+    Args:
+        agents: The agent keys to group.
+        agent_net_keys: Dictionary mapping agent keys to network keys.
+    Returns:
+        Dictionary mapping network keys to the sorted agents using that network.
+    """
+    agents_per_network: Dict[str, List[str]] = {}
+    for agent in sort_str_num(agents):
+        agents_per_network.setdefault(agent_net_keys[agent], []).append(agent)
+    return agents_per_network
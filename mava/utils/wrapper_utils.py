@@ -1,4 +1,3 @@
-import collections
 from typing import Any, Dict, List, Tuple, Union
 
 import dm_env
@@ -16,6 +15,112 @@ except ModuleNotFoundError:
 from mava import types
 
 
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Mark an array shared between timesteps as read-only."""
+    array.setflags(write=False)
+    return array
+
+
+class DMCompatibleObservationConverter:
+    """Converts parallel observations so they're dm_env compatible.
+
+    The legal actions of agents without an action mask, the observations of
+    agents without an observation and the terminals are the same at every step,
+    so they are created once and shared by the converted observations as
+    read-only arrays.
+    """
+
+    def __init__(
+        self, observation_spec: Dict[str, types.OLT], possible_agents: List
+    ) -> None:
+        """Create the constant fields of the observations.
+
+        Args:
+            observation_spec : env observation spec.
+            possible_agents : possible agents in env.
+        """
+        self._possible_agents = list(possible_agents)
+        self._observation_dtypes: Dict[str, np.dtype] = {}
+        self._legal_actions_dtypes: Dict[str, np.dtype] = {}
+        self._default_observations: Dict[str, Any] = {}
+        self._default_legal_actions: Dict[str, np.ndarray] = {}
+
+        for agent in self._possible_agents:
+            agent_spec = observation_spec[agent]
+
+            # Environments like flatland can return tuples for observations
+            if isinstance(agent_spec.observation, tuple):
+                # Assuming tuples all have same type.
+                self._observation_dtypes[agent] = agent_spec.observation[0].dtype
+                self._default_observations[agent] = tuple(
+                    _read_only(generate_zeros_from_spec(obs_spec))
+                    for obs_spec in agent_spec.observation
+                )
+            else:
+                self._observation_dtypes[agent] = agent_spec.observation.dtype
+                self._default_observations[agent] = _read_only(
+                    generate_zeros_from_spec(agent_spec.observation)
+                )
+
+            # TODO Handle legal actions better for continous envs,
+            # maybe have min and max for each action and clip the
+            # agents actions  accordingly
+            self._legal_actions_dtypes[agent] = agent_spec.legal_actions.dtype
+            self._default_legal_actions[agent] = _read_only(
+                np.ones(
+                    agent_spec.legal_actions.shape,
+                    dtype=agent_spec.legal_actions.dtype,
+                )
+            )
+
+        self._terminals = (
+            _read_only(np.zeros((1,), dtype=np.float32)),
+            _read_only(np.ones((1,), dtype=np.float32)),
+        )
+
+    def convert(
+        self, observes: Dict, dones: Dict[str, bool], env_done: bool
+    ) -> Dict[str, types.OLT]:
+        """Convert Parallel observation so it's dm_env compatible.
+
+        Args:
+            observes : observations per agent.
+            dones : dones per agent.
+            env_done : is env done.
+
+        Returns:
+            a dm compatible observation.
+        """
+        observations: Dict[str, types.OLT] = {}
+        for agent in self._possible_agents:
+
+            # If we have a valid observation for this agent.
+            if agent in observes:
+                observation = observes[agent]
+                if isinstance(observation, dict) and "action_mask" in observation:
+                    legals = observation["action_mask"].astype(
+                        self._legal_actions_dtypes[agent]
+                    )
+                    observation = observation["observation"].astype(
+                        self._observation_dtypes[agent]
+                    )
+                else:
+                    legals = self._default_legal_actions[agent]
+
+            # If we have no observation, we need to use the default.
+            else:
+                observation = self._default_observations[agent]
+                legals = self._default_legal_actions[agent]
+
+            terminal = dones[agent] if agent in dones else env_done
+            observations[agent] = types.OLT(
+                observation=observation,
+                legal_actions=legals,
+                terminal=self._terminals[bool(terminal)],
+            )
+        return observations
+
+
 def convert_dm_compatible_observations(
     observes: Dict,
     dones: Dict[str, bool],
@@ -25,6 +130,9 @@ def convert_dm_compatible_observations(
 ) -> Dict[str, types.OLT]:
     """Convert Parallel observation so it's dm_env compatible.
 
+    Wrappers converting observations at every step should keep a
+    DMCompatibleObservationConverter instead.
+
     Args:
         observes : observations per agent.
         dones : dones per agent.
@@ -35,66 +143,9 @@ def convert_dm_compatible_observations(
     Returns:
         a dm compatible observation.
     """
-    observations: Dict[str, types.OLT] = {}
-    for agent in possible_agents:
-
-        # If we have a valid observation for this agent.
-        if agent in observes:
-            observation = observes[agent]
-            if isinstance(observation, dict) and "action_mask" in observation:
-                legals = observation["action_mask"].astype(
-                    observation_spec[agent].legal_actions.dtype
-                )
-
-                # Environments like flatland can return tuples for observations
-                if isinstance(observation_spec[agent].observation, tuple):
-                    # Assuming tuples all have same type.
-                    observation_dtype = observation_spec[agent].observation[0].dtype
-                else:
-                    observation_dtype = observation_spec[agent].observation.dtype
-                observation = observation["observation"].astype(observation_dtype)
-            else:
-                # TODO Handle legal actions better for continous envs,
-                # maybe have min and max for each action and clip the
-                # agents actions  accordingly
-                legals = np.ones(
-                    observation_spec[agent].legal_actions.shape,
-                    dtype=observation_spec[agent].legal_actions.dtype,
-                )
-
-        # If we have no observation, we need to use the default.
-        else:
-            # Handle tuple observations
-            if isinstance(observation_spec[agent].observation, tuple):
-                observation_spec_list = []
-                for obs_spec in observation_spec[agent].observation:
-                    observation_spec_list.append(
-                        np.zeros(
-                            obs_spec.shape,
-                            dtype=obs_spec.dtype,
-                        )
-                    )
-                observation = tuple(observation_spec_list)  # type: ignore
-            else:
-                observation = np.zeros(
-                    observation_spec[agent].observation.shape,
-                    dtype=observation_spec[agent].observation.dtype,
-                )
-            legals = np.ones(
-                observation_spec[agent].legal_actions.shape,
-                dtype=observation_spec[agent].legal_actions.dtype,
-            )
-        if agent in dones:
-            terminal = dones[agent]
-        else:
-            terminal = env_done
-
-        observations[agent] = types.OLT(
-            observation=observation,
-            legal_actions=legals,
-            terminal=np.asarray([terminal], dtype=np.float32),
-        )
-    return observations
+    return DMCompatibleObservationConverter(observation_spec, possible_agents).convert(
+        observes, dones, env_done
+    )
 
 
 def generate_zeros_from_spec(spec: specs.Array) -> np.ndarray:
@@ -206,18 +257,28 @@ class RunningStatistics:
     """Helper class to comute running statistics such as
     the max, min, mean, variance and standard deviation of
     a specific quantity.
+
+    The mean and variance are computed over the last queue_size values, which
+    are kept in a ring buffer with running sums so that pushing is O(1). The
+    max and min are computed over all the pushed values.
     """
 
     # The queue_size is used to estimate a moving mean and variance value.
     def __init__(self, label: str, queue_size: int = 100) -> None:
 
-        self.queue: collections.deque = collections.deque(maxlen=queue_size)
-        self._max = -float("inf")
-        self._min = float("inf")
+        self._queue = np.zeros(queue_size, dtype=np.float64)
+        self._queue_size = queue_size
+        self._count = 0
+        self._next = 0
 
-        self._mean = 0.0
+        # Sums of the values in the queue and of their squares, shifted by the
+        # first pushed value to limit the cancellation in the variance.
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sum_squares = 0.0
 
-        self._var = 0.0
+        self._max = -float("inf")
+        self._min = float("inf")
 
         self._label = label
 
@@ -225,7 +286,6 @@ class RunningStatistics:
 
     def push(self, x: float) -> None:
         self._raw = x
-        self.queue.append(x)
 
         if x > self._max:
             self._max = x
@@ -233,12 +293,52 @@ class RunningStatistics:
         if x < self._min:
             self._min = x
 
-        if len(self.queue) == 1:
-            self._mean = x
-            self._var = 0
+        if self._count == 0:
+            self._shift = float(x)
+        value = float(x) - self._shift
+        if self._count == self._queue_size:
+            removed = self._queue[self._next]
+            self._sum -= removed
+            self._sum_squares -= removed * removed
         else:
-            self._mean = np.mean(np.array(self.queue))
-            self._var = np.var(np.array(self.queue))
+            self._count += 1
+        self._queue[self._next] = value
+        self._sum += value
+        self._sum_squares += value * value
+
+        self._next += 1
+        if self._next == self._queue_size:
+            self._next = 0
+            # Recompute the sums once per pass over the queue so rounding
+            # errors do not accumulate.
+            self._sum = float(np.sum(self._queue))
+            self._sum_squares = float(np.dot(self._queue, self._queue))
+
+    def push_many(self, xs: np.ndarray) -> None:
+        """Push several values in order, with vectorised updates of the queue.
+
+        Args:
+            xs: the values, in the order they would be pushed one by one.
+        """
+        xs = np.asarray(xs, dtype=np.float64).reshape(-1)
+        if xs.size == 0:
+            return
+        self._raw = float(xs[-1])
+        self._max = max(self._max, float(np.max(xs)))
+        self._min = min(self._min, float(np.min(xs)))
+
+        if self._count == 0:
+            self._shift = float(xs[0])
+        # Only the last queue_size values can still be in the queue.
+        positions = (self._next + np.arange(xs.size)) % self._queue_size
+        self._queue[positions[-self._queue_size :]] = (
+            xs[-self._queue_size :] - self._shift
+        )
+        self._count = min(self._count + xs.size, self._queue_size)
+        self._next = int((self._next + xs.size) % self._queue_size)
+        # The queue is zero where it was never written to.
+        self._sum = float(np.sum(self._queue))
+        self._sum_squares = float(np.dot(self._queue, self._queue))
 
     def max(self) -> float:
         return self._max
@@ -247,17 +347,37 @@ class RunningStatistics:
         return self._min
 
     def mean(self) -> float:
-        return self._mean
+        if self._count == 0:
+            return 0.0
+        return self._shift + self._sum / self._count
 
     def var(self) -> float:
-        return self._var
+        if self._count < 2:
+            return 0.0
+        mean = self._sum / self._count
+        return max(self._sum_squares / self._count - mean * mean, 0.0)
 
     def std(self) -> float:
-        return np.sqrt(self._var)
+        return np.sqrt(self.var())
 
     def raw(self) -> float:
         return self._raw
 
+    def quantile(self, q: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """Exact quantiles of the values in the queue.
+
+        Only computed when requested, in O(queue_size).
+
+        Args:
+            q: quantile or quantiles to compute, in [0, 1].
+
+        Returns:
+            the quantiles, or nan if no value was pushed.
+        """
+        if self._count == 0:
+            return np.full(np.shape(q), np.nan)[()]
+        return np.quantile(self._queue[: self._count], q) + self._shift
+
 
 # Adapted From https://github.com/DLR-RM/stable-baselines3/blob/237223f834fe9b8143ea24235d087c4e32addd2f/stable_baselines3/common/running_mean_std.py # noqa: E501
 class RunningMeanStd(object):
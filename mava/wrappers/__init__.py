@@ -21,6 +21,7 @@ from mava.wrappers.environment_loop_wrappers import (
     DetailedPerAgentStatistics,
     MonitorParallelEnvironmentLoop,
 )
+from mava.wrappers.jax_debugging_envs import JaxDebuggingEnvWrapper
 from mava.wrappers.pettingzoo import PettingZooParallelEnvWrapper
 
 try:
@@ -36,6 +37,7 @@ except ModuleNotFoundError:
     pass
 
 from mava.wrappers.saveable import SaveableWrapper
+from mava.wrappers.subprocess_env import SubprocessEnvWrapper
 from mava.wrappers.system_trainer_statistics import (
     DetailedTrainerStatistics,
     ScaledDetailedTrainerStatistics,
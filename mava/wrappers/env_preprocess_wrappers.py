@@ -14,7 +14,6 @@
 # limitations under the License.
 
 from abc import ABC, abstractmethod
-from collections import deque
 from typing import TYPE_CHECKING, Any, Dict
 
 import dm_env
@@ -280,12 +279,29 @@ class StackObservations(BasePreprocessWrapper):
                     wrapper we call in the environment factory."
             )
 
-        self.frames: Dict[str, deque] = {
-            agent: deque([], maxlen=num_frames)
-            for agent in self._environment.possible_agents
-        }
+        # Circular buffers of frames, allocated at reset. Every frame is written
+        # twice, num_frames slots apart, so the last num_frames frames are always
+        # a contiguous slice of the buffer in order.
+        self._frames: Dict[str, np.ndarray] = {}
+        self._next_frame = 0
         self.num_frames = num_frames
 
+    def _stack_frames(self, agent: str, observation: np.ndarray) -> np.ndarray:
+        """Stack the last frames of an agent, from oldest to newest.
+
+        Args:
+            agent: agent id.
+            observation: last observation of the agent.
+
+        Returns:
+            A copy of the stacked frames.
+        """
+        stack = self._frames[agent][
+            self._next_frame : self._next_frame + self.num_frames
+        ]
+        # The slice is contiguous, so this is a single copy.
+        return stack.reshape((-1,) + observation.shape[2:]).copy()
+
     def reset(self) -> dm_env.TimeStep:
         """Reset the environment by setting the same observation to all the frames"""
 
@@ -298,21 +314,26 @@ class StackObservations(BasePreprocessWrapper):
         new_observations: Any = {}
 
         old_observations = timestep.observation
+        self._next_frame = 0
         for agent in self._environment.possible_agents:
             agent_olt = old_observations[agent]
-            agent_observation = agent_olt.observation
-
-            self.frames[agent] = deque(
-                [agent_observation for _ in range(self.num_frames)],
-                maxlen=self.num_frames,
-            )
+            agent_observation = np.asarray(agent_olt.observation)
+
+            frames = self._frames.get(agent)
+            if (
+                frames is None
+                or frames.shape[1:] != agent_observation.shape
+                or frames.dtype != agent_observation.dtype
+            ):
+                frames = np.empty(
+                    (2 * self.num_frames,) + agent_observation.shape,
+                    dtype=agent_observation.dtype,
+                )
+                self._frames[agent] = frames
+            frames[:] = agent_observation
 
-            agent_stack_observation = np.array(self.frames[agent])
-            agent_stack_observation = agent_stack_observation.reshape(
-                (-1,) + agent_observation.shape[2:]
-            )
             new_observations[agent] = OLT(
-                observation=agent_stack_observation,
+                observation=self._stack_frames(agent, agent_observation),
                 legal_actions=agent_olt.legal_actions,
                 terminal=agent_olt.terminal,
             )
@@ -335,18 +356,19 @@ class StackObservations(BasePreprocessWrapper):
         new_observations: Any = {}
 
         old_observations = timestep.observation
+        # The new frame replaces the oldest one.
+        slot = self._next_frame
+        self._next_frame = (slot + 1) % self.num_frames
         for agent in self._environment.possible_agents:
             agent_olt = old_observations[agent]
-            agent_observation = agent_olt.observation
+            agent_observation = np.asarray(agent_olt.observation)
 
-            self.frames[agent].append(agent_observation)
+            frames = self._frames[agent]
+            frames[slot] = agent_observation
+            frames[slot + self.num_frames] = agent_observation
 
-            agent_stack_observation = np.array(self.frames[agent])
-            agent_stack_observation = agent_stack_observation.reshape(
-                (-1,) + agent_observation.shape[2:]
-            )
             new_observations[agent] = OLT(
-                observation=agent_stack_observation,
+                observation=self._stack_frames(agent, agent_observation),
                 legal_actions=agent_olt.legal_actions,
                 terminal=agent_olt.terminal,
             )
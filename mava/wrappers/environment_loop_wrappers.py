@@ -19,6 +19,8 @@ import time
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import dm_env
+import jax
+import jax.numpy as jnp
 import matplotlib.pyplot as plt
 import numpy as np
 from acme.utils import counting, loggers, paths
@@ -31,8 +33,10 @@ except ModuleNotFoundError:
 
 import mava
 from mava.environment_loop import ParallelEnvironmentLoop
+from mava.utils.jax_training_utils import executor_normalisation_args
 from mava.utils.loggers import Logger
-from mava.utils.wrapper_utils import RunningStatistics
+from mava.utils.wrapper_utils import RunningStatistics, generate_zeros_from_spec
+from mava.wrappers.jax_debugging_envs import JaxDebuggingEnvWrapper
 
 
 class EnvironmentLoopStatisticsBase:
@@ -51,6 +55,12 @@ class EnvironmentLoopStatisticsBase:
     def _compute_step_statistics(self, rewards: Dict[str, float]) -> None:
         raise NotImplementedError
 
+    def _compute_trajectory_statistics(self, rewards: Dict[str, np.ndarray]) -> None:
+        for t in range(len(next(iter(rewards.values())))):
+            self._compute_step_statistics(
+                {agent: reward[t] for agent, reward in rewards.items()}
+            )
+
     def _compute_episode_statistics(
         self,
         episode_returns: Dict[str, float],
@@ -69,6 +79,9 @@ class EnvironmentLoopStatisticsBase:
         self._environment_loop._compute_step_statistics = (  # type: ignore
             self._compute_step_statistics
         )
+        self._environment_loop._compute_trajectory_statistics = (  # type: ignore
+            self._compute_trajectory_statistics
+        )
         self._environment_loop._get_running_stats = (  # type: ignore
             self._get_running_stats
         )
@@ -102,6 +115,9 @@ class DetailedEpisodeStatistics(EnvironmentLoopStatisticsBase):
     def _compute_step_statistics(self, rewards: Dict[str, float]) -> None:
         pass
 
+    def _compute_trajectory_statistics(self, rewards: Dict[str, np.ndarray]) -> None:
+        pass
+
     def _compute_episode_statistics(
         self,
         episode_returns: Dict[str, float],
@@ -220,6 +236,10 @@ class DetailedPerAgentStatistics(DetailedEpisodeStatistics):
         for agent, reward in rewards.items():
             self._agents_stats[agent]["reward"].push(reward)
 
+    def _compute_trajectory_statistics(self, rewards: Dict[str, np.ndarray]) -> None:
+        for agent, agent_rewards in rewards.items():
+            self._agents_stats[agent]["reward"].push_many(agent_rewards)
+
     def _compute_episode_statistics(
         self,
         episode_returns: Dict[str, float],
@@ -415,3 +435,230 @@ class MonitorParallelEnvironmentLoop(ParallelEnvironmentLoop):
             f"{path}.gif",
             fps=self._fps,
         )
+
+
+class JaxRolloutEnvironmentLoop(ParallelEnvironmentLoop):
+    """A MARL environment loop that compiles whole rollouts of a jax environment.
+
+    The environment step and the executor action selection are fused into a
+    single `jax.lax.scan` over `rollout_length` steps, so the rollout runs on
+    device without returning to Python between steps. The trajectory is then
+    moved to host memory in one transfer and observed by the executor in a
+    single call, which writes it to its adder. Steps after the end of an episode are discarded
+    and the environment is reset by the next call to `run_episode`.
+    """
+
+    def __init__(
+        self,
+        environment: JaxDebuggingEnvWrapper,
+        executor: mava.core.Executor,
+        rollout_length: Optional[int] = None,
+        counter: Optional[counting.Counter] = None,
+        logger: Optional[loggers.Logger] = None,
+        should_update: bool = True,
+        label: str = "parallel_environment_loop",
+    ):
+        """Jax rollout environment loop init
+
+        Args:
+            environment: a wrapped jax environment.
+            executor: a Mava executor
+            rollout_length: number of steps compiled into a rollout. Defaults
+                to None, in which case a rollout covers a whole episode.
+            counter: an optional counter. Defaults to None.
+            logger: an optional counter. Defaults to None.
+            should_update: should update. Defaults to True.
+            label: optional label. Defaults to "parallel_environment_loop".
+        """
+        super().__init__(
+            environment=environment,
+            executor=executor,
+            counter=counter,
+            logger=logger,
+            should_update=should_update,
+            label=label,
+        )
+        global_config = getattr(executor.store, "global_config", None)
+        self._normalise_observations = getattr(
+            global_config, "normalise_observations", False
+        )
+
+        self._rollout_length = (
+            rollout_length or environment.environment.max_steps  # type: ignore
+        )
+        self._rollout_fn = jax.jit(self._make_rollout_fn())
+
+    def _make_rollout_fn(self) -> Any:
+        """Create the function running a rollout of the executor policy.
+
+        Returns:
+            rollout function taking the environment state, the network
+            parameters and a prng key.
+        """
+        wrapper = self._environment
+        environment = wrapper.environment
+        agents = wrapper.agents
+        select_actions_fn = self._executor.store.select_actions_fn
+        return_state_info = wrapper.return_state_info
+
+        def rollout(
+            env_state: Any,
+            current_params: Any,
+            base_key: Any,
+            *normalisation_args: Any,
+        ) -> Tuple:
+            """Run `rollout_length` steps - this is jitted below.
+
+            The normalisation args, if any, are given to select_actions_fn to
+            normalise the observations.
+            """
+
+            def step(carry: Tuple, _: Any) -> Tuple:
+                env_state, done, base_key = carry
+                observations = wrapper.rollout_observations(
+                    environment.observations(env_state), done
+                )
+                actions_info, policies_info, base_key = select_actions_fn(
+                    observations, current_params, base_key, *normalisation_args
+                )
+                (
+                    next_env_state,
+                    next_observations,
+                    rewards,
+                    next_done,
+                ) = environment.step(
+                    env_state, jnp.stack([actions_info[a] for a in agents])
+                )
+                # The environment state stays the same once the episode is done.
+                next_env_state = jax.tree_util.tree_map(
+                    lambda new, old: jnp.where(done, old, new),
+                    next_env_state,
+                    env_state,
+                )
+                next_done = jnp.logical_or(done, next_done)
+                trajectory = {
+                    "actions_info": actions_info,
+                    "policies_info": policies_info,
+                    "observations": next_observations,
+                    "rewards": rewards,
+                    "done": next_done,
+                }
+                if return_state_info:
+                    trajectory["s_t"] = environment.global_state(next_env_state)
+                return (next_env_state, next_done, base_key), trajectory
+
+            (env_state, done, base_key), trajectory = jax.lax.scan(
+                step,
+                (env_state, jnp.zeros((), dtype=bool), base_key),
+                None,
+                length=self._rollout_length,
+            )
+            return env_state, done, base_key, trajectory
+
+        return rollout
+
+    def _observe_trajectory(self, trajectory: Dict[str, Any]) -> Tuple[int, Dict]:
+        """Let the executor observe the steps of a rollout in the episode.
+
+        Args:
+            trajectory: rollout outputs in host memory, with a leading time axis.
+
+        Returns:
+            the number of steps observed and the rewards of each agent summed
+            over these steps.
+        """
+        # Steps after the end of the episode are discarded.
+        done = np.asarray(trajectory["done"])
+        num_steps = int(np.argmax(done)) + 1 if done.any() else len(done)
+        trajectory = jax.tree_util.tree_map(lambda x: x[:num_steps], trajectory)
+
+        timesteps = self._environment.make_trajectory(
+            trajectory["observations"], trajectory["rewards"], trajectory["done"]
+        )
+        env_extras = {"s_t": trajectory["s_t"]} if "s_t" in trajectory else {}
+        actions_info = trajectory["actions_info"]
+        policies_info = trajectory["policies_info"]
+
+        self._executor.store.actions_info = actions_info
+        self._executor.store.policies_info = policies_info
+        self._executor.observe_trajectory(
+            (actions_info, policies_info),
+            next_timesteps=timesteps,
+            next_extras=env_extras,
+        )
+
+        # Book-keeping.
+        self._compute_trajectory_statistics(timesteps.reward)
+        rollout_returns = {
+            agent: np.sum(rewards) for agent, rewards in timesteps.reward.items()
+        }
+        return num_steps, rollout_returns
+
+    def run_episode(self) -> loggers.LoggingData:
+        """Run one episode with compiled rollouts.
+
+        Returns:
+            An instance of `loggers.LoggingData`.
+        """
+        start_time = time.time()
+        # clear metrics at the start of each episode
+        self._executor.store.episode_metrics = {}
+        episode_steps = 0
+
+        timestep = self._environment.reset()
+
+        if type(timestep) == tuple:
+            timestep, env_extras = timestep
+        else:
+            env_extras = {}
+
+        # Make the first observation.
+        self._executor.observe_first(timestep, extras=env_extras)
+
+        if hasattr(self._executor.store, "policy_states"):
+            raise NotImplementedError(
+                "The jax rollout environment loop only supports feedforward executors."
+            )
+
+        episode_returns = {
+            agent: generate_zeros_from_spec(spec)
+            for agent, spec in self._environment.reward_spec().items()
+        }
+
+        done = False
+        while not done:
+            current_params = {
+                network: self._executor.store.networks[network].get_params()
+                for network in self._executor.store.agent_net_keys.values()
+            }
+            normalisation_args: Tuple = ()
+            if self._normalise_observations:
+                normalisation_args = executor_normalisation_args(
+                    self._executor, self._environment.agents
+                )
+            (
+                env_state,
+                done,
+                self._executor.store.base_key,
+                trajectory,
+            ) = self._rollout_fn(
+                self._environment.state,
+                current_params,
+                self._executor.store.base_key,
+                *normalisation_args,
+            )
+            done = bool(done)
+            self._environment.set_state(env_state, done)
+
+            # A single transfer of the whole rollout to host memory.
+            rollout_steps, rollout_returns = self._observe_trajectory(
+                jax.device_get(trajectory)
+            )
+            episode_steps += rollout_steps
+            for agent, reward in rollout_returns.items():
+                episode_returns[agent] = episode_returns[agent] + reward
+
+            if self._should_update:
+                self._executor.update()
+
+        return self._episode_results(episode_returns, episode_steps, start_time)
@@ -15,8 +15,8 @@
 
 """Wraps a Flatland MARL environment to be used as a dm_env environment."""
 import types as tp
-from functools import partial
-from typing import Any, Callable, Dict, List, Tuple, Union
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import dm_env
 import numpy as np
@@ -39,7 +39,7 @@ from gym.spaces.box import Box
 from mava.types import OLT, Observation
 from mava.utils.sort_utils import sort_str_num
 from mava.utils.wrapper_utils import (
-    convert_dm_compatible_observations,
+    DMCompatibleObservationConverter,
     convert_np_type,
     parameterized_restart,
 )
@@ -96,6 +96,8 @@ class FlatlandEnvWrapper(ParallelEnvWrapper):
         self._reset_next_step = True
         self._step_type = dm_env.StepType.FIRST
         self.num_actions = 5
+        # Created at the first conversion, since the specs are constant.
+        self._observation_converter: Optional[DMCompatibleObservationConverter] = None
 
         self.action_spaces = {
             agent: Discrete(self.num_actions) for agent in self.possible_agents
@@ -277,13 +279,11 @@ class FlatlandEnvWrapper(ParallelEnvWrapper):
         dones: Dict[str, bool],
     ) -> Observation:
         """Convert observation"""
-        return convert_dm_compatible_observations(
-            observes,
-            dones,
-            self.observation_spec(),
-            self.env_done(),
-            self.possible_agents,
-        )
+        if self._observation_converter is None:
+            self._observation_converter = DMCompatibleObservationConverter(
+                self.observation_spec(), self.possible_agents
+            )
+        return self._observation_converter.convert(observes, dones, self.env_done())
 
     # collate agent info and observation into a tuple,
     # making the agents obervation to
@@ -325,16 +325,18 @@ class FlatlandEnvWrapper(ParallelEnvWrapper):
         Obtains the actual preprocessor to be used based on the supplied
         preprocessor and the env's obs_builder object
         """
+        if isinstance(self.obs_builder, TreeObsForRailEnv) and not preprocessor:
+            # Encode the trees of all the agents at once.
+            encoder = TreeObservationEncoder(self.obs_builder.max_depth)
+
+            def tree_preprocessor(obs: Dict[int, Any]) -> Dict[int, np.ndarray]:
+                """Return encoded tree observations."""
+                return dict(zip(obs.keys(), encoder(list(obs.values()))))
+
+            return tree_preprocessor
+
         if not isinstance(self.obs_builder, GlobalObsForRailEnv):
             _preprocessor = preprocessor if preprocessor else lambda x: x
-            if isinstance(self.obs_builder, TreeObsForRailEnv):
-                _preprocessor = (
-                    partial(
-                        normalize_observation, tree_depth=self.obs_builder.max_depth
-                    )
-                    if not preprocessor
-                    else preprocessor
-                )
             assert _preprocessor is not None
         else:
 
@@ -558,95 +560,166 @@ def norm_obs_clip(
     return np.clip((np.array(obs) - min_obs) / norm, clip_min, clip_max)
 
 
-def _split_node_into_feature_groups(
-    node: Node,
-) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-    """Splits node into features."""
-    data = np.zeros(6)
-    distance = np.zeros(1)
-    agent_data = np.zeros(4)
-
-    data[0] = node.dist_own_target_encountered
-    data[1] = node.dist_other_target_encountered
-    data[2] = node.dist_other_agent_encountered
-    data[3] = node.dist_potential_conflict
-    data[4] = node.dist_unusable_switch
-    data[5] = node.dist_to_next_branch
-
-    distance[0] = node.dist_min_to_target
-
-    agent_data[0] = node.num_agents_same_direction
-    agent_data[1] = node.num_agents_opposite_direction
-    agent_data[2] = node.num_agents_malfunctioning
-    agent_data[3] = node.speed_min_fractional
-
-    return data, distance, agent_data
-
-
-def _split_subtree_into_feature_groups(
-    node: Node, current_tree_depth: int, max_tree_depth: int
-) -> Tuple:
-    """Split subtree."""
-    if node == -np.inf:
-        remaining_depth = max_tree_depth - current_tree_depth
-        # reference:
-        # https://stackoverflow.com/questions/515214/total-number-of-nodes-in-a-tree-data-structure
-        num_remaining_nodes = int((4 ** (remaining_depth + 1) - 1) / (4 - 1))
-        return (
-            [-np.inf] * num_remaining_nodes * 6,
-            [-np.inf] * num_remaining_nodes,
-            [-np.inf] * num_remaining_nodes * 4,
-        )
+# Features of a tree node, in their order in the normalised observation: the six
+# distances to encountered objects, the distance to the target and the four
+# features of the encountered agents.
+_node_features = attrgetter(
+    "dist_own_target_encountered",
+    "dist_other_target_encountered",
+    "dist_other_agent_encountered",
+    "dist_potential_conflict",
+    "dist_unusable_switch",
+    "dist_to_next_branch",
+    "dist_min_to_target",
+    "num_agents_same_direction",
+    "num_agents_opposite_direction",
+    "num_agents_malfunctioning",
+    "speed_min_fractional",
+)
+_NUM_NODE_FEATURES = 11
+
+
+def batched_norm_obs_clip(
+    obs: np.ndarray,
+    clip_min: int = -1,
+    clip_max: int = 1,
+    fixed_radius: int = 0,
+    normalize_to_range: bool = False,
+) -> np.ndarray:
+    """Normalize a batch of observations, as norm_obs_clip does for each row.
+
+    Args:
+        obs: observations of shape [batch_size, observation_size].
+        clip_min: min value where observation will be clipped.
+        clip_max: max value where observation will be clipped.
+        fixed_radius: maximum value of the observations, if positive.
+        normalize_to_range: whether to shift by the smallest non negative value.
+
+    Returns:
+        normalized and clipped observations.
+    """
+    if fixed_radius > 0:
+        max_obs = np.full(obs.shape[:1], fixed_radius, dtype=np.float64)
+    else:
+        # max(1, max_lt(obs, 1000)) + 1 of each row.
+        valid = (obs >= 0) & (obs < 1000)
+        max_obs = np.maximum(np.max(np.where(valid, obs, 0), axis=1), 1) + 1
+
+    min_obs = np.zeros_like(max_obs)
+    if normalize_to_range:
+        # min_gt(obs, 0) of each row.
+        min_obs = np.min(np.where(obs >= 0, obs, np.inf), axis=1)
+    min_obs = np.minimum(min_obs, max_obs)
+
+    equal = max_obs == min_obs
+    shift = np.where(equal, 0, min_obs)[:, None]
+    norm = np.where(equal, max_obs, np.abs(max_obs - min_obs))[:, None]
+    return np.clip((obs - shift) / norm, clip_min, clip_max)
 
-    data, distance, agent_data = _split_node_into_feature_groups(node)
 
-    if not node.childs:
-        return data, distance, agent_data
+class TreeObservationEncoder:
+    """Encodes TreeObsForRailEnv observations of many agents at once.
 
-    for direction in TreeObsForRailEnv.tree_explored_actions_char:
-        sub_data, sub_distance, sub_agent_data = _split_subtree_into_feature_groups(
-            node.childs[direction], current_tree_depth + 1, max_tree_depth
+    The tree of an agent is padded to a full tree with four children per node,
+    whose nodes have precomputed slots in depth first order. The features of
+    each node are written to its slot of a features array of all the agents,
+    which is then normalized in a single pass. Missing nodes have -inf
+    features, as in the flatland baselines, and missing observations are zeros.
+    """
+
+    def __init__(self, max_tree_depth: int, observation_radius: int = 0) -> None:
+        """Precompute the slots of the nodes.
+
+        Args:
+            max_tree_depth: depth of the trees.
+            observation_radius: maximum distance of the normalized distances to
+                encountered objects, if positive.
+        """
+        self._max_tree_depth = max_tree_depth
+        self._observation_radius = observation_radius
+
+        # Number of nodes in a full tree whose root is at each depth.
+        subtree_sizes = [
+            (4 ** (max_tree_depth - depth + 1) - 1) // 3
+            for depth in range(max_tree_depth + 2)
+        ]
+        self.num_nodes = subtree_sizes[0]
+        # Offsets of the slots of the children from the slot of their parent.
+        self._child_offsets = [
+            [1 + child * subtree_sizes[depth + 1] for child in range(4)]
+            for depth in range(max_tree_depth)
+        ]
+
+    @property
+    def observation_size(self) -> int:
+        """Size of the encoded observations."""
+        return _NUM_NODE_FEATURES * self.num_nodes
+
+    def features(self, trees: Sequence[Optional[Node]]) -> np.ndarray:
+        """Features of the nodes of the trees.
+
+        Args:
+            trees: root nodes of the trees, or None for missing observations.
+
+        Returns:
+            features of shape [num_trees, num_nodes, 11].
+        """
+        features = np.full((len(trees), self.num_nodes, _NUM_NODE_FEATURES), -np.inf)
+        directions = TreeObsForRailEnv.tree_explored_actions_char
+        for tree_features, tree in zip(features, trees):
+            if tree is None:
+                continue
+            nodes = [(tree, 0, 0)]
+            while nodes:
+                node, slot, depth = nodes.pop()
+                tree_features[slot] = _node_features(node)
+                if depth == self._max_tree_depth or not node.childs:
+                    continue
+                for direction, offset in zip(directions, self._child_offsets[depth]):
+                    child = node.childs[direction]
+                    if child != -np.inf:
+                        nodes.append((child, slot + offset, depth + 1))
+        return features
+
+    def __call__(self, trees: Sequence[Optional[Node]]) -> np.ndarray:
+        """Encode and normalize the observations of the agents.
+
+        Args:
+            trees: root nodes of the trees, or None for missing observations.
+
+        Returns:
+            observations of shape [num_trees, observation_size].
+        """
+        features = self.features(trees)
+        num_trees = len(trees)
+        data = batched_norm_obs_clip(
+            features[:, :, :6].reshape(num_trees, -1),
+            fixed_radius=self._observation_radius,
         )
-        data = np.concatenate((data, sub_data))
-        distance = np.concatenate((distance, sub_distance))
-        agent_data = np.concatenate((agent_data, sub_agent_data))
+        distance = batched_norm_obs_clip(features[:, :, 6], normalize_to_range=True)
+        agent_data = np.clip(features[:, :, 7:].reshape(num_trees, -1), -1, 1)
 
-    return data, distance, agent_data
+        observations = np.concatenate((data, distance, agent_data), axis=1).astype(
+            np.float32
+        )
+        observations[[tree is None for tree in trees]] = 0.0
+        return observations
 
 
 def split_tree_into_feature_groups(
     tree: Node, max_tree_depth: int
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """This function splits the tree into three difference arrays."""
-    data, distance, agent_data = _split_node_into_feature_groups(tree)
-
-    for direction in TreeObsForRailEnv.tree_explored_actions_char:
-        sub_data, sub_distance, sub_agent_data = _split_subtree_into_feature_groups(
-            tree.childs[direction], 1, max_tree_depth
-        )
-        data = np.concatenate((data, sub_data))
-        distance = np.concatenate((distance, sub_distance))
-        agent_data = np.concatenate((agent_data, sub_agent_data))
-
-    return data, distance, agent_data
+    features = TreeObservationEncoder(max_tree_depth).features([tree])[0]
+    return (
+        features[:, :6].reshape(-1),
+        features[:, 6],
+        features[:, 7:].reshape(-1),
+    )
 
 
 def normalize_observation(
     observation: Node, tree_depth: int, observation_radius: int = 0
 ) -> np.ndarray:
     """This function normalizes the observation used by the RL algorithm."""
-    if observation is None:
-        return np.zeros(
-            11 * sum(np.power(4, i) for i in range(tree_depth + 1)),
-            dtype=np.float32,
-        )
-    data, distance, agent_data = split_tree_into_feature_groups(observation, tree_depth)
-
-    data = norm_obs_clip(data, fixed_radius=observation_radius)
-    distance = norm_obs_clip(distance, normalize_to_range=True)
-    agent_data = np.clip(agent_data, -1, 1)
-    normalized_obs = np.array(
-        np.concatenate((np.concatenate((data, distance)), agent_data)),
-        dtype=np.float32,
-    )
-    return normalized_obs
+    return TreeObservationEncoder(tree_depth, observation_radius)([observation])[0]
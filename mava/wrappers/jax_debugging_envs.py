@@ -0,0 +1,305 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Wraps a jax debugging environment to be used as a dm_env environment."""
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import dm_env
+import jax
+import jax.numpy as jnp
+import numpy as np
+from acme import specs
+
+from mava.types import OLT
+from mava.utils.debugging.jax_simple_spread import JaxSimpleSpread
+from mava.utils.wrapper_utils import parameterized_restart
+from mava.wrappers.env_wrappers import ParallelEnvWrapper
+
+
+class JaxDebuggingEnvWrapper(ParallelEnvWrapper):
+    """Environment wrapper for the jax debugging environments.
+
+    Behaves like the DebuggingEnvWrapper of the debugging MultiAgentEnv, with
+    the environment stepped by a single jitted function.
+    """
+
+    def __init__(
+        self,
+        environment: JaxSimpleSpread,
+        return_state_info: bool = False,
+        random_seed: Optional[int] = None,
+    ):
+        """Create the wrapper.
+
+        Args:
+            environment: jax environment.
+            return_state_info: whether to return the global state as extras.
+            random_seed: seed of the random key used to reset the environment.
+        """
+        self._environment = environment
+        self.return_state_info = return_state_info
+        self._agents = [f"agent_{i}" for i in range(environment.num_agents)]
+        self._key = jax.random.PRNGKey(random_seed or 0)
+        self._reset_fn = jax.jit(environment.reset)
+        self._step_fn = jax.jit(environment.step)
+        self._state: Any = None
+        self._env_done = False
+        self._reset_next_step = True
+
+        if environment.action_space == "discrete":
+            self._legal_actions = np.ones(environment.num_actions, dtype=np.int64)
+        else:
+            self._legal_actions = np.ones(environment.dim_p, dtype=np.float32)
+        self._discounts = {agent: np.float32(1.0) for agent in self._agents}
+
+    def seed(self, random_seed: int) -> None:
+        """Seed the random key used to reset the environment."""
+        self._key = jax.random.PRNGKey(random_seed)
+
+    def reset(
+        self,
+    ) -> Union[dm_env.TimeStep, Tuple[dm_env.TimeStep, Dict[str, np.ndarray]]]:
+        """Resets the episode."""
+        self._reset_next_step = False
+        self._env_done = False
+        self._key, reset_key = jax.random.split(self._key)
+        self._state, observations = self._reset_fn(reset_key)
+
+        timestep = parameterized_restart(
+            {agent: np.float32(0.0) for agent in self._agents},
+            self._discounts,
+            self._convert_observations(np.asarray(observations), False),
+        )
+        if self.return_state_info:
+            return timestep, {"s_t": self._global_state()}
+        return timestep
+
+    def step(
+        self, actions: Dict[str, Any]
+    ) -> Union[dm_env.TimeStep, Tuple[dm_env.TimeStep, Dict[str, np.ndarray]]]:
+        """Steps the environment."""
+        if self._reset_next_step:
+            return self.reset()
+
+        self._state, observations, rewards, done = self._step_fn(
+            self._state,
+            np.stack([np.asarray(actions[agent]) for agent in self._agents]),
+        )
+        observations, rewards, done = jax.device_get((observations, rewards, done))
+
+        self._env_done = bool(done)
+        self._reset_next_step = self._env_done
+        timestep = self.make_timestep(observations, rewards, self._env_done)
+        if self.return_state_info:
+            return timestep, {"s_t": self._global_state()}
+        return timestep
+
+    def make_timestep(
+        self, observations: np.ndarray, rewards: np.ndarray, done: bool
+    ) -> dm_env.TimeStep:
+        """Create the dm_env timestep of a step of the jax environment.
+
+        Args:
+            observations: observations of shape [num_agents, observation_size].
+            rewards: rewards of shape [num_agents].
+            done: whether the episode is done.
+
+        Returns:
+            The timestep.
+        """
+        return dm_env.TimeStep(
+            observation=self._convert_observations(observations, done),
+            reward={
+                agent: np.float32(reward)
+                for agent, reward in zip(self._agents, rewards)
+            },
+            discount=self._discounts,
+            step_type=dm_env.StepType.LAST if done else dm_env.StepType.MID,
+        )
+
+    def make_trajectory(
+        self, observations: np.ndarray, rewards: np.ndarray, done: np.ndarray
+    ) -> dm_env.TimeStep:
+        """Create the timesteps of consecutive steps of the jax environment.
+
+        Args:
+            observations: observations of shape
+                [num_steps, num_agents, observation_size].
+            rewards: rewards of shape [num_steps, num_agents].
+            done: whether the episode is done, of shape [num_steps].
+
+        Returns:
+            A timestep whose fields have a leading time axis, stacking the
+            timesteps made by make_timestep.
+        """
+        num_steps = len(done)
+        terminal = np.asarray(done, dtype=np.float32).reshape(num_steps, 1)
+        legal_actions = np.broadcast_to(
+            self._legal_actions, (num_steps,) + self._legal_actions.shape
+        )
+        return dm_env.TimeStep(
+            observation={
+                agent: OLT(
+                    observation=observations[:, agent_id],
+                    legal_actions=legal_actions,
+                    terminal=terminal,
+                )
+                for agent_id, agent in enumerate(self._agents)
+            },
+            reward={
+                agent: np.asarray(rewards[:, agent_id], dtype=np.float32)
+                for agent_id, agent in enumerate(self._agents)
+            },
+            discount={
+                agent: np.full(num_steps, discount)
+                for agent, discount in self._discounts.items()
+            },
+            step_type=np.where(done, dm_env.StepType.LAST, dm_env.StepType.MID),
+        )
+
+    def rollout_observations(
+        self, observations: jnp.ndarray, done: jnp.ndarray
+    ) -> Dict[str, OLT]:
+        """Split the batched observations per agent inside jitted code.
+
+        Args:
+            observations: observations of shape [num_agents, observation_size].
+            done: whether the episode is done.
+
+        Returns:
+            Observations of each agent, as given to the executor.
+        """
+        terminal = jnp.reshape(done, (1,)).astype(jnp.float32)
+        legal_actions = jnp.asarray(self._legal_actions)
+        return {
+            agent: OLT(
+                observation=observations[agent_id],
+                legal_actions=legal_actions,
+                terminal=terminal,
+            )
+            for agent_id, agent in enumerate(self._agents)
+        }
+
+    @property
+    def state(self) -> Any:
+        """State of the jax environment in the current episode."""
+        return self._state
+
+    def set_state(self, state: Any, done: bool) -> None:
+        """Continue the episode from a state computed outside the wrapper.
+
+        Args:
+            state: new state of the jax environment.
+            done: whether the episode is done in the new state.
+        """
+        self._state = state
+        self._env_done = done
+        self._reset_next_step = done
+
+    def _convert_observations(
+        self, observations: np.ndarray, done: bool
+    ) -> Dict[str, OLT]:
+        """Split the batched observations into dm_env observations per agent."""
+        terminal = np.asarray([done], dtype=np.float32)
+        return {
+            agent: OLT(
+                observation=observation,
+                legal_actions=self._legal_actions,
+                terminal=terminal,
+            )
+            for agent, observation in zip(self._agents, observations)
+        }
+
+    def _global_state(self) -> np.ndarray:
+        """Global state of the environment."""
+        return np.asarray(self._environment.global_state(self._state))
+
+    def observation_spec(self) -> Dict[str, OLT]:
+        """Observation spec."""
+        return {
+            agent: OLT(
+                observation=specs.BoundedArray(
+                    shape=(self._environment.observation_size,),
+                    dtype=np.float32,
+                    minimum=-np.inf,
+                    maximum=np.inf,
+                ),
+                legal_actions=self._legal_actions,
+                terminal=specs.Array((1,), np.float32),
+            )
+            for agent in self._agents
+        }
+
+    def action_spec(
+        self,
+    ) -> Dict[str, Union[specs.DiscreteArray, specs.BoundedArray]]:
+        """Action spec."""
+        if self._environment.action_space == "discrete":
+            action_spec = specs.DiscreteArray(
+                num_values=self._environment.num_actions, dtype=np.int64
+            )
+        else:
+            action_spec = specs.BoundedArray(
+                shape=(self._environment.dim_p,),
+                dtype=np.float32,
+                minimum=-1.0,
+                maximum=1.0,
+            )
+        return {agent: action_spec for agent in self._agents}
+
+    def reward_spec(self) -> Dict[str, specs.Array]:
+        """Reward spec."""
+        return {agent: specs.Array((), np.float32) for agent in self._agents}
+
+    def discount_spec(self) -> Dict[str, specs.BoundedArray]:
+        """Discount spec."""
+        return {
+            agent: specs.BoundedArray((), np.float32, minimum=0, maximum=1.0)
+            for agent in self._agents
+        }
+
+    def extras_spec(self) -> Dict[str, specs.BoundedArray]:
+        """Extras spec, holding the global state if it is returned."""
+        if not self.return_state_info:
+            return {}
+        shape = (self._environment.state_size,)
+        return {
+            "s_t": specs.BoundedArray(
+                shape=shape,
+                dtype="float32",
+                name="observation",
+                minimum=[float("-inf")] * shape[0],
+                maximum=[float("inf")] * shape[0],
+            )
+        }
+
+    def env_done(self) -> bool:
+        """Whether the episode is done."""
+        return self._env_done
+
+    @property
+    def agents(self) -> List:
+        """Agents in the environment."""
+        return self._agents
+
+    @property
+    def possible_agents(self) -> List:
+        """All possible agents in the environment."""
+        return self._agents
+
+    @property
+    def environment(self) -> JaxSimpleSpread:
+        """The wrapped jax environment."""
+        return self._environment
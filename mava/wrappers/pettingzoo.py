@@ -32,8 +32,8 @@ except ModuleNotFoundError:
 
 from mava import types
 from mava.utils.wrapper_utils import (
+    DMCompatibleObservationConverter,
     apply_env_wrapper_preprocessors,
-    convert_dm_compatible_observations,
     convert_np_type,
     parameterized_restart,
 )
@@ -62,6 +62,8 @@ class PettingZooParallelEnvWrapper(ParallelEnvWrapper):
         self._environment = environment
         self._reset_next_step = True
         self._return_state_info = return_state_info
+        # Created at the first conversion, since the specs are constant.
+        self._observation_converter: Optional[DMCompatibleObservationConverter] = None
 
         if env_preprocess_wrappers:
             self._environment = apply_env_wrapper_preprocessors(
@@ -84,6 +86,11 @@ class PettingZooParallelEnvWrapper(ParallelEnvWrapper):
             agent: convert_np_type(discount_spec[agent].dtype, 1)
             for agent in self.possible_agents
         }
+        # Terminal discount should be 0.0 as per dm_env
+        self._terminal_discounts = {
+            agent: convert_np_type(discount_spec[agent].dtype, 0.0)
+            for agent in self.possible_agents
+        }
 
         if self._return_state_info and type(observe) == tuple:
             observe, state = observe
@@ -94,8 +101,11 @@ class PettingZooParallelEnvWrapper(ParallelEnvWrapper):
             observe, {agent: False for agent in self.possible_agents}
         )
         rewards_spec = self.reward_spec()
+        self._reward_dtypes = {
+            agent: rewards_spec[agent].dtype for agent in self.possible_agents
+        }
         rewards = {
-            agent: convert_np_type(rewards_spec[agent].dtype, 0)
+            agent: convert_np_type(self._reward_dtypes[agent], 0)
             for agent in self.possible_agents
         }
 
@@ -141,11 +151,7 @@ class PettingZooParallelEnvWrapper(ParallelEnvWrapper):
         if self.env_done():
             self._step_type = dm_env.StepType.LAST
             self._reset_next_step = True
-            # Terminal discount should be 0.0 as per dm_env
-            discount = {
-                agent: convert_np_type(self.discount_spec()[agent].dtype, 0.0)
-                for agent in self.possible_agents
-            }
+            discount = self._terminal_discounts
         else:
             self._step_type = dm_env.StepType.MID
             discount = self._discounts
@@ -202,16 +208,15 @@ class PettingZooParallelEnvWrapper(ParallelEnvWrapper):
         Args:
             rewards (Dict[str, float]): rewards per agent.
         """
-        rewards_spec = self.reward_spec()
         rewards_return = {}
         for agent in self.possible_agents:
+            # Set at reset.
+            reward_dtype = self._reward_dtypes[agent]
             if agent in rewards:
-                rewards_return[agent] = convert_np_type(
-                    rewards_spec[agent].dtype, rewards[agent]
-                )
+                rewards_return[agent] = convert_np_type(reward_dtype, rewards[agent])
             # Default reward
             else:
-                rewards_return[agent] = convert_np_type(rewards_spec[agent].dtype, 0)
+                rewards_return[agent] = convert_np_type(reward_dtype, 0)
         return rewards_return
 
     def _convert_observations(
@@ -226,13 +231,11 @@ class PettingZooParallelEnvWrapper(ParallelEnvWrapper):
         Returns:
             types.Observation: dm compatible observations.
         """
-        return convert_dm_compatible_observations(
-            observes,
-            dones,
-            self.observation_spec(),
-            self.env_done(),
-            self.possible_agents,
-        )
+        if self._observation_converter is None:
+            self._observation_converter = DMCompatibleObservationConverter(
+                self.observation_spec(), self.possible_agents
+            )
+        return self._observation_converter.convert(observes, dones, self.env_done())
 
     def observation_spec(self) -> Dict[str, types.OLT]:
         """Observation spec.
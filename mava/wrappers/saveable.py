@@ -1,5 +1,7 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
+import jax
+import numpy as np
 from acme.core import Saveable as AcmeSaveable
 
 """SaveableWrapper as needed to use the Acme JAX checkpointer."""
@@ -13,13 +15,32 @@ class SaveableWrapper(AcmeSaveable):
             state: a dictionary of variables to save
         """
         self.state = state
+        self._snapshot: Optional[Dict[str, Any]] = None
+
+    def snapshot(self) -> None:
+        """Take a snapshot of the system state to be saved next
+
+        Numpy arrays are copied since they can be updated in place, while jax
+        arrays are immutable and kept as they are. This lets the snapshot be
+        saved in the background while the system state keeps changing.
+
+        Returns:
+            None.
+        """
+        self._snapshot = jax.tree_util.tree_map(
+            lambda x: x.copy() if isinstance(x, np.ndarray) else x, self.state
+        )
 
     def save(self) -> Dict[str, Any]:
         """Save system state
 
         Returns:
-            system state.
+            the last snapshot of the system state if one was taken, otherwise
+            the system state.
         """
+        if self._snapshot is not None:
+            state, self._snapshot = self._snapshot, None
+            return state
         return self.state
 
     def restore(self, state: Dict[str, Any]) -> None:
@@ -61,6 +61,15 @@ class SMACWrapper(ParallelEnvWrapper):
 
         self._death_masking = death_masking
 
+        # Terminals and death masks are shared by the converted observations.
+        self._terminals = (
+            np.zeros((1,), dtype=np.float32),
+            np.ones((1,), dtype=np.float32),
+        )
+        self._death_mask: Optional[np.ndarray] = None
+        for terminal in self._terminals:
+            terminal.setflags(write=False)
+
     def reset(self) -> dm_env.TimeStep:
         """Resets the env, if it was not reset on the previous step.
 
@@ -88,11 +97,19 @@ class SMACWrapper(ParallelEnvWrapper):
             agent: convert_np_type(discount_spec[agent].dtype, 1)
             for agent in self._agents
         }
+        # Discount on last timestep set to zero
+        self._terminal_discounts = {
+            agent: convert_np_type(discount_spec[agent].dtype, 0.0)
+            for agent in self._agents
+        }
 
         # Set reward to zero for all agents
         rewards_spec = self.reward_spec()
+        self._reward_dtypes = {
+            agent: rewards_spec[agent].dtype for agent in self._agents
+        }
         rewards = {
-            agent: convert_np_type(rewards_spec[agent].dtype, 0)
+            agent: convert_np_type(self._reward_dtypes[agent], 0)
             for agent in self._agents
         }
 
@@ -142,10 +159,7 @@ class SMACWrapper(ParallelEnvWrapper):
             self._step_type = dm_env.StepType.LAST
 
             # Discount on last timestep set to zero
-            self._discounts = {
-                agent: convert_np_type(self.discount_spec()[agent].dtype, 0.0)
-                for agent in self._agents
-            }
+            self._discounts = self._terminal_discounts
         else:
             self._step_type = dm_env.StepType.MID
 
@@ -173,20 +187,21 @@ class SMACWrapper(ParallelEnvWrapper):
         Args:
             reward: rewards per agent.
         """
-        rewards_spec = self.reward_spec()
         rewards = {}
         for agent in self._agents:
-            rewards[agent] = convert_np_type(rewards_spec[agent].dtype, reward)
+            # Set at reset.
+            rewards[agent] = convert_np_type(self._reward_dtypes[agent], reward)
         return rewards
 
-    def _get_legal_actions(self) -> List:
-        """Get legal actions from the environment."""
-        legal_actions = []
-        for i, _ in enumerate(self._agents):
-            legal_actions.append(
-                np.array(self._environment.get_avail_agent_actions(i), dtype="int")
-            )
-        return legal_actions
+    def _get_legal_actions(self) -> np.ndarray:
+        """Get legal actions from the environment, stacked over the agents."""
+        return np.array(
+            [
+                self._environment.get_avail_agent_actions(i)
+                for i in range(len(self._agents))
+            ],
+            dtype="int",
+        )
 
     def is_dead(self, agent: Any) -> bool:
         """Check if the agent is dead.
@@ -200,7 +215,7 @@ class SMACWrapper(ParallelEnvWrapper):
         return is_dead
 
     def _convert_observations(
-        self, observations: List, legal_actions: List, done: bool
+        self, observations: List, legal_actions: np.ndarray, done: bool
     ) -> types.Observation:
         """Convert SMAC observation so it's dm_env compatible.
 
@@ -212,21 +227,40 @@ class SMACWrapper(ParallelEnvWrapper):
             types.Observation: dm compatible observations.
         """
         olt_observations = {}
+        terminal = self._terminals[bool(done)]
         for i, agent in enumerate(self._agents):
             # Check if agent is dead, if so, apply death mask.
             if self._death_masking and self.is_dead(i):
-                observation = np.zeros_like(observations[i])
+                observation = self._get_death_mask(observations[i])
             else:
                 observation = observations[i]
 
             olt_observations[agent] = types.OLT(
                 observation=observation,
                 legal_actions=legal_actions[i],
-                terminal=np.asarray([done], dtype=np.float32),
+                terminal=terminal,
             )
 
         return olt_observations
 
+    def _get_death_mask(self, observation: np.ndarray) -> np.ndarray:
+        """Observation of dead agents, shared by all of them.
+
+        Args:
+            observation: observation of a dead agent.
+
+        Returns:
+            zeros like the observation.
+        """
+        if (
+            self._death_mask is None
+            or self._death_mask.shape != observation.shape
+            or self._death_mask.dtype != observation.dtype
+        ):
+            self._death_mask = np.zeros_like(observation)
+            self._death_mask.setflags(write=False)
+        return self._death_mask
+
     def extras_spec(self) -> Dict[str, specs.BoundedArray]:
         """Function returns extra spec (format) of the env.
 
@@ -0,0 +1,422 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Runs a parallel environment in a worker process."""
+import multiprocessing
+import traceback
+from multiprocessing import connection
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import dm_env
+import numpy as np
+import tree
+
+from mava.utils.shared_memory_utils import (
+    array_layout,
+    array_views,
+    attach_shared_memory,
+    create_shared_memory,
+    free_shared_memory,
+)
+from mava.wrappers.env_wrappers import ParallelEnvWrapper
+
+
+def _timestep_data(timestep: dm_env.TimeStep) -> Tuple:
+    """Returns the array data of a timestep, i.e. everything but the step type."""
+    return (timestep.reward, timestep.discount, timestep.observation)
+
+
+class SharedTimestepBuffer:
+    """Shared memory buffer holding the array data of a timestep.
+
+    The layout of the buffer is fixed by a template timestep. Timesteps with a
+    different structure, shape or dtype do not fit in the buffer.
+    """
+
+    def __init__(self, template: dm_env.TimeStep, name: Optional[str] = None):
+        """Create or attach to the shared memory of a timestep buffer.
+
+        Args:
+            template: timestep defining the layout of the buffer.
+            name: name of an existing buffer to attach to. Defaults to None,
+                in which case a new buffer is created.
+        """
+        self._structure = _timestep_data(template)
+        layout, size = array_layout(tree.flatten(self._structure))
+
+        self._owner = name is None
+        if name is None:
+            self.shared_memory = create_shared_memory(size)
+        else:
+            self.shared_memory = attach_shared_memory(name)
+        self._views = array_views(self.shared_memory, layout)
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+        return self.shared_memory.name
+
+    def write(self, timestep: dm_env.TimeStep) -> bool:
+        """Write the array data of a timestep into the buffer.
+
+        Args:
+            timestep: timestep to write.
+
+        Returns:
+            whether the timestep fits the buffer and was written.
+        """
+        data = _timestep_data(timestep)
+        try:
+            tree.assert_same_structure(self._structure, data)
+        except (TypeError, ValueError):
+            return False
+
+        leaves = [np.asarray(leaf) for leaf in tree.flatten(data)]
+        if any(
+            leaf.shape != view.shape or leaf.dtype != view.dtype
+            for leaf, view in zip(leaves, self._views)
+        ):
+            return False
+
+        for leaf, view in zip(leaves, self._views):
+            view[...] = leaf
+        return True
+
+    def read(self, step_type: dm_env.StepType) -> dm_env.TimeStep:
+        """Read a timestep from the buffer.
+
+        The arrays are copied out of shared memory, since the worker overwrites
+        the buffer on its next step.
+
+        Args:
+            step_type: step type of the timestep.
+
+        Returns:
+            the timestep stored in the buffer.
+        """
+        reward, discount, observation = tree.unflatten_as(
+            self._structure,
+            [view.copy() if view.ndim else view[()] for view in self._views],
+        )
+        return dm_env.TimeStep(
+            step_type=step_type,
+            reward=reward,
+            discount=discount,
+            observation=observation,
+        )
+
+    def close(self) -> None:
+        """Release the shared memory, freeing it if this buffer created it."""
+        self._views = []
+        if self._owner:
+            free_shared_memory(self.shared_memory)
+        else:
+            self.shared_memory.close()
+
+
+def _environment_worker(  # noqa: C901
+    remote: connection.Connection,
+    environment_factory: Callable[..., Tuple[dm_env.Environment, Any]],
+    evaluation: bool,
+) -> None:
+    """Worker process that owns an environment and serves commands over a pipe.
+
+    Timesteps are written to a shared memory buffer laid out after the first
+    step, since steps are the hot path and first timesteps can differ in
+    structure. Timesteps that do not fit the buffer are sent over the pipe.
+
+    Args:
+        remote: worker end of the pipe.
+        environment_factory: function that creates the environment.
+        evaluation: whether to create an evaluation environment.
+    """
+    environment, _ = environment_factory(evaluation=evaluation)
+    buffer: Optional[SharedTimestepBuffer] = None
+
+    def send_timestep(output: Any, create_buffer: bool) -> None:
+        nonlocal buffer
+        is_tuple = type(output) == tuple
+        timestep, extras = output if is_tuple else (output, {})
+        # Death masked agents change during an episode and are used on every
+        # step, so they are sent along with the timestep.
+        death_masked_agents = getattr(environment, "death_masked_agents", [])
+        if buffer is None:
+            if create_buffer:
+                buffer = SharedTimestepBuffer(timestep)
+            remote.send(
+                ("timestep", (output, buffer and buffer.name, death_masked_agents))
+            )
+        elif buffer.write(timestep):
+            remote.send(
+                (
+                    "shared",
+                    (timestep.step_type, extras, is_tuple, death_masked_agents),
+                )
+            )
+        else:
+            remote.send(("timestep", (output, None, death_masked_agents)))
+
+    try:
+        while True:
+            command, data = remote.recv()
+            try:
+                if command == "reset":
+                    send_timestep(environment.reset(), create_buffer=False)
+                elif command == "step":
+                    send_timestep(environment.step(data), create_buffer=True)
+                elif command == "getattr":
+                    attribute = getattr(environment, data)
+                    if callable(attribute):
+                        remote.send(("callable", None))
+                    else:
+                        remote.send(("value", attribute))
+                elif command == "call":
+                    name, args, kwargs = data
+                    remote.send(("value", getattr(environment, name)(*args, **kwargs)))
+                elif command == "close":
+                    break
+                else:
+                    raise ValueError(f"Unknown environment worker command {command}.")
+            except Exception:
+                remote.send(("error", traceback.format_exc()))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        if hasattr(environment, "close"):
+            environment.close()
+        if buffer is not None:
+            buffer.close()
+        remote.close()
+
+
+class SubprocessEnvWrapper(ParallelEnvWrapper):
+    """Runs a parallel environment in its own worker process.
+
+    The wrapped environment is created by `environment_factory` inside the
+    worker, so slow simulators step without blocking the executor and several
+    of them can use all the cores of a machine. Observations are passed back
+    through shared memory. `step_async` and `step_wait` split a step into
+    sending the actions and collecting the timestep, and attributes that the
+    wrapper does not define are looked up on the remote environment.
+    """
+
+    def __init__(
+        self,
+        environment_factory: Callable[..., Tuple[dm_env.Environment, Any]],
+        evaluation: bool = False,
+        start_method: str = "spawn",
+    ):
+        """Start the environment worker process.
+
+        Args:
+            environment_factory: function that creates the environment, it
+                must be picklable.
+            evaluation: whether to create an evaluation environment.
+            start_method: multiprocessing start method of the worker.
+        """
+        context = multiprocessing.get_context(start_method)
+        self.connection, worker_remote = context.Pipe()
+        self._process = context.Process(
+            target=_environment_worker,
+            args=(worker_remote, environment_factory, evaluation),
+            daemon=True,
+        )
+        self._process.start()
+        worker_remote.close()
+
+        self._buffer: Optional[SharedTimestepBuffer] = None
+        self._waiting = False
+        self._pending_output: Optional[Any] = None
+        self._closed = False
+        self._specs: Dict[str, Any] = {}
+        self._death_masked_agents: List = []
+
+    def _receive(self) -> Any:
+        """Receive the reply of the worker, raising worker errors locally."""
+        kind, data = self.connection.recv()
+        if kind == "error":
+            raise RuntimeError(f"Environment worker failed:\n{data}")
+        return kind, data
+
+    def _receive_timestep(self) -> Any:
+        """Receive a timestep, reading its arrays from shared memory if possible."""
+        kind, data = self._receive()
+        if kind == "shared":
+            step_type, extras, is_tuple, self._death_masked_agents = data
+            timestep = self._buffer.read(step_type)  # type: ignore
+            return (timestep, extras) if is_tuple else timestep
+
+        output, buffer_name, self._death_masked_agents = data
+        if buffer_name is not None:
+            timestep = output[0] if type(output) == tuple else output
+            self._buffer = SharedTimestepBuffer(timestep, name=buffer_name)
+        return output
+
+    def _send(self, command: str, data: Any = None) -> None:
+        if self._waiting and self._pending_output is None:
+            # Collect the outstanding step first to keep the replies in order.
+            self._pending_output = self._receive_timestep()
+        self.connection.send((command, data))
+
+    def _call(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        self._send("call", (name, args, kwargs))
+        return self._receive()[1]
+
+    def reset(self) -> Any:
+        """Resets the remote environment."""
+        if self._waiting:
+            self.step_wait()
+        self._send("reset")
+        return self._receive_timestep()
+
+    def step(self, actions: Dict[str, np.ndarray]) -> Any:
+        """Steps the remote environment and waits for the timestep."""
+        self.step_async(actions)
+        return self.step_wait()
+
+    def step_async(self, actions: Dict[str, np.ndarray]) -> None:
+        """Sends the actions to the remote environment without waiting."""
+        if self._waiting:
+            raise RuntimeError("Call step_wait before stepping the environment again.")
+        self._send("step", actions)
+        self._waiting = True
+
+    def step_wait(self) -> Any:
+        """Waits for the timestep of the last `step_async` call."""
+        if not self._waiting:
+            raise RuntimeError("Call step_async before step_wait.")
+        self._waiting = False
+        output, self._pending_output = self._pending_output, None
+        if output is None:
+            output = self._receive_timestep()
+        return output
+
+    def ready(self) -> bool:
+        """Whether the timestep of the last `step_async` call is available."""
+        return self._waiting and (
+            self._pending_output is not None or self.connection.poll()
+        )
+
+    def _cached_spec(self, name: str) -> Any:
+        if name not in self._specs:
+            self._specs[name] = self._call(name)
+        return self._specs[name]
+
+    def observation_spec(self) -> Any:
+        """Observation spec of the remote environment."""
+        return self._cached_spec("observation_spec")
+
+    def action_spec(self) -> Any:
+        """Action spec of the remote environment."""
+        return self._cached_spec("action_spec")
+
+    def reward_spec(self) -> Any:
+        """Reward spec of the remote environment."""
+        return self._cached_spec("reward_spec")
+
+    def discount_spec(self) -> Any:
+        """Discount spec of the remote environment."""
+        return self._cached_spec("discount_spec")
+
+    def extras_spec(self) -> Any:
+        """Extras spec of the remote environment."""
+        return self._cached_spec("extras_spec")
+
+    def env_done(self) -> bool:
+        """Returns a bool indicating if the remote env is done."""
+        env_done = self.__getattr__("env_done")
+        return env_done() if callable(env_done) else env_done
+
+    @property
+    def agents(self) -> List:
+        """Returns the active agents in the remote env."""
+        return self.__getattr__("agents")
+
+    @property
+    def possible_agents(self) -> List:
+        """Returns all the possible agents in the remote env."""
+        return self.__getattr__("possible_agents")
+
+    @property
+    def death_masked_agents(self) -> List:
+        """Returns the death masked agents of the last received timestep."""
+        return self._death_masked_agents
+
+    @property
+    def obs_normalisation_start_index(self) -> int:
+        """Returns the first feature of the remote env that should be normalised."""
+        return self.__getattr__("obs_normalisation_start_index")
+
+    def close(self) -> None:
+        """Stops the worker process and releases the shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self._waiting:
+                self.step_wait()
+            self.connection.send(("close", None))
+        except (BrokenPipeError, EOFError, RuntimeError):
+            pass
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+        if self._buffer is not None:
+            self._buffer.close()
+        self.connection.close()
+
+    def __getattr__(self, name: str) -> Any:
+        """Look up attributes on the remote environment.
+
+        Args:
+            name: attribute name.
+
+        Returns:
+            the attribute value, or a function calling the remote method.
+        """
+        if name.startswith("_") or name == "connection":
+            raise AttributeError(name)
+        self._send("getattr", name)
+        kind, value = self._receive()
+        if kind == "callable":
+            return lambda *args, **kwargs: self._call(name, *args, **kwargs)
+        return value
+
+
+def wait_for_environments(
+    environments: Sequence[SubprocessEnvWrapper], timeout: Optional[float] = None
+) -> List[int]:
+    """Wait until at least one of the environments has finished its step.
+
+    Args:
+        environments: environments that were stepped with `step_async`.
+        timeout: maximum time to wait in seconds. Defaults to None, no timeout.
+
+    Returns:
+        indices of the environments whose timesteps are ready.
+    """
+    ready = [
+        index for index, environment in enumerate(environments) if environment.ready()
+    ]
+    if not ready:
+        connection.wait(
+            [environment.connection for environment in environments], timeout=timeout
+        )
+        ready = [
+            index
+            for index, environment in enumerate(environments)
+            if environment.ready()
+        ]
+    return ready
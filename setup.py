@@ -99,7 +99,14 @@ setup(
     license="Apache License, Version 2.0",
     keywords="multi-agent reinforcement-learning python machine learning",
     packages=find_namespace_packages(
-        exclude=["*.tests", "*.tests.*", "tests.*", "tests"]
+        exclude=[
+            "*.tests",
+            "*.tests.*",
+            "tests.*",
+            "tests",
+            "benchmarks",
+            "benchmarks.*",
+        ]
     ),
     install_requires=[
         "dm-acme~=0.4.0",
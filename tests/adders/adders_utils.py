@@ -79,6 +79,7 @@ class MultiAgentAdderTestMixin(test_utils.AdderTestMixin):
         repeat_episode_times: int = 1,
         end_behavior: EndBehavior = EndBehavior.ZERO_PAD,
         item_transform: Optional[Callable[[Sequence[np.ndarray]], Any]] = None,
+        add_trajectory: bool = False,
     ) -> None:
         """Runs a unit test case for the adder.
 
@@ -95,6 +96,8 @@ class MultiAgentAdderTestMixin(test_utils.AdderTestMixin):
                     agents = {"agent_0", "agent_1", "agent_2"}.
                 repeat_episode_times: How many times to run an episode.
                 end_behavior: How end of episode should be handled.
+                add_trajectory: whether to add the steps of each episode with a
+                    single `add_trajectory()` call.
 
         Returns:
             None
@@ -138,6 +141,12 @@ class MultiAgentAdderTestMixin(test_utils.AdderTestMixin):
                 first, extras = first
             adder.add_first(first)
 
+            if add_trajectory:
+                adder.add_trajectory(
+                    *tree_utils.stack_sequence_fields([tuple(step) for step in steps])
+                )
+                continue
+
             # timestep: dm_env.TimeStep, extras: Dict[str, types.NestedArray]
             for step in steps[:-1]:
                 action, ts = step[0], step[1]
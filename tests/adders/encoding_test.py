@@ -0,0 +1,196 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Reverb field encoding unit test"""
+
+from typing import Dict
+
+import dm_env
+import numpy as np
+import pytest
+import reverb
+import tensorflow as tf
+import tree
+
+from mava.adders.reverb import base
+from mava.adders.reverb.transition import ParallelNStepTransitionAdder
+from mava.adders.reverb.encoding import (
+    FieldEncoding,
+    decode_sample,
+    encode_field,
+    encode_signature,
+    validate_field_encodings,
+)
+from mava.types import OLT, Transition
+
+field_encodings = {
+    "observations": FieldEncoding(dtype="uint8", scale=2.0 / 255, offset=-1.0),
+    "extras/s_t": FieldEncoding(dtype="float16"),
+}
+
+
+def make_observations() -> Dict[str, OLT]:
+    """Observations of a single agent with values in [-1, 1]"""
+    return {
+        "agent_0": OLT(
+            observation=np.linspace(-1.0, 1.0, 7, dtype=np.float32),
+            legal_actions=np.ones(5, dtype=np.int64),
+            terminal=np.zeros(1, dtype=np.float32),
+        )
+    }
+
+
+def test_validate_field_encodings() -> None:
+    """Test that only observations and extras can be encoded"""
+    validate_field_encodings(field_encodings)
+
+    with pytest.raises(ValueError):
+        validate_field_encodings({"rewards": FieldEncoding(dtype="float16")})
+    with pytest.raises(ValueError):
+        validate_field_encodings({"observations": FieldEncoding(dtype="bool")})
+
+
+def test_encode_field() -> None:
+    """Test that only the encoded leaves change dtype"""
+    observations = encode_field("observations", make_observations(), field_encodings)
+    assert observations["agent_0"].observation.dtype == np.uint8
+    assert observations["agent_0"].observation[0] == 0
+    assert observations["agent_0"].observation[-1] == 255
+    assert observations["agent_0"].legal_actions.dtype == np.int64
+    assert observations["agent_0"].terminal.dtype == np.float32
+
+    extras = encode_field(
+        "extras",
+        {"s_t": np.ones(3, dtype=np.float32), "network_int_keys": np.int32(2)},
+        field_encodings,
+    )
+    assert extras["s_t"].dtype == np.float16
+    assert extras["network_int_keys"].dtype == np.int32
+
+    # Fields are left as they are without encodings.
+    observations = make_observations()
+    assert encode_field("observations", observations, {}) is observations
+
+
+def test_encode_and_decode_sample() -> None:
+    """Test that sampled items decode to the original values"""
+    observations = make_observations()
+    trajectory = base.Trajectory(
+        observations=observations,
+        actions={"agent_0": np.int64(1)},
+        rewards={"agent_0": np.float32(0.5)},
+        discounts={"agent_0": np.float32(1.0)},
+        start_of_episode=True,
+        extras={"s_t": np.arange(3, dtype=np.float32)},
+    )
+    signature = tf.nest.map_structure(
+        lambda x: tf.TensorSpec(np.shape(x), tf.as_dtype(np.asarray(x).dtype)),
+        trajectory,
+    )
+
+    encoded_signature = encode_signature(signature, field_encodings)
+    assert encoded_signature.observations["agent_0"].observation.dtype == tf.uint8
+    assert encoded_signature.observations["agent_0"].terminal.dtype == tf.float32
+    assert encoded_signature.rewards["agent_0"].dtype == tf.float32
+    assert encoded_signature.extras["s_t"].dtype == tf.float16
+
+    encoded_trajectory = trajectory._replace(
+        observations=encode_field("observations", observations, field_encodings),
+        extras=encode_field("extras", trajectory.extras, field_encodings),
+    )
+    sample = reverb.ReplaySample(
+        info=None, data=tf.nest.map_structure(tf.convert_to_tensor, encoded_trajectory)
+    )
+    decoded = decode_sample(sample, field_encodings).data
+
+    assert decoded.observations["agent_0"].observation.dtype == tf.float32
+    np.testing.assert_allclose(
+        decoded.observations["agent_0"].observation.numpy(),
+        observations["agent_0"].observation,
+        atol=1.0 / 255,
+    )
+    assert decoded.observations["agent_0"].legal_actions.dtype == tf.int64
+    np.testing.assert_array_equal(decoded.extras["s_t"].numpy(), [0.0, 1.0, 2.0])
+
+
+def test_chunked_and_encoded_items_round_trip_through_reverb() -> None:
+    """Test writing encoded items in chunks to a server and decoding samples"""
+    server = reverb.Server([reverb.Table.queue(base.DEFAULT_PRIORITY_TABLE, 100)])
+    client = reverb.Client(f"localhost:{server.port}")
+    adder = ParallelNStepTransitionAdder(
+        client,
+        n_step=1,
+        discount=1.0,
+        field_encodings=field_encodings,
+        max_chunk_length=2,
+    )
+
+    observations = make_observations()
+    actions = {"agent_0": np.int64(1)}
+    rewards = {"agent_0": np.float32(0.5)}
+    extras = {"s_t": np.arange(3, dtype=np.float32)}
+    for _ in range(2):
+        adder.add_first(dm_env.restart(observations))
+        for step_type, discount in [(dm_env.StepType.MID, 1.0)] * 2 + [
+            (dm_env.StepType.LAST, 0.0)
+        ]:
+            timestep = dm_env.TimeStep(
+                step_type, rewards, {"agent_0": np.float32(discount)}, observations
+            )
+            adder.add(actions, next_timestep=timestep, extras=extras)
+
+    # The chunk length of the columns was set on the reverb writer before
+    # their first step was appended.
+    chunked_paths = set(adder._writer._path_to_column_config.keys())
+    assert ("observations", "agent_0", "observation") in chunked_paths
+    assert ("extras", "s_t") in chunked_paths
+
+    num_items = client.server_info()[base.DEFAULT_PRIORITY_TABLE].current_size
+    assert num_items == 6
+    structure = Transition(
+        observations=observations,
+        actions=actions,
+        rewards=rewards,
+        discounts=rewards,
+        next_observations=observations,
+        extras=extras,
+    )
+    for sample in client.sample(
+        base.DEFAULT_PRIORITY_TABLE, num_samples=num_items, emit_timesteps=False
+    ):
+        data = tree.unflatten_as(structure, sample.data)
+        assert data.observations["agent_0"].observation.dtype == np.uint8
+        assert data.extras["s_t"].dtype == np.float16
+
+        decoded = decode_sample(
+            reverb.ReplaySample(
+                info=sample.info, data=tree.map_structure(tf.convert_to_tensor, data)
+            ),
+            field_encodings,
+        ).data
+        for field in [decoded.observations, decoded.next_observations]:
+            assert field["agent_0"].observation.dtype == tf.float32
+            np.testing.assert_allclose(
+                field["agent_0"].observation.numpy(),
+                observations["agent_0"].observation,
+                atol=1.0 / 255,
+            )
+            np.testing.assert_array_equal(
+                field["agent_0"].legal_actions.numpy(),
+                observations["agent_0"].legal_actions,
+            )
+        np.testing.assert_array_equal(decoded.extras["s_t"].numpy(), [0.0, 1.0, 2.0])
+
+    server.stop()
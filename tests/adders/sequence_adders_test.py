@@ -16,12 +16,14 @@
 """Sequence adder unit test"""
 
 from typing import Dict, Tuple, Union
+from unittest import mock
 
 import dm_env
 from absl.testing import parameterized
 from acme.adders.reverb.sequence import EndBehavior
 
 from mava.adders import reverb as reverb_adders
+from mava.adders.reverb import base as reverb_base
 from tests.adders.adders_utils import MultiAgentAdderTestMixin
 from tests.adders.sequence_adders_test_data import TEST_CASES
 
@@ -79,3 +81,75 @@ class SequenceAdderTest(MultiAgentAdderTestMixin, parameterized.TestCase):
             end_behavior=end_behavior,
             agents=agents,
         )
+
+    @parameterized.named_parameters(*TEST_CASES)
+    def test_adder_batched_flushes(
+        self,
+        sequence_length: int,
+        period: int,
+        first: Union[Tuple, dm_env.TimeStep],
+        steps: Tuple,
+        expected_sequences: Tuple,
+        agents: Dict,
+        end_behavior: EndBehavior = EndBehavior.ZERO_PAD,
+        repeat_episode_times: int = 1,
+    ) -> None:
+        """Test that flushing sequences in batches writes the same items
+
+        Pending sequences are flushed when their batch is full and at the end
+        of each episode. The flush interval is tested with a mocked clock below.
+        """
+        adder = reverb_adders.ParallelSequenceAdder(
+            self.client,
+            sequence_length=sequence_length,
+            period=period,
+            end_of_episode_behavior=end_behavior,
+            flush_batch_size=3,
+            flush_interval_seconds=60.0,
+        )
+        super().run_test_adder(
+            adder=adder,
+            first=first,
+            steps=steps,
+            expected_items=expected_sequences,
+            repeat_episode_times=repeat_episode_times,
+            end_behavior=end_behavior,
+            agents=agents,
+        )
+
+
+def test_adder_flush_interval() -> None:
+    """Test that pending items are flushed once the flush interval passed"""
+    with mock.patch.object(reverb_base.time, "monotonic", return_value=0.0) as clock:
+        adder = reverb_adders.ParallelSequenceAdder(
+            mock.MagicMock(),
+            sequence_length=2,
+            period=1,
+            flush_batch_size=10,
+            flush_interval_seconds=5.0,
+        )
+        writer = adder._writer
+
+        adder.write_experience_to_tables(mock.sentinel.trajectory, {"table": 1.0})
+        clock.return_value = 4.0
+        adder.write_experience_to_tables(mock.sentinel.trajectory, {"table": 1.0})
+        writer.flush.assert_not_called()
+
+        # The next step after the interval flushes, without creating an item.
+        clock.return_value = 5.0
+        adder._maybe_flush()
+        writer.flush.assert_called_once_with(adder._max_in_flight_items)
+
+        clock.return_value = 6.0
+        adder.write_experience_to_tables(mock.sentinel.trajectory, {"table": 1.0})
+        clock.return_value = 9.0
+        adder._maybe_flush()
+        assert writer.flush.call_count == 1
+        clock.return_value = 10.0
+        adder._maybe_flush()
+        assert writer.flush.call_count == 2
+
+        # Without pending items there is nothing to flush.
+        clock.return_value = 20.0
+        adder._maybe_flush()
+        assert writer.flush.call_count == 2
@@ -18,9 +18,11 @@
 from typing import Dict, Tuple, Union
 
 import dm_env
+import numpy as np
 from absl.testing import parameterized
 
 from mava.adders import reverb as reverb_adders
+from mava.adders.reverb.transition import NStepAccumulator
 from tests.adders.adders_utils import MultiAgentAdderTestMixin
 from tests.adders.transition_adders_test_data import TEST_CASES
 
@@ -75,3 +77,82 @@ class TestParallelNStepTransitionAdder(
             agents=agents,
             stack_sequence_fields=False,
         )
+
+    @parameterized.named_parameters(*TEST_CASES)
+    def test_transition_adder_trajectory(
+        self,
+        n_step: int,
+        discount: float,
+        first: Union[Tuple, dm_env.TimeStep],
+        steps: Tuple,
+        expected_transitions: Tuple,
+        agents: Dict,
+    ) -> None:
+        """Test that adding whole trajectories writes the same transitions"""
+        adder = reverb_adders.ParallelNStepTransitionAdder(
+            self.client, n_step, discount
+        )
+        super().run_test_adder(
+            adder=adder,
+            first=first,
+            steps=steps,
+            expected_items=expected_transitions,
+            agents=agents,
+            stack_sequence_fields=False,
+            add_trajectory=True,
+        )
+
+    @parameterized.named_parameters(*TEST_CASES)
+    def test_transition_adder_repeated_episodes(
+        self,
+        n_step: int,
+        discount: float,
+        first: Union[Tuple, dm_env.TimeStep],
+        steps: Tuple,
+        expected_transitions: Tuple,
+        agents: Dict,
+    ) -> None:
+        """Test that the rewards of an episode are not carried into the next one"""
+        adder = reverb_adders.ParallelNStepTransitionAdder(
+            self.client, n_step, discount
+        )
+        super().run_test_adder(
+            adder=adder,
+            first=first,
+            steps=steps,
+            expected_items=expected_transitions * 2,
+            agents=agents,
+            stack_sequence_fields=False,
+            repeat_episode_times=2,
+        )
+
+
+def test_n_step_accumulator() -> None:
+    """Test that the accumulated n-step quantities match a step by step loop"""
+    n_step, discount = 3, 0.9
+    agents = ["agent_0", "agent_1"]
+    rng = np.random.default_rng(0)
+    rewards = rng.normal(size=(8, len(agents))).astype(np.float32)
+    discounts = np.ones((8, len(agents)), dtype=np.float32)
+    discounts[5, 1] = 0.0
+
+    accumulator = NStepAccumulator(n_step, discount)
+    for step in range(len(rewards)):
+        accumulator.append(
+            step, dict(zip(agents, rewards[step])), dict(zip(agents, discounts[step]))
+        )
+        first = max(0, step + 1 - n_step)
+        n_step_return, total_discount = accumulator.compute(first, step + 1)
+
+        for i, agent in enumerate(agents):
+            expected_return = rewards[first, i]
+            expected_discount = discounts[first, i]
+            for t in range(first + 1, step + 1):
+                expected_discount *= discount
+                expected_return += rewards[t, i] * expected_discount
+                expected_discount *= discounts[t, i]
+
+            assert n_step_return[agent].shape == ()
+            assert n_step_return[agent].dtype == np.float32
+            np.testing.assert_allclose(n_step_return[agent], expected_return, rtol=1e-6)
+            np.testing.assert_allclose(total_discount[agent], expected_discount)
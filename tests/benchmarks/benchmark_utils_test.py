@@ -0,0 +1,151 @@
+
+"""Tests for the benchmark timing utilities."""
+
+import subprocess
+from typing import Any, List
+
+import numpy as np
+import pytest
+import reverb
+import tensorflow as tf
+
+from benchmarks import benchmark_utils
+
+
+class FakeClock:
+    """Clock advanced by the timed functions instead of wall time."""
+
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def perf_counter(self) -> float:
+        """Current time of the clock in seconds."""
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Clock used by the benchmark function.
+
+    Args:
+        monkeypatch: Pytest fixture to patch the time module.
+
+    Returns:
+        the fake clock.
+    """
+    fake_clock = FakeClock()
+    monkeypatch.setattr(benchmark_utils.time, "perf_counter", fake_clock.perf_counter)
+    return fake_clock
+
+
+def test_benchmark_throughput_and_latency(clock: FakeClock) -> None:
+    """Test that the throughput and latencies of the timed calls are computed"""
+    latencies = iter([1.0, 0.1, 0.2, 0.2, 0.4])
+    calls: List[str] = []
+
+    def fn() -> int:
+        calls.append("fn")
+        clock.now += next(latencies)
+        return 3
+
+    def setup_fn() -> None:
+        calls.append("setup")
+        # Time spent in the setup is not timed.
+        clock.now += 100.0
+
+    results = benchmark_utils.benchmark(
+        fn,
+        num_iterations=4,
+        num_warmup_iterations=1,
+        setup_fn=setup_fn,
+        items_per_call=lambda output: output,
+    )
+
+    assert calls == ["setup", "fn"] * 5
+    assert results["num_iterations"] == 4
+    assert results["calls_per_second"] == pytest.approx(4 / 0.9)
+    assert results["items_per_second"] == pytest.approx(12 / 0.9)
+    assert results["latency_ms"] == pytest.approx(
+        {
+            "mean": 225.0,
+            "p50": 200.0,
+            "p90": np.percentile([100, 200, 200, 400], 90),
+            "p99": np.percentile([100, 200, 200, 400], 99),
+            "max": 400.0,
+        }
+    )
+
+
+def test_benchmark_constant_items_per_call(clock: FakeClock) -> None:
+    """Test that a constant number of items per call is counted"""
+
+    def fn() -> None:
+        clock.now += 0.5
+
+    results = benchmark_utils.benchmark(
+        fn, num_iterations=2, num_warmup_iterations=0, items_per_call=8
+    )
+
+    assert results["calls_per_second"] == pytest.approx(2.0)
+    assert results["items_per_second"] == pytest.approx(16.0)
+
+
+def test_make_synthetic_sample() -> None:
+    """Test that synthetic samples match the signature of the table"""
+    signature = {
+        "observation": tf.TensorSpec([3], tf.float32),
+        "actions": tf.TensorSpec([None], tf.int32),
+    }
+    server = reverb.Server(
+        [reverb.Table.queue(name="table_0", max_size=10, signature=signature)]
+    )
+    client = reverb.Client(f"localhost:{server.port}")
+
+    sample = benchmark_utils.make_synthetic_sample(client, "table_0", batch_size=4)
+
+    assert sample.data["observation"].shape == (4, 3)
+    assert sample.data["observation"].dtype == np.float32
+    # Unknown dimensions are given a size of one.
+    assert sample.data["actions"].shape == (4, 1)
+    assert sample.data["actions"].dtype == np.int32
+    np.testing.assert_array_equal(sample.data["observation"], np.ones((4, 3)))
+    assert sample.info.priority.shape == (4,)
+    server.stop()
+
+
+def test_parameters_size() -> None:
+    """Test that the bytes of all the parameters are counted"""
+    parameters = {
+        "policy": {"w": np.zeros((2, 3), dtype=np.float32), "b": np.zeros(3)},
+        "steps": np.zeros((), dtype=np.int32),
+    }
+
+    assert benchmark_utils.parameters_size(parameters) == 24 + 24 + 4
+
+
+def test_run_metadata_without_git(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the metadata is recorded when git can't be run
+
+    Args:
+        monkeypatch: Pytest fixture to patch subprocess.
+    """
+
+    def run(*args: Any, **kwargs: Any) -> None:
+        raise subprocess.CalledProcessError(128, "git")
+
+    monkeypatch.setattr(benchmark_utils.subprocess, "run", run)
+
+    metadata = benchmark_utils.run_metadata()
+
+    assert metadata["commit"] is None
+    assert metadata["jax_backend"] == "cpu"
+    assert set(metadata) == {
+        "commit",
+        "timestamp",
+        "jax_version",
+        "jax_backend",
+        "platform",
+        "processor",
+        "python_version",
+    }
@@ -0,0 +1,88 @@
+
+"""Tests for the comparison of benchmark results."""
+
+from typing import Any, Dict
+
+import pytest
+
+from benchmarks.compare import compare_results, iterate_benchmarks
+
+
+def make_results(benchmarks: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+    """Results file holding benchmarks with the given throughput and latencies.
+
+    Args:
+        benchmarks: items per second, p50 and p99 latencies of each benchmark,
+            keyed by subsystem and benchmark name, e.g. "trainer/sgd_step".
+
+    Returns:
+        results in the layout written by run_benchmarks.
+    """
+    results: Dict[str, Any] = {"metadata": {}, "benchmarks": {}}
+    for name, values in benchmarks.items():
+        subsystem, benchmark_name = name.split("/")
+        results["benchmarks"].setdefault(subsystem, {})[benchmark_name] = {
+            "items_per_second": values["items_per_second"],
+            "latency_ms": {"p50": values["p50"], "p99": values["p99"]},
+        }
+    return results
+
+
+def test_iterate_benchmarks() -> None:
+    """Test that benchmarks are named after their subsystem"""
+    results = make_results(
+        {
+            "executor/run_episode": {"items_per_second": 1, "p50": 1, "p99": 1},
+            "trainer/sgd_step": {"items_per_second": 2, "p50": 1, "p99": 1},
+        }
+    )
+
+    assert [name for name, _ in iterate_benchmarks(results)] == [
+        "executor/run_episode",
+        "trainer/sgd_step",
+    ]
+
+
+def test_compare_results() -> None:
+    """Test that relative changes and throughput regressions are found"""
+    baseline = make_results(
+        {
+            "executor/run_episode": {"items_per_second": 100, "p50": 10, "p99": 20},
+            "trainer/sgd_step": {"items_per_second": 50, "p50": 4, "p99": 8},
+            "trainer/removed": {"items_per_second": 1, "p50": 1, "p99": 1},
+        }
+    )
+    results = make_results(
+        {
+            "executor/run_episode": {"items_per_second": 120, "p50": 8, "p99": 30},
+            "trainer/sgd_step": {"items_per_second": 40, "p50": 5, "p99": 8},
+            "trainer/added": {"items_per_second": 1, "p50": 1, "p99": 1},
+        }
+    )
+
+    changes, regressions = compare_results(baseline, results, regression_threshold=0.1)
+
+    # Only the benchmarks run in both results are compared.
+    assert list(changes) == ["executor/run_episode", "trainer/sgd_step"]
+    assert changes["executor/run_episode"] == pytest.approx(
+        {"items_per_second": 0.2, "p50": -0.2, "p99": 0.5}
+    )
+    assert changes["trainer/sgd_step"] == pytest.approx(
+        {"items_per_second": -0.2, "p50": 0.25, "p99": 0.0}
+    )
+    assert regressions == ["trainer/sgd_step"]
+
+
+def test_compare_results_threshold() -> None:
+    """Test that throughput drops within the threshold are not regressions"""
+    baseline = make_results(
+        {"trainer/sgd_step": {"items_per_second": 100, "p50": 1, "p99": 1}}
+    )
+    results = make_results(
+        {"trainer/sgd_step": {"items_per_second": 95, "p50": 1, "p99": 1}}
+    )
+
+    assert compare_results(baseline, results, regression_threshold=0.1)[1] == []
+    assert compare_results(baseline, results, regression_threshold=0.01)[1] == [
+        "trainer/sgd_step"
+    ]
@@ -147,8 +147,15 @@ def test_parallel_sequence_adder(
     assert parallel_sequence_adder.config.period == 1
 
     parallel_sequence_adder.on_building_init_start(builder=mock_builder)
+    assert (
+        mock_builder.store.field_encodings
+        == parallel_sequence_adder.config.field_encodings
+    )
     parallel_sequence_adder.on_building_executor_adder(builder=mock_builder)
     assert type(mock_builder.store.adder) == reverb_adders.ParallelSequenceAdder
+    new_adder = mock_builder.store.adder_factory()
+    assert type(new_adder) == reverb_adders.ParallelSequenceAdder
+    assert new_adder is not mock_builder.store.adder
 
     # Reverb ParallelSequenceAdder args have been set correctly
     assert (
@@ -156,6 +163,10 @@ def test_parallel_sequence_adder(
         == parallel_sequence_adder.config.sequence_length
     )
     assert mock_builder.store.adder._period == parallel_sequence_adder.config.period
+    assert (
+        mock_builder.store.adder._flush_batch_size
+        == parallel_sequence_adder.config.flush_batch_size
+    )
     assert mock_builder.store.adder._client == mock_builder.store.data_server_client
     assert mock_builder.store.adder._priority_fns == mock_builder.store.priority_fns
     assert (
@@ -234,6 +245,9 @@ def test_parallel_transition_adder(
     assert parallel_transition_adder.config.discount == 1
     parallel_transition_adder.on_building_executor_adder(builder=mock_builder)
     assert type(mock_builder.store.adder) == reverb_adders.ParallelNStepTransitionAdder
+    new_adder = mock_builder.store.adder_factory()
+    assert type(new_adder) == reverb_adders.ParallelNStepTransitionAdder
+    assert new_adder is not mock_builder.store.adder
 
     # Reverb ParallelSequenceAdder args have been set correctly
     assert mock_builder.store.adder.n_step == parallel_transition_adder.config.n_step
@@ -20,16 +20,20 @@ from typing import Any, Callable, Dict
 
 import pytest
 import reverb
+import tensorflow as tf
 
 from mava import specs
 from mava.adders import reverb as reverb_adders
 from mava.components.building.datasets import (
+    ShardReplaySample,
     TrajectoryDataset,
     TrajectoryDatasetConfig,
     TransitionDataset,
     TransitionDatasetConfig,
+    merge_shard_datasets,
 )
 from mava.systems.builder import Builder
+from mava.utils.dataset_utils import DevicePrefetchIterator
 from tests.mocks import make_fake_env_specs
 
 env_spec = make_fake_env_specs()
@@ -193,3 +197,83 @@ def test_on_building_trainer_dataset_trajectory_dataset(
         dataset._input_dataset._rate_limiter_timeout_ms
         == trajectory_dataset.config.rate_limiter_timeout_ms
     )
+
+
+def test_on_building_trainer_dataset_device_prefetch(
+    mock_builder: MockBuilder,
+) -> None:
+    """Test that the dataset iterator prefetches samples on device when asked
+
+    Args:
+        mock_builder: Builder
+    """
+    trajectory_dataset = TrajectoryDataset(
+        TrajectoryDatasetConfig(device_prefetch_size=2)
+    )
+    trajectory_dataset.on_building_trainer_dataset(builder=mock_builder)
+    assert isinstance(mock_builder.store.dataset_iterator, DevicePrefetchIterator)
+    assert mock_builder.store.dataset_iterator._queue.maxsize == 2
+
+
+def test_merge_shard_datasets() -> None:
+    """Test that the merged dataset samples the elements of every shard"""
+    shard_datasets = [
+        tf.data.Dataset.from_tensor_slices(
+            reverb.ReplaySample(
+                info=tf.range(shard * 10, shard * 10 + 10),
+                data=tf.range(shard * 10, shard * 10 + 10) * 2,
+            )
+        )
+        for shard in range(3)
+    ]
+    assert merge_shard_datasets(shard_datasets[:1]) is shard_datasets[0]
+
+    merged = list(merge_shard_datasets(shard_datasets).as_numpy_iterator())
+    assert sorted(sample.info for sample in merged) == list(range(30))
+    # Samples record the shard they came from.
+    for sample in merged:
+        assert isinstance(sample, ShardReplaySample)
+        assert sample.data == 2 * sample.info
+        assert sample.shard == sample.info // 10
+
+    # Shards are drawn in proportion to their weights.
+    weighted = merge_shard_datasets(shard_datasets, weights=[0.0, 1.0, 0.0])
+    assert [sample.info for sample in weighted.take(10).as_numpy_iterator()] == list(
+        range(10, 20)
+    )
+
+
+def test_on_building_trainer_dataset_sharded_data_server(
+    mock_builder: MockBuilder,
+) -> None:
+    """Test that the trajectory dataset samples from all the data server shards
+
+    Args:
+        mock_builder: Builder
+    """
+    shard_server = reverb.Server(
+        tables=[
+            reverb.Table.queue(
+                name="table_0",
+                max_size=100,
+                signature=adder_signature_fn(env_spec, {}),
+            )
+        ]
+    )
+    mock_builder.store.data_server_clients = [
+        mock_builder.store.data_server_client,
+        SimpleNamespace(server_address=f"localhost:{shard_server.port}"),
+    ]
+    trajectory_dataset = TrajectoryDataset()
+    trajectory_dataset.on_building_trainer_dataset(builder=mock_builder)
+
+    # The dataset of each shard, tagged with its index, is an input of the
+    # merged dataset.
+    dataset = mock_builder.store.dataset_iterator._iterator._dataset
+    server_addresses = [
+        shard_dataset._input_dataset._server_address
+        for shard_dataset in dataset._input_dataset._data_inputs
+    ]
+    assert server_addresses == [
+        client.server_address for client in mock_builder.store.data_server_clients
+    ]
@@ -24,7 +24,12 @@ from reverb import client as reverb_client
 from reverb import item_selectors, rate_limiters
 from reverb import server as reverb_server
 
-from mava.components.building.distributor import Distributor
+from mava.components.building.distributor import (
+    Distributor,
+    DistributorConfig,
+    data_server_shard_sizes,
+    executor_data_server_shard,
+)
 from mava.systems.builder import Builder
 from mava.systems.launcher import Launcher
 
@@ -278,6 +283,89 @@ def test_on_building_program_nodes_no_evaluator(
     assert trainer == "Trainer Test"
 
 
+def test_on_building_program_nodes_sharded_data_server(
+    mock_builder: MockBuilder,
+) -> None:
+    """Test that executors write to one shard and trainers read from all shards"""
+    distributor = Distributor(DistributorConfig(num_executors=5, num_data_servers=2))
+    distributor.on_building_program_nodes(builder=mock_builder)
+
+    assert mock_builder.store.num_data_servers == 2
+    groups = mock_builder.store.program._program._groups
+    assert len(groups["data_server"]) == 2
+    data_server_addresses = [node._address for node in groups["data_server"]]
+
+    # Executors are spread over the shards.
+    executor_shards = [
+        data_server_addresses.index(node._args[1]._address)
+        for node in groups["executor"]
+    ]
+    assert executor_shards == [0, 1, 0, 1, 0]
+
+    # Trainers sample from the shards in proportion to their executors.
+    assert mock_builder.store.data_server_shard_weights == [0.6, 0.4]
+
+    # Trainers receive every shard.
+    assert [
+        handle._address for handle in groups["trainer"][-1]._args[1]
+    ] == data_server_addresses
+
+
+def test_executor_data_server_shard() -> None:
+    """Test the selection of the data server shard of the executors"""
+    assert [
+        executor_data_server_shard(f"executor_{i}", 3, "round_robin") for i in range(4)
+    ] == [0, 1, 2, 0]
+
+    hashed_shards = [
+        executor_data_server_shard(f"executor_{i}", 3, "hash") for i in range(20)
+    ]
+    assert all(0 <= shard < 3 for shard in hashed_shards)
+    assert hashed_shards == [
+        executor_data_server_shard(f"executor_{i}", 3, "hash") for i in range(20)
+    ]
+
+    with pytest.raises(ValueError):
+        executor_data_server_shard("executor_0", 3, "random")
+
+
+def test_sharded_data_server_config_errors(mock_builder: MockBuilder) -> None:
+    """Test that invalid data server sharding is rejected"""
+    with pytest.raises(ValueError):
+        Distributor(DistributorConfig(num_data_servers=0))
+
+    distributor = Distributor(
+        DistributorConfig(num_executors=2, num_data_servers=2, multi_process=False)
+    )
+    with pytest.raises(ValueError):
+        distributor.on_building_program_nodes(builder=mock_builder)
+
+    # More shards than executors.
+    with pytest.raises(ValueError):
+        Distributor(DistributorConfig(num_executors=2, num_data_servers=3))
+
+
+def test_hashed_shards_without_executors() -> None:
+    """Test that hashed shard selection leaving a shard empty is rejected"""
+    # The first four executors all hash to the second shard.
+    assert data_server_shard_sizes(4, 2, "hash") == [0, 4]
+    with pytest.raises(ValueError):
+        Distributor(
+            DistributorConfig(
+                num_executors=4,
+                num_data_servers=2,
+                data_server_shard_selection="hash",
+            )
+        )
+
+    assert data_server_shard_sizes(6, 2, "hash") == [2, 4]
+    Distributor(
+        DistributorConfig(
+            num_executors=6, num_data_servers=2, data_server_shard_selection="hash"
+        )
+    )
+
+
 def test_on_building_launch(
     mock_builder: MockBuilder, distributor: Distributor
 ) -> None:
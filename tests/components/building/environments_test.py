@@ -28,12 +28,26 @@ from mava.components.building.environments import (
     EnvironmentSpecConfig,
     ExecutorEnvironmentLoop,
     ExecutorEnvironmentLoopConfig,
+    JaxRolloutExecutorEnvironmentLoop,
+    JaxRolloutExecutorEnvironmentLoopConfig,
     ParallelExecutorEnvironmentLoop,
+    VectorParallelExecutorEnvironmentLoop,
+    VectorParallelExecutorEnvironmentLoopConfig,
+)
+from mava.components.executing import (
+    FeedforwardExecutorObserve,
+    FeedforwardExecutorSelectAction,
+    RecurrentExecutorObserve,
 )
 from mava.core_jax import SystemBuilder
+from mava.environment_loop import ParallelEnvironmentLoop, VectorParallelEnvironmentLoop
 from mava.systems import Builder
+from mava.systems.idqn.components.executing import DQNFeedforwardExecutorSelectAction
+from mava.utils.debugging.jax_simple_spread import JaxSimpleSpread
 from mava.utils.environments import debugging_utils
 from mava.utils.sort_utils import sort_str_num
+from mava.wrappers.environment_loop_wrappers import JaxRolloutEnvironmentLoop
+from mava.wrappers.jax_debugging_envs import JaxDebuggingEnvWrapper
 
 
 class AbstractExecutorEnvironmentLoop(ExecutorEnvironmentLoop):
@@ -91,6 +105,19 @@ def test_parallel_executor_environment_loop() -> ParallelExecutorEnvironmentLoop
     return ParallelExecutorEnvironmentLoop(config=config)
 
 
+@pytest.fixture
+def test_vector_parallel_executor_environment_loop() -> (
+    VectorParallelExecutorEnvironmentLoop
+):
+    """Pytest fixture for vector executor environment loop"""
+    config = VectorParallelExecutorEnvironmentLoopConfig(
+        should_update=False,
+        executor_stats_wrapper_class=None,
+        num_executor_environments=3,
+    )
+    return VectorParallelExecutorEnvironmentLoop(config=config)
+
+
 @pytest.fixture
 def test_builder() -> SystemBuilder:
     """Pytest fixture for system builder."""
@@ -248,3 +275,156 @@ class TestParallelExecutorEnvironmentLoop:
             executor_environment_loop._should_update
             == test_parallel_executor_environment_loop.config.should_update
         )
+
+
+class TestVectorParallelExecutorEnvironmentLoop:
+    """Tests for VectorParallelExecutorEnvironmentLoop"""
+
+    def test_on_building_init_feedforward(
+        self,
+        test_vector_parallel_executor_environment_loop: VectorParallelExecutorEnvironmentLoop,  # noqa: E501
+        test_builder: SystemBuilder,
+    ) -> None:
+        """Test that feedforward executors can step several environments"""
+        test_builder.callbacks.append(FeedforwardExecutorObserve())
+
+        test_vector_parallel_executor_environment_loop.on_building_init(test_builder)
+
+    def test_on_building_init_recurrent(
+        self,
+        test_vector_parallel_executor_environment_loop: VectorParallelExecutorEnvironmentLoop,  # noqa: E501
+        test_builder: SystemBuilder,
+    ) -> None:
+        """Test that recurrent executors are rejected when building the system"""
+        test_builder.callbacks.append(RecurrentExecutorObserve())
+
+        with pytest.raises(NotImplementedError):
+            test_vector_parallel_executor_environment_loop.on_building_init(
+                test_builder
+            )
+
+    def test_on_building_executor_environment_evaluator(
+        self,
+        test_vector_parallel_executor_environment_loop: VectorParallelExecutorEnvironmentLoop,  # noqa: E501
+        test_builder: SystemBuilder,
+    ) -> None:
+        """Test that the evaluator only creates a single environment"""
+        test_builder.store.adder = None
+        test_vector_parallel_executor_environment_loop.on_building_executor_environment(
+            test_builder
+        )
+
+        assert test_builder.store.executor_environments == ["environment_eval_true"]
+        assert test_builder.store.executor_environment == "environment_eval_true"
+        assert test_builder.store.executor_adders == [None]
+
+    def test_on_building_executor_environment_executor(
+        self,
+        test_vector_parallel_executor_environment_loop: VectorParallelExecutorEnvironmentLoop,  # noqa: E501
+        test_builder: SystemBuilder,
+    ) -> None:
+        """Test that executors create one environment and one adder per env"""
+        test_builder.store.is_evaluator = False
+        test_builder.store.adder = "adder_0"
+        adder_ids = iter(range(1, 3))
+        test_builder.store.adder_factory = lambda: f"adder_{next(adder_ids)}"
+        test_vector_parallel_executor_environment_loop.on_building_executor_environment(
+            test_builder
+        )
+
+        assert (
+            test_builder.store.executor_environments == ["environment_eval_false"] * 3
+        )
+        assert test_builder.store.executor_adders == ["adder_0", "adder_1", "adder_2"]
+        assert test_builder.store.adder == "adder_0"
+
+    def test_on_building_executor_environment_loop_single_environment(
+        self,
+        test_vector_parallel_executor_environment_loop: VectorParallelExecutorEnvironmentLoop,  # noqa: E501
+        test_builder: SystemBuilder,
+    ) -> None:
+        """Test that a single environment falls back to a parallel loop"""
+        test_builder.store.executor_environments = ["environment"]
+        test_vector_parallel_executor_environment_loop.on_building_executor_environment_loop(  # noqa: E501
+            test_builder
+        )
+
+        assert not hasattr(test_builder.store, "executor_logger")
+        executor_environment_loop = test_builder.store.system_executor
+        assert type(executor_environment_loop) == ParallelEnvironmentLoop
+        assert executor_environment_loop._environment == "environment"
+
+    def test_on_building_executor_environment_loop_vector(
+        self,
+        test_vector_parallel_executor_environment_loop: VectorParallelExecutorEnvironmentLoop,  # noqa: E501
+        test_builder: SystemBuilder,
+    ) -> None:
+        """Test that several environments create a vector loop"""
+        test_builder.store.executor_environments = ["env_0", "env_1", "env_2"]
+        test_builder.store.executor_adders = ["adder_0", "adder_1", "adder_2"]
+        executor_store = test_builder.store.executor.store
+        executor_store.adder = "adder_0"
+        executor_store.agent_net_keys = {"agent_0": "network_agent"}
+        executor_store.select_actions_fn = lambda obs, params, key: (obs, None, key)
+
+        test_vector_parallel_executor_environment_loop.on_building_executor_environment_loop(  # noqa: E501
+            test_builder
+        )
+
+        assert not hasattr(test_builder.store, "executor_logger")
+        executor_environment_loop = test_builder.store.system_executor
+        assert type(executor_environment_loop) == VectorParallelEnvironmentLoop
+        assert executor_environment_loop._environments == ["env_0", "env_1", "env_2"]
+        assert [
+            environment_store["adder"]
+            for environment_store in executor_environment_loop._environment_stores
+        ] == ["adder_0", "adder_1", "adder_2"]
+        assert not executor_environment_loop._should_update
+
+
+def test_jax_rollout_executor_environment_loop(test_builder: SystemBuilder) -> None:
+    """Test that the component creates a jax rollout environment loop"""
+    environment = JaxDebuggingEnvWrapper(JaxSimpleSpread(num_agents=3))
+    test_builder.store.executor_environment = environment
+    test_builder.store.executor.store.select_actions_fn = lambda obs, params, key: (
+        obs,
+        None,
+        key,
+    )
+    test_jax_rollout_executor_environment_loop = JaxRolloutExecutorEnvironmentLoop(
+        config=JaxRolloutExecutorEnvironmentLoopConfig(
+            should_update=False, executor_stats_wrapper_class=None, rollout_length=10
+        )
+    )
+
+    test_jax_rollout_executor_environment_loop.on_building_executor_environment_loop(
+        test_builder
+    )
+
+    assert not hasattr(test_builder.store, "executor_logger")
+    executor_environment_loop = test_builder.store.system_executor
+    assert type(executor_environment_loop) == JaxRolloutEnvironmentLoop
+    assert executor_environment_loop._environment == environment
+    assert executor_environment_loop._rollout_length == 10
+    assert not executor_environment_loop._should_update
+
+
+def test_jax_rollout_executor_environment_loop_init(
+    test_builder: SystemBuilder,
+) -> None:
+    """Test that executors selecting actions with policy info are accepted"""
+    test_builder.callbacks.append(FeedforwardExecutorSelectAction())
+    test_jax_rollout_executor_environment_loop = JaxRolloutExecutorEnvironmentLoop()
+
+    test_jax_rollout_executor_environment_loop.on_building_init(test_builder)
+
+
+def test_jax_rollout_executor_environment_loop_init_dqn(
+    test_builder: SystemBuilder,
+) -> None:
+    """Test that DQN executors are rejected when building the system"""
+    test_builder.callbacks.append(DQNFeedforwardExecutorSelectAction())
+    test_jax_rollout_executor_environment_loop = JaxRolloutExecutorEnvironmentLoop()
+
+    with pytest.raises(NotImplementedError):
+        test_jax_rollout_executor_environment_loop.on_building_init(test_builder)
@@ -234,6 +234,31 @@ def test_on_building_trainer_logger(
     assert test_builder.store.trainer_logger._time_stamp == "trainer_logger_config"
 
 
+def test_on_building_parameter_server(
+    test_logger: Logger, test_builder: SystemBuilder
+) -> None:
+    """Test on_building_parameter_server method for the parameter server.
+
+    Args:
+        test_logger: Fixture Logger.
+        test_builder: Fixture SystemBuilder.
+
+    Returns:
+        None.
+    """
+    test_logger.on_building_parameter_server(test_builder)
+
+    # Correct logger has been created
+    assert test_builder.store.parameter_server_logger is not None
+    assert not hasattr(test_builder.store, "trainer_logger")
+
+    # The default logger config is used without a parameter server entry.
+    assert test_builder.store.parameter_server_logger._label == "parameter_server"
+    assert test_builder.store.parameter_server_logger._time_stamp == (
+        "01/01/1997-00:00:00"
+    )
+
+
 def test_logger_s3_url(test_s3_logger: Logger):
     """Test that correct paths are set when using s3 logger.
 
@@ -136,6 +136,22 @@ def get_params() -> Dict[str, jnp.ndarray]:
     return {"params": jnp.zeros(10)}
 
 
+def check_normalisation_args(
+    observations: Dict[str, NestedArray], normalisation_args: Tuple
+) -> None:
+    """Check the stats and death mask given when normalising observations"""
+    if not normalisation_args:
+        return
+    observation_stats, alive = normalisation_args
+    assert set(observation_stats.keys()) == {
+        f"network_{agent}" for agent in observations.keys()
+    }
+    for stats in observation_stats.values():
+        assert stats["mean"].shape == (1, 3)
+        assert jnp.allclose(stats["std"], 2.0)
+    assert alive.tolist() == [True] * len(observations)
+
+
 #######################
 # Feedforward executors#
 #######################
@@ -143,6 +159,7 @@ def select_actions_ff(
     observations: Dict[str, NestedArray],
     current_params: Dict[str, NestedArray],
     base_key: networks_lib.PRNGKey,
+    *normalisation_args: Any,
 ) -> Tuple[Dict[str, NestedArray], Dict[str, NestedArray], networks_lib.PRNGKey]:
     """Dummy select actions.
 
@@ -150,10 +167,12 @@ def select_actions_ff(
         observations : dummy obs.
         params : unused params.
         key : dummy key.
+        normalisation_args : stacked stats and death mask, if normalising.
 
     Returns:
         _description_
     """
+    check_normalisation_args(observations, normalisation_args)
     action_info = {}
     policy_info = {}
     for agent in observations.keys():
@@ -319,6 +338,7 @@ def select_actions_recurrent(
     current_params: Dict[str, NestedArray],
     policy_states: Dict[str, NestedArray],
     key: networks_lib.PRNGKey,
+    *normalisation_args: Any,
 ) -> Tuple[
     Dict[str, NestedArray],
     Dict[str, NestedArray],
@@ -331,10 +351,12 @@ def select_actions_recurrent(
         observations : dummy obs.
         params : unused params.
         key : dummy key.
+        normalisation_args : stacked stats and death mask, if normalising.
 
     Returns:
         _description_
     """
+    check_normalisation_args(observations, normalisation_args)
     action_info = {}
     policy_info = {}
     for agent in observations.keys():
@@ -488,3 +510,141 @@ def test_on_execution_select_actions_recurrent(  # type: ignore # noqa: E501
             mock_recurrent_executor.store.policies_info[agent] == "policy_info_" + agent
         )
         assert mock_recurrent_executor.store.policy_states[agent] == agent
+
+
+class SharedNetwork:
+    """Network that counts how often it is traced"""
+
+    def __init__(self, recurrent: bool = False) -> None:
+        """Init"""
+        self.num_calls = 0
+        self.recurrent = recurrent
+
+    def get_action(
+        self,
+        observations: networks_lib.Observation,
+        params: NestedArray,
+        base_key: networks_lib.PRNGKey,
+        mask: chex.Array,
+        policy_state: Any = None,
+    ) -> Tuple:
+        """Returns the summed observation shifted by the params as action"""
+        self.num_calls += 1
+        action = jnp.sum(observations, axis=-1) + params
+        policy_info = {"log_prob": jnp.zeros(observations.shape[0])}
+        if self.recurrent:
+            assert policy_state is not None
+            return action, policy_info, policy_state + 1
+        return action, policy_info
+
+
+def test_on_execution_init_end_ff_vmaps_shared_networks(
+    mock_feedforward_executor: Executor,
+    ff_executor_select_action: FeedforwardExecutorSelectAction,
+) -> None:
+    """Test that agents sharing a network select actions with one network call"""
+    shared_network = SharedNetwork()
+    other_network = SharedNetwork()
+    mock_feedforward_executor.store.networks = {
+        "network_shared": shared_network,
+        "network_other": other_network,
+    }
+    mock_feedforward_executor.store.agent_net_keys = {
+        "agent_0": "network_shared",
+        "agent_1": "network_other",
+        "agent_2": "network_shared",
+    }
+    ff_executor_select_action.on_execution_init_end(mock_feedforward_executor)
+
+    observations = mock_feedforward_executor.store.observations
+    params = {"network_shared": 1.0, "network_other": 2.0}
+    actions_info, policies_info, _ = mock_feedforward_executor.store.select_actions_fn(
+        observations, params, jax.random.PRNGKey(0)
+    )
+
+    assert shared_network.num_calls == 1
+    assert other_network.num_calls == 1
+    for agent, net_key in mock_feedforward_executor.store.agent_net_keys.items():
+        expected_action = jnp.sum(observations[agent].observation) + params[net_key]
+        assert jnp.allclose(actions_info[agent], jnp.array([expected_action]))
+        assert policies_info[agent]["log_prob"].shape == (1,)
+
+
+def test_on_execution_init_end_recurrent_vmaps_shared_networks(
+    mock_recurrent_executor: Executor,
+    recurrent_executor_select_action: RecurrentExecutorSelectAction,
+) -> None:
+    """Test that recurrent agents sharing a network keep their own states"""
+    shared_network = SharedNetwork(recurrent=True)
+    mock_recurrent_executor.store.networks = {"network_shared": shared_network}
+    mock_recurrent_executor.store.agent_net_keys = {
+        "agent_0": "network_shared",
+        "agent_1": "network_shared",
+        "agent_2": "network_shared",
+    }
+    recurrent_executor_select_action.on_execution_init_end(mock_recurrent_executor)
+
+    policy_states = {
+        "agent_0": jnp.array(0.0),
+        "agent_1": jnp.array(1.0),
+        "agent_2": jnp.array(2.0),
+    }
+    (
+        actions_info,
+        _,
+        new_policy_states,
+        _,
+    ) = mock_recurrent_executor.store.select_actions_fn(
+        mock_recurrent_executor.store.observations,
+        {"network_shared": 0.0},
+        policy_states,
+        jax.random.PRNGKey(0),
+    )
+
+    assert shared_network.num_calls == 1
+    for agent, observation in mock_recurrent_executor.store.observations.items():
+        assert jnp.allclose(
+            actions_info[agent], jnp.array([jnp.sum(observation.observation)])
+        )
+        assert new_policy_states[agent] == policy_states[agent] + 1
+
+
+def test_select_actions_fn_normalises_observations(
+    mock_feedforward_executor: Executor,
+    ff_executor_select_action: FeedforwardExecutorSelectAction,
+) -> None:
+    """Test that alive agents select actions from normalised observations"""
+    shared_network = SharedNetwork()
+    store = mock_feedforward_executor.store
+    store.networks = {"network_shared": shared_network}
+    store.agent_net_keys = {agent: "network_shared" for agent in store.observations}
+    store.executor_environment.death_masked_agents = ["agent_1"]
+    ff_executor_select_action.on_execution_init_end(mock_feedforward_executor)
+
+    ff_executor_select_action.on_execution_select_actions(mock_feedforward_executor)
+
+    assert shared_network.num_calls == 1
+    for agent, observation in store.observations.items():
+        # The stats have a zero mean and a std of 2.
+        scale = 1.0 if agent == "agent_1" else 0.5
+        expected_action = jnp.sum(observation.observation) * scale
+        assert jnp.allclose(store.actions_info[agent], jnp.array([expected_action]))
+
+    # The stats are only stacked again when they are replaced.
+    stacked_stats = store.observation_stats.stacked_stats(
+        store.norm_params[constants.OBS_NORM_STATE_DICT_KEY], list(store.observations)
+    )
+    ff_executor_select_action.on_execution_select_actions(mock_feedforward_executor)
+    assert (
+        store.observation_stats.stacked_stats(
+            store.norm_params[constants.OBS_NORM_STATE_DICT_KEY],
+            list(store.observations),
+        )
+        is stacked_stats
+    )
+    store.norm_params[constants.OBS_NORM_STATE_DICT_KEY]["agent_0"]["std"] = jnp.ones(3)
+    ff_executor_select_action.on_execution_select_actions(mock_feedforward_executor)
+    assert jnp.allclose(
+        store.actions_info["agent_0"],
+        jnp.sum(store.observations["agent_0"].observation),
+    )
@@ -20,6 +20,7 @@ from types import SimpleNamespace
 from typing import Any, Dict
 
 import jax.numpy as jnp
+import numpy as np
 import pytest
 from dm_env import StepType, TimeStep
 
@@ -53,6 +54,17 @@ class MockAdder:
         self.test_next_timestep = next_timestep
         self.test_extras = extras
 
+    def add_trajectory(
+        self,
+        actions: Dict[str, Any],
+        next_timesteps: TimeStep,
+        extras: Dict[str, Any],
+    ) -> None:
+        """Record the observations of consecutive steps of a trajectory."""
+        self.test_trajectory_actions = actions
+        self.test_next_timesteps = next_timesteps
+        self.test_trajectory_extras = extras
+
 
 class MockExecutorParameterClient:
     """Mock for the executor's parameter client"""
@@ -354,6 +366,48 @@ def test_on_execution_observe(
     assert mock_executor.store.adder.test_extras == mock_executor.store.extras
 
 
+def test_on_execution_observe_trajectory(
+    feedforward_executor_observe: FeedforwardExecutorObserve,
+    mock_executor: MockExecutor,
+) -> None:
+    """Test on_execution_observe_trajectory method from FeedForwardExecutorObserve
+
+    Args:
+        feedforward_executor_observe: FeedForwardExecutorObserve,
+        mock_executor: Executor
+    """
+    num_steps = 4
+    mock_executor.store.extras = {"network_int_keys": np.array([0, 1, 2])}
+    mock_executor.store.actions_info = {
+        agent: np.arange(num_steps) for agent in agent_net_keys.keys()
+    }
+    mock_executor.store.policies_info = {
+        agent: {"log_prob": np.zeros(num_steps)} for agent in agent_net_keys.keys()
+    }
+    mock_executor.store.next_timesteps = TimeStep(
+        step_type=np.array([StepType.MID] * (num_steps - 1) + [StepType.LAST]),
+        reward={agent: np.ones(num_steps) for agent in agent_net_keys.keys()},
+        discount={agent: np.ones(num_steps) for agent in agent_net_keys.keys()},
+        observation={},
+    )
+
+    feedforward_executor_observe.on_execution_observe_trajectory(executor=mock_executor)
+
+    adder = mock_executor.store.adder
+    assert adder.test_next_timesteps is mock_executor.store.next_timesteps
+    for agent in agent_net_keys.keys():
+        assert np.array_equal(
+            adder.test_trajectory_actions[agent]["actions_info"], np.arange(num_steps)
+        )
+        assert adder.test_trajectory_extras["policy_info"][agent]["log_prob"].shape == (
+            num_steps,
+        )
+    # The network keys of the episode are repeated at each step.
+    assert np.array_equal(
+        adder.test_trajectory_extras["network_int_keys"], [[0, 1, 2]] * num_steps
+    )
+
+
 def test_on_execution_update(
     feedforward_executor_observe: FeedforwardExecutorObserve,
     mock_executor: MockExecutor,
@@ -21,8 +21,13 @@ from typing import Callable, List, Tuple
 import jax
 import jax.numpy as jnp
 import pytest
+import rlax
 
-from mava.components.training.advantage_estimation import GAE, GAEConfig
+from mava.components.training.advantage_estimation import (
+    GAE,
+    GAEConfig,
+    associative_scan_gae,
+)
 from mava.systems.trainer import Trainer
 
 
@@ -282,3 +287,54 @@ def test_gae_function_stop_gradient(
     # Gradient of zero means gradient was stopped
     assert jnp.array_equal(gradients_1, jnp.array([0, 0, 0, 0]))
     assert jnp.array_equal(gradients_2, jnp.array([0, 0, 0, 0]))
+
+
+@pytest.mark.parametrize("sequence_length", [1, 7, 200])
+def test_associative_scan_gae_matches_rlax(sequence_length: int) -> None:
+    """Test that the associative scan GAE matches the sequential rlax GAE"""
+    rewards_key, discounts_key, values_key = jax.random.split(jax.random.PRNGKey(0), 3)
+    batch_size = 4
+    rewards = jax.random.normal(rewards_key, (batch_size, sequence_length))
+    # Include episode ends in the sequences.
+    discounts = 0.99 * jax.random.bernoulli(
+        discounts_key, 0.9, (batch_size, sequence_length)
+    )
+    values = jax.random.normal(values_key, (batch_size, sequence_length + 1))
+
+    expected_advantages = jax.vmap(
+        rlax.truncated_generalized_advantage_estimation, in_axes=(0, 0, None, 0)
+    )(rewards, discounts, 0.95, values)
+    advantages = jax.vmap(associative_scan_gae, in_axes=(0, 0, None, 0))(
+        rewards, discounts, 0.95, values
+    )
+
+    assert jnp.allclose(advantages, expected_advantages, atol=1e-5)
+
+
+@pytest.mark.parametrize(
+    "rewards_1,rewards_2,discounts,values", different_reward_values()
+)
+def test_gae_function_associative_scan(
+    rewards_1: jnp.ndarray,
+    rewards_2: jnp.ndarray,
+    discounts: jnp.ndarray,
+    values: jnp.ndarray,
+    gae_without_reward_clipping: GAE,
+    mock_trainer: Trainer,
+) -> None:
+    """Test that gae_advantages gives the same results with the associative scan"""
+
+    gae_without_reward_clipping.on_training_utility_fns(trainer=mock_trainer)
+    advantages, target_values = mock_trainer.store.gae_fn(
+        rewards=rewards_1, discounts=discounts, values=values
+    )
+
+    GAE(config=GAEConfig(use_associative_scan_gae=True)).on_training_utility_fns(
+        trainer=mock_trainer
+    )
+    scan_advantages, scan_target_values = mock_trainer.store.gae_fn(
+        rewards=rewards_1, discounts=discounts, values=values
+    )
+
+    assert jnp.allclose(advantages, scan_advantages, atol=1e-6)
+    assert jnp.allclose(target_values, scan_target_values, atol=1e-6)
@@ -404,3 +404,78 @@ def test_mapg_huber_loss(
 
     assert low_loss_policy < loss_policy
     assert low_loss_critic < loss_critic
+
+
+def test_mapg_loss_batched_by_network(mock_trainer: Trainer) -> None:
+    """Test that batching agents per network matches the per-agent losses"""
+    SquaredErrorValueLoss().on_training_utility_fns(trainer=mock_trainer)
+    agents = ["agent_0", "agent_1", "agent_2"]
+    masks = {agent: jnp.array([1.0, 1.0, 1.0, 1.0]) for agent in agents}
+    behavior_values = {agent: jnp.array([1.0, 1.0, 1.0, 1.0]) for agent in agents}
+    target_values = {
+        agent: jnp.array([1.0, 2.0, 3.0, 4.0]) * (agent_index + 1)
+        for agent_index, agent in enumerate(agents)
+    }
+    policy_inputs = dict(
+        policy_params=mock_trainer.store.parameters,
+        observations=mock_trainer.store.observations,
+        actions={agent: jnp.array([1.0, 1.0, 1.0, 1.0]) for agent in agents},
+        behaviour_log_probs={
+            agent: jnp.array([-2.0, -2.0, -2.0, -2.0]) for agent in agents
+        },
+        advantages={agent: jnp.array([2.0, 2.0, 2.0, 2.0]) for agent in agents},
+        policy_states={agent: None for agent in agents},
+        masks=masks,
+    )
+
+    MAPGWithTrustRegionClippingLoss().on_training_loss_fns(trainer=mock_trainer)
+    assert not mock_trainer.store.grads_per_network
+    _, policy_loss_info = mock_trainer.store.policy_grad_fn(**policy_inputs)
+    critic_grads, critic_loss_info = mock_trainer.store.critic_grad_fn(
+        mock_trainer.store.parameters,
+        mock_trainer.store.observations,
+        target_values,
+        behavior_values,
+        masks,
+    )
+
+    MAPGWithTrustRegionClippingLoss(
+        config=MAPGTrustRegionClippingLossConfig(batch_agents_by_network=True)
+    ).on_training_loss_fns(trainer=mock_trainer)
+    assert mock_trainer.store.grads_per_network
+    batched_policy_grads, batched_policy_loss_info = mock_trainer.store.policy_grad_fn(
+        **policy_inputs
+    )
+    (
+        batched_critic_grads,
+        batched_critic_loss_info,
+    ) = mock_trainer.store.critic_grad_fn(
+        mock_trainer.store.parameters,
+        mock_trainer.store.observations,
+        target_values,
+        behavior_values,
+        masks,
+    )
+
+    # A single gradient is computed for the shared network.
+    assert list(batched_policy_grads.keys()) == ["network_agent"]
+    assert list(batched_critic_grads.keys()) == ["network_agent"]
+
+    # The shared gradient is the mean of the per-agent gradients.
+    expected_critic_grad = jax.tree_util.tree_map(
+        lambda *grads: sum(grads) / len(grads),
+        *[critic_grads[agent] for agent in agents],
+    )
+    assert jnp.allclose(
+        batched_critic_grads["network_agent"]["mlp/~/linear_0"]["w"],
+        expected_critic_grad["mlp/~/linear_0"]["w"],
+    )
+
+    # Loss information is still reported per agent.
+    for agent in agents:
+        for key, value in policy_loss_info[agent].items():
+            assert jnp.isclose(batched_policy_loss_info[agent][key], value)
+        assert jnp.isclose(
+            batched_critic_loss_info[agent]["loss_critic"],
+            critic_loss_info[agent]["loss_critic"],
+        )
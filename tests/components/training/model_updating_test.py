@@ -416,6 +416,74 @@ def test_minibatch_update_fn(
         )
 
 
+def fake_ppo_network_grad_fn(*args: Any) -> Tuple[Dict, Dict]:
+    """Fake grad function returning one gradient per network
+
+    Returns:
+        gradient: fake gradient per network
+        agent_metrics: fake metrics dictionary per agent
+    """
+    gradient = {
+        "network_agent_0": jnp.array([5.0, 5.0, 5.0]),
+        "network_agent_1": jnp.array([1.0, 1.0, 1.0]),
+    }
+    agent_metrics: Dict[str, Any] = {
+        agent: {} for agent in ["agent_0", "agent_1", "agent_2"]
+    }
+    return (gradient, agent_metrics)
+
+
+def test_minibatch_update_fn_grads_per_network(
+    mock_state_and_trainer: Tuple[Dict[str, Any], MockTrainer]
+) -> None:
+    """Test that agents sharing a network get a single update
+
+    Args:
+        mock_state_and_trainer: tuple
+            include fake state and mock trainer
+    """
+    state, mock_trainer = mock_state_and_trainer
+    mock_trainer.store.grads_per_network = True
+    mock_trainer.store.policy_grad_fn = fake_ppo_network_grad_fn
+    mock_trainer.store.critic_grad_fn = fake_ppo_network_grad_fn
+    mock_trainer.store.trainer_agent_net_keys = {
+        "agent_0": "network_agent_0",
+        "agent_1": "network_agent_1",
+        "agent_2": "network_agent_0",
+    }
+    carry = [
+        state["policy_params"],
+        state["critic_params"],
+        state["policy_opt_states"],
+        state["critic_opt_states"],
+    ]
+    (
+        new_policy_params,
+        new_critic_params,
+        _,
+        _,
+    ), metrics = mock_trainer.store.minibatch_update_fn(
+        carry=carry, minibatch=state["batch"]
+    )
+
+    # The shared network is updated once and not once per agent.
+    assert list(new_policy_params["network_agent_0"]) == [5.0, 5.0, 5.0]
+    assert list(new_policy_params["network_agent_1"]) == [2.0, 2.0, 2.0]
+    assert list(new_policy_params["network_agent_2"]) == [2.0, 2.0, 2.0]
+    assert list(new_critic_params["network_agent_0"]) == [5.0, 5.0, 5.0]
+
+    assert sorted(list(metrics.keys())) == ["agent_0", "agent_1", "agent_2"]
+    assert metrics["agent_0"]["norm_policy_grad"] == optax.global_norm(
+        jnp.array([5.0, 5.0, 5.0])
+    )
+    assert metrics["agent_2"]["norm_policy_grad"] == optax.global_norm(
+        jnp.array([5.0, 5.0, 5.0])
+    )
+    assert metrics["agent_1"]["norm_critic_grad"] == optax.global_norm(
+        jnp.array([1.0, 1.0, 1.0])
+    )
+
+
 def test_on_training_utility_fns_epoch(
     mock_trainer: MockTrainer,
 ) -> None:
@@ -19,7 +19,8 @@ import os
 import tempfile
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
 
 import numpy as np
 import pytest
@@ -28,6 +29,7 @@ from acme.jax import savers as acme_savers
 from mava.components.updating import Checkpointer
 from mava.components.updating.checkpointer import CheckpointerConfig
 from mava.core_jax import SystemParameterServer
+from mava.utils import lp_utils
 
 
 @dataclass
@@ -105,6 +107,7 @@ def test_save_restore(
     # Save modified parameters
     time.sleep(checkpointer.config.checkpoint_minute_interval * 60 + 2)
     checkpointer.on_parameter_server_run_loop_checkpoint(server=mock_parameter_server)
+    mock_parameter_server.store.checkpoint_thread.join()
     saved_trainer_steps = mock_parameter_server.store.parameters["trainer_steps"]
 
     # Check whether the checkpointer has saved to disk
@@ -167,8 +170,127 @@ def test_checkpointer(
     # Sleep until checkpoint_minute_interval elapses
     time.sleep(checkpointer.config.checkpoint_minute_interval * 60 + 2)
     checkpointer.on_parameter_server_run_loop_checkpoint(server=mock_parameter_server)
+    mock_parameter_server.store.checkpoint_thread.join()
 
     assert mock_parameter_server.store.last_checkpoint_time > checkpoint_init_time
     assert mock_parameter_server.store.last_checkpoint_time < time.time()
     assert mock_parameter_server.store.system_checkpointer._last_saved != 0
     assert mock_parameter_server.store.system_checkpointer._last_saved < time.time()
+
+
+def test_async_checkpoint_saves_snapshot(
+    mock_parameter_server: SystemParameterServer,
+    checkpointer: Checkpointer,
+) -> None:
+    """Test that parameters changing during an async checkpoint are not saved.
+
+    Args:
+        mock_parameter_server: Fixture SystemParameterServer.
+        checkpointer: Fixture Checkpointer.
+
+    Returns:
+        None
+    """
+    logged_metrics: List[Dict[str, Any]] = []
+    mock_parameter_server.store.parameter_server_logger = SimpleNamespace(
+        write=logged_metrics.append
+    )
+    checkpointer.on_parameter_server_init(server=mock_parameter_server)
+    system_checkpointer = mock_parameter_server.store.system_checkpointer
+    mock_parameter_server.store.parameters["trainer_steps"] += 10
+
+    time.sleep(checkpointer.config.checkpoint_minute_interval * 60 + 2)
+    checkpointer.on_parameter_server_run_loop_checkpoint(server=mock_parameter_server)
+
+    # Update the parameters in place while the checkpoint is being written.
+    mock_parameter_server.store.parameters["trainer_steps"] += 10
+    mock_parameter_server.store.checkpoint_thread.join()
+
+    metrics = mock_parameter_server.store.checkpoint_metrics
+    assert metrics["checkpoint_duration_seconds"] > 0
+    assert metrics["checkpoint_bytes_written"] > 0
+    # The metrics are written by the parameter server logger.
+    assert logged_metrics == [metrics]
+
+    # The snapshot taken when the checkpoint started is restored.
+    system_checkpointer.restore()
+    assert mock_parameter_server.store.parameters["trainer_steps"] == 10
+
+
+def test_termination_waits_for_checkpoint(
+    mock_parameter_server: SystemParameterServer,
+    checkpointer: Checkpointer,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that terminating the system waits for the async checkpoint.
+
+    Args:
+        mock_parameter_server: Fixture SystemParameterServer.
+        checkpointer: Fixture Checkpointer.
+        monkeypatch: Pytest fixture to patch launchpad.
+
+    Returns:
+        None
+    """
+    checkpointer.on_parameter_server_init(server=mock_parameter_server)
+    assert mock_parameter_server.store.checkpoint_dir == os.path.join(
+        mock_parameter_server.store.experiment_path, "checkpoints", "default"
+    )
+
+    time.sleep(checkpointer.config.checkpoint_minute_interval * 60 + 2)
+    checkpointer.on_parameter_server_run_loop_checkpoint(server=mock_parameter_server)
+
+    stopped = []
+    monkeypatch.setattr(lp_utils.lp, "stop", lambda: stopped.append(True))
+    mock_parameter_server.store.manager_pid = None
+    lp_utils.termination_fn(mock_parameter_server)
+
+    assert stopped
+    assert not mock_parameter_server.store.checkpoint_thread.is_alive()
+    assert mock_parameter_server.store.checkpoint_metrics
+
+
+def test_failed_async_checkpoint_is_raised(
+    mock_parameter_server: SystemParameterServer,
+    checkpointer: Checkpointer,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the error of a failed async checkpoint is raised later.
+
+    Args:
+        mock_parameter_server: Fixture SystemParameterServer.
+        checkpointer: Fixture Checkpointer.
+        monkeypatch: Pytest fixture to patch the checkpointer and launchpad.
+
+    Returns:
+        None
+    """
+    checkpointer.on_parameter_server_init(server=mock_parameter_server)
+    error = OSError("disk full")
+
+    def failing_save() -> None:
+        """Fail to write the checkpoint"""
+        raise error
+
+    monkeypatch.setattr(
+        mock_parameter_server.store.system_checkpointer, "save", failing_save
+    )
+
+    time.sleep(checkpointer.config.checkpoint_minute_interval * 60 + 2)
+    checkpointer.on_parameter_server_run_loop_checkpoint(server=mock_parameter_server)
+    mock_parameter_server.store.checkpoint_thread.join()
+    assert mock_parameter_server.store.checkpoint_error is error
+
+    # The next checkpoint call raises the error.
+    with pytest.raises(OSError, match="disk full"):
+        checkpointer.on_parameter_server_run_loop_checkpoint(
+            server=mock_parameter_server
+        )
+
+    # Terminating the system stops the processes before raising the error.
+    stopped = []
+    monkeypatch.setattr(lp_utils.lp, "stop", lambda: stopped.append(True))
+    mock_parameter_server.store.manager_pid = None
+    with pytest.raises(OSError, match="disk full"):
+        lp_utils.termination_fn(mock_parameter_server)
+    assert stopped
@@ -108,6 +108,8 @@ def mock_system_parameter_server() -> SystemParameterServer:
         "terminate": False,
         "num_executor_failed": 0,
     }
+    mock_system_parameter_server.store.parameter_versions = {}
+    mock_system_parameter_server.store._param_versions = None
 
     mock_system_parameter_server.store.checkpointing_metric = ["mean_episode_return"]
 
@@ -335,3 +337,54 @@ def test_on_parameter_server_add_to_parameters(
         mock_system_parameter_server
     )
     assert mock_system_parameter_server.store.parameters["num_executor_failed"] == 1
+
+
+def test_on_parameter_server_get_parameters_versioned(
+    default_parameter_server: DefaultParameterServer,
+    mock_system_parameter_server: SystemParameterServer,
+) -> None:
+    """Test that only parameters changed since the client versions are returned"""
+
+    mock_system_parameter_server.store._set_params = {"param1": "param1_new_value"}
+    default_parameter_server.on_parameter_server_set_parameters(
+        mock_system_parameter_server
+    )
+    mock_system_parameter_server.store._add_to_params = {"param3": "_param3_add"}
+    default_parameter_server.on_parameter_server_add_to_parameters(
+        mock_system_parameter_server
+    )
+    assert mock_system_parameter_server.store.parameter_versions == {
+        "param1": 1,
+        "param3": 1,
+    }
+
+    # A client without versions gets all parameters.
+    mock_system_parameter_server.store._param_names = ["param1", "param2", "param3"]
+    mock_system_parameter_server.store._param_versions = {}
+    default_parameter_server.on_parameter_server_get_parameters(
+        mock_system_parameter_server
+    )
+    assert mock_system_parameter_server.store.get_parameters == {
+        "param1": "param1_new_value",
+        "param2": "param2_value",
+        "param3": "param3_value_param3_add",
+    }
+    assert mock_system_parameter_server.store.get_parameter_versions == {
+        "param1": 1,
+        "param2": 0,
+        "param3": 1,
+    }
+
+    # A client holding the latest param1 and param2 only gets param3.
+    mock_system_parameter_server.store._param_versions = {
+        "param1": 1,
+        "param2": 0,
+        "param3": 0,
+    }
+    default_parameter_server.on_parameter_server_get_parameters(
+        mock_system_parameter_server
+    )
+    assert mock_system_parameter_server.store.get_parameters == {
+        "param3": "param3_value_param3_add"
+    }
+    assert mock_system_parameter_server.store.get_parameter_versions == {"param3": 1}
@@ -183,6 +183,27 @@ def test_observe_hook_order(
     ]
 
 
+def test_observe_trajectory_hook_order(
+    test_executor: MockExecutor,
+    dummy_actions: Dict[str, NestedArray],
+    dummy_time_step: dm_env.TimeStep,
+    dummy_extras: Dict[str, NestedArray],
+) -> None:
+    """Test if observe_trajectory hooks are called in the correct order"""
+    test_executor.reset_hook_list()
+    test_executor.observe_trajectory(
+        actions=(dummy_actions, {}),
+        next_timesteps=dummy_time_step,
+        next_extras=dummy_extras,
+    )
+    assert test_executor.store.next_timesteps == dummy_time_step
+    assert test_executor.hook_list == [
+        "on_execution_observe_trajectory_start",
+        "on_execution_observe_trajectory",
+        "on_execution_observe_trajectory_end",
+    ]
+
+
 def test_select_actions_hook_order(
     test_executor: MockExecutor,
 ) -> None:
@@ -16,6 +16,8 @@
 """Tests for parameter client class for Jax-based Mava systems"""
 
 import copy
+import uuid
+from concurrent import futures
 from types import SimpleNamespace
 from typing import Any, Dict, List, Sequence, Set, Union
 
@@ -24,6 +26,10 @@ import numpy as np
 import pytest
 
 from mava.callbacks.base import Callback
+from mava.components.updating.parameter_server import (
+    DefaultParameterServer,
+    SharedMemoryParameterBroadcast,
+)
 from mava.systems.parameter_client import ParameterClient
 from mava.systems.parameter_server import ParameterServer
 
@@ -419,3 +425,123 @@ def test_copy_tuple_with_device(parameter_client: ParameterClient) -> None:
         jax.numpy.array([11]),
         jax.numpy.array([22]),
     ]
+
+
+def test_versioned_get_only_copies_changed_parameters() -> None:
+    """Test that a versioned client only receives parameters that changed"""
+    server = ParameterServer(
+        store=SimpleNamespace(
+            network_factory=lambda: {
+                "network_agent": SimpleNamespace(policy_params={"w": np.zeros(2)})
+            },
+            policy_opt_states={"network_agent": {"opt_state": np.zeros(2)}},
+            num_executors=1,
+        ),
+        components=[DefaultParameterServer()],
+    )
+    parameter_client = ParameterClient(
+        server=server,
+        parameters={
+            "policy_network-network_agent": {"w": np.zeros(2)},
+            "executor_steps": np.zeros(1, dtype=np.int32),
+        },
+        multi_process=False,
+        get_keys=["policy_network-network_agent", "executor_steps"],
+        versioned=True,
+    )
+
+    # The first request returns all parameters.
+    parameter_client.get_and_wait()
+    assert parameter_client._versions == {
+        "policy_network-network_agent": 0,
+        "executor_steps": 0,
+    }
+
+    server.add_to_parameters({"executor_steps": np.ones(1, dtype=np.int32)})
+    assert server.get_updated_parameters(
+        ["policy_network-network_agent", "executor_steps"],
+        parameter_client._versions,
+    ) == ({"executor_steps": np.ones(1, dtype=np.int32)}, {"executor_steps": 1})
+
+    server.set_parameters({"policy_network-network_agent": {"w": np.ones(2)}})
+    parameter_client.get_and_wait()
+    assert np.array_equal(
+        parameter_client._parameters["policy_network-network_agent"]["w"], np.ones(2)
+    )
+    assert parameter_client._parameters["executor_steps"] == 1
+    assert parameter_client._versions == {
+        "policy_network-network_agent": 1,
+        "executor_steps": 1,
+    }
+
+    # Nothing changed so nothing is returned.
+    assert server.get_updated_parameters(
+        ["policy_network-network_agent", "executor_steps"],
+        parameter_client._versions,
+    ) == ({}, {})
+
+
+def test_versions_updated_from_done_callbacks() -> None:
+    """Test that versions updated by other threads are read consistently"""
+    parameter_client = ParameterClient(
+        server=None,  # type: ignore
+        parameters={},
+        multi_process=False,
+        versioned=True,
+    )
+    num_updates = 1000
+
+    def update(step: int) -> None:
+        parameter_client._copy_response(({}, {f"param_{step}": step}))
+
+    with futures.ThreadPoolExecutor(max_workers=4) as pool:
+        done = [pool.submit(update, step) for step in range(num_updates)]
+        while not all(future.done() for future in done):
+            versions = parameter_client._get_versions()
+            versions["copied"] = 0
+        for future in done:
+            future.result()
+
+    assert parameter_client._get_versions() == {
+        f"param_{step}": step for step in range(num_updates)
+    }
+
+
+def test_get_reads_shared_parameters() -> None:
+    """Test that a client reads broadcast parameters from shared memory"""
+    server = ParameterServer(
+        store=SimpleNamespace(
+            network_factory=lambda: {
+                "network_agent": SimpleNamespace(policy_params={"w": np.zeros(2)})
+            },
+            policy_opt_states={"network_agent": {"opt_state": np.zeros(2)}},
+            num_executors=1,
+            shared_parameters_name=f"mava_test_{uuid.uuid4().hex[:8]}",
+        ),
+        components=[DefaultParameterServer(), SharedMemoryParameterBroadcast()],
+    )
+    parameter_client = ParameterClient(
+        server=server,
+        parameters={
+            "policy_network-network_agent": {"w": np.zeros(2)},
+            "executor_steps": np.zeros(1, dtype=np.int32),
+        },
+        multi_process=False,
+        get_keys=["policy_network-network_agent", "executor_steps"],
+        versioned=True,
+        shared_parameters_name=server.store.shared_parameters_name,
+    )
+
+    server.set_parameters({"policy_network-network_agent": {"w": np.ones(2)}})
+    parameter_client.get_and_wait()
+    assert np.array_equal(
+        parameter_client._parameters["policy_network-network_agent"]["w"], np.ones(2)
+    )
+    assert parameter_client._versions["policy_network-network_agent"] == 1
+
+    # Only the parameters that are not broadcast are requested from the server.
+    assert parameter_client._request_keys == ["executor_steps"]
+
+    assert parameter_client._shared_parameters is not None
+    parameter_client._shared_parameters.close()
+    server.store.shared_parameters.close()
@@ -0,0 +1,233 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Jax rollout environment loop unit test"""
+
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+import dm_env
+import jax
+import jax.numpy as jnp
+import numpy as np
+import pytest
+
+from mava import constants
+from mava.utils.debugging.jax_simple_spread import JaxSimpleSpread
+from mava.utils.jax_training_utils import normalize_stacked_observations
+from mava.utils.jax_tree_utils import index_stacked_tree, stack_trees
+from mava.utils.sort_utils import sort_str_num
+from mava.wrappers.environment_loop_wrappers import JaxRolloutEnvironmentLoop
+from mava.wrappers.jax_debugging_envs import JaxDebuggingEnvWrapper
+
+
+class MockExecutor:
+    """Executor selecting random actions and recording what it observes"""
+
+    def __init__(self, agents: List[str], num_actions: int) -> None:
+        """Init"""
+
+        def select_actions(
+            observations: Dict[str, Any],
+            current_params: Any,
+            base_key: Any,
+            observation_stats: Any = None,
+            alive: Any = None,
+        ) -> Tuple:
+            """Select random discrete actions"""
+            if observation_stats is not None:
+                agents = sort_str_num(observations.keys())
+                normalised = normalize_stacked_observations(
+                    observation_stats["network_agent"],
+                    stack_trees([observations[agent] for agent in agents]),
+                    alive,
+                )
+                observations = {
+                    agent: index_stacked_tree(normalised, index)
+                    for index, agent in enumerate(agents)
+                }
+            keys = jax.random.split(base_key, len(observations) + 1)
+            actions_info = {
+                agent: jax.random.randint(key, (), 0, num_actions)
+                for agent, key in zip(observations.keys(), keys[1:])
+            }
+            policies_info = {
+                agent: {"log_prob": jnp.sum(observation.observation)}
+                for agent, observation in observations.items()
+            }
+            return actions_info, policies_info, keys[0]
+
+        self.store = SimpleNamespace(
+            select_actions_fn=jax.jit(select_actions),
+            networks={"network_agent": SimpleNamespace(get_params=lambda: {})},
+            agent_net_keys={agent: "network_agent" for agent in agents},
+            base_key=jax.random.PRNGKey(0),
+        )
+        self.first_timestep: Any = None
+        self.observed: List[Tuple] = []
+        self.num_trajectories = 0
+        self.num_updates = 0
+
+    def observe_first(self, timestep: dm_env.TimeStep, extras: Dict = {}) -> None:
+        """Record the first timestep"""
+        self.first_timestep = timestep
+
+    def observe_trajectory(
+        self, actions: Any, next_timesteps: dm_env.TimeStep, next_extras: Dict = {}
+    ) -> None:
+        """Record each observed step of the trajectory"""
+        self.num_trajectories += 1
+        for t in range(len(next_timesteps.step_type)):
+            self.observed.append(
+                jax.tree_util.tree_map(
+                    lambda x: x[t], (actions, next_timesteps, next_extras)
+                )
+            )
+
+    def update(self) -> None:
+        """Count the updates"""
+        self.num_updates += 1
+
+
+def make_environment_loop(
+    rollout_length: Any = None, normalise_observations: bool = False
+) -> Tuple[JaxRolloutEnvironmentLoop, MockExecutor]:
+    """Create an environment loop for the jax simple spread environment"""
+    environment = JaxDebuggingEnvWrapper(
+        JaxSimpleSpread(num_agents=3), return_state_info=True, random_seed=42
+    )
+    executor = MockExecutor(environment.agents, environment.environment.num_actions)
+    if normalise_observations:
+        observation_size = environment.environment.observation_size
+        executor.store.global_config = SimpleNamespace(normalise_observations=True)
+        executor.store.executor_environment = environment
+        executor.store.norm_params = {
+            constants.OBS_NORM_STATE_DICT_KEY: {
+                agent: dict(
+                    mean=jnp.ones(observation_size),
+                    std=jnp.ones(observation_size) * 2,
+                )
+                for agent in environment.agents
+            }
+        }
+    environment_loop = JaxRolloutEnvironmentLoop(
+        environment,
+        executor,  # type: ignore
+        rollout_length=rollout_length,
+        logger=SimpleNamespace(write=lambda _: None),  # type: ignore
+    )
+    return environment_loop, executor
+
+
+@pytest.mark.parametrize("rollout_length", [None, 20])
+def test_run_episode(rollout_length: Any) -> None:
+    """Test that the executor observes every step of the episode"""
+    environment_loop, executor = make_environment_loop(rollout_length)
+    max_steps = JaxSimpleSpread.max_steps
+
+    result = environment_loop.run_episode()
+
+    assert executor.first_timestep.first()
+    assert len(executor.observed) == max_steps
+    assert [timestep.last() for _, timestep, _ in executor.observed] == [False] * (
+        max_steps - 1
+    ) + [True]
+    assert result["episode_length"] == max_steps
+    assert executor.num_updates == -(-max_steps // (rollout_length or max_steps))
+    # Each rollout is observed with a single call.
+    assert executor.num_trajectories == executor.num_updates
+
+    _, timestep, extras = executor.observed[0]
+    assert set(timestep.observation.keys()) == {"agent_0", "agent_1", "agent_2"}
+    assert timestep.observation["agent_0"].observation.shape == (15,)
+    assert extras["s_t"].shape == (19,)
+
+
+def test_rollout_matches_environment_steps() -> None:
+    """Test that rollouts follow the dynamics of the wrapped environment"""
+    environment_loop, executor = make_environment_loop(rollout_length=20)
+    environment_loop.run_episode()
+
+    environment = JaxDebuggingEnvWrapper(JaxSimpleSpread(num_agents=3), random_seed=42)
+    timestep = environment.reset()
+    assert isinstance(timestep, dm_env.TimeStep)
+    assert np.allclose(
+        timestep.observation["agent_1"].observation,
+        executor.first_timestep.observation["agent_1"].observation,
+    )
+
+    for (actions_info, policies_info), observed_timestep, _ in executor.observed:
+        # Policy info is computed from the observations the actions were
+        # selected with.
+        assert np.isclose(
+            policies_info["agent_2"]["log_prob"],
+            np.sum(timestep.observation["agent_2"].observation),
+            rtol=1e-5,
+        )
+        timestep = environment.step(actions_info)
+        assert isinstance(timestep, dm_env.TimeStep)
+        assert timestep.step_type == observed_timestep.step_type
+        for agent in environment.agents:
+            assert np.allclose(
+                timestep.observation[agent].observation,
+                observed_timestep.observation[agent].observation,
+                atol=1e-5,
+            )
+            assert np.isclose(
+                timestep.reward[agent], observed_timestep.reward[agent], atol=1e-5
+            )
+
+
+def test_consecutive_episodes() -> None:
+    """Test that the environment is reset between episodes"""
+    environment_loop, executor = make_environment_loop(rollout_length=32)
+
+    environment_loop.run_episode()
+    first_episode = executor.observed
+    executor.observed = []
+    environment_loop.run_episode()
+
+    assert len(executor.observed) == JaxSimpleSpread.max_steps
+    assert not np.allclose(
+        first_episode[0][1].observation["agent_0"].observation,
+        executor.observed[0][1].observation["agent_0"].observation,
+    )
+
+
+def test_rollout_normalises_observations() -> None:
+    """Test that actions are selected from normalised observations"""
+    environment_loop, executor = make_environment_loop(
+        rollout_length=20, normalise_observations=True
+    )
+    environment_loop.run_episode()
+
+    environment = JaxDebuggingEnvWrapper(JaxSimpleSpread(num_agents=3), random_seed=42)
+    timestep = environment.reset()
+    assert isinstance(timestep, dm_env.TimeStep)
+    for (actions_info, policies_info), observed_timestep, _ in executor.observed:
+        # The stats have a mean of 1 and a std of 2.
+        assert np.isclose(
+            policies_info["agent_0"]["log_prob"],
+            np.sum((timestep.observation["agent_0"].observation - 1.0) / 2.0),
+            rtol=1e-5,
+        )
+        # The executor observes the raw observations.
+        timestep = environment.step(actions_info)
+        assert isinstance(timestep, dm_env.TimeStep)
+        assert np.allclose(
+            timestep.observation["agent_0"].observation,
+            observed_timestep.observation["agent_0"].observation,
+            atol=1e-5,
+        )
@@ -0,0 +1,434 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Vector parallel environment loop unit test"""
+
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+import dm_env
+import jax
+import jax.numpy as jnp
+import numpy as np
+from dm_env import specs
+
+from mava.environment_loop import (
+    AsyncVectorParallelEnvironmentLoop,
+    VectorParallelEnvironmentLoop,
+)
+from mava.utils.jax_training_utils import ExecutorObservationStats
+
+AGENTS = ["agent_0", "agent_1"]
+
+
+class MockEnvironment:
+    """Environment with a fixed episode length, observing its id and step"""
+
+    def __init__(self, env_id: int, episode_length: int) -> None:
+        """Init"""
+        self.env_id = env_id
+        self.episode_length = episode_length
+        self.agents = AGENTS
+        self.death_masked_agents: List[str] = []
+        self.num_resets = 0
+        self.actions: List[Dict[str, Any]] = []
+        self._step = 0
+
+    def _observations(self) -> Dict[str, np.ndarray]:
+        """Observations of the agents"""
+        return {
+            agent: np.array([self.env_id, self._step], dtype=np.float32)
+            for agent in self.agents
+        }
+
+    def reset(self) -> dm_env.TimeStep:
+        """Start a new episode"""
+        self._step = 0
+        self.num_resets += 1
+        return dm_env.restart(self._observations())
+
+    def step(self, actions: Dict[str, Any]) -> dm_env.TimeStep:
+        """Record the actions and take a step"""
+        self.actions.append(actions)
+        self._step += 1
+        rewards = {agent: np.float32(1.0) for agent in self.agents}
+        if self._step == self.episode_length:
+            return dm_env.termination(rewards, self._observations())
+        return dm_env.transition(rewards, self._observations())
+
+    def reward_spec(self) -> Dict[str, specs.Array]:
+        """Reward spec"""
+        return {agent: specs.Array((), np.float32) for agent in self.agents}
+
+
+class MockAsyncEnvironment(MockEnvironment):
+    """Environment whose steps are ready after being polled step_polls times"""
+
+    def __init__(self, env_id: int, episode_length: int, step_polls: int) -> None:
+        """Init"""
+        super().__init__(env_id, episode_length)
+        self.step_polls = step_polls
+        self.closed = False
+        self._pending_actions: Any = None
+        self._polls = 0
+
+    def step_async(self, actions: Dict[str, Any]) -> None:
+        """Start a step"""
+        assert self._pending_actions is None
+        self._pending_actions = actions
+        self._polls = 0
+
+    def ready(self) -> bool:
+        """Whether the step is finished"""
+        if self._pending_actions is None:
+            return False
+        self._polls += 1
+        return self._polls >= self.step_polls
+
+    def step_wait(self) -> dm_env.TimeStep:
+        """Finish the step"""
+        actions, self._pending_actions = self._pending_actions, None
+        return self.step(actions)
+
+    def close(self) -> None:
+        """Close the environment"""
+        self.closed = True
+
+
+class MockExecutor:
+    """Executor recording what each adder observes"""
+
+    def __init__(self) -> None:
+        """Init"""
+
+        def select_actions(
+            observations: Dict[str, Any], current_params: Any, base_key: Any
+        ) -> Tuple:
+            """Act with the id of the environment and a random policy info"""
+            actions_info = {
+                agent: observation[0].astype(jnp.int32)
+                for agent, observation in observations.items()
+            }
+            policies_info = {
+                agent: {"log_prob": jax.random.uniform(base_key)}
+                for agent in observations.keys()
+            }
+            return actions_info, policies_info, base_key
+
+        self.store = SimpleNamespace(
+            select_actions_fn=select_actions,
+            agent_net_keys={agent: "network_agent" for agent in AGENTS},
+            base_key=jax.random.PRNGKey(0),
+            adder=None,
+        )
+        self.selected_observations: List[Any] = []
+        self.num_updates = 0
+
+    def select_actions(self, observations: Dict[str, Any]) -> Tuple:
+        """Select the actions with the action selection function in store"""
+        self.selected_observations.append(observations)
+        (
+            actions_info,
+            policies_info,
+            self.store.base_key,
+        ) = self.store.select_actions_fn(observations, {}, self.store.base_key)
+        return actions_info, policies_info
+
+    def observe_first(self, timestep: dm_env.TimeStep, extras: Dict = {}) -> None:
+        """Write the first timestep to the adder in store"""
+        self.store.adder.append(("first", timestep))
+
+    def observe(
+        self, actions: Any, next_timestep: dm_env.TimeStep, next_extras: Dict = {}
+    ) -> None:
+        """Write the step to the adder in store"""
+        self.store.adder.append((actions, next_timestep))
+
+    def update(self) -> None:
+        """Count the updates"""
+        self.num_updates += 1
+
+
+class MockNormalisingExecutor(MockExecutor):
+    """Executor giving the normalisation args of the first environment"""
+
+    def __init__(self, environments: List[MockEnvironment]) -> None:
+        """Init"""
+        super().__init__()
+        self.environments = environments
+
+        def select_actions(
+            observations: Dict[str, Any],
+            current_params: Any,
+            base_key: Any,
+            observation_stats: Dict[str, Any],
+            alive: Any,
+        ) -> Tuple:
+            """Act with the scaled death mask of the agents"""
+            actions_info = {
+                agent: (alive[agent_id] * observation_stats["scale"]).astype(jnp.int32)
+                for agent_id, agent in enumerate(observations.keys())
+            }
+            return actions_info, {}, base_key
+
+        self.store.select_actions_fn = select_actions
+        self.store.observation_stats = ExecutorObservationStats(
+            self.store.agent_net_keys
+        )
+
+    def select_actions(self, observations: Dict[str, Any]) -> Tuple:
+        """Select the actions with the death mask of the first environment"""
+        self.selected_observations.append(observations)
+        alive = self.store.observation_stats.alive_mask(
+            list(observations.keys()), self.environments[0].death_masked_agents
+        )
+        (
+            actions_info,
+            policies_info,
+            self.store.base_key,
+        ) = self.store.select_actions_fn(
+            observations, {}, self.store.base_key, {"scale": 2}, alive
+        )
+        return actions_info, policies_info
+
+
+class MockEpsilonExecutor(MockExecutor):
+    """Executor selecting actions with an epsilon, like a DQN executor"""
+
+    def __init__(self) -> None:
+        """Init"""
+        super().__init__()
+
+        def select_actions(
+            observations: Dict[str, Any],
+            current_params: Any,
+            base_key: Any,
+            epsilon: float,
+        ) -> Tuple:
+            """Act with the id of the environment scaled by epsilon"""
+            actions_info = {
+                agent: (observation[0] * epsilon).astype(jnp.int32)
+                for agent, observation in observations.items()
+            }
+            return actions_info, base_key
+
+        self.store.select_actions_fn = select_actions
+
+    def select_actions(self, observations: Dict[str, Any]) -> Tuple:
+        """Select the actions with an epsilon of 2"""
+        self.selected_observations.append(observations)
+        actions_info, self.store.base_key = self.store.select_actions_fn(
+            observations, {}, self.store.base_key, 2.0
+        )
+        return actions_info, {}
+
+
+class MockMetricsExecutor(MockExecutor):
+    """Executor writing episode metrics when selecting actions and observing"""
+
+    def __init__(self) -> None:
+        """Init"""
+        super().__init__()
+        self.num_selections = 0
+
+    def select_actions(self, observations: Dict[str, Any]) -> Tuple:
+        """Record the number of action selection calls as a metric"""
+        self.num_selections += 1
+        self.store.episode_metrics["num_selections"] = self.num_selections
+        return super().select_actions(observations)
+
+    def observe(
+        self, actions: Any, next_timestep: dm_env.TimeStep, next_extras: Dict = {}
+    ) -> None:
+        """Count the observed steps of the episode as a metric"""
+        metrics = self.store.episode_metrics
+        metrics["observed_steps"] = metrics.get("observed_steps", 0) + 1
+        super().observe(actions, next_timestep, next_extras)
+
+
+def make_environment_loop(
+    episode_lengths: List[int],
+) -> Tuple[VectorParallelEnvironmentLoop, MockExecutor, List, List]:
+    """Create a vector environment loop with one list adder per environment"""
+    environments = [
+        MockEnvironment(env_id, episode_length)
+        for env_id, episode_length in enumerate(episode_lengths)
+    ]
+    adders: List[List] = [[] for _ in environments]
+    executor = MockExecutor()
+    environment_loop = VectorParallelEnvironmentLoop(
+        environments,  # type: ignore
+        executor,  # type: ignore
+        adders=adders,
+        logger=SimpleNamespace(write=lambda _: None),  # type: ignore
+    )
+    return environment_loop, executor, environments, adders
+
+
+def test_run_episode_returns_every_finished_episode() -> None:
+    """Test that episodes finishing in the same step are all returned"""
+    environment_loop, executor, _, _ = make_environment_loop([2, 2, 3])
+
+    results = [environment_loop.run_episode() for _ in range(3)]
+
+    assert [result["episode_length"] for result in results] == [2, 2, 3]
+    assert [result["episodes"] for result in results] == [1, 2, 3]
+    # The second episode finished in the same step as the first, so it is
+    # returned without stepping the environments.
+    assert len(executor.selected_observations) == 3
+    assert executor.num_updates == 3
+
+
+def test_batched_action_selection() -> None:
+    """Test that all environments act from a single action selection call"""
+    environment_loop, executor, environments, _ = make_environment_loop([3, 3, 3])
+
+    environment_loop.run_episode()
+
+    assert len(executor.selected_observations) == 3
+    for step, observations in enumerate(executor.selected_observations):
+        assert np.array_equal(
+            observations["agent_1"], [[0, step], [1, step], [2, step]]
+        )
+    for environment in environments:
+        assert [actions["agent_0"] for actions in environment.actions] == [
+            environment.env_id
+        ] * 3
+
+
+def test_per_environment_adders() -> None:
+    """Test that every environment writes its episode to its own adder"""
+    environment_loop, _, _, adders = make_environment_loop([2, 2, 2])
+
+    environment_loop.run_episode()
+
+    log_probs = []
+    for env_id, adder in enumerate(adders):
+        assert adder[0][0] == "first"
+        assert adder[0][1].first()
+        assert [timestep.last() for _, timestep in adder[1:3]] == [False, True]
+        for (actions_info, policies_info), timestep in adder[1:3]:
+            assert actions_info["agent_0"] == env_id
+            assert timestep.observation["agent_0"][0] == env_id
+        log_probs.append(adder[1][0][1]["agent_0"]["log_prob"])
+        # The environment was reset for its next episode.
+        assert adder[3][0] == "first"
+
+    # Every environment selects its actions with its own prng key.
+    assert len(set(log_probs)) == len(adders)
+
+
+def test_independent_resets() -> None:
+    """Test that environments are only reset when their episode finishes"""
+    environment_loop, _, environments, adders = make_environment_loop([2, 3])
+
+    environment_loop.run_episode()
+    assert [environment.num_resets for environment in environments] == [2, 1]
+
+    environment_loop.run_episode()
+    assert [environment.num_resets for environment in environments] == [2, 2]
+    # The first environment kept stepping its second episode.
+    assert adders[0][-1][1].observation["agent_0"][1] == 1
+    assert adders[1][-1][0] == "first"
+
+
+def test_per_environment_death_masks() -> None:
+    """Test that every environment normalises with its own death mask"""
+    environments = [MockEnvironment(env_id, 2) for env_id in range(3)]
+    environments[1].death_masked_agents = ["agent_1"]
+    environments[2].death_masked_agents = ["agent_0", "agent_1"]
+    executor = MockNormalisingExecutor(environments)
+    environment_loop = VectorParallelEnvironmentLoop(
+        environments,  # type: ignore
+        executor,  # type: ignore
+        adders=[[], [], []],
+        logger=SimpleNamespace(write=lambda _: None),  # type: ignore
+    )
+
+    environment_loop.run_episode()
+
+    # The stats are shared and the masks differ between environments.
+    assert [environment.actions[0] for environment in environments] == [
+        {"agent_0": 2, "agent_1": 2},
+        {"agent_0": 2, "agent_1": 0},
+        {"agent_0": 0, "agent_1": 0},
+    ]
+
+
+def test_extra_action_selection_args() -> None:
+    """Test that extra arguments such as epsilon are shared by all environments"""
+    environments = [MockEnvironment(env_id, 2) for env_id in range(3)]
+    executor = MockEpsilonExecutor()
+    environment_loop = VectorParallelEnvironmentLoop(
+        environments,  # type: ignore
+        executor,  # type: ignore
+        adders=[[], [], []],
+        logger=SimpleNamespace(write=lambda _: None),  # type: ignore
+    )
+
+    environment_loop.run_episode()
+
+    for environment in environments:
+        assert environment.actions[0] == {
+            agent: 2 * environment.env_id for agent in AGENTS
+        }
+
+
+def test_per_environment_episode_metrics() -> None:
+    """Test that episode metrics are kept and reset for every environment"""
+    environments = [MockEnvironment(0, 2), MockEnvironment(1, 3)]
+    executor = MockMetricsExecutor()
+    environment_loop = VectorParallelEnvironmentLoop(
+        environments,  # type: ignore
+        executor,  # type: ignore
+        adders=[[], []],
+        logger=SimpleNamespace(write=lambda _: None),  # type: ignore
+    )
+
+    results = [environment_loop.run_episode() for _ in range(3)]
+
+    # Each episode only counts its own steps, including the episode that
+    # finished in a later call than the episode of the other environment.
+    assert [result["episode_length"] for result in results] == [2, 3, 2]
+    assert [result["observed_steps"] for result in results] == [2, 3, 2]
+    # The action selection metrics are shared by the environments.
+    assert [result["num_selections"] for result in results] == [2, 3, 4]
+
+
+def test_async_loop_steps_ready_environments() -> None:
+    """Test that the async loop only waits for the environments that are ready"""
+    environments = [MockAsyncEnvironment(0, 3, 1), MockAsyncEnvironment(1, 3, 3)]
+    adders: List[List] = [[], []]
+    executor = MockExecutor()
+    environment_loop = AsyncVectorParallelEnvironmentLoop(
+        environments,  # type: ignore
+        executor,  # type: ignore
+        adders=adders,
+        logger=SimpleNamespace(write=lambda _: None),  # type: ignore
+    )
+
+    result = environment_loop.run_episode()
+
+    assert result["episode_length"] == 3
+    assert len(executor.selected_observations) == 3
+    # The slow environment took a single step while the fast one finished.
+    assert [len(environment.actions) for environment in environments] == [3, 1]
+    assert [actions["agent_0"] for actions in environments[1].actions] == [1]
+    assert [timestep.last() for _, timestep in adders[0][1:4]] == [False] * 2 + [True]
+    assert len(adders[1]) == 2
+    assert adders[1][1][1].observation["agent_0"][0] == 1
+
+    environment_loop.close()
+    assert all(environment.closed for environment in environments)
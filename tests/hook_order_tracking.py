@@ -211,6 +211,18 @@ class HookOrderTracking:
         """[summary]"""
         self.hook_list.append("on_execution_observe_end")
 
+    def on_execution_observe_trajectory_start(self) -> None:
+        """[summary]"""
+        self.hook_list.append("on_execution_observe_trajectory_start")
+
+    def on_execution_observe_trajectory(self) -> None:
+        """[summary]"""
+        self.hook_list.append("on_execution_observe_trajectory")
+
+    def on_execution_observe_trajectory_end(self) -> None:
+        """[summary]"""
+        self.hook_list.append("on_execution_observe_trajectory_end")
+
     def on_execution_select_actions_start(self) -> None:
         """[summary]"""
         self.hook_list.append("on_execution_select_actions_start")
@@ -99,6 +99,7 @@ def test_parameter_server_single_process(test_system_sp: System) -> None:
 
     # Run step function
     parameter_server.step()
+    parameter_server.store.checkpoint_thread.join()
 
     # Check that the checkpoint is saved thanks to the step function
     assert parameter_server.store.last_checkpoint_time > checkpoint_init_time
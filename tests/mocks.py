@@ -90,11 +90,17 @@ class MockedExecutor(ActorMock, core.Executor):
 
     def observe(
         self,
-        action: Dict[str, NestedArray],
+        action: Union[
+            Dict[str, NestedArray],
+            Tuple[Dict[str, NestedArray], Dict[str, NestedArray]],
+        ],
         next_timestep: dm_env.TimeStep,
         next_extras: Dict[str, NestedArray] = {},
     ) -> None:
         """Observe environment."""
+        if isinstance(action, tuple):
+            # Actions given with their policy info.
+            action, _ = action
 
         for agent, observation_spec in self._spec.items():
             if agent in action.keys():
@@ -1,7 +1,15 @@
 from types import SimpleNamespace
 
-from mava.systems.idqn.components.training.loss import IDQNLoss
+import jax.numpy as jnp
+import numpy as np
+
+from mava.systems.idqn.components.training.loss import (
+    IDQNLoss,
+    IDQNLossConfig,
+    importance_sampling_weights,
+)
 from mava.systems.trainer import Trainer
+from mava.types import OLT
 
 
 class MockTrainer(Trainer):
@@ -18,3 +26,102 @@ def test_idqn_loss() -> None:
 
     assert hasattr(trainer.store, "policy_grad_fn")
     assert callable(trainer.store.policy_grad_fn)
+
+
+def test_importance_sampling_weights() -> None:
+    """Tests that rarely sampled transitions get the largest weights"""
+    probabilities = jnp.array([0.5, 0.25, 0.125, 0.125])
+
+    weights = importance_sampling_weights(probabilities, 1.0)
+    np.testing.assert_allclose(weights, [0.25, 0.5, 1.0, 1.0])
+
+    weights = importance_sampling_weights(probabilities, 0.5)
+    np.testing.assert_allclose(weights, np.sqrt([0.25, 0.5, 1.0, 1.0]), rtol=1e-6)
+
+    # No correction without an exponent or for uniform sampling.
+    np.testing.assert_allclose(importance_sampling_weights(probabilities, 0.0), 1.0)
+    np.testing.assert_allclose(importance_sampling_weights(jnp.full(4, 0.25), 1.0), 1.0)
+
+
+def test_idqn_loss_priorities_and_importance_weights() -> None:
+    """Tests that the loss is weighted and returns the largest TD errors"""
+    trainer = MockTrainer()
+    trainer.store.trainer_agents = ["agent_0", "agent_1"]
+    trainer.store.trainer_agent_net_keys = {
+        "agent_0": "network_agent",
+        "agent_1": "network_agent",
+    }
+    # Q-values are the observations scaled by the parameters.
+    trainer.store.networks = {
+        "network_agent": SimpleNamespace(
+            forward=lambda params, observations: observations * params["w"]
+        )
+    }
+    IDQNLoss(
+        IDQNLossConfig(
+            gamma=0.5, importance_sampling_exponent=1.0, priority_epsilon=0.01
+        )
+    ).on_training_loss_fns(trainer)
+
+    def olt(value: float) -> OLT:
+        return OLT(
+            observation=jnp.full((3, 2), value),
+            legal_actions=jnp.ones((3, 2)),
+            terminal=jnp.zeros((3, 1)),
+        )
+
+    agents = trainer.store.trainer_agents
+    rewards = {
+        "agent_0": jnp.array([0.0, 1.0, 2.0]),
+        "agent_1": jnp.array([1.0, 0.0, 0.0]),
+    }
+    probabilities = jnp.array([0.5, 0.25, 0.25])
+    loss_args = (
+        {"network_agent": {"w": jnp.array([1.0, 2.0])}},
+        {"network_agent": {"w": jnp.array([0.5, 0.5])}},
+        {agent: olt(1.0) for agent in agents},
+        {agent: jnp.array([0, 1, 0]) for agent in agents},
+        rewards,
+        {agent: olt(2.0) for agent in agents},
+        {agent: jnp.ones(3) for agent in agents},
+    )
+    _, loss_info, priorities = trainer.store.policy_grad_fn(*loss_args, probabilities)
+
+    # The selected next action is 1, with a target value of 1.
+    q_tm1 = np.array([1.0, 2.0, 1.0])
+    td_errors = {agent: rewards[agent] + 0.5 - q_tm1 for agent in agents}
+    np.testing.assert_allclose(
+        priorities,
+        np.max(np.abs([td_errors["agent_0"], td_errors["agent_1"]]), axis=0) + 0.01,
+        rtol=1e-6,
+    )
+    np.testing.assert_allclose(priorities, [0.51, 1.51, 1.51], rtol=1e-6)
+
+    weights = np.array([0.5, 1.0, 1.0])
+    for agent in agents:
+        np.testing.assert_allclose(
+            loss_info[agent]["policy_loss_total"],
+            np.mean(weights * 0.5 * td_errors[agent] ** 2),
+            rtol=1e-6,
+        )
+
+    # Without sampling probabilities the loss is not reweighted.
+    _, loss_info, _ = trainer.store.policy_grad_fn(*loss_args)
+    for agent in agents:
+        np.testing.assert_allclose(
+            loss_info[agent]["policy_loss_total"],
+            np.mean(0.5 * td_errors[agent] ** 2),
+            rtol=1e-6,
+        )
+
+    # Transitions without TD error keep a non-zero priority.
+    no_error_rewards = {agent: q_tm1 - 0.5 for agent in agents}
+    _, _, priorities = trainer.store.policy_grad_fn(
+        loss_args[0],
+        loss_args[1],
+        loss_args[2],
+        loss_args[3],
+        no_error_rewards,
+        *loss_args[5:],
+    )
+    np.testing.assert_allclose(priorities, 0.01, rtol=1e-6)
@@ -1,7 +1,21 @@
 from types import SimpleNamespace
+from typing import Any, Dict, List, NamedTuple, Tuple
 
-from mava.systems.idqn.components.training.step import IDQNStep
+import jax
+import jax.numpy as jnp
+import numpy as np
+import optax
+
+from mava import constants
+from mava.components.building.datasets import ShardReplaySample
+from mava.systems.idqn.components.training.step import (
+    IDQNStep,
+    IDQNStepConfig,
+    shard_priority_updates,
+)
 from mava.systems.trainer import Trainer
+from mava.types import Transition
+from mava.utils.dataset_utils import DevicePrefetchIterator
 
 
 class MockTrainer(Trainer):
@@ -10,6 +24,95 @@ class MockTrainer(Trainer):
         self.store = SimpleNamespace()
 
 
+class MockDataServerClient:
+    def __init__(self) -> None:
+        """Init"""
+        self.updates: List[Tuple[str, Dict]] = []
+
+    def mutate_priorities(self, table: str, updates: Dict) -> None:
+        """Record the priority updates"""
+        self.updates.append((table, updates))
+
+
+class MockSampleInfo(NamedTuple):
+    key: Any
+    probability: Any
+
+
+class MockSample(NamedTuple):
+    info: Any
+    data: Any
+    shard: Any
+
+
+def make_trainer(update_priorities: bool) -> MockTrainer:
+    """Trainer whose loss gives the rewards as the priorities"""
+    trainer = MockTrainer()
+    # Whether each traced loss was given sampling probabilities.
+    weighted_losses: List[bool] = []
+    params = {"w": jnp.zeros(2)}
+    optimiser = optax.sgd(0.1)
+
+    def policy_grad_fn(
+        policy_params: Any,
+        target_policy_params: Any,
+        observations: Any,
+        actions: Any,
+        rewards: Any,
+        next_observations: Any,
+        discounts: Any,
+        probabilities: Any,
+    ) -> Tuple:
+        """Constant gradients, with the rewards as priorities"""
+        weighted_losses.append(probabilities is not None)
+        grads = {"agent_0": {"w": jnp.ones(2)}}
+        return grads, {"agent_0": {"policy_loss_total": 0.0}}, rewards["agent_0"]
+
+    trainer.store = SimpleNamespace(
+        networks={
+            "network_agent": SimpleNamespace(
+                policy_params=dict(params), target_policy_params=dict(params)
+            )
+        },
+        policy_optimiser=optimiser,
+        policy_opt_states={
+            "network_agent": {constants.OPT_STATE_DICT_KEY: optimiser.init(params)}
+        },
+        policy_grad_fn=policy_grad_fn,
+        trainer_agents=["agent_0"],
+        trainer_agent_net_keys={"agent_0": "network_agent"},
+        base_key=jax.random.PRNGKey(0),
+        trainer_counts={"trainer_steps": 0},
+        trainer_id="trainer_0",
+        data_server_clients=[MockDataServerClient(), MockDataServerClient()],
+        weighted_losses=weighted_losses,
+    )
+    IDQNStep(IDQNStepConfig(update_priorities=update_priorities)).on_training_step_fn(
+        trainer
+    )
+    return trainer
+
+
+def make_sample(keys: List[int], shard: int, key_offset: int = 0) -> MockSample:
+    """Sample of transitions with the keys, minus key_offset, as rewards"""
+    batch = len(keys)
+    observations = {"agent_0": jnp.zeros((batch, 2))}
+    return MockSample(
+        info=MockSampleInfo(
+            key=np.array(keys, dtype=np.uint64) + np.uint64(key_offset),
+            probability=jnp.full(batch, 0.5),
+        ),
+        data=Transition(
+            observations=observations,
+            actions={"agent_0": jnp.zeros(batch, dtype=jnp.int32)},
+            rewards={"agent_0": jnp.array(keys, dtype=jnp.float32)},
+            discounts={"agent_0": jnp.ones(batch)},
+            next_observations=observations,
+        ),
+        shard=np.int32(shard),
+    )
+
+
 def test_idqn_loss() -> None:
     """Tests that idqn step creates the step function"""
     trainer = MockTrainer()
@@ -18,3 +121,71 @@ def test_idqn_loss() -> None:
 
     assert hasattr(trainer.store, "step_fn")
     assert callable(trainer.store.step_fn)
+    assert trainer.store.priority_updater is None
+
+
+def test_step_updates_priorities() -> None:
+    """Tests that the step sends the priorities to the shard of the sample"""
+    trainer = make_trainer(update_priorities=True)
+
+    trainer.store.step_fn(make_sample([3, 5], shard=1))
+    trainer.store.step_fn(make_sample([7], shard=0))
+    trainer.store.priority_updater.shutdown(wait=True)
+
+    first_shard, second_shard = trainer.store.data_server_clients
+    # The priorities are keyed by sample.info.key.
+    assert second_shard.updates == [("trainer_0", {3: 3.0, 5: 5.0})]
+    assert first_shard.updates == [("trainer_0", {7: 7.0})]
+    # The loss is corrected with the sampling probabilities.
+    assert trainer.store.weighted_losses and all(trainer.store.weighted_losses)
+    # The parameters were updated.
+    assert not np.allclose(
+        trainer.store.networks["network_agent"].policy_params["w"], 0.0
+    )
+
+
+def test_step_without_priority_updates() -> None:
+    """Tests that priorities are only updated when configured"""
+    trainer = make_trainer(update_priorities=False)
+
+    trainer.store.step_fn(make_sample([3, 5], shard=1))
+
+    assert trainer.store.priority_updater is None
+    assert all(not client.updates for client in trainer.store.data_server_clients)
+    # Uniformly sampled transitions are not reweighted.
+    assert trainer.store.weighted_losses == [False]
+
+
+def test_step_updates_priorities_of_prefetched_shard_samples() -> None:
+    """Tests priority updates of shard samples prefetched onto the device"""
+    trainer = make_trainer(update_priorities=True)
+    key_offset = 2**40
+    samples = [
+        ShardReplaySample(*make_sample([3, 5], shard=1, key_offset=key_offset)),
+        ShardReplaySample(*make_sample([7], shard=0, key_offset=key_offset)),
+    ]
+
+    for sample in DevicePrefetchIterator(iter(samples), buffer_size=2):
+        trainer.store.step_fn(sample)
+    trainer.store.priority_updater.shutdown(wait=True)
+
+    # Each update is sent to the shard of its sample, with the 64 bit keys.
+    first_shard, second_shard = trainer.store.data_server_clients
+    assert second_shard.updates == [
+        ("trainer_0", {key_offset + 3: 3.0, key_offset + 5: 5.0})
+    ]
+    assert first_shard.updates == [("trainer_0", {key_offset + 7: 7.0})]
+
+
+def test_shard_priority_updates() -> None:
+    """Tests that priority updates are grouped by data server shard"""
+    keys = np.array([10, 11, 12, 13], dtype=np.uint64)
+    priorities = np.array([0.1, 0.2, 0.3, 0.4])
+
+    assert shard_priority_updates(keys, priorities) == {
+        0: {10: 0.1, 11: 0.2, 12: 0.3, 13: 0.4}
+    }
+    assert shard_priority_updates(keys, priorities, np.array([1, 0, 1, 1])) == {
+        0: {11: 0.2},
+        1: {10: 0.1, 12: 0.3, 13: 0.4},
+    }
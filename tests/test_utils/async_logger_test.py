@@ -0,0 +1,112 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Async logger unit test"""
+
+import threading
+from typing import Any, List
+
+import pytest
+
+from mava.utils.loggers.async_logger import AsyncLogger
+
+
+class RecordingLogger:
+    """Logger recording the written records, optionally until it is released"""
+
+    def __init__(self) -> None:
+        """Init"""
+        self.records: List[Any] = []
+        self.closed = False
+        self.release = threading.Event()
+        self.release.set()
+
+    def write(self, data: Any) -> None:
+        """Record the data"""
+        self.release.wait()
+        self.records.append(data)
+
+    def close(self) -> None:
+        """Record that the logger is closed"""
+        self.closed = True
+
+
+def test_records_are_written_in_order() -> None:
+    """Test that every record is written when time_delta is zero"""
+    destination = RecordingLogger()
+    logger = AsyncLogger(destination, time_delta=0)  # type: ignore
+    for step in range(100):
+        logger.write({"step": step})
+    logger.close()
+
+    assert destination.records == [{"step": step} for step in range(100)]
+    assert destination.closed
+
+
+def test_records_are_coalesced() -> None:
+    """Test that records within time_delta are merged into the last record"""
+    destination = RecordingLogger()
+    logger = AsyncLogger(destination, time_delta=60)  # type: ignore
+    logger.write({"step": 0, "loss": 1.0})
+    for step in range(1, 10):
+        logger.write({"step": step})
+    logger.close()
+
+    assert destination.records[-1] == {"step": 9, "loss": 1.0}
+    assert len(destination.records) <= 2
+
+
+@pytest.mark.parametrize("overflow", ["aggregate", "drop"])
+def test_overflow(overflow: str) -> None:
+    """Test that writing does not block when the queue is full"""
+    destination = RecordingLogger()
+    destination.release.clear()
+    logger = AsyncLogger(
+        destination, time_delta=0, max_queue_size=2, overflow=overflow  # type: ignore
+    )
+    for step in range(10):
+        logger.write({"step": step})
+    destination.release.set()
+    logger.close()
+
+    steps = [record["step"] for record in destination.records]
+    assert steps == sorted(steps)
+    if overflow == "aggregate":
+        assert steps[-1] == 9
+        assert logger.num_dropped == 0
+    else:
+        assert logger.num_dropped == 10 - len(steps)
+        assert logger.num_dropped > 0
+
+
+def test_writes_after_close_are_dropped() -> None:
+    """Test that records written once the logger is closed are dropped"""
+    destination = RecordingLogger()
+    logger = AsyncLogger(destination, time_delta=0)  # type: ignore
+    logger.write({"step": 0})
+    logger.close()
+    logger.write({"step": 1})
+    logger.close()
+
+    assert destination.records == [{"step": 0}]
+    assert logger.num_dropped == 1
+
+
+def test_invalid_config() -> None:
+    """Test that invalid queue sizes and overflow modes are rejected"""
+    with pytest.raises(ValueError):
+        AsyncLogger(RecordingLogger(), max_queue_size=0)  # type: ignore
+    with pytest.raises(ValueError):
+        AsyncLogger(RecordingLogger(), overflow="block")  # type: ignore
@@ -0,0 +1,112 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Dataset util functions unit test"""
+
+import time
+from typing import Iterator
+
+import jax
+import numpy as np
+import pytest
+import reverb
+
+from mava.components.building.datasets import ShardReplaySample
+from mava.utils.dataset_utils import DevicePrefetchIterator
+
+
+def make_samples(num_samples: int) -> Iterator[reverb.ReplaySample]:
+    """Create reverb samples holding their index"""
+    for i in range(num_samples):
+        yield reverb.ReplaySample(
+            info=reverb.SampleInfo(
+                key=np.array([2**40 + i], dtype=np.uint64),
+                probability=np.ones(1),
+                table_size=np.ones(1, dtype=np.int64),
+                priority=np.ones(1),
+                times_sampled=np.ones(1, dtype=np.int32),
+            ),
+            data={"observations": np.full((2, 3), i, dtype=np.float32)},
+        )
+
+
+def test_prefetch_iterator_puts_data_on_device() -> None:
+    """Test that samples are put on device in order"""
+    iterator = DevicePrefetchIterator(make_samples(5), buffer_size=2)
+
+    samples = list(iterator)
+    assert len(samples) == 5
+    for i, sample in enumerate(samples):
+        assert isinstance(sample.data["observations"], jax.Array)
+        assert np.all(np.asarray(sample.data["observations"]) == i)
+        # The sample info, e.g. the 64 bit keys, stays on the host.
+        assert sample.info.key.dtype == np.uint64
+        assert sample.info.key[0] == 2**40 + i
+
+    with pytest.raises(StopIteration):
+        next(iterator)
+
+
+def test_prefetch_iterator_keeps_shard_samples_info_on_host() -> None:
+    """Test that the info and shard of sharded data server samples stay on host"""
+    shard_samples = (
+        ShardReplaySample(info=sample.info, data=sample.data, shard=np.int32(i % 2))
+        for i, sample in enumerate(make_samples(3))
+    )
+    iterator = DevicePrefetchIterator(shard_samples, buffer_size=2)
+
+    for i, sample in enumerate(iterator):
+        assert isinstance(sample, ShardReplaySample)
+        assert isinstance(sample.data["observations"], jax.Array)
+        assert np.all(np.asarray(sample.data["observations"]) == i)
+        assert isinstance(sample.info.key, np.ndarray)
+        assert sample.info.key.dtype == np.uint64
+        assert sample.info.key[0] == 2**40 + i
+        assert isinstance(sample.shard, np.integer)
+        assert sample.shard == i % 2
+
+
+def test_prefetch_iterator_metrics() -> None:
+    """Test that the queue depth and stall time are reported"""
+    iterator = DevicePrefetchIterator(make_samples(5), buffer_size=3)
+
+    # Wait for the buffer to fill up.
+    time.sleep(0.5)
+    next(iterator)
+    assert iterator.metrics["prefetch_queue_depth"] == 3
+    assert iterator.metrics["prefetch_stall_seconds"] >= 0
+
+
+def test_prefetch_iterator_raises_producer_errors() -> None:
+    """Test that errors raised by the dataset are raised by next"""
+
+    def failing_samples() -> Iterator[np.ndarray]:
+        """Yield one sample and fail"""
+        yield np.zeros(2)
+        raise RuntimeError("Dataset failed.")
+
+    iterator = DevicePrefetchIterator(failing_samples(), buffer_size=2)
+    next(iterator)
+    with pytest.raises(RuntimeError, match="Dataset failed."):
+        next(iterator)
+    # Later calls raise the error instead of waiting for a sample.
+    with pytest.raises(RuntimeError, match="Dataset failed."):
+        next(iterator)
+
+
+def test_prefetch_iterator_buffer_size() -> None:
+    """Test that the buffer must hold at least one sample"""
+    with pytest.raises(ValueError):
+        DevicePrefetchIterator(make_samples(1), buffer_size=0)
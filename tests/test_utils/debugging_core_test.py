@@ -0,0 +1,74 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Debugging environment physics unit test"""
+
+import numpy as np
+import pytest
+
+from mava.utils.debugging.core import Agent, Landmark, World
+
+
+def make_world(num_agents: int) -> World:
+    """Create a world with overlapping agents and landmarks"""
+    rng = np.random.RandomState(42)
+    world = World()
+    world.agents = [Agent() for _ in range(num_agents)]
+    for i, agent in enumerate(world.agents):
+        agent.size = 0.15
+        agent.initial_mass = 1.0 + i % 3
+        agent.max_speed = 0.5 if i % 2 else None
+    world.landmarks = [Landmark() for _ in range(num_agents)]
+    for landmark in world.landmarks:
+        landmark.collide = False
+    for entity in world.entities:
+        entity.state.p_pos = rng.uniform(-0.5, 0.5, world.dim_p)
+        entity.state.p_vel = rng.uniform(-1, 1, world.dim_p)
+    return world
+
+
+@pytest.mark.parametrize("num_agents", [1, 3, 20])
+def test_collision_forces_match_pairwise_forces(num_agents: int) -> None:
+    """Test that the vectorized collision forces sum the pairwise forces"""
+    world = make_world(num_agents)
+
+    expected_forces = np.zeros((len(world.entities), world.dim_p))
+    for a, entity_a in enumerate(world.entities):
+        for b, entity_b in enumerate(world.entities):
+            force_a, _ = world.get_collision_force(entity_a, entity_b)
+            if force_a is not None:
+                expected_forces[a] += force_a
+
+    assert np.allclose(world.get_collision_forces(), expected_forces)
+
+
+def test_step_integrates_movable_entities() -> None:
+    """Test that a world step updates the state of the entities"""
+    world = make_world(4)
+    for agent in world.agents:
+        agent.action.u = np.ones(world.dim_p)
+    landmark_pos = np.array(world.landmarks[0].state.p_pos)
+    agent_pos = np.array(world.agents[0].state.p_pos)
+
+    world.step()
+
+    # Landmarks do not move and agents keep under their max speed.
+    assert np.array_equal(world.landmarks[0].state.p_pos, landmark_pos)
+    assert not np.array_equal(world.agents[0].state.p_pos, agent_pos)
+    assert np.linalg.norm(world.agents[1].state.p_vel) <= 0.5 + 1e-9
+
+    # Entity states are views into the world arrays.
+    world.agents[0].state.p_pos = np.zeros(world.dim_p)
+    assert np.array_equal(world.state.p_pos[0], np.zeros(world.dim_p))
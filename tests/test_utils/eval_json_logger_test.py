@@ -14,13 +14,14 @@
 # limitations under the License.
 
 import json
+import os
 import tempfile
 from typing import Dict
 
 import jax.numpy as jnp
 import pytest
 
-from mava.utils.loggers.eval_json_logger import JSONLogger
+from mava.utils.loggers.eval_json_logger import JSONLogger, read_json_records
 
 temp_path = tempfile.mkdtemp()
 
@@ -52,6 +53,18 @@ def logger(test_data: Dict) -> JSONLogger:
     return logger
 
 
+def make_logger(test_data: Dict, experiment_path: str) -> JSONLogger:
+    """Logger of the test data writing to experiment_path."""
+
+    return JSONLogger(
+        experiment_path=experiment_path,
+        random_seed=test_data["random_seed"],
+        env_name=test_data["env_name"],
+        task_name=test_data["task_name"],
+        system_name=test_data["system_name"],
+    )
+
+
 @pytest.fixture
 def jax_type_step_data() -> Dict:
     """Mock data for a logging step in jax format."""
@@ -249,6 +262,16 @@ def test_write(
     # Test that step data logged correctly.
     logger.write(mock_normal_step_data)
 
+    assert list(read_json_records(logger._records_file_dir)) == [
+        (
+            "step_0",
+            expected_output_data["after_one_normal_log"]["test_env"]["test_task"][
+                "test_system"
+            ]["1111"]["step_0"],
+        )
+    ]
+
+    logger.export()
     with open(logger._logs_file_dir, "r") as f:
         read_in_data = json.load(f)
 
@@ -261,3 +284,59 @@ def test_write(
         read_in_data = json.load(f)
 
     assert read_in_data == expected_output_data["after_normal_and_absolute_log"]
+
+
+def test_resume_after_interrupted_write(
+    test_data: Dict, full_logging_data: Dict, expected_output_data: Dict
+) -> None:
+    """Test that a new logger keeps the complete records of an earlier run."""
+
+    experiment_path = tempfile.mkdtemp()
+    logger = make_logger(test_data, experiment_path)
+    logger.write(full_logging_data["mock_normal_step_data"])
+
+    # Simulate a write interrupted in the middle of a line.
+    with open(logger._records_file_dir, "a") as f:
+        f.write('{"key": "step_1", "da')
+    assert len(list(read_json_records(logger._records_file_dir))) == 1
+
+    logger = make_logger(test_data, experiment_path)
+    logger.write(full_logging_data["mock_absolute_metric_data"])
+
+    with open(logger._logs_file_dir, "r") as f:
+        read_in_data = json.load(f)
+
+    assert read_in_data == expected_output_data["after_normal_and_absolute_log"]
+
+
+def test_resume_continues_step_count(test_data: Dict, full_logging_data: Dict) -> None:
+    """Test that a new logger doesn't overwrite the steps of an earlier run."""
+
+    experiment_path = tempfile.mkdtemp()
+    logger = make_logger(test_data, experiment_path)
+    logger.write(full_logging_data["mock_normal_step_data"])
+    logger.write(full_logging_data["mock_normal_step_data"])
+
+    logger = make_logger(test_data, experiment_path)
+    assert logger._step_count == 2
+    logger.write(full_logging_data["mock_normal_step_data"])
+
+    assert [
+        dict_key for dict_key, _ in read_json_records(logger._records_file_dir)
+    ] == ["step_0", "step_1", "step_2"]
+
+
+def test_records_from_json_file(test_data: Dict, expected_output_data: Dict) -> None:
+    """Test that the data of json files without records is kept."""
+
+    experiment_path = tempfile.mkdtemp()
+    logger = make_logger(test_data, experiment_path)
+    os.remove(logger._records_file_dir)
+    with open(logger._logs_file_dir, "w") as f:
+        json.dump(expected_output_data["after_normal_and_absolute_log"], f)
+
+    logger = make_logger(test_data, experiment_path)
+
+    assert [
+        dict_key for dict_key, _ in read_json_records(logger._records_file_dir)
+    ] == ["step_0", "absolute_metrics"]
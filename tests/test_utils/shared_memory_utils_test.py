@@ -0,0 +1,156 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared memory util functions unit test"""
+
+import threading
+import uuid
+from typing import Any, Dict, Iterator, Tuple
+
+import numpy as np
+import pytest
+
+from mava.utils.shared_memory_utils import SharedParameterBuffer, is_shareable
+
+
+def make_parameters(value: float) -> Dict[str, Any]:
+    """Create network parameters filled with the given value"""
+    return {
+        "policy_network-network_agent": {
+            "mlp/~/linear_0": {
+                "w": np.full((3, 2), value, dtype=np.float32),
+                "b": np.full(2, value, dtype=np.float32),
+            }
+        },
+        "norm_params": {"count": np.array([value])},
+    }
+
+
+@pytest.fixture
+def shared_buffers() -> Iterator[Tuple[SharedParameterBuffer, SharedParameterBuffer]]:
+    """Creates a shared parameter buffer and a reader attached to it"""
+    name = f"mava_test_{uuid.uuid4().hex[:8]}"
+    writer = SharedParameterBuffer(name, make_parameters(0.0))
+    reader = SharedParameterBuffer(name)
+    yield writer, reader
+    reader.close()
+    writer.close()
+
+
+def test_is_shareable() -> None:
+    """Test that only numeric arrays can be shared"""
+    assert is_shareable(make_parameters(0.0))
+    assert not is_shareable({"state": "not an array"})
+
+
+def test_read_only_returns_changed_parameters(
+    shared_buffers: Tuple[SharedParameterBuffer, SharedParameterBuffer]
+) -> None:
+    """Test that readers only get parameters with a new version"""
+    writer, reader = shared_buffers
+    names = ["policy_network-network_agent", "norm_params", "executor_steps"]
+    assert reader.keys == ["policy_network-network_agent", "norm_params"]
+
+    parameters, versions = reader.read(names, {})
+    assert versions == {"policy_network-network_agent": 0, "norm_params": 0}
+
+    new_parameters = make_parameters(1.0)
+    writer.write(
+        {
+            "policy_network-network_agent": new_parameters[
+                "policy_network-network_agent"
+            ]
+        },
+        {"policy_network-network_agent": 1},
+    )
+    parameters, versions = reader.read(names, versions)
+    assert versions == {"policy_network-network_agent": 1}
+    assert np.array_equal(
+        parameters["policy_network-network_agent"]["mlp/~/linear_0"]["w"],
+        np.ones((3, 2)),
+    )
+
+    # Nothing changed since the last read.
+    assert reader.read(names, {**versions, "norm_params": 0}) == ({}, {})
+
+
+def test_write_with_wrong_shape(
+    shared_buffers: Tuple[SharedParameterBuffer, SharedParameterBuffer]
+) -> None:
+    """Test that parameters not matching the layout are rejected"""
+    writer, _ = shared_buffers
+    with pytest.raises(ValueError):
+        writer.write({"norm_params": {"count": np.zeros(2)}}, {"norm_params": 1})
+
+
+def test_write_with_wrong_dtype(
+    shared_buffers: Tuple[SharedParameterBuffer, SharedParameterBuffer]
+) -> None:
+    """Test that parameters are not silently cast to the dtype of the layout"""
+    writer, reader = shared_buffers
+    parameters = make_parameters(1.0)["policy_network-network_agent"]
+    parameters["mlp/~/linear_0"]["w"] = parameters["mlp/~/linear_0"]["w"].astype(
+        np.float64
+    )
+    with pytest.raises(ValueError):
+        writer.write(
+            {"policy_network-network_agent": parameters},
+            {"policy_network-network_agent": 1},
+        )
+    assert reader.read(reader.keys, {})[1]["policy_network-network_agent"] == 0
+
+
+def test_read_times_out_during_unfinished_write(
+    shared_buffers: Tuple[SharedParameterBuffer, SharedParameterBuffer]
+) -> None:
+    """Test that readers give up when the writer died in the middle of a write"""
+    writer, reader = shared_buffers
+    # Start a write that never finishes.
+    writer._sequence += 1
+
+    with pytest.raises(TimeoutError):
+        reader.read(reader.keys, {}, timeout=0.01)
+
+
+def test_reads_are_consistent_during_writes(
+    shared_buffers: Tuple[SharedParameterBuffer, SharedParameterBuffer]
+) -> None:
+    """Test that readers never see a partially written parameter"""
+    writer, reader = shared_buffers
+    done = threading.Event()
+
+    def write_parameters() -> None:
+        """Keep writing parameters with increasing values"""
+        version = 0
+        while not done.is_set():
+            version += 1
+            writer.write(
+                make_parameters(float(version)),
+                dict.fromkeys(["policy_network-network_agent", "norm_params"], version),
+            )
+
+    writer_thread = threading.Thread(target=write_parameters)
+    writer_thread.start()
+    try:
+        for _ in range(200):
+            parameters, versions = reader.read(reader.keys, {})
+            linear = parameters["policy_network-network_agent"]["mlp/~/linear_0"]
+            version = versions["policy_network-network_agent"]
+            assert np.all(linear["w"] == version)
+            assert np.all(linear["b"] == version)
+            assert parameters["norm_params"]["count"][0] == versions["norm_params"]
+    finally:
+        done.set()
+        writer_thread.join()
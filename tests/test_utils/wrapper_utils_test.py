@@ -0,0 +1,155 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Wrapper util functions unit test"""
+from typing import Dict
+
+import numpy as np
+import pytest
+from dm_env import specs
+
+from mava import types
+from mava.utils.wrapper_utils import (
+    DMCompatibleObservationConverter,
+    RunningStatistics,
+    convert_dm_compatible_observations,
+)
+
+agents = ["agent_0", "agent_1"]
+
+
+@pytest.fixture
+def observation_spec() -> Dict[str, types.OLT]:
+    """Observation spec of agents with discrete actions"""
+    return {
+        agent: types.OLT(
+            observation=specs.Array((3,), np.float32),
+            legal_actions=specs.Array((4,), np.int64),
+            terminal=specs.Array((1,), np.float32),
+        )
+        for agent in agents
+    }
+
+
+def test_convert_observations(observation_spec: Dict[str, types.OLT]) -> None:
+    """Test that observations, masks and defaults are converted"""
+    converter = DMCompatibleObservationConverter(observation_spec, agents)
+    observes = {
+        "agent_0": {
+            "observation": np.arange(3, dtype=np.float64),
+            "action_mask": np.array([1, 0, 1, 0]),
+        }
+    }
+
+    observations = converter.convert(observes, {"agent_0": True}, env_done=False)
+
+    assert observations["agent_0"].observation.dtype == np.float32
+    np.testing.assert_array_equal(observations["agent_0"].observation, [0, 1, 2])
+    np.testing.assert_array_equal(observations["agent_0"].legal_actions, [1, 0, 1, 0])
+    assert observations["agent_0"].legal_actions.dtype == np.int64
+    np.testing.assert_array_equal(observations["agent_0"].terminal, [1.0])
+
+    # Agents without observations get the default values.
+    np.testing.assert_array_equal(observations["agent_1"].observation, np.zeros(3))
+    np.testing.assert_array_equal(observations["agent_1"].legal_actions, np.ones(4))
+    np.testing.assert_array_equal(observations["agent_1"].terminal, [0.0])
+
+    # The function gives the same observations.
+    expected = convert_dm_compatible_observations(
+        observes, {"agent_0": True}, observation_spec, False, agents
+    )
+    for agent in agents:
+        for field, expected_field in zip(observations[agent], expected[agent]):
+            np.testing.assert_array_equal(field, expected_field)
+
+
+def test_convert_observations_reuses_constants(
+    observation_spec: Dict[str, types.OLT]
+) -> None:
+    """Test that constant fields are shared between steps and read-only"""
+    converter = DMCompatibleObservationConverter(observation_spec, agents)
+    observes = {agent: np.ones(3, dtype=np.float32) for agent in agents}
+
+    first = converter.convert(observes, {}, env_done=False)
+    second = converter.convert(observes, {}, env_done=False)
+
+    assert first["agent_0"].observation is observes["agent_0"]
+    assert first["agent_0"].legal_actions is second["agent_0"].legal_actions
+    assert first["agent_0"].terminal is second["agent_1"].terminal
+    with pytest.raises(ValueError):
+        first["agent_0"].legal_actions[0] = 0
+
+
+def test_convert_observations_copies_env_arrays(
+    observation_spec: Dict[str, types.OLT]
+) -> None:
+    """Test that observations and masks don't alias the environment's arrays"""
+    converter = DMCompatibleObservationConverter(observation_spec, agents)
+    observation = np.ones(3, dtype=np.float32)
+    action_mask = np.array([1, 0, 1, 0], dtype=np.int64)
+
+    converted = converter.convert(
+        {"agent_0": {"observation": observation, "action_mask": action_mask}},
+        {},
+        env_done=False,
+    )
+
+    # Environments writing their next observations in place don't change them.
+    observation[:] = 0.0
+    action_mask[:] = 1
+    np.testing.assert_array_equal(converted["agent_0"].observation, np.ones(3))
+    np.testing.assert_array_equal(converted["agent_0"].legal_actions, [1, 0, 1, 0])
+
+
+def test_running_statistics_window() -> None:
+    """Test that the mean, variance and quantiles are computed over the window"""
+    values = np.random.default_rng(0).normal(1e4, 3.0, size=250)
+    stats = RunningStatistics("return", queue_size=100)
+    assert stats.mean() == 0.0 and stats.var() == 0.0
+    assert np.isnan(stats.quantile(0.5))
+
+    for i, value in enumerate(values):
+        stats.push(value)
+        window = values[max(0, i - 99) : i + 1]
+        assert np.isclose(stats.mean(), np.mean(window), rtol=1e-12)
+        assert np.isclose(stats.var(), np.var(window), rtol=1e-6, atol=1e-9)
+
+    assert stats.max() == np.max(values)
+    assert stats.min() == np.min(values)
+    assert stats.raw() == values[-1]
+    np.testing.assert_allclose(
+        stats.quantile([0.1, 0.5, 0.9]), np.quantile(values[-100:], [0.1, 0.5, 0.9])
+    )
+
+
+def test_running_statistics_push_many() -> None:
+    """Test that pushing values at once matches pushing them one by one"""
+    values = np.random.default_rng(1).normal(5.0, 2.0, size=250)
+    stats = RunningStatistics("reward", queue_size=100)
+    batched_stats = RunningStatistics("reward", queue_size=100)
+
+    for start, stop in [(0, 30), (30, 30), (30, 95), (95, 250)]:
+        for value in values[start:stop]:
+            stats.push(value)
+        batched_stats.push_many(values[start:stop])
+
+        for stat in ["mean", "var", "max", "min", "raw"]:
+            assert np.isclose(
+                getattr(batched_stats, stat)(), getattr(stats, stat)(), rtol=1e-9
+            )
+        np.testing.assert_allclose(
+            batched_stats.quantile([0.1, 0.5, 0.9]),
+            stats.quantile([0.1, 0.5, 0.9]),
+        )
@@ -0,0 +1,240 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests that the tree observation encoder matches the flatland baselines"""
+
+import random
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pytest
+
+from mava.utils.environments.flatland_utils import check_flatland_import
+
+_has_flatland = check_flatland_import()
+if _has_flatland:
+    from flatland.envs.observations import Node, TreeObsForRailEnv
+
+    from mava.wrappers.flatland import (
+        TreeObservationEncoder,
+        batched_norm_obs_clip,
+        norm_obs_clip,
+        normalize_observation,
+        split_tree_into_feature_groups,
+    )
+
+pytestmark = pytest.mark.skipif(not _has_flatland, reason="flatland not installed")
+
+NUM_TREES_PER_DEPTH = 100
+
+
+# Baseline implementation of the flatland starter-kit, splitting the tree
+# recursively and normalizing one observation at a time.
+def _baseline_split_node(node: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Splits node into features."""
+    data = np.array(
+        [
+            node.dist_own_target_encountered,
+            node.dist_other_target_encountered,
+            node.dist_other_agent_encountered,
+            node.dist_potential_conflict,
+            node.dist_unusable_switch,
+            node.dist_to_next_branch,
+        ],
+        dtype=np.float64,
+    )
+    distance = np.array([node.dist_min_to_target], dtype=np.float64)
+    agent_data = np.array(
+        [
+            node.num_agents_same_direction,
+            node.num_agents_opposite_direction,
+            node.num_agents_malfunctioning,
+            node.speed_min_fractional,
+        ],
+        dtype=np.float64,
+    )
+    return data, distance, agent_data
+
+
+def _baseline_split_subtree(
+    node: Any, current_tree_depth: int, max_tree_depth: int
+) -> Tuple:
+    """Split subtree."""
+    if node == -np.inf:
+        remaining_depth = max_tree_depth - current_tree_depth
+        num_remaining_nodes = int((4 ** (remaining_depth + 1) - 1) / (4 - 1))
+        return (
+            [-np.inf] * num_remaining_nodes * 6,
+            [-np.inf] * num_remaining_nodes,
+            [-np.inf] * num_remaining_nodes * 4,
+        )
+
+    data, distance, agent_data = _baseline_split_node(node)
+    if not node.childs:
+        return data, distance, agent_data
+
+    for direction in TreeObsForRailEnv.tree_explored_actions_char:
+        sub_data, sub_distance, sub_agent_data = _baseline_split_subtree(
+            node.childs[direction], current_tree_depth + 1, max_tree_depth
+        )
+        data = np.concatenate((data, sub_data))
+        distance = np.concatenate((distance, sub_distance))
+        agent_data = np.concatenate((agent_data, sub_agent_data))
+    return data, distance, agent_data
+
+
+def _baseline_split_tree(tree: Any, max_tree_depth: int) -> Tuple:
+    """Splits the tree into three difference arrays."""
+    data, distance, agent_data = _baseline_split_node(tree)
+    for direction in TreeObsForRailEnv.tree_explored_actions_char:
+        sub_data, sub_distance, sub_agent_data = _baseline_split_subtree(
+            tree.childs[direction], 1, max_tree_depth
+        )
+        data = np.concatenate((data, sub_data))
+        distance = np.concatenate((distance, sub_distance))
+        agent_data = np.concatenate((agent_data, sub_agent_data))
+    return data, distance, agent_data
+
+
+def _baseline_normalize_observation(
+    observation: Any, tree_depth: int, observation_radius: int = 0
+) -> np.ndarray:
+    """Normalizes the observation as the flatland baselines."""
+    if observation is None:
+        return np.zeros(
+            11 * sum(np.power(4, i) for i in range(tree_depth + 1)),
+            dtype=np.float32,
+        )
+    data, distance, agent_data = _baseline_split_tree(observation, tree_depth)
+
+    data = norm_obs_clip(data, fixed_radius=observation_radius)
+    distance = norm_obs_clip(distance, normalize_to_range=True)
+    agent_data = np.clip(agent_data, -1, 1)
+    return np.array(
+        np.concatenate((np.concatenate((data, distance)), agent_data)),
+        dtype=np.float32,
+    )
+
+
+def _random_value(rng: random.Random) -> float:
+    """Feature value, including the infinities used by flatland"""
+    return rng.choice(
+        [
+            np.inf,
+            -np.inf,
+            0,
+            rng.randint(0, 5),
+            rng.randint(0, 50),
+            rng.random() * 2000,
+        ]
+    )
+
+
+def _random_tree(rng: random.Random, depth: int, max_tree_depth: int) -> Any:
+    """Tree whose children are missing with probability 0.4"""
+    childs = {}
+    if depth < max_tree_depth:
+        for direction in TreeObsForRailEnv.tree_explored_actions_char:
+            if rng.random() < 0.6:
+                childs[direction] = _random_tree(rng, depth + 1, max_tree_depth)
+            else:
+                childs[direction] = -np.inf
+    features = {
+        field: _random_value(rng) for field in Node._fields if field != "childs"
+    }
+    return Node(childs=childs, **features)
+
+
+def _random_trees(max_tree_depth: int) -> List[Optional[Any]]:
+    """Random trees, with missing observations"""
+    rng = random.Random(max_tree_depth)
+    trees: List[Optional[Any]] = [
+        _random_tree(rng, 0, max_tree_depth) for _ in range(NUM_TREES_PER_DEPTH)
+    ]
+    trees[::10] = [None] * len(trees[::10])
+    return trees
+
+
+@pytest.mark.parametrize("max_tree_depth", [1, 2, 3])
+@pytest.mark.parametrize("observation_radius", [0, 10])
+def test_encoder_matches_baseline(max_tree_depth: int, observation_radius: int) -> None:
+    """Test that the batched encoding equals the baseline normalization"""
+    trees = _random_trees(max_tree_depth)
+    encoder = TreeObservationEncoder(max_tree_depth, observation_radius)
+
+    observations = encoder(trees)
+
+    assert observations.shape == (len(trees), encoder.observation_size)
+    assert observations.dtype == np.float32
+    for tree, observation in zip(trees, observations):
+        expected = _baseline_normalize_observation(
+            tree, max_tree_depth, observation_radius
+        )
+        assert np.array_equal(observation, expected)
+        assert np.array_equal(
+            normalize_observation(tree, max_tree_depth, observation_radius), expected
+        )
+
+
+@pytest.mark.parametrize("max_tree_depth", [1, 2, 3])
+def test_split_tree_matches_baseline(max_tree_depth: int) -> None:
+    """Test that the features are in the order of the baseline split"""
+    for tree in _random_trees(max_tree_depth):
+        if tree is None:
+            continue
+        for features, expected in zip(
+            split_tree_into_feature_groups(tree, max_tree_depth),
+            _baseline_split_tree(tree, max_tree_depth),
+        ):
+            assert np.array_equal(features, expected)
+
+
+def test_none_observations() -> None:
+    """Test that missing observations are encoded as zeros"""
+    encoder = TreeObservationEncoder(2)
+
+    observations = encoder([None, None])
+
+    assert np.array_equal(
+        observations, np.zeros((2, 11 * (1 + 4 + 16)), dtype=np.float32)
+    )
+    assert np.array_equal(
+        normalize_observation(None, 2), _baseline_normalize_observation(None, 2)
+    )
+
+
+@pytest.mark.parametrize("fixed_radius", [0, 10])
+@pytest.mark.parametrize("normalize_to_range", [False, True])
+def test_batched_norm_obs_clip(fixed_radius: int, normalize_to_range: bool) -> None:
+    """Test that every row is normalized as norm_obs_clip does"""
+    rng = random.Random(0)
+    obs = np.array(
+        [[_random_value(rng) for _ in range(21)] for _ in range(300)], dtype=np.float64
+    )
+    # Rows without valid values and with a single valid value.
+    obs[0] = -np.inf
+    obs[1] = np.inf
+    obs[2, :] = -np.inf
+    obs[2, 3] = 4.0
+
+    batched = batched_norm_obs_clip(
+        obs, fixed_radius=fixed_radius, normalize_to_range=normalize_to_range
+    )
+
+    for row, normalized in zip(obs, batched):
+        expected = norm_obs_clip(
+            row, fixed_radius=fixed_radius, normalize_to_range=normalize_to_range
+        )
+        assert np.array_equal(normalized, expected, equal_nan=True)
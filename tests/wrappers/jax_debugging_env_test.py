@@ -0,0 +1,121 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the jax simple_spread environment and its dm_env wrapper."""
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+import pytest
+
+from mava.utils.debugging import scenarios
+from mava.utils.debugging.jax_simple_spread import JaxSimpleSpread, SimpleSpreadState
+from mava.utils.environments import debugging_utils
+
+
+@pytest.mark.parametrize("recurrent_test", [False, True])
+def test_jax_simple_spread_matches_debugging_env(recurrent_test: bool) -> None:
+    """Test that the jax environment follows the debugging scenario"""
+    num_agents = 4
+    scenario = scenarios.load("simple_spread").Scenario(recurrent_test=recurrent_test)
+    world = scenario.make_world(num_agents)
+    environment = JaxSimpleSpread(num_agents, "discrete", recurrent_test)
+    state = SimpleSpreadState(
+        agent_pos=jnp.array([agent.state.p_pos for agent in world.agents]),
+        agent_vel=jnp.zeros((num_agents, 2)),
+        landmark_pos=jnp.array([landmark.state.p_pos for landmark in world.landmarks]),
+        step=jnp.zeros((), dtype=jnp.int32),
+    )
+    moves = np.array([[0, 0], [-1, 0], [1, 0], [0, -1], [0, 1]], dtype=float)
+    step_fn = jax.jit(environment.step)
+
+    rng = np.random.RandomState(0)
+    for _ in range(environment.max_steps):
+        actions = rng.randint(environment.num_actions, size=num_agents)
+        for agent, action in zip(world.agents, actions):
+            agent.action.u = moves[action] * 5.0
+        world.step()
+        state, observations, rewards, done = step_fn(state, jnp.array(actions))
+
+        for i, agent in enumerate(world.agents):
+            assert np.allclose(
+                observations[i], scenario.observation(agent, i, world), atol=1e-5
+            )
+            assert np.isclose(rewards[i], scenario.reward(agent, i, world), atol=1e-5)
+    assert done
+
+
+def test_jax_simple_spread_vmap() -> None:
+    """Test stepping a batch of environments with vmap"""
+    environment = JaxSimpleSpread(num_agents=3)
+    num_envs = 128
+    keys = jax.random.split(jax.random.PRNGKey(0), num_envs)
+
+    states, observations = jax.vmap(environment.reset)(keys)
+    states, observations, rewards, done = jax.jit(jax.vmap(environment.step))(
+        states, jnp.ones((num_envs, 3), dtype=jnp.int32)
+    )
+
+    assert observations.shape == (num_envs, 3, environment.observation_size)
+    assert rewards.shape == (num_envs, 3)
+    assert done.shape == (num_envs,)
+    # The environments are reset with different keys.
+    assert not jnp.allclose(states.agent_pos[0], states.agent_pos[1])
+
+
+@pytest.mark.parametrize("action_space", ["discrete", "continuous"])
+def test_jax_debugging_env_wrapper(action_space: str) -> None:
+    """Test that the wrapper can replace the debugging environment wrapper"""
+    environment, _ = debugging_utils.make_environment(
+        env_name="jax_simple_spread",
+        action_space=action_space,
+        return_state_info=True,
+        random_seed=42,
+    )
+    debugging_environment, _ = debugging_utils.make_environment(
+        env_name="simple_spread",
+        action_space=action_space,
+        return_state_info=True,
+        random_seed=42,
+    )
+
+    assert environment.possible_agents == debugging_environment.possible_agents
+    assert environment.action_spec() == debugging_environment.action_spec()
+    for agent in environment.possible_agents:
+        spec = environment.observation_spec()[agent]
+        debugging_spec = debugging_environment.observation_spec()[agent]
+        assert spec.observation.shape == debugging_spec.observation.shape
+        assert np.array_equal(spec.legal_actions, debugging_spec.legal_actions)
+    assert (
+        environment.extras_spec()["s_t"].shape
+        == debugging_environment.extras_spec()["s_t"].shape
+    )
+
+    timestep, extras = environment.reset()
+    assert timestep.first()
+    actions = {
+        agent: spec.generate_value()
+        for agent, spec in environment.action_spec().items()
+    }
+    num_steps = 0
+    while not timestep.last():
+        timestep, extras = environment.step(actions)
+        num_steps += 1
+
+    assert num_steps == JaxSimpleSpread.max_steps
+    assert environment.env_done()
+    assert extras["s_t"].shape == environment.extras_spec()["s_t"].shape
+    for observation in timestep.observation.values():
+        assert observation.terminal == 1.0
@@ -0,0 +1,126 @@
+# python3
+# Copyright 2021 InstaDeep Ltd. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the subprocess environment wrapper."""
+
+import functools
+from typing import Iterator, List
+
+import dm_env
+import numpy as np
+import pytest
+
+from mava.types import OLT
+from mava.utils.environments import debugging_utils
+from mava.wrappers.subprocess_env import (
+    SharedTimestepBuffer,
+    SubprocessEnvWrapper,
+    wait_for_environments,
+)
+
+environment_factory = functools.partial(
+    debugging_utils.make_environment,
+    env_name="simple_spread",
+    action_space="discrete",
+    num_agents=3,
+    random_seed=42,
+)
+
+
+def make_timestep(value: float) -> dm_env.TimeStep:
+    """Create a timestep filled with the given value"""
+    return dm_env.transition(
+        reward={"agent_0": np.float32(value)},
+        observation={
+            "agent_0": OLT(
+                observation=np.full(4, value, dtype=np.float32),
+                legal_actions=np.ones(2, dtype=np.int64),
+                terminal=np.zeros(1, dtype=np.float32),
+            )
+        },
+        discount={"agent_0": np.float32(1.0)},
+    )
+
+
+@pytest.fixture
+def subprocess_environments() -> Iterator[List[SubprocessEnvWrapper]]:
+    """Pytest fixture for two subprocess environments"""
+    environments = [SubprocessEnvWrapper(environment_factory) for _ in range(2)]
+    yield environments
+    for environment in environments:
+        environment.close()
+
+
+def test_shared_timestep_buffer() -> None:
+    """Test that timesteps are written to and read from shared memory"""
+    buffer = SharedTimestepBuffer(make_timestep(0.0))
+    attached_buffer = SharedTimestepBuffer(make_timestep(0.0), name=buffer.name)
+
+    assert buffer.write(make_timestep(3.0))
+    timestep = attached_buffer.read(dm_env.StepType.MID)
+    assert timestep.step_type == dm_env.StepType.MID
+    assert timestep.reward["agent_0"] == 3.0
+    assert np.array_equal(timestep.observation["agent_0"].observation, np.full(4, 3.0))
+
+    # Timesteps with a different structure do not fit the buffer.
+    assert not buffer.write(dm_env.restart({"agent_0": np.zeros(4)}))
+
+    attached_buffer.close()
+    buffer.close()
+
+
+def test_subprocess_env_matches_local_env(
+    subprocess_environments: List[SubprocessEnvWrapper],
+) -> None:
+    """Test that the remote environment behaves like a local one"""
+    local_environment, _ = environment_factory()
+    remote_environment = subprocess_environments[0]
+
+    assert remote_environment.possible_agents == local_environment.possible_agents
+    assert remote_environment.reward_spec() == local_environment.reward_spec()
+
+    local_timestep = local_environment.reset()
+    remote_timestep = remote_environment.reset()
+    actions = {agent: 1 for agent in local_environment.possible_agents}
+    for _ in range(3):
+        local_timestep = local_environment.step(actions)
+        remote_timestep = remote_environment.step(actions)
+
+        assert remote_timestep.step_type == local_timestep.step_type
+        for agent in local_environment.possible_agents:
+            assert np.allclose(
+                remote_timestep.observation[agent].observation,
+                local_timestep.observation[agent].observation,
+            )
+            assert remote_timestep.reward[agent] == local_timestep.reward[agent]
+
+    # Observations after the first step are passed through shared memory.
+    assert remote_environment._buffer is not None
+
+
+def test_step_async(subprocess_environments: List[SubprocessEnvWrapper]) -> None:
+    """Test stepping environments without waiting for them"""
+    for environment in subprocess_environments:
+        environment.reset()
+        environment.step_async({agent: 0 for agent in environment.possible_agents})
+
+    ready: List[int] = []
+    while len(ready) < len(subprocess_environments):
+        for env_id in wait_for_environments(subprocess_environments):
+            ready.append(env_id)
+            timestep = subprocess_environments[env_id].step_wait()
+            assert timestep.mid()
+
+    assert sorted(ready) == [0, 1]
@@ -474,6 +474,44 @@ class TestEnvWrapper:
             for k in range(num_frames - 1):
                 assert np.array_equal(old_obs, stacked_obs[k * size : (k + 1) * size])
 
+    def test_wrapper_env_obs_stacking_order(
+        self, env_spec: EnvSpec, helpers: Helpers
+    ) -> None:
+        """Test that stacked frames shift by one frame at every step"""
+
+        if env_spec is None:
+            pytest.skip()
+
+        wrapped_env, _ = helpers.get_wrapped_env(env_spec)
+        num_frames = 3
+        stacked_env = StackObservations(wrapped_env, num_frames=num_frames)
+        agents = wrapped_env.agents
+
+        stacked_step = stacked_env.reset()
+        if type(stacked_step) == tuple:
+            stacked_step, _ = stacked_step
+
+        # Step past the size of the stack to wrap around the frame buffer.
+        for _ in range(num_frames + 2):
+            test_agents_actions = {
+                agent: wrapped_env.action_spaces[agent].sample() for agent in agents
+            }
+            next_stacked_step = stacked_env.step(test_agents_actions)
+            if type(next_stacked_step) == tuple:
+                next_stacked_step, _ = next_stacked_step
+            if next_stacked_step.last():
+                break
+
+            for agent in agents:
+                stacked_obs = stacked_step.observation[agent].observation
+                next_stacked_obs = next_stacked_step.observation[agent].observation
+                size = stacked_obs.shape[0] // num_frames
+
+                # Previous observations are not changed by the next steps.
+                assert np.array_equal(next_stacked_obs[:-size], stacked_obs[size:])
+
+            stacked_step = next_stacked_step
+
     def test_wrapper_env_obs_stacking_and_concate(
         self, env_spec: EnvSpec, helpers: Helpers
     ) -> None: